@@ -0,0 +1,13 @@
+"""
+Throughput benchmarks for Pancham.
+
+The benchmarks build synthetic inputs with :class:`benchmark.data_generator.DataGenerator`,
+time the loaders, field parsers, lookup caches and database output against them and
+write the timings to a JSON results file. Two results files can be compared to find
+regressions between commits.
+
+Run from the repository root::
+
+    python -m benchmark run --rows 5000 --output results.json
+    python -m benchmark compare baseline.json results.json
+"""
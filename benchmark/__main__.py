@@ -0,0 +1,60 @@
+import os
+import tempfile
+from typing import Annotated, Optional
+
+import typer
+
+from .data_generator import DataGenerator
+from .results import BenchmarkResults, compare_results
+from .suite import BenchmarkSuite
+
+app = typer.Typer()
+
+
+@app.command()
+def run(
+        rows: Annotated[int, typer.Option(help="Number of rows to generate")] = 5000,
+        repeat: Annotated[int, typer.Option(help="Number of times each benchmark is run")] = 3,
+        output: Annotated[str, typer.Option(help="Path of the results file")] = "benchmark_results.json",
+        data_dir: Annotated[Optional[str], typer.Option(help="Directory for the generated data, a temporary directory is used if not set")] = None,
+        group: Annotated[Optional[list[str]], typer.Option(help="Only run benchmarks in this group")] = None,
+        name: Annotated[Optional[list[str]], typer.Option(help="Only run benchmarks starting with this name")] = None,
+        seed: Annotated[int, typer.Option(help="Seed for the generated data")] = 42
+):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        generator = DataGenerator(rows, data_dir if data_dir is not None else temp_dir, seed=seed)
+        results = BenchmarkSuite(generator, repeat=repeat).run(groups=group, names=name)
+
+    results.save(output)
+
+    for result in results.results:
+        if result.error is not None:
+            print(f"{result.name:<45} FAILED {result.error}")
+        else:
+            print(f"{result.name:<45} {result.best:>10.4f}s {result.rows_per_second:>14,.0f} rows/s")
+
+    print(f"Results written to {os.path.abspath(output)}")
+
+
+@app.command()
+def compare(
+        baseline: Annotated[str, typer.Argument(help="Results file to compare against")],
+        current: Annotated[str, typer.Argument(help="New results file")],
+        threshold: Annotated[float, typer.Option(help="Relative slowdown reported as a regression")] = 0.1
+):
+    comparisons = compare_results(BenchmarkResults.load(baseline), BenchmarkResults.load(current), threshold)
+
+    for c in comparisons:
+        if c.change is None:
+            print(f"{c.name:<45} {'missing':>10}")
+            continue
+
+        flag = " REGRESSION" if c.regression else ""
+        print(f"{c.name:<45} {c.baseline:>10.4f}s {c.current:>10.4f}s {c.change:>+8.1%}{flag}")
+
+    if any(c.regression for c in comparisons):
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,346 @@
+import json
+import os
+import random
+import sqlite3
+
+import pandas as pd
+import yaml
+
+FIRST_NAMES = ['Ada', 'Grace', 'Alan', 'Edsger', 'Barbara', 'Donald', 'Frances', 'Ken', 'Margaret', 'Linus']
+LAST_NAMES = ['Lovelace', 'Hopper', 'Turing', 'Dijkstra', 'Liskov', 'Knuth', 'Allen', 'Thompson', 'Hamilton', 'Torvalds']
+REGIONS = [('North', 'GB'), ('South', 'GB'), ('East', 'DE'), ('West', 'FR'), ('Central', 'ES')]
+COUNTRIES = ['GB', 'DE', 'FR', 'ES', 'IT']
+TAGS = ['retail', 'trade', 'online', 'priority', 'export']
+STATUSES = ['Open', 'Closed', 'Pending']
+
+ORDERS_TABLE = 'orders'
+CUSTOMER_TABLE = 'customer'
+STATUS_TABLE = 'order_status'
+REGION_TABLE = 'region'
+JSON_KEY = 'orders'
+SHEET_NAME = 'Orders'
+
+FILE_TYPES = ['csv', 'json', 'xlsx', 'yaml', 'sql_file']
+
+
+class DataGenerator:
+    """
+    Builds deterministic synthetic order data and writes it in each of the supported
+    input formats, along with a SQLite database holding the lookup tables and a mapping
+    file per format that uses every default field parser.
+
+    The same seed and row count always produce the same data so results from different
+    commits can be compared.
+
+    :ivar rows: Number of order rows to generate.
+    :type rows: int
+    :ivar output_dir: Directory the generated files are written to.
+    :type output_dir: str
+    :ivar seed: Seed for the random number generator.
+    :type seed: int
+    :ivar customers: Number of customers in the lookup table, roughly a tenth of the
+        generated customer codes do not exist so lookups also measure misses.
+    :type customers: int
+    """
+
+    def __init__(self, rows: int, output_dir: str, seed: int = 42, customers: int = 1000):
+        if rows < 1:
+            raise ValueError("At least one row must be generated")
+
+        self.rows = rows
+        self.output_dir = output_dir
+        self.seed = seed
+        self.customers = customers
+        self.__frame: pd.DataFrame | None = None
+
+    @property
+    def database_path(self) -> str:
+        return os.path.join(self.output_dir, 'benchmark.db')
+
+    @property
+    def database_connection(self) -> str:
+        return f"sqlite:///{self.database_path}"
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.output_dir, name)
+
+    def build_frame(self) -> pd.DataFrame:
+        """
+        Builds the order data. Around 5% of the rows repeat an earlier order id, some
+        quantities and amounts are invalid or missing and some emails are malformed so
+        the error paths of the parsers are exercised.
+
+        :return: The generated orders.
+        :rtype: pd.DataFrame
+        """
+        if self.__frame is not None:
+            return self.__frame
+
+        rand = random.Random(self.seed)
+        rows = []
+
+        for i in range(self.rows):
+            order_id = rand.randint(1, i) if i > 20 and rand.random() < 0.05 else i + 1
+            first_name = rand.choice(FIRST_NAMES)
+            last_name = rand.choice(LAST_NAMES)
+            region, country = rand.choice(REGIONS)
+            email = f"{first_name}.{last_name}{i}@example.com".lower()
+
+            rows.append({
+                'order_id': order_id,
+                'first_name': first_name,
+                'last_name': last_name,
+                'email': email if rand.random() > 0.05 else email.replace('@', ' at '),
+                'order_date': f"{rand.randint(1, 28):02d}/{rand.randint(1, 12):02d}/{rand.randint(2015, 2025)}",
+                'quantity': str(rand.randint(1, 50)) if rand.random() > 0.02 else 'n/a',
+                'amount': round(rand.uniform(1, 5000), 2) if rand.random() > 0.05 else None,
+                'active': rand.randint(0, 1),
+                'dispatched': 'X' if rand.random() > 0.3 else '',
+                'tags': ';'.join(rand.sample(TAGS, rand.randint(1, 3))),
+                'reference': f"ORD-{rand.randint(1000, 99999)}-{rand.choice(COUNTRIES)}",
+                'customer_code': f"C{rand.randint(1, int(self.customers * 1.1)):06d}",
+                'region': region,
+                'country': country,
+                'notes': rand.choice(['', 'Leave at door', 'Call ahead', None]),
+            })
+
+        self.__frame = pd.DataFrame(rows)
+        return self.__frame
+
+    def generate(self, file_types: list[str] | None = None) -> dict[str, str]:
+        """
+        Writes the database, the input files and their mappings.
+
+        :param file_types: The input formats to write, defaults to all of them.
+        :type file_types: list[str] | None
+        :return: Path of the mapping file for each input format.
+        :rtype: dict[str, str]
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        if file_types is None:
+            file_types = FILE_TYPES
+
+        self.write_database()
+
+        writers = {
+            'csv': self.write_csv,
+            'json': self.write_json,
+            'xlsx': self.write_xlsx,
+            'yaml': self.write_yaml,
+            'sql_file': self.write_sql_file,
+        }
+
+        mappings = {}
+        for file_type in file_types:
+            if file_type not in writers:
+                raise ValueError(f"Unsupported file type: {file_type}")
+
+            writers[file_type]()
+            mappings[file_type] = self.write_mapping(file_type)
+
+        return mappings
+
+    def write_csv(self) -> str:
+        path = self.path('orders.csv')
+        self.build_frame().to_csv(path, index=False)
+        return path
+
+    def write_json(self) -> str:
+        path = self.path('orders.json')
+        records = json.loads(self.build_frame().to_json(orient='records'))
+
+        # The chunked JSON reader needs each record on its own lines
+        with open(path, 'w') as f:
+            json.dump({JSON_KEY: records}, f, indent=1)
+
+        return path
+
+    def write_xlsx(self) -> str:
+        path = self.path('orders.xlsx')
+        self.build_frame().to_excel(path, sheet_name=SHEET_NAME, index=False)
+        return path
+
+    def write_yaml(self) -> str:
+        path = self.path('orders.yaml')
+        records = json.loads(self.build_frame().to_json(orient='records'))
+
+        with open(path, 'w') as f:
+            yaml.safe_dump({JSON_KEY: records}, f)
+
+        return path
+
+    def write_sql_file(self) -> str:
+        path = self.path('orders.sql')
+
+        with open(path, 'w') as f:
+            f.write(f"SELECT * FROM {ORDERS_TABLE}")
+
+        return path
+
+    def write_database(self) -> str:
+        """
+        Writes the orders and the lookup tables used by the database parsers to a new
+        SQLite database, along with a SQL file selecting the customer lookup.
+
+        :return: The path of the database.
+        :rtype: str
+        """
+        if os.path.exists(self.database_path):
+            os.remove(self.database_path)
+
+        customers = pd.DataFrame({
+            'code': [f"C{i:06d}" for i in range(1, self.customers + 1)],
+            'id': range(1, self.customers + 1),
+            'active': [0 if i % 10 == 0 else 1 for i in range(1, self.customers + 1)],
+        })
+        statuses = pd.DataFrame({'name': STATUSES, 'id': range(1, len(STATUSES) + 1)})
+        regions = pd.DataFrame([
+            {'region': region, 'country': country, 'id': i + 1} for i, (region, country) in enumerate(REGIONS)
+        ])
+
+        with sqlite3.connect(self.database_path) as conn:
+            self.build_frame().to_sql(ORDERS_TABLE, conn, index=False)
+            customers.to_sql(CUSTOMER_TABLE, conn, index=False)
+            statuses.to_sql(STATUS_TABLE, conn, index=False)
+            regions.to_sql(REGION_TABLE, conn, index=False)
+
+        with open(self.path('customer_lookup.sql'), 'w') as f:
+            f.write(f"SELECT code, id FROM {CUSTOMER_TABLE}")
+
+        return self.database_path
+
+    def write_mapping(self, file_type: str) -> str:
+        """
+        Writes a mapping for the given input format using all the default field parsers.
+
+        :param file_type: The input format the mapping reads.
+        :type file_type: str
+        :return: The path of the mapping.
+        :rtype: str
+        """
+        file_paths = {
+            'csv': 'orders.csv',
+            'json': 'orders.json',
+            'xlsx': 'orders.xlsx',
+            'yaml': 'orders.yaml',
+            'sql_file': 'orders.sql',
+        }
+
+        mapping = {
+            'name': f"benchmark_{file_type}",
+            'file_type': file_type,
+            'file_path': file_paths[file_type],
+            'output': [
+                {'output_type': 'database', 'table': f"benchmark_{file_type}"}
+            ],
+            'fields': mapping_fields(),
+        }
+
+        if file_type in ['json', 'yaml']:
+            mapping['key'] = JSON_KEY
+
+        if file_type == 'xlsx':
+            mapping['sheet'] = SHEET_NAME
+
+        path = self.path(f"mapping_{file_type}.yml")
+        with open(path, 'w') as f:
+            yaml.safe_dump(mapping, f, sort_keys=False)
+
+        return path
+
+
+def mapping_fields() -> list[dict]:
+    """
+    Fields using each of the default field parsers against the generated orders. The
+    order matters as dynamic fields are applied in turn: duplicates are removed before
+    the tags are split and exploded.
+
+    :return: The field definitions for a mapping.
+    :rtype: list[dict]
+    """
+    return [
+        {'name': 'order_id', 'source_name': 'order_id', 'field_type': 'int', 'nullable': False},
+        {'name': 'first_name', 'source_name': 'first_name', 'field_type': 'str'},
+        {'name': 'last_name', 'source_name': 'last_name', 'field_type': 'str'},
+        {'name': 'email', 'source_name': 'email', 'field_type': 'str'},
+        {'name': 'amount', 'source_name': 'amount', 'field_type': 'str'},
+        {'name': 'order_dedup', 'field_type': 'int', 'func': {'deduplicate': {'source_name': 'order_id'}}},
+        {'name': 'is_dispatched', 'func': {'eq': {'source_name': 'dispatched', 'match': 'X'}}},
+        {'name': 'ordered_at', 'func': {'datetime': {'source_name': 'order_date', 'format': '%d/%m/%Y'}}},
+        {
+            'name': 'quantity_dynamic',
+            'field_type': 'int',
+            'func': {
+                'dynamic': {'module': 'pancham.configuration.to_int_field_parser', 'class': 'ToIntFieldParser'},
+                'to_int': {'source_name': 'quantity', 'error_value': 0},
+            },
+        },
+        {'name': 'quantity_int', 'field_type': 'int', 'func': {'to_int': {'source_name': 'quantity', 'error_value': 0}}},
+        {'name': 'reference_country', 'func': {'split_extract': {'source_name': 'reference', 'splitter': '-', 'return_index': 2}}},
+        {'name': 'source_system', 'field_type': 'str', 'func': {'static': {'value': 'benchmark'}}},
+        {
+            'name': 'customer_id',
+            'field_type': 'int',
+            'nullable': True,
+            'func': {
+                'database_match': {
+                    'table_name': CUSTOMER_TABLE,
+                    'search_column': 'code',
+                    'value_column': 'id',
+                    'source_name': 'customer_code',
+                }
+            },
+        },
+        {
+            'name': 'status_id',
+            'field_type': 'int',
+            'func': {
+                'database_value': {
+                    'table_name': STATUS_TABLE,
+                    'search_column': 'name',
+                    'value_column': 'id',
+                    'value': 'Open',
+                }
+            },
+        },
+        {'name': 'tag', 'field_type': 'str', 'func': {'split': {'source_name': 'tags', 'split_char': ';'}}},
+        {'name': 'tag_explode', 'field_type': 'str', 'func': {'explode': {'source_name': 'tag'}}},
+        {'name': 'full_name', 'func': {'concat': {'fields': ['first_name', 'last_name']}}},
+        {
+            'name': 'region_id',
+            'field_type': 'int',
+            'nullable': True,
+            'func': {
+                'database_multi_field_search': {
+                    'table_name': REGION_TABLE,
+                    'value_column': 'id',
+                    'search': [
+                        {'type': 'field', 'search_column': 'region', 'source_name': 'region'},
+                        {'type': 'field', 'search_column': 'country', 'source_name': 'country'},
+                    ],
+                }
+            },
+        },
+        {'name': 'drop_notes', 'func': {'remove': {'name': 'notes'}}},
+        {'name': 'reference_valid', 'func': {'regex_match': {'source_name': 'reference', 'pattern': r'^ORD-\d+-[A-Z]{2}$'}}},
+        {'name': 'reference_number', 'func': {'regex_extract': {'source_name': 'reference', 'pattern': r'^ORD-(\d+)-'}}},
+        {'name': 'email_valid', 'func': {'email_match': {'source_name': 'email'}}},
+        {
+            'name': 'account_id',
+            'field_type': 'str',
+            'nullable': True,
+            'func': {
+                'sf_lookup': {
+                    'source_name': 'customer_code',
+                    'query': 'SELECT Id, Code__c FROM Account',
+                    'search_column': 'Code__c',
+                    'value_column': 'Id',
+                }
+            },
+        },
+        {'name': 'amount_filled', 'field_type': 'float', 'func': {'fill_nan': {'source_name': 'amount', 'replace_value': 0}}},
+        {'name': 'is_active', 'func': {'to_bool': {'source_name': 'active'}}},
+        {'name': 'amount_text', 'func': {'number_format': {'source_name': 'amount', 'format': '{:.2f}'}}},
+        {'name': 'amount_gross', 'field_type': 'float', 'func': {'expr': 'where(active == 1, coalesce(amount, 0) * 1.2, 0)'}},
+    ]
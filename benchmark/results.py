@@ -0,0 +1,200 @@
+import json
+import platform
+import statistics
+import subprocess
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from typing import Any
+
+RESULTS_VERSION = 1
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Timings for a single benchmark.
+
+    :ivar name: Unique name of the benchmark, used to match results between runs.
+    :type name: str
+    :ivar group: The part of Pancham being measured, e.g. loader, parser, lookup, output.
+    :type group: str
+    :ivar rows: Number of rows processed by each repeat.
+    :type rows: int
+    :ivar times: Wall time in seconds of each repeat.
+    :type times: list[float]
+    :ivar error: The error raised by the benchmark, if it failed.
+    :type error: str | None
+    """
+
+    name: str
+    group: str
+    rows: int = 0
+    times: list[float] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def best(self) -> float | None:
+        return min(self.times) if len(self.times) > 0 else None
+
+    @property
+    def median(self) -> float | None:
+        return statistics.median(self.times) if len(self.times) > 0 else None
+
+    @property
+    def rows_per_second(self) -> float | None:
+        if self.best is None or self.best == 0:
+            return None
+
+        return self.rows / self.best
+
+    def to_dict(self) -> dict[str, Any]:
+        output = asdict(self)
+        output['best'] = self.best
+        output['median'] = self.median
+        output['rows_per_second'] = self.rows_per_second
+        return output
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> 'BenchmarkResult':
+        return cls(
+            name=data['name'],
+            group=data['group'],
+            rows=data.get('rows', 0),
+            times=data.get('times', []),
+            error=data.get('error', None)
+        )
+
+
+@dataclass
+class BenchmarkResults:
+    """
+    The results of a benchmark run along with the details needed to decide whether
+    two runs are comparable.
+
+    :ivar metadata: Details of the run such as the commit, row count and library versions.
+    :type metadata: dict[str, Any]
+    :ivar results: The result of each benchmark.
+    :type results: list[BenchmarkResult]
+    """
+
+    metadata: dict[str, Any] = field(default_factory=dict)
+    results: list[BenchmarkResult] = field(default_factory=list)
+
+    def save(self, path: str):
+        data = {
+            'version': RESULTS_VERSION,
+            'metadata': self.metadata,
+            'results': [r.to_dict() for r in self.results]
+        }
+
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> 'BenchmarkResults':
+        with open(path, 'r') as f:
+            data = json.load(f)
+
+        if data.get('version') != RESULTS_VERSION:
+            raise ValueError(f"Unsupported benchmark results version in {path}")
+
+        return cls(
+            metadata=data.get('metadata', {}),
+            results=[BenchmarkResult.from_dict(r) for r in data.get('results', [])]
+        )
+
+    def by_name(self) -> dict[str, BenchmarkResult]:
+        return {r.name: r for r in self.results}
+
+
+@dataclass
+class Comparison:
+    """
+    Change in the best time of a benchmark between a baseline and a current run.
+
+    :ivar name: Name of the benchmark.
+    :type name: str
+    :ivar baseline: Best time in the baseline run, None if it did not run.
+    :type baseline: float | None
+    :ivar current: Best time in the current run, None if it did not run.
+    :type current: float | None
+    :ivar change: Relative change, positive values are slower.
+    :type change: float | None
+    :ivar regression: True if the benchmark is slower by more than the threshold.
+    :type regression: bool
+    """
+
+    name: str
+    baseline: float | None
+    current: float | None
+    change: float | None
+    regression: bool
+
+
+def compare_results(baseline: BenchmarkResults, current: BenchmarkResults, threshold: float = 0.1) -> list[Comparison]:
+    """
+    Compares the best time of each benchmark in two runs.
+
+    :param baseline: The results to compare against.
+    :type baseline: BenchmarkResults
+    :param current: The new results.
+    :type current: BenchmarkResults
+    :param threshold: Relative slowdown above which a benchmark counts as a regression.
+    :type threshold: float
+    :return: A comparison for every benchmark in either run.
+    :rtype: list[Comparison]
+    """
+    baseline_results = baseline.by_name()
+    current_results = current.by_name()
+    names = list(baseline_results.keys()) + [n for n in current_results.keys() if n not in baseline_results]
+
+    comparisons = []
+    for name in names:
+        baseline_best = baseline_results[name].best if name in baseline_results else None
+        current_best = current_results[name].best if name in current_results else None
+
+        change = None
+        if baseline_best is not None and current_best is not None and baseline_best > 0:
+            change = (current_best - baseline_best) / baseline_best
+
+        comparisons.append(Comparison(
+            name=name,
+            baseline=baseline_best,
+            current=current_best,
+            change=change,
+            regression=change is not None and change > threshold
+        ))
+
+    return comparisons
+
+
+def build_metadata(**kwargs) -> dict[str, Any]:
+    """
+    Collects the details of the environment a benchmark run was made in.
+
+    :param kwargs: Additional details of the run, such as the row count.
+    :return: The metadata for the run.
+    :rtype: dict[str, Any]
+    """
+    import numpy
+    import pandas
+    import sqlalchemy
+
+    return {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pandas': pandas.__version__,
+        'numpy': numpy.__version__,
+        'sqlalchemy': sqlalchemy.__version__,
+        **kwargs
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        output = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True)
+        return output.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,383 @@
+import copy
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+from unittest import mock
+
+import pandas as pd
+
+from pancham.data_frame_configuration import DataFrameConfiguration
+from pancham.data_frame_configuration_loader import YamlDataFrameConfigurationLoader
+from pancham.data_frame_loader import DataFrameLoader
+from pancham.database.caching_database_search import CachingDatabaseSearch, FilteredCachingDatabaseSearch, SQLFileCachingDatabaseSearch
+from pancham.database.database_engine import initialize_db_engine
+from pancham.database.database_output import DatabaseOutputWriter
+from pancham.database.multi_column_database_search import MultiColumnDatabaseSearch
+from pancham.database.populating_database_search import PopulatingDatabaseSearch
+from pancham.database.py_database_cache_search import PyDatabaseCacheSearch, get_db_value
+from pancham.pancham_configuration import PanchamConfiguration
+from pancham.plugin_registry import resolve_plugin
+from pancham.reporter import Reporter, get_reporter
+from pancham.runner import DEFAULT_LOADERS, DEFAULT_FIELD_PARSERS, DEFAULT_OUTPUTS, PanchamRunner
+
+from .data_generator import DataGenerator, mapping_fields, CUSTOMER_TABLE, REGION_TABLE, JSON_KEY, SHEET_NAME
+from .results import BenchmarkResult, BenchmarkResults, build_metadata
+
+# Parsers that query the database for every row are run against fewer rows so the
+# suite finishes in a reasonable time, their rows per second are still comparable.
+ROW_BY_ROW_LIMIT = 1000
+
+LOADER_FILES = {
+    'csv': ('orders.csv', {}),
+    'json': ('orders.json', {'key': JSON_KEY}),
+    'xlsx': ('orders.xlsx', {'sheet': SHEET_NAME}),
+    'yaml': ('orders.yaml', {'key': JSON_KEY}),
+    'sql_file': ('orders.sql', {}),
+}
+
+
+class BenchmarkConfiguration(PanchamConfiguration):
+    """
+    Pancham configuration pointing at the generated data. Schema validation failures
+    are not raised as the benchmark mappings mix types across parsers.
+    """
+
+    def __init__(self, generator: DataGenerator):
+        self.generator = generator
+
+    @property
+    def database_connection(self) -> str:
+        return self.generator.database_connection
+
+    @property
+    def source_dir(self) -> str:
+        return self.generator.output_dir
+
+    @property
+    def disable_schema_validation(self) -> bool:
+        return True
+
+
+@dataclass
+class Benchmark:
+    """
+    A single timed operation.
+
+    :ivar name: Unique name of the benchmark.
+    :type name: str
+    :ivar group: The part of Pancham being measured.
+    :type group: str
+    :ivar run: The timed operation, returning the number of rows processed.
+    :type run: Callable[[], int]
+    :ivar setup: Called before each repeat and not timed.
+    :type setup: Callable[[], None] | None
+    """
+
+    name: str
+    group: str
+    run: Callable[[], int]
+    setup: Callable[[], None] | None = None
+
+
+class BenchmarkSuite:
+    """
+    Builds and runs the benchmarks for the loaders, field parsers, lookup caches,
+    database output and complete mappings against the generated data.
+
+    :ivar generator: Generator for the data the benchmarks run against.
+    :type generator: DataGenerator
+    :ivar repeat: Number of times each benchmark is run.
+    :type repeat: int
+    """
+
+    def __init__(self, generator: DataGenerator, repeat: int = 3):
+        if repeat < 1:
+            raise ValueError("Benchmarks must be repeated at least once")
+
+        self.generator = generator
+        self.repeat = repeat
+        self.configuration = BenchmarkConfiguration(generator)
+        self.reporter = Reporter()
+        self.mappings: dict[str, str] = {}
+
+    def prepare(self):
+        """
+        Generates the data and initialises the database engine.
+
+        :return: None
+        """
+        self.mappings = self.generator.generate()
+        get_reporter(reporter=self.reporter)
+        initialize_db_engine(self.configuration, self.reporter)
+
+    def benchmarks(self) -> list[Benchmark]:
+        return (self.loader_benchmarks()
+                + self.parser_benchmarks()
+                + self.lookup_benchmarks()
+                + self.output_benchmarks()
+                + self.mapping_benchmarks())
+
+    def run(self, groups: list[str] | None = None, names: list[str] | None = None) -> BenchmarkResults:
+        """
+        Generates the data and runs the benchmarks.
+
+        :param groups: Only run benchmarks in these groups.
+        :type groups: list[str] | None
+        :param names: Only run benchmarks whose name starts with one of these values.
+        :type names: list[str] | None
+        :return: The results of every benchmark that was run.
+        :rtype: BenchmarkResults
+        """
+        previous_reporter = get_reporter()
+        self.prepare()
+
+        results = BenchmarkResults(metadata=build_metadata(
+            rows=self.generator.rows,
+            seed=self.generator.seed,
+            repeat=self.repeat
+        ))
+
+        try:
+            # Runs are measured with the pandas options the command line starts with
+            with salesforce_stand_in(self.generator), pd.option_context('mode.copy_on_write', self.configuration.copy_on_write):
+                for benchmark in self.benchmarks():
+                    if groups is not None and benchmark.group not in groups:
+                        continue
+
+                    if names is not None and not any(benchmark.name.startswith(n) for n in names):
+                        continue
+
+                    results.results.append(self.run_benchmark(benchmark))
+        finally:
+            get_reporter(reporter=previous_reporter)
+
+        return results
+
+    def run_benchmark(self, benchmark: Benchmark) -> BenchmarkResult:
+        result = BenchmarkResult(name=benchmark.name, group=benchmark.group)
+
+        try:
+            for _ in range(self.repeat):
+                if benchmark.setup is not None:
+                    benchmark.setup()
+
+                start = time.perf_counter()
+                result.rows = benchmark.run()
+                result.times.append(time.perf_counter() - start)
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+
+        return result
+
+    def loader_benchmarks(self) -> list[Benchmark]:
+        benchmarks = []
+
+        for file_type, (file_path, options) in LOADER_FILES.items():
+            benchmarks.append(Benchmark(
+                name=f"loader.{file_type}",
+                group='loader',
+                run=self.__load_file(file_type, file_path, options, use_iterator=False)
+            ))
+
+        benchmarks.append(Benchmark(
+            name='loader.json.iterator',
+            group='loader',
+            run=self.__load_file('json', 'orders.json', {'key': JSON_KEY}, use_iterator=True)
+        ))
+
+        return benchmarks
+
+    def parser_benchmarks(self) -> list[Benchmark]:
+        """
+        One benchmark per default field parser, using the first field of the benchmark
+        mapping that the parser would be chosen for.
+        """
+        benchmarks = []
+        fields = mapping_fields()
+
+        for parser in DEFAULT_FIELD_PARSERS:
+            field = next((f for f in fields if _select_parser(f) is parser), None)
+            if field is None:
+                continue
+
+            parser_name = type(resolve_plugin(parser)).__name__
+            row_limit = ROW_BY_ROW_LIMIT if parser_name == 'DatabaseMultiFieldSearchParser' else None
+
+            benchmarks.append(self.__parser_benchmark(parser_name, field, row_limit))
+
+        return benchmarks
+
+    def lookup_benchmarks(self) -> list[Benchmark]:
+        codes = lambda limit=None: list(self.generator.build_frame()['customer_code'][:limit])
+        lookup_sql = self.generator.path('customer_lookup.sql')
+
+        def lookup(build: Callable[[], object], limit: int | None = None) -> Callable[[], int]:
+            def run() -> int:
+                search = build()
+                values = codes(limit)
+                for value in values:
+                    search.get_mapped_id(value)
+                return len(values)
+            return run
+
+        def multi_column() -> int:
+            search = MultiColumnDatabaseSearch(REGION_TABLE, 'id')
+            frame = self.generator.build_frame()[:ROW_BY_ROW_LIMIT]
+            for region, country in zip(frame['region'], frame['country']):
+                search.get_mapped_id({'region': region, 'country': country})
+            return len(frame)
+
+        return [
+            Benchmark('lookup.caching', 'lookup', lookup(lambda: CachingDatabaseSearch(CUSTOMER_TABLE, 'code', 'id'))),
+            Benchmark('lookup.filtered', 'lookup', lookup(lambda: FilteredCachingDatabaseSearch(CUSTOMER_TABLE, 'code', 'id', {'active': 1}))),
+            Benchmark('lookup.sql_file', 'lookup', lookup(lambda: SQLFileCachingDatabaseSearch(lookup_sql))),
+            Benchmark(
+                'lookup.pycache',
+                'lookup',
+                lookup(lambda: PyDatabaseCacheSearch(CUSTOMER_TABLE, 'code', 'id'), ROW_BY_ROW_LIMIT),
+                setup=get_db_value.cache_clear
+            ),
+            Benchmark(
+                'lookup.populating',
+                'lookup',
+                lookup(lambda: PopulatingDatabaseSearch('customer_populate', 'code', 'id'), ROW_BY_ROW_LIMIT),
+                setup=self.__create_populate_table
+            ),
+            Benchmark('lookup.multi_column', 'lookup', multi_column),
+        ]
+
+    def output_benchmarks(self) -> list[Benchmark]:
+        frame = self.generator.build_frame().drop_duplicates(subset=['order_id'])
+        merge_frame = frame[:ROW_BY_ROW_LIMIT]
+
+        def write(configuration: dict, data: pd.DataFrame) -> Callable[[], int]:
+            writer = DatabaseOutputWriter(configuration)
+
+            def run() -> int:
+                writer.write(data.copy())
+                return len(data)
+            return run
+
+        return [
+            Benchmark(
+                'output.database.append',
+                'output',
+                write({'table': 'output_append'}, frame),
+                setup=lambda: self.__drop_tables('output_append')
+            ),
+            Benchmark(
+                'output.database.merge',
+                'output',
+                write({'table': 'output_merge', 'merge_key': 'order_id'}, merge_frame),
+                setup=lambda: self.__create_merge_table('output_merge', merge_frame)
+            ),
+            Benchmark(
+                'output.database.merge_native',
+                'output',
+                write({'table': 'output_merge_native', 'merge_key': 'order_id', 'native': 'sqlite'}, merge_frame),
+                setup=lambda: self.__create_merge_table('output_merge_native', merge_frame)
+            ),
+        ]
+
+    def mapping_benchmarks(self) -> list[Benchmark]:
+        benchmarks = []
+
+        for file_type, mapping in self.mappings.items():
+            benchmarks.append(Benchmark(
+                name=f"mapping.{file_type}",
+                group='mapping',
+                run=self.__run_mapping(mapping),
+                setup=lambda t=file_type: self.__drop_tables(f"benchmark_{t}")
+            ))
+
+        return benchmarks
+
+    def __load_file(self, file_type: str, file_path: str, options: dict, use_iterator: bool) -> Callable[[], int]:
+        def run() -> int:
+            configuration = DataFrameConfiguration(file_path, file_type, f"load_{file_type}", **options)
+            configuration.use_iterator = use_iterator
+            configuration.chunk_size = 1000
+
+            loader = DEFAULT_LOADERS[file_type]
+            return sum(len(df) for df in loader.read_file_from_configuration(configuration, self.configuration))
+
+        return run
+
+    def __parser_benchmark(self, parser_name: str, field: dict, row_limit: int | None) -> Benchmark:
+        frame = self.generator.build_frame()[:row_limit]
+
+        if parser_name == 'ExplodeFieldParser':
+            frame = frame.assign(tag=frame['tags'].str.split(';'))
+
+        loader = DataFrameLoader(DEFAULT_LOADERS, self.reporter, self.configuration)
+        state = {}
+
+        def setup():
+            configuration = DataFrameConfiguration('', '', parser_name)
+            configuration.add_field(data_frame_field=_select_parser(field).parse_field(copy.deepcopy(field)))
+            state['configuration'] = configuration
+
+        def run() -> int:
+            loader.process_dataframe(frame.copy(), state['configuration'])
+            return len(frame)
+
+        return Benchmark(f"parser.{parser_name}", 'parser', run, setup=setup)
+
+    def __run_mapping(self, mapping: str) -> Callable[[], int]:
+        def run() -> int:
+            runner = PanchamRunner(self.configuration, reporter=self.reporter)
+            configuration = YamlDataFrameConfigurationLoader(DEFAULT_FIELD_PARSERS, DEFAULT_OUTPUTS).load(mapping)
+            runner.run(configuration)
+            return self.generator.rows
+
+        return run
+
+    def __drop_tables(self, *tables: str):
+        with sqlite3.connect(self.generator.database_path) as conn:
+            for table in tables:
+                conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+
+    def __create_populate_table(self):
+        self.__drop_tables('customer_populate')
+
+        with sqlite3.connect(self.generator.database_path) as conn:
+            conn.execute('CREATE TABLE customer_populate (id INTEGER PRIMARY KEY, code TEXT)')
+            conn.execute(f'INSERT INTO customer_populate (id, code) SELECT id, code FROM {CUSTOMER_TABLE}')
+
+    def __create_merge_table(self, table: str, data: pd.DataFrame):
+        """
+        Creates the merge target holding every other row, so half the merged rows are
+        updates and half are inserts.
+        """
+        self.__drop_tables(table)
+
+        with sqlite3.connect(self.generator.database_path) as conn:
+            data[::2].to_sql(table, conn, index=False)
+            conn.execute(f'CREATE UNIQUE INDEX "{table}_order_id" ON "{table}" (order_id)')
+
+
+def _select_parser(field: dict):
+    for parser in DEFAULT_FIELD_PARSERS:
+        if parser.can_parse_field(field):
+            return parser
+
+    return None
+
+
+@contextmanager
+def salesforce_stand_in(generator: DataGenerator) -> Iterator[None]:
+    """
+    Replaces the Salesforce connection used by `sf_lookup` with an in-memory query
+    result, so the lookup itself can be measured without a Salesforce org.
+    """
+    records = [
+        {'Id': f"001{i:015d}", 'Code__c': f"C{i:06d}"} for i in range(1, generator.customers + 1)
+    ]
+
+    connection = mock.Mock()
+    connection.query_all_iter.side_effect = lambda query: iter(records)
+
+    with mock.patch('pancham.integration.salesforce_lookup.get_connection', return_value=connection):
+        yield
@@ -1 +1,10 @@
-from .configuration import *
\ No newline at end of file
+from importlib import import_module
+
+from .configuration import __all__
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(import_module('.configuration', __name__), name)
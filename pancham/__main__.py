@@ -2,14 +2,31 @@ from typing import Annotated, Optional
 
 import typer
 
-from .runner import PanchamRunner, start_pancham
-
 app = typer.Typer()
+serve_app = typer.Typer()
 
 @app.command()
 def run(
         configuration: Annotated[str, typer.Argument(help = "Path to the Pancham configuration file")],
         data_configuration: Annotated[Optional[str], typer.Argument(help = "Path to the data mapping if individual files are being used")] = None,
-        test: Annotated[bool, typer.Option(help="Run all the tests")] = False
+        test: Annotated[bool, typer.Option(help="Run all the tests")] = False,
+        profile: Annotated[bool, typer.Option(help="Report the time taken by each stage of the run")] = False,
+        resume: Annotated[bool, typer.Option(help="Skip the chunks written before a failed run stopped")] = False
 ):
-    start_pancham(configuration, data_configuration, test = test)
+    # Imported here so the help text is shown without loading the runner
+    from .runner import start_pancham
+
+    start_pancham(configuration, data_configuration, test = test, profile = profile, resume = resume)
+
+
+@serve_app.command()
+def serve(
+        configuration: Annotated[str, typer.Argument(help = "Path to the Pancham configuration file")],
+        port: Annotated[Optional[int], typer.Option(help="Port to accept jobs on over HTTP")] = None,
+        watch: Annotated[Optional[str], typer.Option(help="Directory to watch for mapping files to run")] = None,
+        workers: Annotated[Optional[int], typer.Option(help="Number of jobs to run at the same time")] = None
+):
+    # Imported here so the help text is shown without loading the runner
+    from .server import start_pancham_server
+
+    start_pancham_server(configuration, port = port, watch = watch, workers = workers)
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass
+
+from .file_loader import ChunkPosition, FileLoader
+from .file_loader_configuration import FileLoaderConfiguration
+from .pancham_configuration import PanchamConfiguration
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """
+    Records how far a run of a configuration got.
+
+    :ivar fingerprint: Identifies the source and chunking the checkpoint was made with.
+    :type fingerprint: str
+    :ivar chunks: Number of chunks that were completely written.
+    :type chunks: int
+    :ivar position: Position in the source after the last written chunk.
+    :type position: ChunkPosition
+    :ivar completed: Whether the configuration was completely written, so that
+        resuming the run skips it.
+    :type completed: bool
+    """
+
+    fingerprint: str
+    chunks: int
+    position: ChunkPosition
+    completed: bool = False
+
+
+def configuration_fingerprint(configuration: FileLoaderConfiguration) -> str:
+    """
+    Builds a fingerprint of what is read by a configuration and how it is chunked.
+    Unlike `hash` it is the same in every process, so it can be stored between runs.
+
+    :param configuration: The configuration being read.
+    :type configuration: FileLoaderConfiguration
+    :return: A hex digest of the configuration.
+    :rtype: str
+    """
+    values = {
+        'file_path': configuration.file_path,
+        'file_type': configuration.file_type,
+        'sheet': configuration.sheet,
+        'key': configuration.key,
+        'query': configuration.query,
+        'chunk_size': configuration.chunk_size
+    }
+
+    return hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def source_fingerprint(
+        configuration: FileLoaderConfiguration,
+        file_loader: FileLoader,
+        pancham_configuration: PanchamConfiguration|None
+) -> str:
+    """
+    Builds a fingerprint of a configuration and the size and modification time of
+    each file it reads, so a checkpoint does not match a source that was replaced.
+
+    :param configuration: The configuration being read.
+    :type configuration: FileLoaderConfiguration
+    :param file_loader: The loader that reads the configuration's source.
+    :type file_loader: FileLoader
+    :param pancham_configuration: The configuration for the run.
+    :type pancham_configuration: PanchamConfiguration | None
+    :return: A hex digest of the configuration and its files.
+    :rtype: str
+    """
+    values = [configuration_fingerprint(configuration)]
+
+    if configuration.query is None:
+        for file_path in file_loader.reduce_file_paths(configuration, pancham_configuration):
+            values.append(file_stamp(file_path['path'] if type(file_path) is dict else file_path))
+
+    return hashlib.sha256(json.dumps(values).encode('utf-8')).hexdigest()
+
+
+def file_stamp(path: str) -> str|None:
+    """
+    Identifies a version of a file by its path, modification time and size.
+
+    :param path: The path of the file.
+    :type path: str
+    :return: The stamp, or None if there is no file at the path.
+    :rtype: str | None
+    """
+    if not os.path.isfile(path):
+        return None
+
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}"
+
+
+class CheckpointStore:
+    """
+    Keeps the checkpoint of each configuration in a JSON file, replaced atomically
+    after every chunk. Unreadable checkpoints are ignored so the run starts again
+    from the first chunk. Completed configurations keep a checkpoint until the whole
+    run has completed, so resuming a failed run does not write them again.
+
+    :ivar checkpoint_dir: Directory the checkpoints are written to.
+    :type checkpoint_dir: str
+    """
+
+    def __init__(self, checkpoint_dir: str):
+        self.checkpoint_dir = checkpoint_dir
+
+    def load(self, name: str) -> Checkpoint|None:
+        """
+        Reads the checkpoint for a configuration.
+
+        :param name: The name of the configuration.
+        :type name: str
+        :return: The checkpoint, or None if there is no readable checkpoint.
+        :rtype: Checkpoint | None
+        """
+        path = self.__get_path(name)
+
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'r') as checkpoint_file:
+                data = json.load(checkpoint_file)
+
+            return Checkpoint(
+                fingerprint=data['fingerprint'],
+                chunks=data['chunks'],
+                position=ChunkPosition(data['file_index'], data['rows']),
+                completed=data.get('completed', False) is True
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, name: str, checkpoint: Checkpoint):
+        """
+        Writes the checkpoint for a configuration.
+
+        :param name: The name of the configuration.
+        :type name: str
+        :param checkpoint: The checkpoint to save.
+        :type checkpoint: Checkpoint
+        """
+        path = self.__get_path(name)
+        data = {
+            'fingerprint': checkpoint.fingerprint,
+            'chunks': checkpoint.chunks,
+            'file_index': checkpoint.position.file_index,
+            'rows': checkpoint.position.rows,
+            'completed': checkpoint.completed
+        }
+
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as checkpoint_file:
+            json.dump(data, checkpoint_file)
+        os.replace(temp_path, path)
+
+    def clear(self, name: str):
+        """
+        Removes the checkpoint for a configuration once every configuration of the
+        run has completed.
+
+        :param name: The name of the configuration.
+        :type name: str
+        """
+        path = self.__get_path(name)
+
+        if os.path.exists(path):
+            os.remove(path)
+
+    def __get_path(self, name: str) -> str:
+        return os.path.join(self.checkpoint_dir, f"{re.sub(r'[^A-Za-z0-9_.-]', '_', name)}.json")
@@ -1,43 +1,36 @@
-from .field_parser import FieldParser
-from .concat_field_parser import ConcatFieldParser
-from .database_fixed_field_parser import DatabaseFixedFieldParser
-from .database_multi_field_search_parser import DatabaseMultiFieldSearchParser
-from .datetime_field_parser import DateTimeFieldParser
-from .dynamic_field_parser import DynamicFieldParser
-from .match_field_parser import MatchFieldParser
-from .part_text_extractor_parser import PartTextExtractorParser
-from .remove_field_parser import RemoveFieldParser
-from .static_field_parser import StaticFieldParser
-from .split_field_parser import SplitFieldParser
-from .text_field_parser import TextFieldParser
-from .to_int_field_parser import ToIntFieldParser
-from .email_regex_match_parser import EmailRegexMatchParser
-from .regex_match_field_parser import RegexMatchFieldParser
-from .sf_lookup_field_parser import SFLookupFieldParser
-from .fillnan_field_parser import FillNanFieldParser
-from .to_bool_field_parser import ToBoolFieldParser
-from .number_format_field_parser import NumberFormatFieldParser
-from .regex_extract_field_parser import RegexExtractFieldParser
+from importlib import import_module
 
-__all__ = [
-    'FieldParser',
-    'ConcatFieldParser',
-    'DatabaseFixedFieldParser',
-    'DatabaseMultiFieldSearchParser',
-    'DateTimeFieldParser',
-    'DynamicFieldParser',
-    'MatchFieldParser',
-    'PartTextExtractorParser',
-    'RemoveFieldParser',
-    'StaticFieldParser',
-    'SplitFieldParser',
-    'TextFieldParser',
-    'ToIntFieldParser',
-    'RegexMatchFieldParser',
-    'RegexExtractFieldParser',
-    'EmailRegexMatchParser',
-    'SFLookupFieldParser',
-    'FillNanFieldParser',
-    'ToBoolFieldParser',
-    'NumberFormatFieldParser'
-]
\ No newline at end of file
+# Parsers are imported on first use, as several depend on database and Salesforce
+# libraries that are slow to import
+_PARSER_MODULES = {
+    'FieldParser': 'field_parser',
+    'ConcatFieldParser': 'concat_field_parser',
+    'DatabaseFixedFieldParser': 'database_fixed_field_parser',
+    'DatabaseMultiFieldSearchParser': 'database_multi_field_search_parser',
+    'DateTimeFieldParser': 'datetime_field_parser',
+    'DynamicFieldParser': 'dynamic_field_parser',
+    'MatchFieldParser': 'match_field_parser',
+    'PartTextExtractorParser': 'part_text_extractor_parser',
+    'RemoveFieldParser': 'remove_field_parser',
+    'StaticFieldParser': 'static_field_parser',
+    'SplitFieldParser': 'split_field_parser',
+    'TextFieldParser': 'text_field_parser',
+    'ToIntFieldParser': 'to_int_field_parser',
+    'RegexMatchFieldParser': 'regex_match_field_parser',
+    'RegexExtractFieldParser': 'regex_extract_field_parser',
+    'EmailRegexMatchParser': 'email_regex_match_parser',
+    'SFLookupFieldParser': 'sf_lookup_field_parser',
+    'FillNanFieldParser': 'fillnan_field_parser',
+    'ToBoolFieldParser': 'to_bool_field_parser',
+    'NumberFormatFieldParser': 'number_format_field_parser',
+    'ExpressionFieldParser': 'expression_field_parser'
+}
+
+__all__ = list(_PARSER_MODULES.keys())
+
+
+def __getattr__(name: str):
+    if name not in _PARSER_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(import_module(f".{_PARSER_MODULES[name]}", __name__), name)
@@ -55,5 +55,7 @@ class ConcatFieldParser(FieldParser):
             field_type=str,
             nullable=self.is_nullable(field),
             source_name=None,
-            func=concat_fields
+            func=concat_fields,
+            input_columns=list(concat_field_keys),
+            pure=True
         )
\ No newline at end of file
@@ -59,6 +59,7 @@ class DatabaseFixedFieldParser(FieldParser):
 
         return self.build_func_field(
             field=field,
-            func=map_value
+            func=map_value,
+            input_columns=[]
         )
 
@@ -100,7 +100,7 @@ class DatabaseMatchFieldParser(FieldParser):
             nonlocal database_search, mapped_filtered
             if database_search is None:
                 if filter_value and len(mapped_filtered) == 0:
-                    reporter.report_debug(f'Filter value {filter_value}')
+                    reporter.report_debug(lambda: f'Filter value {filter_value}')
                     for key, value in filter_value.items():
                         if isinstance(value, str) or isinstance(value, int) or isinstance(value, float):
                             mapped_filtered[key] = value
@@ -108,7 +108,7 @@ class DatabaseMatchFieldParser(FieldParser):
                             fixture_key = value.get(self.FIXTURE_KEY, None)
                             if fixture_key is not None and fixture_key in self.fixture_map:
                                 mapped_filtered[key] = self.fixture_map[fixture_key]
-                                reporter.report_debug(f'Using fixture value {mapped_filtered[key]} for {key}')
+                                reporter.report_debug(lambda: f'Using fixture value {mapped_filtered[key]} for {key}')
                                 continue
 
                             filter_search = self.__build_search_value(value)
@@ -117,7 +117,7 @@ class DatabaseMatchFieldParser(FieldParser):
                             search_value = self.__get_search_value({}, value)
                             filter_id = filter_search.get_mapped_id(search_value)
                             mapped_filtered[key] = filter_id
-                            reporter.report_debug(f'Using filter value {filter_id} for {key}')
+                            reporter.report_debug(lambda: f'Using filter value {filter_id} for {key}')
 
                             if fixture_key is not None:
                                 self.fixture_map[fixture_key] = filter_id
@@ -134,13 +134,20 @@ class DatabaseMatchFieldParser(FieldParser):
             search_value = self.__get_search_value(data, properties)
 
             mapped_id = search.get_mapped_id(search_value)
-            reporter.report_debug(f'Database search {search_value} mapped to {mapped_id}')
+            reporter.report_debug(lambda: f'Database search {search_value} mapped to {mapped_id}')
 
             return mapped_id
 
+        # Static searches do not read the row so are only run once
+        if self.STATIC_VALUE_KEY in properties:
+            input_columns = []
+        else:
+            input_columns = [properties.get(self.SOURCE_NAME_KEY, None)]
+
         return self.build_func_field(
             field=field,
-            func=map_value
+            func=map_value,
+            input_columns=input_columns
         )
 
     def __build_search_value(self, properties: dict, filter: dict[str, str]|None = None) -> DatabaseSearch:
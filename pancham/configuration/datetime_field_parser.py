@@ -48,5 +48,7 @@ class DateTimeFieldParser(FieldParser):
             field_type=field.get('field_type', datetime.datetime),
             nullable=self.is_nullable(field),
             source_name=None,
-            func=parse_datetime
+            func=parse_datetime,
+            input_columns=[self.get_source_name(field)],
+            pure=True
         )
\ No newline at end of file
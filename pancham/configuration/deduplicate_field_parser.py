@@ -1,7 +1,5 @@
-import pandas as pd
-
 from pancham.data_frame_field import DataFrameField
-from pancham.reporter import get_reporter
+from pancham.deduplication import DeduplicateFunction
 from .field_parser import FieldParser
 
 
@@ -40,29 +38,16 @@ class DeduplicateFieldParser(FieldParser):
         """
         properties = field[self.FUNCTION_KEY][self.FUNCTION_ID]
 
-        def apply_deduplicate(data: pd.DataFrame) -> pd.DataFrame:
-            reporter = get_reporter()
-            if 'sort_by' in properties:
-                sort_values = [properties[self.SOURCE_NAME_KEY]]
-                sort_by_key = properties.get('sort_by', None)
-                if isinstance(sort_by_key, list):
-                    sort_values.extend(sort_by_key)
-                else:
-                    sort_values.append(sort_by_key)
-
-                ascending = properties.get('ascending', True)
-
-                data = data.sort_values(by=sort_values, ascending=ascending)
-
-            output = data.drop_duplicates(subset=[properties[self.SOURCE_NAME_KEY]], keep='first')
-            reporter.report_debug(f'Deduplicate outcome {output}')
-
-            return output
+        deduplicate = DeduplicateFunction(
+            properties[self.SOURCE_NAME_KEY],
+            sort_by=properties.get('sort_by', None),
+            ascending=properties.get('ascending', True)
+        )
 
         return DataFrameField(
             name = field['name'],
             field_type=field[self.FIELD_TYPE_KEY],
             nullable=True,
             source_name=self.get_source_name(field),
-            df_func=apply_deduplicate
-        )
\ No newline at end of file
+            df_func=deduplicate
+        )
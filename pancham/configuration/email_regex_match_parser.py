@@ -36,4 +36,4 @@ class EmailRegexMatchParser(FieldParser):
 
             return bool(re.search(self.PATTERN, value))
 
-        return self.build_func_field(field, regex_match)
\ No newline at end of file
+        return self.build_func_field(field, regex_match, input_columns=[source_name])
\ No newline at end of file
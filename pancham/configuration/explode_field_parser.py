@@ -34,7 +34,7 @@ class ExplodeFieldParser(FieldParser):
             if properties.get('drop_nulls', False):
                 output = output.dropna(subset=[properties[self.SOURCE_NAME_KEY]])
 
-            reporter.report_debug(f'Explode outcome {output}')
+            reporter.report_debug(lambda: f'Explode outcome {output}')
 
             return output
 
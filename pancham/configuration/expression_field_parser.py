@@ -0,0 +1,46 @@
+from pancham.data_frame_field import DataFrameField
+from pancham.tool.expression_tools import compile_expression
+from .field_parser import FieldParser
+
+
+class ExpressionFieldParser(FieldParser):
+    """
+    Builds a field from an expression over the columns of the data. The expression is
+    compiled when the configuration is loaded and evaluated for all rows at once.
+
+    Configuration:
+
+    func:
+        expr: "quantity * price"
+
+    or
+
+    func:
+        expr:
+            expression: "where(`Order Status` == 'X', total, 0)"
+    """
+
+    FUNCTION_ID = "expr"
+
+    def can_parse_field(self, field: dict) -> bool:
+        return self.has_function_key(field, self.FUNCTION_ID)
+
+    def parse_field(self, field: dict) -> DataFrameField:
+        properties = field[self.FUNCTION_KEY][self.FUNCTION_ID]
+
+        if type(properties) is dict:
+            expression = properties.get('expression', None)
+        else:
+            expression = properties
+
+        if not isinstance(expression, str) or len(expression.strip()) == 0:
+            raise ValueError(f"{self.FUNCTION_ID} requires an expression")
+
+        return DataFrameField(
+            name=field[self.NAME_KEY],
+            nullable=self.is_nullable(field),
+            source_name=None,
+            field_type=field.get(self.FIELD_TYPE_KEY, object),
+            cast_type=field.get(self.CAST_KEY, False) is True,
+            vector_func=compile_expression(expression)
+        )
@@ -112,7 +112,7 @@ class FieldParser:
         """
         return self.has_name(field) and self.is_function(field) and function_key in field[self.FUNCTION_KEY]
 
-    def build_func_field(self, field: dict, func: Callable[[dict], int|str|None|bool|pd.Series|list]) -> DataFrameField:
+    def build_func_field(self, field: dict, func: Callable[[dict], int|str|None|bool|pd.Series|list], input_columns: list[str] | None = None) -> DataFrameField:
         """
         Generates a DataFrameField instance, combining the attributes of a provided
         field dictionary along with a user-defined transformation function. This
@@ -125,6 +125,8 @@ class FieldParser:
                      an output of types int, str, None, bool, or pd.Series. This
                      function is used to perform transformations or computations on the
                      field data.
+        :param input_columns: The columns read by the function. When set the function
+                     is treated as pure and only run once for each distinct input.
         :return: A DataFrameField object constructed with metadata and the specified
                  transformation function.
         """
@@ -135,7 +137,9 @@ class FieldParser:
             source_name=None,
             field_type=field[self.FIELD_TYPE_KEY],
             func=func,
-            cast_type=field.get(self.CAST_KEY, False) is True
+            cast_type=field.get(self.CAST_KEY, False) is True,
+            input_columns=input_columns,
+            pure=input_columns is not None
         )
 
     def get_source_name(self, field: dict) -> str|None:
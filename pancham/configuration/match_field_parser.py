@@ -37,5 +37,7 @@ class MatchFieldParser(FieldParser):
             nullable=self.is_nullable(field),
             source_name=None,
             field_type=bool,
-            func=lambda x: x[is_properties['source_name']] == is_properties['match']
+            func=lambda x: x[is_properties['source_name']] == is_properties['match'],
+            input_columns=[is_properties['source_name']],
+            pure=True
         )
\ No newline at end of file
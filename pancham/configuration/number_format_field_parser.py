@@ -28,4 +28,4 @@ class NumberFormatFieldParser(FieldParser):
             field_value = data[source_name]
             return number_format.format(field_value)
 
-        return self.build_func_field(field, apply_number_format)
+        return self.build_func_field(field, apply_number_format, input_columns=[source_name])
@@ -93,5 +93,7 @@ class PartTextExtractorParser(FieldParser):
             nullable = self.is_nullable(field),
             source_name=None,
             field_type=str,
-            func=extract_value
+            func=extract_value,
+            input_columns=[self.get_source_name(field)],
+            pure=True
         )
\ No newline at end of file
@@ -37,4 +37,4 @@ class RegexExtractFieldParser(FieldParser):
 
             return None
 
-        return self.build_func_field(field, regex_extract)
\ No newline at end of file
+        return self.build_func_field(field, regex_extract, input_columns=[source_name])
\ No newline at end of file
@@ -35,4 +35,4 @@ class RegexMatchFieldParser(FieldParser):
             
             return bool(re.search(pattern, value))
 
-        return self.build_func_field(field, regex_match)
\ No newline at end of file
+        return self.build_func_field(field, regex_match, input_columns=[source_name])
\ No newline at end of file
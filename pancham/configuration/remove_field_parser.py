@@ -29,5 +29,5 @@ class RemoveFieldParser(FieldParser):
             nullable=True,
             field_type=str,
             source_name=None,
-            df_func=lambda d: d.drop(columns=[column_name], axis=1, inplace=True)
+            df_func=lambda d: d.drop(columns=[column_name])
         )
\ No newline at end of file
@@ -36,4 +36,4 @@ class SFLookupFieldParser(FieldParser):
 
             return lookup.get_mapped_id(search_column=search_column, value = value, value_column=value_column)
 
-        return self.build_func_field(field, sf_lookup)
+        return self.build_func_field(field, sf_lookup, input_columns=[self.get_source_name(field)])
@@ -31,13 +31,13 @@ class SplitFieldParser(FieldParser):
         field[self.FIELD_TYPE_KEY] = list[str]
         reporter = get_reporter()
 
-        reporter.report_debug(f'Split field {source_name} with split_char {split_char} and remove_pattern {remove_pattern}')
+        reporter.report_debug(lambda: f'Split field {source_name} with split_char {split_char} and remove_pattern {remove_pattern}')
 
         def extract(data: dict) -> list[str|int|float]:
             value = data[source_name]
 
             split_values = remove_and_split(value, split_char, remove_pattern)
-            reporter.report_debug(f'Split outcome {split_values}')
+            reporter.report_debug(lambda: f'Split outcome {split_values}')
             return split_values
 
         return self.build_func_field(field, extract)
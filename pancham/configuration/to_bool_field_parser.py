@@ -29,7 +29,9 @@ class ToBoolFieldParser(FieldParser):
             field_type=int,
             source_name=None,
             func=lambda x: self.__to_bool(field, x),
-            cast_type=True
+            cast_type=True,
+            input_columns=[self.get_source_name(field)],
+            pure=True
         )
 
     def __to_bool(self, field: dict, values: dict):
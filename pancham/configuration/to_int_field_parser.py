@@ -32,7 +32,9 @@ class ToIntFieldParser(FieldParser):
             field_type=int,
             source_name=None,
             func=lambda x: self.__to_int(field, x),
-            cast_type=True
+            cast_type=True,
+            input_columns=[self.get_source_name(field)],
+            pure=True
         )
 
     def __to_int(self, field: dict, values: dict):
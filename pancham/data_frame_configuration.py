@@ -1,4 +1,4 @@
-from typing import Self, Type, Literal
+from typing import Self, Type, Literal, Callable
 
 import pandera as pa
 
@@ -21,6 +21,115 @@ class MergeConfiguration:
         self.source_key = source_key
         self.processed_key = processed_key
 
+class IncrementalConfiguration:
+    """
+    Represents the configuration for loading only the rows that changed since the
+    previous run.
+
+    Rows are either compared by a hash of their source values, stored per key, or
+    filtered on a watermark column that only ever increases, such as a last modified
+    date.
+
+    :ivar key: The source column or columns identifying a row. When not set the
+        hash of the row is used as its key, so a changed row is seen as a new row.
+    :type key: str|list[str]|None
+    :ivar watermark: Source column compared to the highest value seen in the
+        previous run. Only the rows at the highest value are hashed, so rows that
+        arrive later with the same value are still loaded.
+    :type watermark: str|None
+    :ivar detect_deletes: Whether to find the keys that were in the previous run
+        but are no longer in the source.
+    :type detect_deletes: bool
+    :ivar deleted_configuration: Fields and outputs the deleted keys are written to.
+    :type deleted_configuration: DataFrameConfiguration|None
+    """
+
+    def __init__(self,
+                 key: str|list[str]|None = None,
+                 watermark: str|None = None,
+                 detect_deletes: bool = False,
+                 deleted_configuration: 'DataFrameConfiguration|None' = None):
+        if detect_deletes and key is None:
+            raise ValueError("A key is required to detect deleted rows")
+
+        if detect_deletes and watermark is not None:
+            raise ValueError("Deleted rows cannot be detected when using a watermark")
+
+        self.key = key
+        self.watermark = watermark
+        self.detect_deletes = detect_deletes
+        self.deleted_configuration = deleted_configuration
+
+    @property
+    def key_columns(self) -> list[str]:
+        if self.key is None:
+            return []
+
+        if isinstance(self.key, str):
+            return [self.key]
+
+        return list(self.key)
+
+class ResultCacheConfiguration:
+    """
+    Represents the configuration for skipping a mapping when neither its inputs nor
+    its configuration have changed since the last run.
+
+    :ivar store_output: Whether to keep the processed output so it can be written to
+        outputs added to the mapping without processing the inputs again.
+    :type store_output: bool
+    :ivar hash_content: Whether to hash the content of input files, instead of only
+        using their size and modification time.
+    :type hash_content: bool
+    :ivar watermark_query: SQL query returning a single value that changes when a
+        database source changes, such as the latest modified date.
+    :type watermark_query: str|None
+    :ivar lookup_query: SQL query returning a single value that changes when a table
+        used by a lookup field changes.
+    :type lookup_query: str|None
+    :ivar ignore_lookups: Whether a mapping with lookup fields can be skipped without
+        a `lookup_query`, when changes to the lookup tables do not matter.
+    :type ignore_lookups: bool
+    """
+
+    def __init__(
+            self,
+            store_output: bool = False,
+            hash_content: bool = False,
+            watermark_query: str|None = None,
+            lookup_query: str|None = None,
+            ignore_lookups: bool = False
+    ):
+        self.store_output = store_output
+        self.hash_content = hash_content
+        self.watermark_query = watermark_query
+        self.lookup_query = lookup_query
+        self.ignore_lookups = ignore_lookups
+
+class DtypeOptimizationConfiguration:
+    """
+    Represents the settings for reducing the memory used by processed data, by
+    converting text columns with few distinct values to `category` and downcasting
+    numbers.
+
+    :ivar enabled: Whether the processed data is optimized, False turns off the
+        global setting for a mapping.
+    :type enabled: bool
+    :ivar category_ratio: The highest ratio of distinct values to rows for a text
+        column to be converted to `category`.
+    :type category_ratio: float
+    :ivar downcast: Whether integer and float columns are downcast.
+    :type downcast: bool
+    """
+
+    def __init__(self, enabled: bool = True, category_ratio: float = 0.5, downcast: bool = True):
+        if not 0 <= category_ratio <= 1:
+            raise ValueError("category_ratio must be between 0 and 1")
+
+        self.enabled = enabled
+        self.category_ratio = category_ratio
+        self.downcast = downcast
+
 class DataFrameConfiguration(FileLoaderConfiguration):
     """
     Represents a configuration for managing and processing data in a DataFrame.
@@ -41,6 +150,21 @@ class DataFrameConfiguration(FileLoaderConfiguration):
     :type fields: list[DataFrameField]
     :ivar output: A list of dictionaries containing output configuration for processing.
     :type output: list[dict]
+    :ivar wait_for_output: For post run configurations, whether the step must wait for
+        the primary outputs to be written before it runs.
+    :type wait_for_output: bool
+    :ivar incremental: When set only new and changed rows are processed and written.
+    :type incremental: IncrementalConfiguration|None
+    :ivar result_cache: When set the mapping is skipped if nothing has changed.
+    :type result_cache: ResultCacheConfiguration|None
+    :ivar optimize_dtypes: Overrides the global settings for optimizing the dtypes of
+        the processed data.
+    :type optimize_dtypes: DtypeOptimizationConfiguration|None
+    :ivar mapping_fingerprint: Digest of the mapping the configuration was loaded from.
+    :type mapping_fingerprint: str|None
+    :ivar source_deduplicator: Replaces `drop_duplicates` while a run deduplicates the
+        source across chunks.
+    :type source_deduplicator: Callable|None
     """
 
     def __init__(self,
@@ -54,6 +178,10 @@ class DataFrameConfiguration(FileLoaderConfiguration):
                  drop_duplicates: str|list[str]|None = None,
                  process: Literal['passthrough', 'parse', 'append'] = 'parse',
                  query: str|None = None,
+                 wait_for_output: bool = True,
+                 incremental: IncrementalConfiguration|None = None,
+                 result_cache: ResultCacheConfiguration|None = None,
+                 optimize_dtypes: DtypeOptimizationConfiguration|None = None
                  ):
         self.file_path = file_path
         self.file_type = file_type
@@ -64,6 +192,12 @@ class DataFrameConfiguration(FileLoaderConfiguration):
         self.depends_on = depends_on
         self.drop_duplicates = drop_duplicates
         self.query = query
+        self.wait_for_output = wait_for_output
+        self.incremental = incremental
+        self.result_cache = result_cache
+        self.optimize_dtypes = optimize_dtypes
+        self.mapping_fingerprint: str|None = None
+        self.source_deduplicator: Callable|None = None
 
         self.fields: list[DataFrameField] = []
         self.validation_rules: list[ValidationField] = []
@@ -149,6 +283,22 @@ class DataFrameConfiguration(FileLoaderConfiguration):
 
         return self
 
+    @property
+    def requires_source(self) -> bool:
+        """
+        Whether a post run configuration reads the source data of a chunk, so it has
+        to be kept after the chunk is processed.
+
+        :return: True if a post run configuration merges with or uses the source.
+        :rtype: bool
+        """
+        for post_run_configuration in self.post_run_configuration:
+            merge = post_run_configuration.merge_configuration
+            if merge is not None and merge.required_dataframe in ('source', 'merged'):
+                return True
+
+        return False
+
     @property
     def renames(self) -> dict[str, str]:
         """
@@ -272,6 +422,21 @@ class DataFrameConfiguration(FileLoaderConfiguration):
                 return field.field_type
         return None
 
+    def get_chunk_memory(self) -> int|None:
+        """
+        The target memory of each chunk, lowered to the smallest `max_chunk_memory` of
+        the output writers.
+
+        :return: The target in bytes, or None to read `chunk_size` rows at a time.
+        :rtype: int|None
+        """
+        if self.chunk_memory is None:
+            return None
+
+        limits = [o.primary_writer.max_chunk_memory for o in self.output if getattr(o.primary_writer, 'max_chunk_memory', None) is not None]
+
+        return min([self.chunk_memory] + limits)
+
     def add_output(self, output_configuration) -> Self:
         """
         Appends the given output configuration to the output list of the current
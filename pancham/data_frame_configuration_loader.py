@@ -1,18 +1,32 @@
-import yaml
+import hashlib
+import json
 from typing import Literal
 
 from .validation_field import ValidationField, ValidationRule
-from .data_frame_configuration import MergeConfiguration
+from .data_frame_configuration import MergeConfiguration, IncrementalConfiguration, ResultCacheConfiguration, DtypeOptimizationConfiguration
 from .configuration.field_parser import FieldParser
 from .data_frame_configuration import DataFrameConfiguration
 from .output_configuration import OutputConfiguration, OutputActivitySet
+from .mapping_cache import MappingFileCache
+from .plugin_registry import resolve_plugin
+from .tool.yaml_tools import safe_load
+from .file_loader_configuration import parse_memory_size
+from .database.sql_pushdown import SqlPushdownOptimizer, PushdownPlan, build_pushdown_field
 
 
 class DataFrameConfigurationLoader:
+    """
+    Loads mapping configurations.
 
-    def __init__(self, field_parsers: list[FieldParser], output_configuration: list[OutputConfiguration]):
+    :ivar sql_pushdown: Optional optimizer that moves the database lookups of SQL
+        mappings into their query.
+    :type sql_pushdown: SqlPushdownOptimizer | None
+    """
+
+    def __init__(self, field_parsers: list[FieldParser], output_configuration: list[OutputConfiguration], sql_pushdown: SqlPushdownOptimizer | None = None):
         self.field_parsers = field_parsers
         self.output_configuration = output_configuration
+        self.sql_pushdown = sql_pushdown
 
     def load(self, filename: str) -> DataFrameConfiguration:
 
@@ -21,8 +35,11 @@ class DataFrameConfigurationLoader:
         self.__validate_input(data, filename)
 
         sheet: str|None = self.__get_configuration_for_file_type(data, 'sheet', ['xlsx'])
-        key: str|None = self.__get_configuration_for_file_type(data, 'key', ['json', 'yaml'])
-        configuration = self.__load_section(data, "main", sheet=sheet, key=key)
+        key: str|None = self.__get_configuration_for_file_type(data, 'key', ['json', 'jsonl', 'yaml'])
+        pushdown = self.sql_pushdown.plan(data) if self.sql_pushdown is not None else None
+        configuration = self.__load_section(data, "main", sheet=sheet, key=key, pushdown=pushdown)
+        configuration.json_schema = self.__get_configuration_for_file_type(data, 'json_schema', ['jsonl'])
+        configuration.unexpected_fields = self.__get_configuration_for_file_type(data, 'unexpected_fields', ['jsonl']) or 'ignore'
 
         self.__load_additional_fields(data, configuration, 'pre')
         self.__load_additional_fields(data, configuration, 'post')
@@ -30,11 +47,18 @@ class DataFrameConfigurationLoader:
 
         configuration.drop_duplicates = data.get('drop_duplicates', None)
         configuration.process = data.get('process', 'parse')
+        configuration.incremental = self.__load_incremental_configuration(data.get('incremental', None))
+        configuration.result_cache = self.__load_result_cache_configuration(data.get('result_cache', None))
+        configuration.optimize_dtypes = self.__load_dtype_optimization_configuration(data.get('optimize_dtypes', None))
+        configuration.mapping_fingerprint = hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
 
         if data.get('use_iterator', False) is True:
             configuration.use_iterator = True
             configuration.chunk_size = data.get('chunk_size', 100000)
 
+            if 'chunk_memory' in data:
+                configuration.chunk_memory = parse_memory_size(data['chunk_memory'])
+
         return configuration
 
     def load_file(self, filename: str) -> dict:
@@ -82,7 +106,7 @@ class DataFrameConfigurationLoader:
                 if key == 'validation':
                     configuration.validation_rules.append(self.__load_validation_configuration(d))
 
-    def __load_section(self, data: dict, label: str, sheet: str|None = None, key: str|None = None) -> DataFrameConfiguration:
+    def __load_section(self, data: dict, label: str, sheet: str|None = None, key: str|None = None, pushdown: PushdownPlan|None = None) -> DataFrameConfiguration:
         """
         Dataframes are loaded in sections, allowing the pre and post steps to be their own configuration that
         is loaded using the same methods
@@ -97,6 +121,8 @@ class DataFrameConfigurationLoader:
         :param sheet: Optional sheet identifier for file-based input if relevant (e.g., Excel files).
             Determines a particular sheet to pull data from when parsing input.
         :type sheet: str | None
+        :param pushdown: Optional plan that reads the database lookups of the section from its query.
+        :type pushdown: PushdownPlan | None
         :return: A configured `DataFrameConfiguration` object instantiated based on input_data and label,
             populated with fields parsed by supported parsers, and associated output configurations if specified
             and applicable.
@@ -108,7 +134,10 @@ class DataFrameConfigurationLoader:
         if configuration.name.startswith('test'):
             return configuration
 
-        configuration = self.__parse_fields(configuration, data)
+        if pushdown is not None:
+            configuration.query = pushdown.query
+
+        configuration = self.__parse_fields(configuration, data, pushdown)
 
         if 'output' in data:
             for c in self.output_configuration:
@@ -149,7 +178,7 @@ class DataFrameConfigurationLoader:
         if 'merge' in data:
             merge_dict = data['merge']
             merge_configuration = MergeConfiguration(merge_dict.get('type', 'processed'), merge_dict.get('source_key', None), merge_dict.get('processed_key', None))
-        return DataFrameConfiguration(label, label, name=data['name'], merge_configuration=merge_configuration)
+        return DataFrameConfiguration(label, label, name=data['name'], merge_configuration=merge_configuration, wait_for_output=data.get('wait_for_output', True))
 
     def __load_validation_configuration(self, data: dict) -> ValidationField:
         """
@@ -176,7 +205,73 @@ class DataFrameConfigurationLoader:
             rule=rule
         )
 
-    def __parse_fields(self, configuration: DataFrameConfiguration, data: dict) -> DataFrameConfiguration:
+    def __load_incremental_configuration(self, data: dict|None) -> IncrementalConfiguration|None:
+        """
+        Loads the incremental section of a mapping. The deleted rows are configured in
+        the same way as an output handler, with their own fields and outputs.
+
+        :param data: The incremental section of the mapping, if there is one.
+        :type data: dict | None
+        :return: The incremental configuration, or None if the mapping is not incremental.
+        :rtype: IncrementalConfiguration | None
+        """
+        if data is None:
+            return None
+
+        return IncrementalConfiguration(
+            key=data.get('key', None),
+            watermark=data.get('watermark', None),
+            detect_deletes=data.get('detect_deletes', False),
+            deleted_configuration=self.__parse_post_output(data.get('deleted', None))
+        )
+
+    def __load_result_cache_configuration(self, data: dict|bool|None) -> ResultCacheConfiguration|None:
+        """
+        Loads the result cache section of a mapping, `result_cache: true` uses the
+        default settings.
+
+        :param data: The result cache section of the mapping, if there is one.
+        :type data: dict | bool | None
+        :return: The result cache configuration, or None if results are not cached.
+        :rtype: ResultCacheConfiguration | None
+        """
+        if data is None or data is False:
+            return None
+
+        if data is True:
+            return ResultCacheConfiguration()
+
+        return ResultCacheConfiguration(
+            store_output=data.get('store_output', False),
+            hash_content=data.get('hash_content', False),
+            watermark_query=data.get('watermark_query', None),
+            lookup_query=data.get('lookup_query', None),
+            ignore_lookups=data.get('ignore_lookups', False)
+        )
+
+    def __load_dtype_optimization_configuration(self, data: dict|bool|None) -> DtypeOptimizationConfiguration|None:
+        """
+        Loads the optimize_dtypes section of a mapping, `optimize_dtypes: true` uses the
+        default settings and `optimize_dtypes: false` turns off the global setting.
+
+        :param data: The optimize_dtypes section of the mapping, if there is one.
+        :type data: dict | bool | None
+        :return: The dtype optimization configuration, or None to use the global setting.
+        :rtype: DtypeOptimizationConfiguration | None
+        """
+        if data is None:
+            return None
+
+        if isinstance(data, bool):
+            return DtypeOptimizationConfiguration(enabled=data)
+
+        return DtypeOptimizationConfiguration(
+            enabled=data.get('enabled', True),
+            category_ratio=data.get('category_ratio', 0.5),
+            downcast=data.get('downcast', True)
+        )
+
+    def __parse_fields(self, configuration: DataFrameConfiguration, data: dict, pushdown: PushdownPlan|None = None) -> DataFrameConfiguration:
         """
         Parses fields from the provided data based on the configuration and applicable
         field parsers. If a field cannot be parsed by any parser, an exception is raised.
@@ -187,6 +282,8 @@ class DataFrameConfigurationLoader:
             with parsed fields.
         :param data: A dictionary containing field definitions under the 'fields' key
             for parsing.
+        :param pushdown: Optional plan, the fields it pushed down copy the looked up
+            values from the query instead of being parsed.
         :return: The updated DataFrameConfiguration object containing the successfully
             parsed fields.
         :rtype: DataFrameConfiguration
@@ -194,11 +291,16 @@ class DataFrameConfigurationLoader:
             available field parsers.
         """
         if 'fields' in data:
-            for f in data['fields']:
+            for index, f in enumerate(data['fields']):
+                if pushdown is not None and index in pushdown.columns:
+                    configuration.add_field(data_frame_field=build_pushdown_field(f, pushdown.columns[index]))
+                    continue
+
                 has_parsed = False
                 for parser in self.field_parsers:
                     if parser.can_parse_field(f):
                         field = parser.parse_field(f)
+                        field.parser_name = type(resolve_plugin(parser)).__name__
 
                         if 'supress_error' in f:
                             field.supress_error = f['supress_error']
@@ -238,6 +340,16 @@ class DataFrameConfigurationLoader:
 
 
 class YamlDataFrameConfigurationLoader(DataFrameConfigurationLoader):
+    """
+    Loads mapping configurations from YAML files.
+
+    :ivar mapping_cache: Optional on disk cache of parsed mapping files.
+    :type mapping_cache: MappingFileCache | None
+    """
+
+    def __init__(self, field_parsers: list[FieldParser], output_configuration: list[OutputConfiguration], mapping_cache: MappingFileCache | None = None, sql_pushdown: SqlPushdownOptimizer | None = None):
+        super().__init__(field_parsers, output_configuration, sql_pushdown)
+        self.mapping_cache = mapping_cache
 
     def load_file(self, filename: str) -> dict:
         """
@@ -245,7 +357,8 @@ class YamlDataFrameConfigurationLoader(DataFrameConfigurationLoader):
 
         The method attempts to open the specified file in read mode and parse its
         content using the YAML-safe loader. The retrieved data is then returned to
-        the caller as a dictionary.
+        the caller as a dictionary. When a mapping cache is set the parsed file is
+        read from the cache if the file has not changed.
 
         :param filename: The name of the YAML file to load.
         :type filename: str
@@ -253,5 +366,11 @@ class YamlDataFrameConfigurationLoader(DataFrameConfigurationLoader):
         :return: A dictionary containing the parsed YAML file data.
         :rtype: dict
         """
+        if self.mapping_cache is not None:
+            return self.mapping_cache.load(filename, self.__parse_file)
+
+        return self.__parse_file(filename)
+
+    def __parse_file(self, filename: str) -> dict:
         with open(filename, 'r') as file:
-            return yaml.safe_load(file)
\ No newline at end of file
+            return safe_load(file)
\ No newline at end of file
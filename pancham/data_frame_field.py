@@ -10,6 +10,8 @@ class DataFrameField:
         2. Func fields - These are fields that use a function in the dataframe apply method to create a new field
         3. Dataframe func fields - These return a new data frame and can make changes like exploding or deduplicating the
         entire dataframe.
+        4. Vector func fields - These use a function that takes the dataframe and returns the values of the field for
+        every row at once.
 
     :ivar name: Name of the field, typically used to reference it programmatically.
     :type name: str
@@ -29,6 +31,18 @@ class DataFrameField:
     :type suppress_errors: bool
     :ivar cast_type: Flag to indicate if the type should be changed to the field type
     :type: cast_type: bool
+    :ivar parser_name: Name of the field parser that created the field, used when
+        reporting on the field.
+    :type parser_name: str | None
+    :ivar input_columns: The columns of the row read by `func`, None if unknown.
+    :type input_columns: list[str] | None
+    :ivar vector_func: A callable that takes the DataFrame and returns a Series with
+        the value of the field for every row.
+    :type vector_func: Callable[[pd.DataFrame], pd.Series] | None
+    :ivar pure: Flag to indicate that `func` always returns the same value for the same
+        input columns and has no side effects, so it only needs to be run once for each
+        distinct combination of input values.
+    :type pure: bool
     """
 
     def __init__(
@@ -41,6 +55,9 @@ class DataFrameField:
             suppress_errors: bool = False,
             cast_type: bool = False,
             df_func: Callable[[pd.DataFrame], pd.DataFrame] | None = None,
+            input_columns: list[str] | None = None,
+            pure: bool = False,
+            vector_func: Callable[[pd.DataFrame], pd.Series] | None = None
     ) -> None:
         self.name = name
         self.source_name = source_name
@@ -50,9 +67,13 @@ class DataFrameField:
         self.suppress_errors = suppress_errors
         self.cast_type = cast_type
         self.df_func = df_func
+        self.parser_name: str | None = None
+        self.input_columns = input_columns
+        self.pure = pure
+        self.vector_func = vector_func
 
     def is_dynamic(self) -> bool:
-        return self.func is not None or self.df_func is not None
+        return self.func is not None or self.df_func is not None or self.vector_func is not None
 
     def has_df_func(self) -> bool:
         """
@@ -69,5 +90,24 @@ class DataFrameField:
         """
         return self.df_func is not None
 
+    def has_vector_func(self) -> bool:
+        """
+        Checks if the field is computed for all rows at once by a vector function.
+
+        :return: Indicates whether the vector function is defined.
+        :rtype: bool
+        """
+        return self.vector_func is not None
+
+    def is_memoizable(self) -> bool:
+        """
+        Checks if the field function can be run once per distinct value of its input
+        columns rather than once per row.
+
+        :return: True if the field has a pure function with known input columns.
+        :rtype: bool
+        """
+        return self.func is not None and self.pure and self.input_columns is not None and None not in self.input_columns
+
     def __str__(self) -> str:
         return f"Name: {self.name}, Source Name: {self.source_name}, Type: {self.field_type}, Nullable: {self.nullable}"
\ No newline at end of file
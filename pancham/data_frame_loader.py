@@ -1,3 +1,4 @@
+import math
 from typing import Iterator
 
 import numpy as np
@@ -6,11 +7,14 @@ import dask.dataframe as dd
 from pandera.errors import SchemaError
 
 from .file_loader_configuration import FileLoaderConfiguration
-from .data_frame_configuration import MergeConfiguration
+from .data_frame_configuration import MergeConfiguration, DtypeOptimizationConfiguration
 from .pancham_configuration import PanchamConfiguration
 from .data_frame_configuration import DataFrameConfiguration
-from .file_loader import FileLoader
+from .data_frame_field import DataFrameField
+from .file_loader import FileLoader, ChunkPosition
+from .profiler import StageProfiler, set_active_profiler
 from .reporter import Reporter
+from .tool.frame_tools import detach, optimize_dtypes
 
 class DataFrameOutput:
     """
@@ -23,8 +27,8 @@ class DataFrameOutput:
     structure for handling data transformation workflows.
 
     :ivar source: The original pandas DataFrame containing raw data before
-        processing.
-    :type source: pd.DataFrame
+        processing, only kept when a post run step needs it.
+    :type source: pd.DataFrame | None
     :ivar processed: The pandas DataFrame containing the data after being
         processed.
     :type processed: pd.DataFrame
@@ -32,7 +36,7 @@ class DataFrameOutput:
 
     MAX_ROWS_IN_FRAME = 25000
 
-    def __init__(self, source: pd.DataFrame, processed: pd.DataFrame):
+    def __init__(self, source: pd.DataFrame | None, processed: pd.DataFrame):
         self.source = source
         self.processed = processed
 
@@ -50,23 +54,29 @@ class DataFrameOutput:
         operation between `source` and `processed` DataFrames. Otherwise,
         it defaults to returning a copy of the `processed` DataFrame.
 
+        With copy-on-write enabled the copies share data with the originals.
+
         :param merge_configuration: Configuration object specifying which
             DataFrame to return or how to merge existing ones
         :type merge_configuration: MergeConfiguration
         :return: The resolved DataFrame based on the conditions provided in
             merge_configuration
         :rtype: pd.DataFrame
+        :raises ValueError: If the source is required but was not kept.
         """
         if merge_configuration is None:
-            return self.processed.copy()
+            return detach(self.processed)
+
+        if merge_configuration.required_dataframe in ('source', 'merged') and self.source is None:
+            raise ValueError(f"The source data was not kept for a {merge_configuration.required_dataframe} step")
 
         if merge_configuration.required_dataframe == 'source':
-            return self.source.copy()
+            return detach(self.source)
 
         if merge_configuration.required_dataframe == 'merged' and merge_configuration.processed_key is not None and merge_configuration.source_key is not None:
             return self.source.merge(self.processed, how='left', left_on=merge_configuration.source_key, right_on=merge_configuration.processed_key)
 
-        return self.processed.copy()
+        return detach(self.processed)
 
 class DataFrameLoader:
     """
@@ -86,12 +96,40 @@ class DataFrameLoader:
     :ivar pancham_configuration: Optional configuration specific to the "Pancham"
         system. If provided, it is used for additional customization of the loading process.
     :type pancham_configuration: PanchamConfiguration | None
+    :ivar profiler: Measures each stage of the load when profiling is enabled.
+    :type profiler: StageProfiler
     """
 
     def __init__(self, file_loaders: dict[str, FileLoader], reporter: Reporter, pancham_configuration: PanchamConfiguration|None = None) -> None:
         self.file_loaders = file_loaders
         self.reporter = reporter
         self.pancham_configuration = pancham_configuration
+        self.__profiler: StageProfiler | None = None
+        self.__dtype_savings: dict[str, dict[str, int]] = {}
+
+    @property
+    def profiler(self) -> StageProfiler:
+        """
+        The profiler is created on first use as the configuration may not be readable
+        when the loader is constructed.
+        """
+        if self.__profiler is None:
+            if self.pancham_configuration is None:
+                self.__profiler = StageProfiler(self.reporter)
+            else:
+                profile_enabled = self.pancham_configuration.profile_enabled
+                self.__profiler = StageProfiler(
+                    self.reporter,
+                    enabled=profile_enabled or self.reporter.is_telemetry_enabled(),
+                    track_allocations=profile_enabled and self.pancham_configuration.profile_allocations,
+                    track_memory=profile_enabled and self.pancham_configuration.profile_memory,
+                    snapshot_top=self.pancham_configuration.profile_snapshot_top
+                )
+
+            # Lookup caches are loaded outside the loader and measured by the same profiler
+            set_active_profiler(self.__profiler)
+
+        return self.__profiler
 
     def load(
             self,
@@ -115,13 +153,49 @@ class DataFrameLoader:
         """
         self.reporter.report_debug("Starting load")
         for source_df in self.load_file(configuration):
-            if configuration.drop_duplicates is None:
-                prepared_df = source_df.copy()
-            else:
-                prepared_df = source_df.drop_duplicates(subset=configuration.drop_duplicates)
+            yield self.process_chunk(source_df, configuration)
+
+    def process_chunk(self, source_df: pd.DataFrame, configuration: DataFrameConfiguration) -> DataFrameOutput:
+        """
+        Processes a single chunk returned by the file loader, removing duplicates if
+        required and applying the configuration to build the output.
+
+        This is the transform stage of a load, separated from reading so that it can
+        be run independently of the loader, for example in a pipelined run.
+
+        The source is only kept in the output when a post run step reads it, so it
+        can be released as soon as the chunk is processed.
 
-            processed = self.process_dataframe(prepared_df, configuration)
-            yield DataFrameOutput(source_df, processed)
+        :param source_df: The chunk as read from the source.
+        :type source_df: pd.DataFrame
+        :param configuration: The configuration to apply to the chunk.
+        :type configuration: DataFrameConfiguration
+        :return: The source and processed data for the chunk.
+        :rtype: DataFrameOutput
+        """
+        processed = self.process_dataframe(self.__drop_duplicates(source_df, configuration), configuration)
+        return DataFrameOutput(source_df if configuration.requires_source else None, processed)
+
+    def process_until(self, source_df: pd.DataFrame, configuration: DataFrameConfiguration, field: DataFrameField) -> pd.DataFrame:
+        """
+        Applies the configuration to a chunk up to, but not including, one of its
+        dynamic fields. The result is the frame that field is applied to, which lets
+        a field look at every chunk of a run before any of them are processed.
+
+        :param source_df: The chunk as read from the source.
+        :type source_df: pd.DataFrame
+        :param configuration: The configuration to apply to the chunk.
+        :type configuration: DataFrameConfiguration
+        :param field: The field to stop at.
+        :type field: DataFrameField
+        :return: The renamed chunk with the earlier fields applied.
+        :rtype: pd.DataFrame
+        """
+        fields = configuration.dynamic_fields
+        position = next(i for i, f in enumerate(fields) if f is field)
+        split_df = self.__split_df(self.__drop_duplicates(source_df, configuration))
+
+        return self.__apply_fields(split_df.rename(columns=configuration.renames), fields[:position], configuration)
 
     def process_dataframe(self, source_df: pd.DataFrame, configuration: DataFrameConfiguration) -> pd.DataFrame:
         """
@@ -142,48 +216,118 @@ class DataFrameLoader:
         :rtype: pd.DataFrame
         """
         if configuration.process == 'passthrough':
-            return source_df.copy()
+            return detach(source_df)
 
+        profiler = self.profiler
         split_df = self.__split_df(source_df)
 
-        renamed_df = split_df.rename(columns=configuration.renames)
-
-        for field in configuration.dynamic_fields:
-            self.reporter.report_debug(f"Processing dynamic field {field.name} - Data frame field {field.has_df_func()}")
-            try:
-                if field.has_df_func():
-                    renamed_df = field.df_func(renamed_df)
-                else:
-                    if isinstance(renamed_df, dd.DataFrame):
-                        type = configuration.get_field_type(field.name)
-                        renamed_df[field.name] = renamed_df.apply(field.func, axis=1, meta=(field.name, type))
-                    else:
-                        renamed_df[field.name] = renamed_df.apply(field.func, axis=1)
-            except Exception as e:
-                if field.suppress_errors:
-                    self.reporter.report_error(e)
-                else:
-                    raise e
+        with profiler.stage('rename', rows_in=_count_rows(split_df), configuration=configuration.name) as stage:
+            renamed_df = split_df.rename(columns=configuration.renames)
+            stage.rows_out = _count_rows(renamed_df)
 
+        renamed_df = self.__apply_fields(renamed_df, configuration.dynamic_fields, configuration)
+
+        # The renamed frame is only referenced here, so it is returned without a copy
         if configuration.process == 'append':
-            return renamed_df.copy()
+            return renamed_df
+
+        with profiler.stage('cast', rows_in=_count_rows(renamed_df), configuration=configuration.name) as stage:
+            output = renamed_df[configuration.output_fields]
+            if not isinstance(output, dd.DataFrame):
+                output = detach(output)
+
+            for key, value in configuration.cast_values.items():
+                if value == 'int':
+                    output[key] = output[key].replace([np.nan, np.inf, -np.inf], 0)
+                output[key] = output[key].astype(value)
 
-        output = renamed_df[configuration.output_fields].copy()
+            if isinstance(output, dd.DataFrame):
+                procesed = output.compute()
+            else:
+                procesed = output
 
-        for key, value in configuration.cast_values.items():
-            if value == 'int':
-                output[key] = output[key].replace([np.nan, np.inf, -np.inf], 0)
-            output[key] = output[key].astype(value)
+            stage.rows_out = len(procesed)
 
-        if isinstance(output, dd.DataFrame):
-            procesed = output.compute()
-        else:
-            procesed = output
+        with profiler.stage('schema_validation', rows_in=len(procesed), configuration=configuration.name) as stage:
+            self.__validate_schema(procesed, configuration)
+            stage.rows_out = len(procesed)
 
-        self.__validate_schema(procesed, configuration)
+        optimization = self.__get_dtype_optimization(configuration)
+        if optimization is not None:
+            with profiler.stage('optimize_dtypes', rows_in=len(procesed), configuration=configuration.name) as stage:
+                procesed, saved = optimize_dtypes(procesed, optimization.category_ratio, optimization.downcast)
+                self.__record_dtype_savings(configuration.name, saved)
+                stage.rows_out = len(procesed)
 
         return procesed
 
+    def pop_dtype_savings(self, name: str) -> dict[str, int]:
+        """
+        Returns the bytes saved by optimizing the dtypes of a configuration since the
+        last call, and resets the totals.
+
+        :param name: The name of the configuration.
+        :type name: str
+        :return: The bytes saved for each converted column.
+        :rtype: dict[str, int]
+        """
+        return self.__dtype_savings.pop(name, {})
+
+    def register_configuration(self, configuration: FileLoaderConfiguration):
+        """
+        Tells the file loader for the configuration's file type that the configuration
+        will be read, so reads can be shared with other configurations.
+
+        :param configuration: A configuration that will be loaded during the run.
+        :type configuration: FileLoaderConfiguration
+        """
+        if configuration.file_type in self.file_loaders:
+            self.file_loaders[configuration.file_type].register_configuration(configuration, self.pancham_configuration)
+
+    def clear_cache(self):
+        """
+        Releases the data cached by each file loader.
+        """
+        for loader in self.file_loaders.values():
+            loader.clear_cache()
+
+    def cache_sizes(self) -> dict[str, int]:
+        """
+        :return: The number of entries cached by each file loader that holds any.
+        :rtype: dict[str, int]
+        """
+        sizes = {file_type: loader.cache_size() for file_type, loader in self.file_loaders.items()}
+
+        return {file_type: size for file_type, size in sizes.items() if size > 0}
+
+    def describe_caches(self) -> list[dict[str, str | int]]:
+        """
+        :return: The data cached by each file loader, as described by the loader.
+        :rtype: list[dict[str, str | int]]
+        """
+        return [item for loader in self.file_loaders.values() for item in loader.describe_cache()]
+
+    def estimate_rows(self, configuration: FileLoaderConfiguration) -> int | None:
+        """
+        Estimates the number of rows in the source of a configuration. Failing to
+        estimate does not stop the run, it is reported as a debug message.
+
+        :param configuration: The configuration that will be read.
+        :type configuration: FileLoaderConfiguration
+        :return: The estimated number of rows, or None if it is not known.
+        :rtype: int | None
+        """
+        loader = self.file_loaders.get(configuration.file_type)
+
+        if loader is None:
+            return None
+
+        try:
+            return loader.estimate_rows(configuration, self.pancham_configuration)
+        except Exception as e:
+            self.reporter.report_debug(lambda: f"Could not estimate the rows of {configuration.file_path}: {e}")
+            return None
+
     def load_file(self, configuration: FileLoaderConfiguration) -> Iterator[pd.DataFrame]:
         """
         Loads a data file based on its specified file type and associated configuration details
@@ -208,8 +352,125 @@ class DataFrameLoader:
             raise ValueError(f'Unsupported file type: {file_type}')
 
         loader = self.file_loaders[file_type]
+        chunks = loader.read_file_from_configuration(configuration, self.pancham_configuration)
 
-        yield from loader.read_file_from_configuration(configuration, self.pancham_configuration)
+        yield from self.profiler.profile_iterator(chunks, 'load', file_type=file_type, file_path=str(configuration.file_path))
+
+    def load_chunks(self, configuration: FileLoaderConfiguration, start: ChunkPosition | None = None) -> Iterator[tuple[ChunkPosition, pd.DataFrame]]:
+        """
+        Loads a data file in the same way as `load_file`, yielding the position in
+        the source reached after each chunk along with the chunk so that a later run
+        can start from it.
+
+        :param configuration: Configuration object containing details necessary to identify
+            and load the file.
+        :type configuration: FileLoaderConfiguration
+        :param start: The position to start reading from, None to read from the start.
+        :type start: ChunkPosition | None
+        :return: The position after each chunk and the chunk.
+        :rtype: Iterator[tuple[ChunkPosition, pd.DataFrame]]
+        :raises ValueError: If the specified file type is not supported within `file_loaders`.
+        """
+        file_type = configuration.file_type
+
+        if file_type not in self.file_loaders:
+            raise ValueError(f'Unsupported file type: {file_type}')
+
+        chunks = self.file_loaders[file_type].read_chunks_from_configuration(configuration, self.pancham_configuration, start)
+        position: list[ChunkPosition] = []
+
+        # The profiler measures frames, so the position of the current frame is held aside
+        def frames() -> Iterator[pd.DataFrame]:
+            for chunk_position, frame in chunks:
+                position[:] = [chunk_position]
+                yield frame
+
+        for frame in self.profiler.profile_iterator(frames(), 'load', file_type=file_type, file_path=str(configuration.file_path)):
+            yield position[0], frame
+
+    def __apply_fields(self, renamed_df: pd.DataFrame, fields: list[DataFrameField], configuration: DataFrameConfiguration) -> pd.DataFrame:
+        profiler = self.profiler
+
+        for field in fields:
+            self.reporter.report_debug(lambda: f"Processing dynamic field {field.name} - Data frame field {field.has_df_func()}")
+            with profiler.stage(
+                    'field',
+                    rows_in=_count_rows(renamed_df),
+                    configuration=configuration.name,
+                    field=field.name,
+                    parser=field.parser_name or ('df_func' if field.has_df_func() else 'vector_func' if field.has_vector_func() else 'func')
+            ) as stage:
+                try:
+                    if field.has_df_func():
+                        renamed_df = field.df_func(renamed_df)
+                    elif field.has_vector_func():
+                        if isinstance(renamed_df, dd.DataFrame):
+                            type = configuration.get_field_type(field.name)
+                            renamed_df[field.name] = renamed_df.map_partitions(field.vector_func, meta=(field.name, type))
+                        else:
+                            renamed_df[field.name] = field.vector_func(renamed_df)
+                    else:
+                        if isinstance(renamed_df, dd.DataFrame):
+                            type = configuration.get_field_type(field.name)
+                            renamed_df[field.name] = renamed_df.apply(field.func, axis=1, meta=(field.name, type))
+                        elif field.is_memoizable():
+                            renamed_df[field.name] = self.__apply_unique(renamed_df, field)
+                        else:
+                            renamed_df[field.name] = renamed_df.apply(field.func, axis=1)
+                except Exception as e:
+                    if field.suppress_errors:
+                        self.reporter.report_error(e)
+                    else:
+                        raise e
+
+                stage.rows_out = _count_rows(renamed_df)
+
+        return renamed_df
+
+    def __apply_unique(self, df: pd.DataFrame, field: DataFrameField) -> pd.Series:
+        """
+        Runs a pure field function once for each distinct combination of its input
+        columns and broadcasts the results back to every row.
+
+        Rows are grouped on the exact type and value of the input columns, so None
+        and NaN or 1, 1.0 and True are kept apart, and the function is called with the
+        first row of each group. Falls back to calling the function for every row when
+        the input columns are missing or hold values that cannot be grouped, such as
+        lists.
+        """
+        columns = field.input_columns
+
+        if len(df) == 0 or any(c not in df.columns for c in columns):
+            return df.apply(field.func, axis=1)
+
+        try:
+            if len(columns) == 0:
+                codes = np.zeros(len(df), dtype=np.intp)
+            else:
+                column_codes = np.column_stack([_factorize_exact(df[c]) for c in columns])
+                _, codes = np.unique(column_codes, axis=0, return_inverse=True)
+                codes = codes.reshape(-1)
+        except TypeError:
+            return df.apply(field.func, axis=1)
+
+        _, first_rows = np.unique(codes, return_index=True)
+        self.reporter.report_debug(lambda: f"Evaluating {field.name} for {len(first_rows)} distinct values of {columns}")
+
+        unique_values = df.iloc[first_rows].apply(field.func, axis=1)
+        values = unique_values.take(codes)
+        values.index = df.index
+
+        return values
+
+    def __drop_duplicates(self, source_df: pd.DataFrame, configuration: DataFrameConfiguration) -> pd.DataFrame:
+        # Processing never modifies the frame it is given, so the chunk is not copied
+        if configuration.drop_duplicates is None:
+            return source_df
+
+        if configuration.source_deduplicator is not None:
+            return configuration.source_deduplicator(source_df)
+
+        return source_df.drop_duplicates(subset=configuration.drop_duplicates)
 
     def __validate_schema(self, output: pd.DataFrame, configuration: DataFrameConfiguration):
         """
@@ -227,13 +488,27 @@ class DataFrameLoader:
         :return: None
         """
         try:
-            configuration.schema.validate(output)
+            configuration.schema.validate(_widen_downcast(output, configuration))
         except SchemaError as e:
             if self.pancham_configuration is not None and self.pancham_configuration.disable_schema_validation:
-                self.reporter.report_debug(f'Schema validation failed but is disabled: {e}')
+                self.reporter.report_debug(lambda: f'Schema validation failed but is disabled: {e}')
             else:
                 raise e
 
+    def __get_dtype_optimization(self, configuration: DataFrameConfiguration) -> DtypeOptimizationConfiguration | None:
+        if configuration.optimize_dtypes is not None:
+            return configuration.optimize_dtypes if configuration.optimize_dtypes.enabled else None
+
+        if self.pancham_configuration is not None and self.pancham_configuration.optimize_dtypes:
+            return DtypeOptimizationConfiguration(category_ratio=self.pancham_configuration.dtype_category_ratio)
+
+        return None
+
+    def __record_dtype_savings(self, name: str, saved: dict[str, int]):
+        totals = self.__dtype_savings.setdefault(name, {})
+        for column, saved_bytes in saved.items():
+            totals[column] = totals.get(column, 0) + saved_bytes
+
     def __split_df(self, df: pd.DataFrame) -> pd.DataFrame | dd.DataFrame:
         """
         Splits the given DataFrame into smaller partitions if it exceeds the maximum
@@ -256,3 +531,53 @@ class DataFrameLoader:
             return dd.from_pandas(df, npartitions=8)
 
         return df
+
+
+def _widen_downcast(df: pd.DataFrame, configuration: DataFrameConfiguration) -> pd.DataFrame:
+    """
+    Widens numbers downcast by the dtype optimization of an earlier step back to the
+    64 bit type of their declared field type, so they pass the schema check.
+    """
+    widened = {}
+    for name, column in df.items():
+        field_type = configuration.get_field_type(name)
+
+        if field_type in ('int', int) and column.dtype in (np.int8, np.int16, np.int32):
+            widened[name] = column.astype(np.int64)
+        elif field_type in ('float', float) and column.dtype == np.float32:
+            widened[name] = column.astype(np.float64)
+
+    if len(widened) == 0:
+        return df
+
+    widened_df = df.copy(deep=False)
+    for name, column in widened.items():
+        widened_df[name] = column
+
+    return widened_df
+
+
+def _factorize_exact(values: pd.Series) -> np.ndarray:
+    """
+    Numbers the distinct values of a column. Values of object columns are compared
+    with their type, as grouping them by value alone treats None and NaN, or 1, 1.0
+    and True, as the same value. Raises a TypeError for values that are not hashable.
+    """
+    if values.dtype != object:
+        return pd.factorize(values, use_na_sentinel=False)[0]
+
+    index = {}
+    keys = ((type(v), None) if isinstance(v, float) and math.isnan(v) else (type(v), v) for v in values)
+
+    return np.fromiter((index.setdefault(key, len(index)) for key in keys), dtype=np.intp, count=len(values))
+
+
+def _count_rows(df: pd.DataFrame | dd.DataFrame) -> int | None:
+    """
+    Counts the rows of a frame for profiling, dask frames are not counted as that
+    would force them to be computed.
+    """
+    if isinstance(df, dd.DataFrame):
+        return None
+
+    return len(df)
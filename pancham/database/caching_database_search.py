@@ -2,6 +2,7 @@ from collections import defaultdict
 
 from sqlalchemy import Table, select, Connection, Select, text, TextClause
 
+from pancham.profiler import get_active_profiler
 from pancham.reporter import get_reporter
 from .database_engine import get_db_engine, META
 
@@ -45,17 +46,17 @@ class DatabaseSearch:
 
         try:
             if cast_to == 'str':
-                reporter.report_debug(f"Casting {value} to string")
+                reporter.report_debug(lambda: f"Casting {value} to string")
                 return str(value)
 
             if cast_to == 'int':
-                reporter.report_debug(f"Casting {value} to int")
+                reporter.report_debug(lambda: f"Casting {value} to int")
                 return int(value)
 
         except ValueError:
-            reporter.report_debug(f"Value {value} cannot be cast to {cast_to}")
+            reporter.report_debug(lambda: f"Value {value} cannot be cast to {cast_to}")
 
-        reporter.report_debug(f"No cast to value set - {cast_to}")
+        reporter.report_debug(lambda: f"No cast to value set - {cast_to}")
 
         return value
 
@@ -118,10 +119,10 @@ class CachingDatabaseSearch(DatabaseSearch):
         """
         data = self.__load_data()
         reporter = get_reporter()
-        reporter.report_debug(f"Reading cached data: {data}")
+        reporter.report_debug(lambda: f"Reading cached data: {data}")
 
         search = self.cast_value(search_value, self.cast_search)
-        reporter.report_debug(f"Finding id {search} - type {type(search)}")
+        reporter.report_debug(lambda: f"Finding id {search} - type {type(search)}")
 
         if search in data:
             return data[search]
@@ -160,18 +161,32 @@ class CachingDatabaseSearch(DatabaseSearch):
         if len(self.cached_data) > 0:
             return self.cached_data
 
-        with get_db_engine().engine.connect() as conn:
-            query = self.get_query(conn)
+        with get_active_profiler().stage('lookup_cache', lookup=self.get_cache_name()) as stage:
+            with get_db_engine().engine.connect() as conn:
+                query = self.get_query(conn)
 
-            res = conn.execute(query).fetchall()
+                res = conn.execute(query).fetchall()
 
-            for row in res:
-                key = self.cast_value(row[0], self.cast_search)
-                value = self.cast_value(row[1], self.cast_value_type)
-                self.cached_data[key] = value
+                # Filled before it is set so searches on other threads never see part of it
+                cached_data = {}
+                for row in res:
+                    key = self.cast_value(row[0], self.cast_search)
+                    value = self.cast_value(row[1], self.cast_value_type)
+                    cached_data[key] = value
+
+                self.cached_data = cached_data
+
+            stage.rows_out = len(self.cached_data)
 
         return self.cached_data
 
+    def get_cache_name(self) -> str:
+        """
+        :return: A name identifying the cached lookup in profiles.
+        :rtype: str
+        """
+        return f"{self.table_name}.{self.search_col}"
+
 class SQLFileCachingDatabaseSearch(CachingDatabaseSearch):
     """
     A specialized class that extends CachingDatabaseSearch to include SQL file
@@ -200,6 +215,9 @@ class SQLFileCachingDatabaseSearch(CachingDatabaseSearch):
             query = sql_file.read()
             return text(query)
 
+    def get_cache_name(self) -> str:
+        return self.file
+
 class FilteredCachingDatabaseSearch(CachingDatabaseSearch):
     """
     A specialized class that extends CachingDatabaseSearch to include filtering functionality.
@@ -239,6 +257,6 @@ class FilteredCachingDatabaseSearch(CachingDatabaseSearch):
         for k, v in self.filter.items():
             select_query = select_query.where(data_table.c[k] == v)
 
-        reporter.report_debug(f"Generated query: {str(select_query)}")
+        reporter.report_debug(lambda: f"Generated query: {str(select_query)}")
         return select_query
 
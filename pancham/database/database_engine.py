@@ -127,7 +127,8 @@ def initialize_db_engine(config: PanchamConfiguration, reporter: Reporter):
 
     This function sets up the `db_engine` with the given `config` and `reporter`.
     It ensures the global database engine is initialized and ready to interact with
-    the configured database.
+    the configured database. Calling it again with the same configuration keeps
+    the engine and its connection pool, so runs in the same process share them.
 
     :param config: The configuration object used for database setup.
     :type config: PanchamConfiguration
@@ -139,6 +140,10 @@ def initialize_db_engine(config: PanchamConfiguration, reporter: Reporter):
     """
     global db_engine, META
 
+    if db_engine is not None and db_engine.config is config:
+        db_engine.reporter = reporter
+        return
+
     db_engine = DatabaseEngine(config, reporter)
     META = MetaData()
 
@@ -53,6 +53,9 @@ class DatabaseOutputWriter(OutputWriter):
         self.merge_data_type = configuration.get('merge_data_type', None)
         self.native = configuration.get('native', None)
 
+    def target_identity(self) -> str|None:
+        return get_db_engine().config.database_connection
+
     def write(self,
               data: pd.DataFrame,
               success_handler: DataFrameConfiguration | None = None,
@@ -75,7 +78,7 @@ class DatabaseOutputWriter(OutputWriter):
         :return: None
         """
         reporter = get_reporter()
-        reporter.report_debug(f'Writing to database', data)
+        reporter.report_debug('Writing to database', data)
 
         if len(self.columns) > 0:
             data = data[self.columns]
@@ -1,5 +1,6 @@
 import hashlib
 import json
+import sys
 from typing import Literal
 
 from pancham.reporter import get_reporter
@@ -52,8 +53,8 @@ def get_database_search(
     global __managed_db_cache
 
     reporter = get_reporter()
-    reporter.report_debug(f'Database search cache {__managed_db_cache}')
-    reporter.report_debug(f'Database search using populate - {populate}, filter - {filter}, Sql file - {sql_file}')
+    reporter.report_debug(lambda: f'Database search cache {__managed_db_cache}')
+    reporter.report_debug(lambda: f'Database search using populate - {populate}, filter - {filter}, Sql file - {sql_file}')
 
     filter_key = ''
     if filter is not None:
@@ -75,3 +76,57 @@ def get_database_search(
             __managed_db_cache[db_key] = CachingDatabaseSearch(table_name, search_col, value_col, cast_search, cast_value)
 
     return __managed_db_cache[db_key]
+
+
+def clear_search_caches():
+    """
+    Removes every managed database search, so the next search for each table loads
+    its values from the database again. Searches already in use keep their values.
+    """
+    global __managed_db_cache
+
+    __managed_db_cache = {}
+
+
+def count_cached_search_values() -> int:
+    """
+    Counts the values held in memory by the managed database searches.
+
+    :return: The number of cached values.
+    :rtype: int
+    """
+    return sum(len(_get_cached_data(search)) for search in __managed_db_cache.values())
+
+
+def describe_search_caches() -> list[dict[str, str|int]]:
+    """
+    Measures the values held in memory by each managed database search. The size
+    counts the dictionary and its keys and values, not objects shared with other
+    caches.
+
+    :return: The name, number of values and approximate bytes of each cache that
+        holds values.
+    :rtype: list[dict[str, str | int]]
+    """
+    caches = []
+
+    for search in __managed_db_cache.values():
+        if isinstance(search, PopulatingDatabaseSearch):
+            search = search.caching_search
+
+        cached_data = _get_cached_data(search)
+        if len(cached_data) == 0:
+            continue
+
+        size = sys.getsizeof(cached_data) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in cached_data.items())
+        name = search.get_cache_name() if isinstance(search, CachingDatabaseSearch) else type(search).__name__
+        caches.append({'cache': 'database_search', 'name': name, 'entries': len(cached_data), 'bytes': size})
+
+    return caches
+
+
+def _get_cached_data(search: DatabaseSearch|None) -> dict:
+    if isinstance(search, PopulatingDatabaseSearch):
+        search = search.caching_search
+
+    return getattr(search, 'cached_data', {})
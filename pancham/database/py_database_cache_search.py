@@ -48,7 +48,7 @@ class PyDatabaseCacheSearch(DatabaseSearch):
             which can be of type `str` or `int`. Returns `None` if the key is not found.
         """
         reporter = get_reporter()
-        reporter.report_debug(f"Reading non-cached data")
+        reporter.report_debug("Reading non-cached data")
 
         value = get_db_value(self.table_name, self.search_col, self.value_col, self.cast_value(search_value, self.cast_search))
         return self.cast_value(value, self.cast_value_type)
@@ -6,6 +6,7 @@ from sqlalchemy import text
 from pancham.file_loader_configuration import FileLoaderConfiguration, DEFAULT_CHUNK_SIZE
 from pancham.database.database_engine import get_db_engine
 from pancham.file_loader import FileLoader
+from pancham.pancham_configuration import PanchamConfiguration
 
 
 class SqlFileLoader(FileLoader):
@@ -15,7 +16,8 @@ class SqlFileLoader(FileLoader):
 
     This class is used to load data from a SQL file, execute the SQL query
     on the specified database engine, and return the result as a pandas
-    DataFrame.
+    DataFrame. When the mapping has a `query` it is run instead of reading
+    a file.
 
     :ivar some_class_attribute: Description of the attribute, if any exists.
     :type some_class_attribute: type_of_the_attribute
@@ -23,11 +25,10 @@ class SqlFileLoader(FileLoader):
 
     def read_file(self, filename: str, **kwargs) -> pd.DataFrame:
 
-        with open(filename, 'r') as sql_file:
-            with get_db_engine().engine.connect() as connection:
-                select = text(sql_file.read())
+        with get_db_engine().engine.connect() as connection:
+            select = text(_read_query(filename, kwargs.get('query', None)))
 
-                return pd.read_sql(select, connection)
+            return pd.read_sql(select, connection)
 
     def can_yield(self, configuraton: FileLoaderConfiguration|None = None) -> bool:
         return (configuraton is not None
@@ -36,11 +37,37 @@ class SqlFileLoader(FileLoader):
 
     def yield_file(self, filename: str, **kwargs) -> Iterator[pd.DataFrame]:
         chunk_size = kwargs.get('chunk_size', 10000)
-        with open(filename, 'r') as sql_file:
-            with get_db_engine().engine.connect() as connection:
-                select = text(sql_file.read())
+        with get_db_engine().engine.connect() as connection:
+            select = text(_read_query(filename, kwargs.get('query', None)))
+
+            return pd.read_sql(select, connection, chunksize=chunk_size)
+
+    def estimate_rows(self, configuration: FileLoaderConfiguration, pancham_configuration: PanchamConfiguration | None = None) -> int | None:
+        """
+        Counts the rows returned by the query or each SQL file with `COUNT(*)`, the
+        query is run once more by the database to count them.
+        """
+        if configuration.query is not None:
+            queries = [configuration.query]
+        else:
+            queries = [_read_query(file_path['path'] if type(file_path) is dict else file_path)
+                       for file_path in self.reduce_file_paths(configuration, pancham_configuration)]
+
+        total = 0
+        with get_db_engine().engine.connect() as connection:
+            for query in queries:
+                query = query.strip().rstrip(';')
+                total += connection.execute(text(f"SELECT COUNT(*) FROM ({query}) counted")).scalar()
+
+        return total
+
+
+def _read_query(filename: str, query: str|None = None) -> str:
+    if query is not None:
+        return query
 
-                return pd.read_sql(select, connection, chunksize=chunk_size)
+    with open(filename, 'r') as sql_file:
+        return sql_file.read()
 
 
 class SqlExecuteFileLoader(FileLoader):
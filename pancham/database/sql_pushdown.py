@@ -0,0 +1,478 @@
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Integer, String, and_, cast, column, func, literal_column, select, table, text
+from sqlalchemy.engine import Dialect, make_url
+from sqlalchemy.sql.elements import ColumnElement
+
+from pancham.data_frame_field import DataFrameField
+from pancham.reporter import get_reporter
+
+PUSHDOWN_SOURCE = 'pushdown_source'
+PUSHDOWN_PARSER_NAME = 'SqlPushdown'
+
+SAFE_MAPPING_KEYS = {
+    'name', 'file_type', 'file_path', 'query', 'fields', 'output', 'use_iterator', 'chunk_size', 'chunk_memory',
+    'sql_pushdown', 'depends_on', 'result_cache', 'optimize_dtypes'
+}
+SQL_CASTS = {'str': String, 'int': Integer}
+ORDER_BY_PATTERN = re.compile(r'\border\s+by\b', re.IGNORECASE)
+ORDER_BY_END_PATTERN = re.compile(r'\b(limit|offset|fetch)\b', re.IGNORECASE)
+ORDER_TERM_PATTERN = re.compile(r'^"?(\w+)"?(?:\s+(asc|desc))?$', re.IGNORECASE)
+
+
+@dataclass
+class PushdownPlan:
+    """
+    A mapping rewritten so the database runs its lookups.
+
+    :ivar query: The query that reads the source rows joined to the lookup tables.
+    :type query: str
+    :ivar columns: The column holding the looked up value of each pushed down
+        field, by the position of the field in the mapping.
+    :type columns: dict[int, str]
+    """
+
+    query: str
+    columns: dict[int, str] = field(default_factory=dict)
+
+
+class SqlPushdownOptimizer:
+    """
+    Rewrites mappings that read a SQL query so that their database lookups are
+    joined to the query in the database, rather than each value being searched for
+    once the rows have been loaded.
+
+    The source query becomes a subquery with a LEFT JOIN to each lookup table, and
+    the looked up values are selected as extra columns. The fields then copy those
+    columns, so the rest of the mapping runs as before. When every other field of
+    the mapping only renames a source column, only the renamed columns are selected.
+
+    The following fields are pushed down, other fields are run as usual:
+
+    - `database_match` on a source column, with or without a filter of fixed values.
+      Searches that populate the table, use a SQL file or take their filter from
+      another search are not.
+    - `database_value`.
+    - `database_multi_field_search` with `static` and `field` searches only.
+
+    A lookup is not pushed down when its source column is renamed or written by
+    another field, as the search would then be made on a different value. When the
+    query ends with an ORDER BY it is applied again to the joined rows, which is only
+    done when the query is ordered by columns the fields read. Otherwise the mapping
+    is not pushed down, as the order of the rows would be lost.
+
+    Casts are done by the database with `CAST`. When a table has more than one row
+    for a search value the largest value is used.
+
+    :ivar database_connection: Connection string of the database the mappings are
+        read from, used to write the SQL for it.
+    :type database_connection: str
+    :ivar source_dir: Directory SQL files are read from.
+    :type source_dir: str | None
+    :ivar enabled: Whether mappings are pushed down unless they set `sql_pushdown`.
+    :type enabled: bool
+    """
+
+    def __init__(self, database_connection: str, source_dir: str|None = None, enabled: bool = False):
+        self.database_connection = database_connection
+        self.source_dir = source_dir
+        self.enabled = enabled
+        self.__dialect: Dialect|None = None
+
+    def plan(self, data: dict) -> PushdownPlan|None:
+        """
+        Plans the pushdown of a mapping.
+
+        :param data: The mapping as read from its file, it is not modified.
+        :type data: dict
+        :return: The plan, or None if the mapping is not pushed down or has no field
+            that can be.
+        :rtype: PushdownPlan | None
+        """
+        if data.get('sql_pushdown', self.enabled) is not True or data.get('file_type', None) != 'sql_file':
+            return None
+
+        source_query = self.__read_source_query(data)
+        if source_query is None:
+            return None
+
+        fields = data.get('fields', [])
+        lookups: dict[int, Any] = {}
+        source_columns: set[str] = set()
+
+        for index, field_data in enumerate(fields):
+            lookup = _build_lookup(field_data)
+            if lookup is not None and not _is_shadowed(lookup, index, fields):
+                lookups[index] = lookup
+                source_columns.update(lookup.source_columns)
+
+        if len(lookups) == 0:
+            return None
+
+        ordering = _find_ordering(source_query)
+        read_columns = source_columns | {f['source_name'] for f in fields if 'func' not in f and isinstance(f.get('source_name', None), str)}
+        if ordering is None or any(name not in read_columns for name, _ in ordering):
+            get_reporter().report_debug(lambda: f"The order of {data.get('name', '')} cannot be kept, it is not pushed down")
+            return None
+
+        projected = self.__get_projected_columns(data, lookups)
+        if projected is not None:
+            source_columns.update(projected)
+
+        source_columns.update(name for name, _ in ordering)
+        source = text(source_query).columns(*[column(name) for name in sorted(source_columns)]).subquery(PUSHDOWN_SOURCE)
+
+        if projected is None:
+            selected = [literal_column(f"{PUSHDOWN_SOURCE}.*")]
+        else:
+            selected = [source.c[name] for name in projected]
+
+        joined = source
+        plan = PushdownPlan(query='')
+
+        for position, (index, lookup) in enumerate(lookups.items()):
+            alias = f"pushdown_{position}"
+            value, joined = lookup.join(source, joined, alias)
+            selected.append(value.label(alias))
+            plan.columns[index] = alias
+
+        statement = select(*selected).select_from(joined)
+        for name, descending in ordering:
+            statement = statement.order_by(source.c[name].desc() if descending else source.c[name].asc())
+
+        plan.query = str(statement.compile(dialect=self.__get_dialect(), compile_kwargs={'literal_binds': True}))
+        get_reporter().report_debug(lambda: f"Pushed {len(lookups)} lookups of {data.get('name', '')} down to the database: {plan.query}")
+
+        return plan
+
+    def __read_source_query(self, data: dict) -> str|None:
+        query = data.get('query', None)
+
+        if query is None:
+            file_path = data.get('file_path', None)
+            if not isinstance(file_path, str):
+                return None
+
+            if self.source_dir is not None:
+                file_path = f"{self.source_dir}/{file_path}"
+
+            if not os.path.isfile(file_path):
+                return None
+
+            with open(file_path, 'r') as sql_file:
+                query = sql_file.read()
+
+        query = query.strip().rstrip(';')
+
+        # Escaped colons would become parameters once the query is parsed again
+        if '\\:' in query:
+            return None
+
+        return query
+
+    def __get_projected_columns(self, data: dict, lookups: dict[int, Any]) -> list[str]|None:
+        if any(key not in SAFE_MAPPING_KEYS for key in data):
+            return None
+
+        projected = []
+        for index, field_data in enumerate(data.get('fields', [])):
+            if index in lookups:
+                continue
+
+            source_name = field_data.get('source_name', None)
+            if 'func' in field_data or not isinstance(source_name, str):
+                return None
+
+            if source_name not in projected:
+                projected.append(source_name)
+
+        return projected
+
+    def __get_dialect(self) -> Dialect:
+        if self.__dialect is None:
+            # Named parameters stop percent signs being escaped twice once the query is executed
+            self.__dialect = make_url(self.database_connection).get_dialect()(paramstyle='named')
+
+        return self.__dialect
+
+
+def build_pushdown_field(field_data: dict, column_name: str) -> DataFrameField:
+    """
+    Builds the field that copies a looked up value from the column added by the
+    pushdown, in place of the field that searches the database.
+
+    :param field_data: The field as configured in the mapping.
+    :type field_data: dict
+    :param column_name: The column holding the looked up value.
+    :type column_name: str
+    :return: The field.
+    :rtype: DataFrameField
+    """
+    data_frame_field = DataFrameField(
+        name=field_data['name'],
+        source_name=None,
+        field_type=field_data['field_type'],
+        nullable=field_data.get('nullable', False) is True,
+        cast_type=field_data.get('cast', False) is True,
+        vector_func=lambda df: df[column_name]
+    )
+    data_frame_field.parser_name = PUSHDOWN_PARSER_NAME
+
+    return data_frame_field
+
+
+@dataclass
+class _MatchLookup:
+    table_name: str
+    search_column: str
+    value_column: str
+    source_name: str
+    search_cast: str|None
+    value_cast: str|None
+    filter: dict[str, Any]|None
+
+    @property
+    def source_columns(self) -> list[str]:
+        return [self.source_name]
+
+    def join(self, source, joined, alias: str):
+        lookup_table = table(self.table_name, column(self.search_column), column(self.value_column), *[column(k) for k in (self.filter or {})])
+        search = _cast(lookup_table.c[self.search_column], self.search_cast)
+
+        query = (select(search.label('search'), func.max(lookup_table.c[self.value_column]).label('value'))
+                 .where(lookup_table.c[self.search_column].is_not(None)))
+
+        # Filtered searches keep rows without a value, as the filtered cache does
+        if self.filter is None:
+            query = query.where(lookup_table.c[self.value_column].is_not(None))
+        else:
+            for k, v in self.filter.items():
+                query = query.where(lookup_table.c[k] == v)
+
+        lookup = query.group_by(search).subquery(alias)
+        joined = joined.outerjoin(lookup, _cast(source.c[self.source_name], self.search_cast) == lookup.c.search)
+
+        return _cast(lookup.c.value, self.value_cast), joined
+
+
+@dataclass
+class _ValueLookup:
+    table_name: str
+    search_column: str
+    value_column: str
+    value: Any
+    value_cast: str|None
+
+    @property
+    def source_columns(self) -> list[str]:
+        return []
+
+    def join(self, source, joined, alias: str):
+        lookup_table = table(self.table_name, column(self.search_column), column(self.value_column))
+
+        value = (select(func.max(lookup_table.c[self.value_column]))
+                 .where(lookup_table.c[self.search_column] == self.value)
+                 .where(lookup_table.c[self.value_column].is_not(None))
+                 .scalar_subquery())
+
+        return _cast(value, self.value_cast), joined
+
+
+@dataclass
+class _MultiFieldLookup:
+    table_name: str
+    value_column: str
+    static: dict[str, Any]
+    fields: dict[str, str]
+
+    @property
+    def source_columns(self) -> list[str]:
+        return list(self.fields.values())
+
+    def join(self, source, joined, alias: str):
+        columns = [self.value_column, *self.static, *self.fields]
+        lookup_table = table(self.table_name, *[column(name) for name in dict.fromkeys(columns)])
+
+        search_columns = [lookup_table.c[name] for name in self.fields]
+        query = select(*search_columns, func.max(lookup_table.c[self.value_column]).label(alias))
+
+        for k, v in self.static.items():
+            query = query.where(lookup_table.c[k] == v)
+
+        lookup = query.group_by(*search_columns).subquery(alias)
+
+        # Missing values match missing values, as they do when searching from Python
+        condition = and_(*[source.c[source_name].is_not_distinct_from(lookup.c[search_column]) for search_column, source_name in self.fields.items()])
+
+        return lookup.c[alias], joined.outerjoin(lookup, condition)
+
+
+def _build_lookup(field_data: dict):
+    functions = field_data.get('func', None)
+    if not isinstance(functions, dict) or len(functions) != 1:
+        return None
+
+    function_id, properties = next(iter(functions.items()))
+    if not isinstance(properties, dict):
+        return None
+
+    if function_id == 'database_match':
+        return _build_match_lookup(properties)
+
+    if function_id == 'database_value':
+        return _build_value_lookup(properties)
+
+    if function_id == 'database_multi_field_search':
+        return _build_multi_field_lookup(properties)
+
+    return None
+
+
+def _build_match_lookup(properties: dict) -> _MatchLookup|None:
+    required = ['table_name', 'search_column', 'value_column', 'source_name']
+    if any(not isinstance(properties.get(key, None), str) for key in required):
+        return None
+
+    if 'static' in properties or properties.get('populate', False) or properties.get('sql_file', None) is not None:
+        return None
+
+    search_cast = properties.get('search_cast', None)
+    value_cast = properties.get('value_cast', None)
+    if not _is_supported_cast(search_cast) or not _is_supported_cast(value_cast):
+        return None
+
+    filter_value = properties.get('filter', None)
+    if filter_value is not None and (not isinstance(filter_value, dict) or len(filter_value) == 0 or not all(_is_literal(v) for v in filter_value.values())):
+        return None
+
+    return _MatchLookup(
+        table_name=properties['table_name'],
+        search_column=properties['search_column'],
+        value_column=properties['value_column'],
+        source_name=properties['source_name'],
+        search_cast=search_cast,
+        value_cast=value_cast,
+        filter=filter_value
+    )
+
+
+def _build_value_lookup(properties: dict) -> _ValueLookup|None:
+    required = ['table_name', 'search_column', 'value_column']
+    if any(not isinstance(properties.get(key, None), str) for key in required):
+        return None
+
+    value_cast = properties.get('value_cast', None)
+    if not _is_literal(properties.get('value', None)) or not _is_supported_cast(value_cast):
+        return None
+
+    return _ValueLookup(
+        table_name=properties['table_name'],
+        search_column=properties['search_column'],
+        value_column=properties['value_column'],
+        value=properties['value'],
+        value_cast=value_cast
+    )
+
+
+def _build_multi_field_lookup(properties: dict) -> _MultiFieldLookup|None:
+    if not isinstance(properties.get('table_name', None), str) or not isinstance(properties.get('value_column', None), str):
+        return None
+
+    search_options = properties.get('search', None)
+    if not isinstance(search_options, list) or len(search_options) == 0:
+        return None
+
+    static = {}
+    fields = {}
+    for search_option in search_options:
+        search_column = search_option.get('search_column', None)
+        if not isinstance(search_column, str) or search_column in static or search_column in fields:
+            return None
+
+        if search_option.get('type', None) == 'static' and _is_literal(search_option.get('value', None)):
+            static[search_column] = search_option['value']
+        elif search_option.get('type', None) == 'field' and isinstance(search_option.get('source_name', None), str):
+            fields[search_column] = search_option['source_name']
+        else:
+            return None
+
+    if len(fields) == 0:
+        return None
+
+    return _MultiFieldLookup(
+        table_name=properties['table_name'],
+        value_column=properties['value_column'],
+        static=static,
+        fields=fields
+    )
+
+
+def _is_shadowed(lookup, index: int, fields: list[dict]) -> bool:
+    # Renames run before any field and the other fields may overwrite a column, so the
+    # search would no longer be made on the value read from the query
+    for other_index, field_data in enumerate(fields):
+        name = field_data.get('name', None)
+        source_name = field_data.get('source_name', None)
+
+        if 'func' not in field_data and isinstance(source_name, str):
+            if source_name != name and source_name in lookup.source_columns:
+                return True
+            if source_name == name:
+                continue
+
+        if other_index != index and name in lookup.source_columns:
+            return True
+
+    return False
+
+
+def _find_ordering(query: str) -> list[tuple[str, bool]]|None:
+    # Text in quotes and brackets is blanked out, so only the ORDER BY of the query is found
+    masked = re.sub(r"'[^']*'|\"[^\"]*\"", lambda m: ' ' * len(m.group(0)), query)
+    while True:
+        unbracketed = re.sub(r'\([^()]*\)', lambda m: ' ' * len(m.group(0)), masked)
+        if unbracketed == masked:
+            break
+        masked = unbracketed
+
+    matches = list(ORDER_BY_PATTERN.finditer(masked))
+    if len(matches) == 0:
+        return []
+
+    start = matches[-1].end()
+    end = ORDER_BY_END_PATTERN.search(masked, start)
+    end = len(query) if end is None else end.start()
+
+    ordering = []
+    position = start
+    for term in masked[start:end].split(','):
+        term_match = ORDER_TERM_PATTERN.match(query[position:position + len(term)].strip())
+        position += len(term) + 1
+        if term_match is None:
+            return None
+
+        ordering.append((term_match.group(1), (term_match.group(2) or '').lower() == 'desc'))
+
+    return ordering
+
+
+def _cast(value: ColumnElement, cast_to: str|None) -> ColumnElement:
+    if cast_to is None:
+        return value
+
+    return cast(value, SQL_CASTS[cast_to])
+
+
+def _is_supported_cast(cast_to: str|None) -> bool:
+    return cast_to is None or cast_to in SQL_CASTS
+
+
+def _is_literal(value: Any) -> bool:
+    # Colons in text would be read as parameters once the query is parsed again
+    if isinstance(value, str):
+        return ':' not in value
+
+    return isinstance(value, (int, float, bool))
@@ -0,0 +1,567 @@
+import math
+import os
+import pickle
+import sqlite3
+import tempfile
+from typing import Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .data_frame_configuration import DataFrameConfiguration
+from .data_frame_field import DataFrameField
+from .reporter import get_reporter
+from .tool.frame_tools import hash_rows
+
+DEFAULT_DEDUPLICATION_MEMORY_LIMIT = 256 * 1024 * 1024
+
+# Spilled candidates are split by key hash so each part can be reduced on its own
+SPILL_PARTITIONS = 16
+
+HASH_COLUMN = '__pancham_hash'
+ROW_COLUMN = '__pancham_row'
+
+
+class KeyStore:
+    """
+    Set of the 64 bit hashes of the keys seen so far in a run. Hashes are kept in a
+    sorted array until it reaches the memory limit, then moved to a SQLite database
+    in a temporary directory that is removed by `close`.
+
+    Keys are compared by hash, two different keys only collide with a probability
+    of about n² / 2⁶⁵ for n distinct keys.
+
+    :ivar memory_limit: Number of bytes of hashes kept in memory.
+    :type memory_limit: int
+    :ivar spill_dir: Directory the database is created in, None for the system
+        temporary directory.
+    :type spill_dir: str | None
+    """
+
+    def __init__(self, memory_limit: int, spill_dir: str|None = None):
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+
+        self.__memory = np.empty(0, dtype=np.uint64)
+        self.__directory: tempfile.TemporaryDirectory|None = None
+        self.__connection: sqlite3.Connection|None = None
+
+    @property
+    def spilled(self) -> bool:
+        """
+        :return: True once hashes have been moved to disk.
+        :rtype: bool
+        """
+        return self.__connection is not None
+
+    def add(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Adds hashes to the set.
+
+        :param hashes: The hashes of the keys of a chunk.
+        :type hashes: np.ndarray
+        :return: A mask that is True for the first occurrence of each hash that was
+            not already in the set.
+        :rtype: np.ndarray
+        """
+        hashes = np.ascontiguousarray(hashes, dtype=np.uint64)
+
+        first = np.zeros(len(hashes), dtype=bool)
+        first[np.unique(hashes, return_index=True)[1]] = True
+
+        new = first & ~self.__contains(hashes)
+        self.__insert(hashes[new])
+
+        return new
+
+    def close(self):
+        """
+        Removes the hashes moved to disk.
+        """
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+        if self.__directory is not None:
+            self.__directory.cleanup()
+            self.__directory = None
+
+        self.__memory = np.empty(0, dtype=np.uint64)
+
+    def __contains(self, hashes: np.ndarray) -> np.ndarray:
+        positions = np.searchsorted(self.__memory, hashes)
+        found = positions < len(self.__memory)
+        found[found] = self.__memory[positions[found]] == hashes[found]
+
+        if self.__connection is not None and len(hashes) > 0:
+            found |= np.isin(hashes, self.__find_spilled(hashes))
+
+        return found
+
+    def __insert(self, hashes: np.ndarray):
+        if len(hashes) == 0:
+            return
+
+        self.__memory = np.union1d(self.__memory, hashes)
+
+        if self.__memory.nbytes > self.memory_limit:
+            self.__spill()
+
+    def __spill(self):
+        connection = self.__connect()
+        # SQLite integers are signed, the hashes are stored with the same bits
+        connection.executemany("INSERT OR IGNORE INTO seen (hash) VALUES (?)", ((int(h),) for h in self.__memory.view(np.int64)))
+        connection.commit()
+
+        self.__memory = np.empty(0, dtype=np.uint64)
+
+    def __find_spilled(self, hashes: np.ndarray) -> np.ndarray:
+        connection = self.__connection
+        connection.execute("DELETE FROM probe")
+        connection.executemany("INSERT INTO probe (hash) VALUES (?)", ((int(h),) for h in hashes.view(np.int64)))
+        found = [row[0] for row in connection.execute("SELECT probe.hash FROM probe JOIN seen ON seen.hash = probe.hash")]
+
+        return np.array(found, dtype=np.int64).view(np.uint64)
+
+    def __connect(self) -> sqlite3.Connection:
+        if self.__connection is None:
+            if self.spill_dir is not None:
+                os.makedirs(self.spill_dir, exist_ok=True)
+
+            self.__directory = tempfile.TemporaryDirectory(prefix='pancham-dedup-', dir=self.spill_dir)
+            # Stages of a pipelined run use the store one after another from another thread
+            self.__connection = sqlite3.connect(os.path.join(self.__directory.name, 'keys.db'), check_same_thread=False)
+            self.__connection.execute("PRAGMA journal_mode = OFF")
+            self.__connection.execute("PRAGMA synchronous = OFF")
+            self.__connection.execute("CREATE TABLE seen (hash INTEGER PRIMARY KEY)")
+            self.__connection.execute("CREATE TEMP TABLE probe (hash INTEGER)")
+
+        return self.__connection
+
+
+class BestRowStore:
+    """
+    Finds the best row for each key across every chunk of a run. Candidates have a
+    key hash column, a row number column and the columns they are sorted by.
+
+    Candidates are reduced to the best row per key in memory. Once they reach the
+    memory limit they are written to partitions on disk by key hash, and each
+    partition is sorted and reduced separately by `winners`.
+
+    :ivar sort_columns: Columns the candidates are sorted by, best first.
+    :type sort_columns: list[str]
+    :ivar ascending: Sort direction of each sort column.
+    :type ascending: list[bool]
+    :ivar memory_limit: Number of bytes of candidates kept in memory.
+    :type memory_limit: int
+    :ivar spill_dir: Directory the partitions are created in, None for the system
+        temporary directory.
+    :type spill_dir: str | None
+    """
+
+    def __init__(self, sort_columns: list[str], ascending: list[bool], memory_limit: int, spill_dir: str|None = None):
+        self.sort_columns = sort_columns
+        self.ascending = ascending
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+
+        self.__best: pd.DataFrame|None = None
+        self.__directory: tempfile.TemporaryDirectory|None = None
+
+    @property
+    def spilled(self) -> bool:
+        """
+        :return: True once candidates have been written to disk.
+        :rtype: bool
+        """
+        return self.__directory is not None
+
+    def add(self, candidates: pd.DataFrame):
+        """
+        Adds the candidates from a chunk.
+
+        :param candidates: Frame with the hash, row number and sort columns.
+        :type candidates: pd.DataFrame
+        """
+        candidates = self.__reduce(candidates)
+
+        if self.__directory is not None:
+            self.__spill(candidates)
+            return
+
+        if self.__best is None:
+            self.__best = candidates
+        else:
+            self.__best = self.__reduce(pd.concat([self.__best, candidates], ignore_index=True))
+
+        if self.__best.memory_usage(deep=True).sum() > self.memory_limit:
+            if self.spill_dir is not None:
+                os.makedirs(self.spill_dir, exist_ok=True)
+
+            self.__directory = tempfile.TemporaryDirectory(prefix='pancham-dedup-', dir=self.spill_dir)
+            self.__spill(self.__best)
+            self.__best = None
+
+    def winners(self) -> np.ndarray:
+        """
+        :return: The sorted row numbers of the best row of each key.
+        :rtype: np.ndarray
+        """
+        if self.__directory is None:
+            if self.__best is None:
+                return np.empty(0, dtype=np.int64)
+
+            return np.sort(self.__best[ROW_COLUMN].to_numpy(dtype=np.int64))
+
+        rows = [np.empty(0, dtype=np.int64)]
+        for partition in range(SPILL_PARTITIONS):
+            frames = list(self.__read_partition(partition))
+            if len(frames) > 0:
+                rows.append(self.__reduce(pd.concat(frames, ignore_index=True))[ROW_COLUMN].to_numpy(dtype=np.int64))
+
+        return np.sort(np.concatenate(rows))
+
+    def close(self):
+        """
+        Removes the candidates written to disk.
+        """
+        if self.__directory is not None:
+            self.__directory.cleanup()
+            self.__directory = None
+
+        self.__best = None
+
+    def __reduce(self, candidates: pd.DataFrame) -> pd.DataFrame:
+        # The row number breaks ties, so the first of equal rows is kept
+        ordered = candidates.sort_values(
+            by=self.sort_columns + [ROW_COLUMN],
+            ascending=self.ascending + [True],
+            na_position='last'
+        )
+
+        return ordered.drop_duplicates(subset=[HASH_COLUMN], keep='first')
+
+    def __spill(self, candidates: pd.DataFrame):
+        partitions = candidates[HASH_COLUMN].to_numpy() % np.uint64(SPILL_PARTITIONS)
+
+        for partition in np.unique(partitions):
+            with open(self.__get_path(int(partition)), 'ab') as partition_file:
+                pickle.dump(candidates[partitions == partition], partition_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def __read_partition(self, partition: int) -> Iterator[pd.DataFrame]:
+        path = self.__get_path(partition)
+
+        if not os.path.exists(path):
+            return
+
+        with open(path, 'rb') as partition_file:
+            while True:
+                try:
+                    yield pickle.load(partition_file)
+                except EOFError:
+                    return
+
+    def __get_path(self, partition: int) -> str:
+        return os.path.join(self.__directory.name, f"{partition}.pickle")
+
+
+class DeduplicateFunction:
+    """
+    Removes rows with duplicate keys, keeping the first row of each key or, when
+    `sort_by` is set, the best row by the sort order.
+
+    On its own each frame it is called with is deduplicated separately. During an
+    iterated run `GlobalDeduplication` extends this to every chunk of the run: keys
+    are tracked in a `KeyStore` so only their first row is kept, or the best rows are
+    found by `collect` in an earlier pass and then selected by their row number.
+
+    :ivar key_columns: The columns that identify a row.
+    :type key_columns: list[str]
+    :ivar sort_by: The columns the rows of a key are sorted by.
+    :type sort_by: list[str]
+    :ivar ascending: The sort direction, either for all columns or one per column
+        including the key.
+    :type ascending: bool | list[bool]
+    """
+
+    def __init__(self, key: str|list[str], sort_by: str|list[str]|None = None, ascending: bool|list[bool] = True):
+        self.key_columns = key if isinstance(key, list) else [key]
+        self.sort_by = [] if sort_by is None else sort_by if isinstance(sort_by, list) else [sort_by]
+        self.ascending = ascending
+
+        self.__keys: KeyStore|None = None
+        self.__winners: np.ndarray|None = None
+        self.__rows = 0
+
+    @property
+    def keeps_best(self) -> bool:
+        """
+        :return: True if the best row of each key is kept rather than the first.
+        :rtype: bool
+        """
+        return len(self.sort_by) > 0
+
+    def __call__(self, data: pd.DataFrame) -> pd.DataFrame:
+        if self.__winners is not None:
+            data = _compute(data)
+            return data[np.isin(self.__next_rows(len(data)), self.__winners, assume_unique=True)]
+
+        if self.__keys is not None:
+            data = _compute(data)
+
+        output = self.deduplicate(data)
+
+        if self.__keys is not None:
+            output = output[self.__keys.add(_hash_keys(output, self.key_columns))]
+
+        return output
+
+    def deduplicate(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Removes the duplicate keys within a single frame.
+
+        :param data: The frame to deduplicate.
+        :type data: pd.DataFrame
+        :return: The first or best row of each key.
+        :rtype: pd.DataFrame
+        """
+        if self.keeps_best:
+            data = data.sort_values(by=self.key_columns + self.sort_by, ascending=self.ascending)
+
+        output = data.drop_duplicates(subset=self.key_columns, keep='first')
+        get_reporter().report_debug(lambda: f'Deduplicate outcome {output}')
+
+        return output
+
+    def track(self, keys: KeyStore|None):
+        """
+        Keeps the first row of each key across every frame until the store is removed.
+
+        :param keys: The keys seen so far, or None to deduplicate each frame separately.
+        :type keys: KeyStore | None
+        """
+        self.__keys = keys
+        self.__rows = 0
+
+    def collect(self, data: pd.DataFrame, store: BestRowStore):
+        """
+        Adds the best row of each key in a frame to the candidates of the run. Rows
+        are numbered in the order they are passed, so a later pass over the same
+        frames can select the winners.
+
+        :param data: A frame this function would be called with.
+        :type data: pd.DataFrame
+        :param store: The candidates of the run.
+        :type store: BestRowStore
+        """
+        data = _compute(data)
+
+        candidates = pd.DataFrame({
+            HASH_COLUMN: _hash_keys(data, self.key_columns),
+            ROW_COLUMN: self.__next_rows(len(data))
+        })
+        for column, sort_column in zip(self.sort_by, self.sort_columns):
+            candidates[sort_column] = data[column].to_numpy()
+
+        store.add(candidates)
+
+    def select(self, winners: np.ndarray|None):
+        """
+        Only keeps the rows found by `collect`, counting rows from the start again.
+
+        :param winners: The sorted row numbers to keep, or None to stop selecting.
+        :type winners: np.ndarray | None
+        """
+        self.__winners = winners
+        self.__rows = 0
+
+    def rewind(self):
+        """
+        Counts rows from the start again for another pass over the same frames.
+        """
+        self.__rows = 0
+
+    def reset(self):
+        """
+        Returns to deduplicating each frame separately.
+        """
+        self.__keys = None
+        self.__winners = None
+        self.__rows = 0
+
+    @property
+    def sort_columns(self) -> list[str]:
+        """
+        :return: The names of the sort columns in the candidates.
+        :rtype: list[str]
+        """
+        return [f"__pancham_sort_{i}" for i in range(len(self.sort_by))]
+
+    @property
+    def sort_ascending(self) -> list[bool]:
+        """
+        :return: The direction of each sort column, without the key.
+        :rtype: list[bool]
+        """
+        if isinstance(self.ascending, list):
+            return list(self.ascending[-len(self.sort_by):])
+
+        return [self.ascending] * len(self.sort_by)
+
+    def __next_rows(self, count: int) -> np.ndarray:
+        rows = np.arange(self.__rows, self.__rows + count, dtype=np.int64)
+        self.__rows += count
+
+        return rows
+
+
+class GlobalDeduplication:
+    """
+    Deduplicates an iterated run across all of its chunks instead of within each
+    chunk, for both the `drop_duplicates` setting and `deduplicate` fields.
+
+    Keeping the first row of a key is done as the chunks stream through. Keeping the
+    best row needs every chunk to be seen first, so for each such field the runner
+    makes an extra pass over the source with `collect`, which only applies the
+    fields before it.
+
+    Used as a context manager around the run, the functions are returned to
+    deduplicating each chunk separately on exit.
+
+    :ivar configuration: The configuration being run.
+    :type configuration: DataFrameConfiguration
+    :ivar memory_limit: Number of bytes each store keeps in memory before it spills.
+    :type memory_limit: int
+    :ivar spill_dir: Directory the stores spill to, None for the system temporary
+        directory.
+    :type spill_dir: str | None
+    """
+
+    def __init__(self, configuration: DataFrameConfiguration, memory_limit: int, spill_dir: str|None = None):
+        self.configuration = configuration
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+
+        self.source_function = None
+        if configuration.drop_duplicates is not None:
+            self.source_function = DeduplicateFunction(configuration.drop_duplicates)
+
+        self.fields = [f for f in configuration.dynamic_fields if isinstance(f.df_func, DeduplicateFunction)]
+        self.__key_stores: list[KeyStore] = []
+
+    @property
+    def keep_best_fields(self) -> list[DataFrameField]:
+        """
+        :return: The fields that keep the best row of each key, in the order they are
+            applied.
+        :rtype: list[DataFrameField]
+        """
+        return [f for f in self.fields if f.df_func.keeps_best]
+
+    def __enter__(self):
+        self.configuration.source_deduplicator = self.source_function
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.configuration.source_deduplicator = None
+
+        for field in self.fields:
+            field.df_func.reset()
+
+        self.__close_key_stores()
+
+    def start_pass(self):
+        """
+        Prepares for a pass over the source, forgetting the keys seen by the last.
+        """
+        self.__close_key_stores()
+
+        first_functions = [f.df_func for f in self.fields if not f.df_func.keeps_best]
+        if self.source_function is not None:
+            first_functions.append(self.source_function)
+
+        for function in first_functions:
+            keys = KeyStore(self.memory_limit, self.spill_dir)
+            self.__key_stores.append(keys)
+            function.track(keys)
+
+        for field in self.keep_best_fields:
+            field.df_func.rewind()
+
+    def collect(self, field: DataFrameField, chunks: Iterator[pd.DataFrame], prepare: Callable[[pd.DataFrame], pd.DataFrame]):
+        """
+        Finds the best row of each key for a field, which then only keeps those rows.
+
+        :param field: A field that keeps the best row of each key.
+        :type field: DataFrameField
+        :param chunks: The chunks of the source.
+        :type chunks: Iterator[pd.DataFrame]
+        :param prepare: Applies the configuration to a chunk up to the field.
+        :type prepare: Callable[[pd.DataFrame], pd.DataFrame]
+        """
+        function = field.df_func
+        store = BestRowStore(function.sort_columns, function.sort_ascending, self.memory_limit, self.spill_dir)
+
+        try:
+            for chunk in chunks:
+                function.collect(prepare(chunk), store)
+
+            function.select(store.winners())
+        finally:
+            store.close()
+
+    def __close_key_stores(self):
+        for keys in self.__key_stores:
+            keys.close()
+
+        self.__key_stores = []
+
+
+def deduplicates_across_chunks(configuration: DataFrameConfiguration) -> bool:
+    """
+    :param configuration: The configuration being run.
+    :type configuration: DataFrameConfiguration
+    :return: True if the run of the configuration is deduplicated across chunks.
+    :rtype: bool
+    """
+    if not configuration.use_iterator:
+        return False
+
+    return configuration.drop_duplicates is not None or any(isinstance(f.df_func, DeduplicateFunction) for f in configuration.dynamic_fields)
+
+
+def _hash_keys(data: pd.DataFrame, key_columns: list[str]) -> np.ndarray:
+    """
+    Hashes the keys of each row as text. The dtype of a column is inferred for each
+    chunk, so an integer key is read as float once a chunk has a missing value or as
+    text once it has a string, and the same key must hash the same in every chunk.
+    """
+    keys = pd.DataFrame(index=data.index)
+
+    for column in key_columns:
+        values = data[column]
+
+        if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'iub':
+            keys[column] = values.astype(str).astype(object)
+        else:
+            keys[column] = values.astype(object).map(_canonical_key)
+
+    return hash_rows(keys)
+
+
+def _canonical_key(value):
+    if value is None or value is pd.NA or value is pd.NaT or (isinstance(value, float) and math.isnan(value)):
+        return None
+
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+
+    return str(value)
+
+
+def _compute(data: pd.DataFrame) -> pd.DataFrame:
+    # Split frames are brought together as rows must be numbered and tracked in order
+    if isinstance(data, pd.DataFrame):
+        return data
+
+    return data.compute()
@@ -1,14 +1,182 @@
+import csv
 import json
-from typing import Iterator
+import os
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterator, TYPE_CHECKING
 
 import pandas as pd
-import yaml
 from jsonstraw import read_json_chunk
+from pandas.io.parsers import TextParser
 
-from .file_loader_configuration import FileLoaderConfiguration
+from .file_loader_configuration import FileLoaderConfiguration, DEFAULT_CHUNK_SIZE
 from .reporter import get_reporter
 from .pancham_configuration import PanchamConfiguration
 from .data_frame_configuration import DataFrameConfiguration
+from .tool.frame_tools import detach
+from .tool.yaml_tools import safe_load, yield_key_items
+
+# openpyxl and the pyarrow JSON reader are imported by the loaders that use them,
+# so runs that read neither do not pay for the imports
+if TYPE_CHECKING:
+    import pyarrow as pa
+    import pyarrow.json as pa_json
+
+
+# Bounds on the rows in a chunk when its size follows a memory target
+MIN_CHUNK_ROWS = 1000
+MAX_CHUNK_ROWS = 1000000
+
+# Bytes read from the start of a text file to estimate its number of lines
+ESTIMATE_SAMPLE_BYTES = 1024 * 1024
+
+# Set by loaders whose chunks can hold fewer rows than were read from the file
+SOURCE_ROWS_ATTR = 'pancham_source_rows'
+
+
+@dataclass(frozen=True)
+class ChunkPosition:
+    """
+    The position reached in the files of a configuration after reading a chunk.
+
+    :ivar file_index: Index of the file being read in the configuration's file paths.
+    :type file_index: int
+    :ivar rows: Number of rows read from that file.
+    :type rows: int
+    """
+
+    file_index: int
+    rows: int
+
+
+class ChunkSizer:
+    """
+    Adjusts the number of rows in each chunk of an iterated read to a memory target.
+
+    The first chunk of each file is read with `min_rows` rows and its memory measured,
+    later chunks of the file hold as many rows of that size as fit in the target,
+    limited to `max_rows`. Loaders that support it read `rows` before each chunk.
+
+    :ivar memory: The target memory of each chunk in bytes.
+    :type memory: int
+    :ivar min_rows: The fewest rows in a chunk, also used for the first chunk.
+    :type min_rows: int
+    :ivar max_rows: The most rows in a chunk.
+    :type max_rows: int
+    :ivar rows: The number of rows to read for the next chunk.
+    :type rows: int
+    """
+
+    def __init__(self, memory: int, min_rows: int = MIN_CHUNK_ROWS, max_rows: int = MAX_CHUNK_ROWS):
+        self.memory = memory
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.rows = min_rows
+        self.bytes_per_row: float | None = None
+
+    def start_file(self):
+        """
+        Measures the rows again, as another file can have wider or narrower rows.
+        """
+        self.rows = self.min_rows
+        self.bytes_per_row = None
+
+    def observe(self, chunk: pd.DataFrame):
+        """
+        Sets the size of the following chunks from the first chunk read from a file.
+
+        :param chunk: A chunk that has been read.
+        :type chunk: pd.DataFrame
+        """
+        if self.bytes_per_row is not None or len(chunk) == 0:
+            return
+
+        self.bytes_per_row = chunk.memory_usage(deep=True).sum() / len(chunk)
+        self.rows = max(self.min_rows, min(self.max_rows, int(self.memory / self.bytes_per_row)))
+
+        get_reporter().report_debug(lambda: f"Chunks of {self.bytes_per_row:.0f} bytes per row, reading {self.rows} rows")
+
+
+def _chunk_rows(chunk_size: int, chunk_sizer: ChunkSizer | None) -> int:
+    return chunk_size if chunk_sizer is None else chunk_sizer.rows
+
+
+def _estimate_file_lines(
+        loader: 'FileLoader',
+        configuration: FileLoaderConfiguration,
+        pancham_configuration: PanchamConfiguration | None,
+        header_lines: int
+) -> int | None:
+    """
+    Estimates the rows in the text files of a configuration from their size and the
+    length of the lines at the start of each file. Files smaller than the sample are
+    counted exactly.
+    """
+    if configuration.query is not None:
+        return None
+
+    total = 0
+    for file_path in loader.reduce_file_paths(configuration, pancham_configuration):
+        path = file_path['path'] if type(file_path) is dict else file_path
+
+        if not os.path.isfile(path):
+            return None
+
+        size = os.path.getsize(path)
+        with open(path, 'rb') as text_file:
+            sample = text_file.read(ESTIMATE_SAMPLE_BYTES)
+
+        lines = sample.count(b'\n')
+        if size > len(sample):
+            lines = int(lines * size / len(sample))
+        elif len(sample) > 0 and not sample.endswith(b'\n'):
+            lines += 1
+
+        total += max(lines - header_lines, 0)
+
+    return total
+
+
+def _skip_rows(chunks: Iterator[pd.DataFrame], rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Drops the first rows from a stream of chunks, for loaders that cannot seek.
+    """
+    for chunk in chunks:
+        if rows >= len(chunk):
+            rows -= len(chunk)
+            continue
+
+        yield chunk.iloc[rows:] if rows > 0 else chunk
+        rows = 0
+
+
+def _read_csv_chunks(reader, chunk_sizer: ChunkSizer|None) -> Iterator[pd.DataFrame]:
+    if chunk_sizer is None:
+        yield from reader
+        return
+
+    while True:
+        try:
+            yield reader.get_chunk(chunk_sizer.rows)
+        except StopIteration:
+            return
+
+
+def _skip_csv_records(csv_file, records: int):
+    """
+    Moves an open CSV file past its header and a number of data rows. Blank lines are
+    not counted, as pandas drops them, and quoted values may span several lines.
+    """
+    reader = csv.reader(iter(csv_file.readline, ''))
+    next(reader, None)
+
+    while records > 0:
+        row = next(reader, None)
+        if row is None:
+            return
+
+        if len(row) > 0:
+            records -= 1
 
 
 class FileLoader:
@@ -35,18 +203,66 @@ class FileLoader:
         :return: A pandas DataFrame containing the data from the file.
         :rtype: pd.DataFrame
         """
+        for _, frame in self.read_chunks_from_configuration(configuration, pancham_configuration):
+            yield frame
+
+    def read_chunks_from_configuration(
+            self,
+            configuration: FileLoaderConfiguration,
+            pancham_configuration: PanchamConfiguration | None = None,
+            start: ChunkPosition | None = None
+    ) -> Iterator[tuple[ChunkPosition, pd.DataFrame]]:
+        """
+        Reads the configuration in the same way as `read_file_from_configuration`,
+        yielding the position reached after each chunk along with the chunk.
+
+        When a start position is given the files before it are not read at all. Rows
+        already read from the file at the position are skipped by the loader if it
+        can seek, otherwise the file is read from the start and the rows dropped.
+        Only configurations read with an iterator can be started part way through, for
+        others a start position means the single chunk has already been read. A query
+        set on the configuration is read in the same way as a single file.
+
+        When the configuration has a chunk memory target, a `ChunkSizer` is passed to
+        `yield_file` and the first chunk of each file is measured to size the rest.
+        Loaders that do not use it read `chunk_size` rows at a time.
+
+        :param configuration: Configuration object containing the details needed
+            to locate and process the file.
+        :type configuration: FileLoaderConfiguration
+        :param pancham_configuration: The configuration for the run.
+        :type pancham_configuration: PanchamConfiguration | None
+        :param start: The position to start reading from, None to read everything.
+        :type start: ChunkPosition | None
+        :return: The position after each chunk and the chunk.
+        :rtype: Iterator[tuple[ChunkPosition, pd.DataFrame]]
+        """
         reporter = get_reporter()
         data = []
         will_use_iterator = configuration.use_iterator is True and self.can_yield(configuration)
 
+        if not will_use_iterator and start is not None:
+            return
+
         if configuration.query is not None:
             """
             If a query is coded into the mapping then load it directly 
             """
-            yield self.read_file(configuration.query, query=configuration.query)
+            if will_use_iterator:
+                skip_rows = start.rows if start is not None else 0
+                yield from self.__yield_positions(configuration, 0, configuration.query, skip_rows, query=configuration.query, chunk_size=configuration.chunk_size)
+                return
+
+            frame = self.read_file(configuration.query, query=configuration.query)
+            yield ChunkPosition(1, 0), frame
             return
 
-        for file_path in self.reduce_file_paths(configuration, pancham_configuration):
+        file_paths = list(self.reduce_file_paths(configuration, pancham_configuration))
+
+        chunk_memory = configuration.get_chunk_memory() if will_use_iterator else None
+        chunk_sizer = ChunkSizer(chunk_memory) if chunk_memory is not None else None
+
+        for file_index, file_path in enumerate(file_paths):
             sheet = configuration.sheet
             key = configuration.key
             path = file_path
@@ -56,18 +272,44 @@ class FileLoader:
                 sheet = file_path.get('sheet', None)
                 key = file_path.get('key', None)
 
-            reporter.report_start(path)
-
             if will_use_iterator:
-                yield from self.yield_file(path, sheet = sheet, key = key, chunk_size = configuration.chunk_size)
+                if start is not None and file_index < start.file_index:
+                    continue
+
+                skip_rows = start.rows if start is not None and file_index == start.file_index else 0
+
+                reporter.report_start(path)
+                read_options = {'sheet': sheet, 'key': key, 'chunk_size': configuration.chunk_size, **_schema_options(configuration)}
+                if chunk_sizer is not None:
+                    chunk_sizer.start_file()
+                    read_options['chunk_sizer'] = chunk_sizer
+
+                yield from self.__yield_positions(configuration, file_index, path, skip_rows, **read_options)
             else:
-                frame = self.read_file(path, sheet = sheet, key = key)
+                reporter.report_start(path)
+                frame = self.read_file(path, sheet = sheet, key = key, **_schema_options(configuration))
                 data.append(frame)
                 reporter.report_end(path, frame)
 
         if not will_use_iterator:
             data = pd.concat(data)
-            yield data
+            yield ChunkPosition(len(file_paths), 0), data
+
+    def __yield_positions(self, configuration: FileLoaderConfiguration, file_index: int, path: str, skip_rows: int, **kwargs) -> Iterator[tuple[ChunkPosition, pd.DataFrame]]:
+        rows = skip_rows
+        chunk_sizer = kwargs.get('chunk_sizer', None)
+
+        if skip_rows > 0 and self.can_seek(configuration):
+            chunks = self.yield_file(path, skip_rows=skip_rows, **kwargs)
+        else:
+            chunks = _skip_rows(self.yield_file(path, **kwargs), skip_rows)
+
+        for chunk in chunks:
+            rows += chunk.attrs.pop(SOURCE_ROWS_ATTR, len(chunk))
+            if chunk_sizer is not None:
+                chunk_sizer.observe(chunk)
+
+            yield ChunkPosition(file_index, rows), chunk
 
     def read_file(self, filename: str, **kwargs) -> pd.DataFrame:
         """
@@ -90,6 +332,63 @@ class FileLoader:
         """
         return False
 
+    def can_seek(self, configuraton: FileLoaderConfiguration|None = None) -> bool:
+        """
+        Return true if `yield_file` accepts a `skip_rows` argument and can skip the
+        rows without parsing them.
+        :return: True if the loader can start part way through a file
+        """
+        return False
+
+    def register_configuration(self, configuration: FileLoaderConfiguration, pancham_configuration: PanchamConfiguration | None = None):
+        """
+        Called with each configuration that will be read during a run, before any file
+        is loaded. Loaders can use this to plan reads that can be shared between
+        configurations.
+
+        :param configuration: A configuration that will be read by this loader.
+        :type configuration: FileLoaderConfiguration
+        :param pancham_configuration: The configuration for the run.
+        :type pancham_configuration: PanchamConfiguration | None
+        """
+        pass
+
+    def clear_cache(self):
+        """
+        Releases any data cached by the loader. Called at the end of a run.
+        """
+        pass
+
+    def cache_size(self) -> int:
+        """
+        :return: The number of entries currently cached by the loader.
+        :rtype: int
+        """
+        return 0
+
+    def describe_cache(self) -> list[dict[str, str | int]]:
+        """
+        Measures the data currently cached by the loader, for the memory profile.
+
+        :return: The name, number of entries and bytes of each cached item.
+        :rtype: list[dict[str, str | int]]
+        """
+        return []
+
+    def estimate_rows(self, configuration: FileLoaderConfiguration, pancham_configuration: PanchamConfiguration | None = None) -> int | None:
+        """
+        Estimates the number of rows the configuration will read, so the progress of
+        a run can be reported. It should be cheap compared to reading the source.
+
+        :param configuration: The configuration that will be read.
+        :type configuration: FileLoaderConfiguration
+        :param pancham_configuration: The configuration for the run.
+        :type pancham_configuration: PanchamConfiguration | None
+        :return: The estimated number of rows, or None if the loader cannot estimate it.
+        :rtype: int | None
+        """
+        return None
+
     def yield_file(self, filename: str, **kwargs) -> Iterator[pd.DataFrame]:
         """
         Yield DataFrames from a file, processing its contents as per the provided
@@ -146,8 +445,59 @@ class ExcelFileLoader(FileLoader):
     :type supported_formats: list
     :ivar default_sheet: Name of the default sheet to use if not specified.
     :type default_sheet: str
+    :ivar requested_sheets: The sheets registered for each workbook, read together
+        the first time any of them is needed.
+    :type requested_sheets: dict[str, set[str]]
+    :ivar workbook_cache: Parsed sheets keyed by the workbook path and modification time.
+    :type workbook_cache: dict[tuple[str, float], dict[str, pd.DataFrame]]
     """
 
+    def __init__(self):
+        self.requested_sheets: dict[str, set[str]] = {}
+        self.workbook_cache: dict[tuple[str, float], dict[str, pd.DataFrame]] = {}
+
+    def register_configuration(self, configuration: FileLoaderConfiguration, pancham_configuration: PanchamConfiguration | None = None):
+        """
+        Records the sheets each workbook will be read for, so that all of them are
+        parsed in a single pass.
+
+        :param configuration: A configuration that will read from a workbook.
+        :type configuration: FileLoaderConfiguration
+        :param pancham_configuration: The configuration for the run.
+        :type pancham_configuration: PanchamConfiguration | None
+        """
+        if configuration.query is not None:
+            return
+
+        for file_path in self.reduce_file_paths(configuration, pancham_configuration):
+            sheet = configuration.sheet
+            path = file_path
+
+            if type(file_path) is dict:
+                path = file_path['path']
+                sheet = file_path.get('sheet', None)
+
+            if sheet is not None:
+                self.requested_sheets.setdefault(os.path.abspath(path), set()).add(sheet)
+
+    def clear_cache(self):
+        self.requested_sheets = {}
+        self.workbook_cache = {}
+
+    def cache_size(self) -> int:
+        return len(self.workbook_cache)
+
+    def describe_cache(self) -> list[dict[str, str | int]]:
+        return [
+            {
+                'cache': 'excel',
+                'name': path,
+                'entries': len(sheets),
+                'bytes': int(sum(sheet.memory_usage(deep=True).sum() for sheet in sheets.values()))
+            }
+            for (path, _), sheets in self.workbook_cache.items()
+        ]
+
     def read_file(self, filename: str, **kwargs) -> pd.DataFrame:
         """
         Reads a file and returns its data as a Pandas DataFrame. This method specifically
@@ -168,25 +518,136 @@ class ExcelFileLoader(FileLoader):
         if "sheet" not in kwargs:
             raise ValueError("Sheet name must be provided for Excel files.")
 
-        return pd.read_excel(filename, sheet_name=kwargs["sheet"])
+        sheet = kwargs["sheet"]
+        if sheet is None:
+            return pd.read_excel(filename, sheet_name=None)
+
+        path = os.path.abspath(filename)
+        cache_key = (path, os.path.getmtime(path))
+        sheets = self.workbook_cache.get(cache_key, {})
+
+        if sheet not in sheets:
+            sheets = self.__read_workbook(path, sheet, sheets)
+            self.workbook_cache = {k: v for k, v in self.workbook_cache.items() if k[0] != path}
+            self.workbook_cache[cache_key] = sheets
+
+        # Callers are free to modify the frame, so the cached copy is never handed out
+        return detach(sheets[sheet])
+
+    def __read_workbook(self, path: str, sheet: str, sheets: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+        """
+        Parses the requested sheet along with every other sheet registered for the
+        workbook that has not yet been read.
+        """
+        with pd.ExcelFile(path) as workbook:
+            requested = self.requested_sheets.get(path, set()) | {sheet}
+            to_read = [s for s in requested if s not in sheets and (s == sheet or s in workbook.sheet_names)]
+
+            get_reporter().report_debug(lambda: f'Reading sheets {to_read} from {path}')
+            return {**sheets, **workbook.parse(sheet_name=to_read)}
 
     def can_yield(self, configuraton: FileLoaderConfiguration|None = None) -> bool:
         return True
 
+    def can_seek(self, configuraton: FileLoaderConfiguration|None = None) -> bool:
+        return True
+
     def yield_file(self, filename: str, **kwargs) -> Iterator[pd.DataFrame]:
         """
-        Reads data from a file and yields it as a pandas DataFrame. Supports specifying
-        additional options like the sheet name for cases where the file format is
-        spreadsheet-based.
+        Streams a sheet from an Excel file, yielding DataFrames of `chunk_size` rows.
+
+        The workbook is opened in openpyxl's read only mode so only the rows of the
+        current chunk are held in memory. Each chunk is parsed with the header row by
+        the same parser `pd.read_excel` uses, so column names, missing values and type
+        inference match reading the whole sheet. Types are inferred per chunk, so a
+        column can have a different type in each chunk if its values are mixed.
 
-        :param filename: The name of the file to be read.
-        :param kwargs: Arbitrary keyword arguments, such as 'sheet' for specifying
-            the sheet name when reading spreadsheet files.
-        :return: An iterator over the read pandas DataFrame.
+        :param filename: The path to the Excel file to be read.
+        :param kwargs: Keyword arguments, 'sheet' for the name of the sheet to read,
+            'chunk_size' for the number of rows in each DataFrame, 'chunk_sizer' to
+            size each DataFrame from a memory target instead and 'skip_rows' for the
+            number of rows after the header to skip without converting them.
+        :return: An iterator over the chunks of the sheet.
         :rtype: Iterator[pd.DataFrame]
+        :raises ValueError: If the 'sheet' keyword argument is not provided.
         """
-        yield self.read_file(filename, sheet=kwargs.get("sheet", None))
+        sheet = kwargs.get("sheet", None)
+        if sheet is None:
+            raise ValueError("Sheet name must be provided for Excel files.")
+
+        chunk_size = kwargs.get("chunk_size", None) or DEFAULT_CHUNK_SIZE
+        chunk_sizer = kwargs.get("chunk_sizer", None)
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(filename, read_only=True, data_only=True)
+
+        try:
+            rows = workbook[sheet].iter_rows(values_only=True)
+            header = self.__convert_row(next(rows, ()))
+
+            # Skipped rows are read but not converted or parsed
+            skip_rows = kwargs.get("skip_rows", 0)
+            next(islice(rows, skip_rows, skip_rows), None)
+
+            chunk = []
+            has_yielded = False
+            blank_rows = 0
+
+            for row in rows:
+                converted = self.__convert_row(row)
+
+                # Trailing blank rows are dropped by pandas, so only keep blank rows
+                # once a later row has data
+                if len(converted) == 0:
+                    blank_rows += 1
+                    continue
+
+                chunk.extend([[]] * blank_rows)
+                blank_rows = 0
+                chunk.append(converted)
+
+                if len(chunk) >= _chunk_rows(chunk_size, chunk_sizer):
+                    yield self.__parse_chunk(header, chunk)
+                    has_yielded = True
+                    chunk = []
+
+            if len(chunk) > 0 or not has_yielded:
+                yield self.__parse_chunk(header, chunk)
+        finally:
+            workbook.close()
+
+    def __convert_row(self, row: tuple) -> list:
+        """
+        Converts cell values the same way as the pandas openpyxl reader, removing
+        trailing empty cells.
+        """
+        converted = []
+        for value in row:
+            if value is None:
+                converted.append("")
+            elif isinstance(value, float) and value.is_integer():
+                converted.append(int(value))
+            else:
+                converted.append(value)
 
+        while len(converted) > 0 and converted[-1] == "":
+            converted.pop()
+
+        return converted
+
+    def __parse_chunk(self, header: list, chunk: list[list]) -> pd.DataFrame:
+        if len(header) == 0 and len(chunk) == 0:
+            return pd.DataFrame()
+
+        data = [header] + chunk
+        width = max(len(r) for r in data)
+        data = [r + [""] * (width - len(r)) for r in data]
+
+        # Rows with a single empty cell are dropped as blank, but were read from the sheet
+        frame = TextParser(data, header=0).read()
+        frame.attrs[SOURCE_ROWS_ATTR] = len(chunk)
+
+        return frame
 
 
 class YamlFileLoader(FileLoader):
@@ -196,12 +657,47 @@ class YamlFileLoader(FileLoader):
             raise ValueError("Key must be provided for Yaml files.")
 
         with open(filename, 'r') as file:
-            data = yaml.safe_load(file)
+            data = safe_load(file)
             if kwargs["key"] not in data:
                 raise ValueError(f"{kwargs['key']} not in {filename}")
 
             return pd.DataFrame(data[kwargs["key"]])
 
+    def can_yield(self, configuraton: FileLoaderConfiguration|None = None) -> bool:
+        return True
+
+    def yield_file(self, filename: str, **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Streams the list under the top level `key` of a YAML file, yielding DataFrames
+        of `chunk_size` rows. Items are parsed one at a time so large files are read
+        without loading the whole document.
+
+        :param filename: The path to the YAML file.
+        :param kwargs: Keyword arguments, 'key' for the top level key of the list and
+            'chunk_size' for the number of rows in each DataFrame.
+        :return: An iterator over the chunks of the list.
+        :rtype: Iterator[pd.DataFrame]
+        :raises ValueError: If the key is not provided or is not a list in the file.
+        """
+        if kwargs.get("key", None) is None:
+            raise ValueError("Key must be provided for Yaml files.")
+
+        chunk_size = kwargs.get("chunk_size", None) or DEFAULT_CHUNK_SIZE
+        rows = []
+        has_yielded = False
+
+        with open(filename, 'r') as file:
+            for item in yield_key_items(file, kwargs["key"]):
+                rows.append(item)
+
+                if len(rows) >= chunk_size:
+                    yield pd.DataFrame(rows)
+                    has_yielded = True
+                    rows = []
+
+        if len(rows) > 0 or not has_yielded:
+            yield pd.DataFrame(rows)
+
 class JsonFileLoader(FileLoader):
 
     def read_file(self, filename: str, **kwargs) -> pd.DataFrame:
@@ -226,11 +722,181 @@ class JsonFileLoader(FileLoader):
         reporter.report_debug("Starting Json chunk load")
         for data in read_json_chunk(filename, key=kwargs.get("key", None), chunk_size=kwargs.get('chunk_size', 1000)):
             df = pd.DataFrame(data)
-            reporter.report_debug(f"Loading iterator - size {len(data)}")
-            reporter.report_debug(df)
+            reporter.report_debug(lambda: f"Loading iterator - size {len(data)}", df)
             yield df
 
 
+DEFAULT_JSONL_BLOCK_SIZE = 16 * 1024 * 1024
+
+JSONL_UNEXPECTED_FIELDS = ['ignore', 'infer', 'error']
+
+# Names of the mapping field types, other names are read as pyarrow type aliases such as `int32`
+ARROW_TYPES = {
+    'str': 'string',
+    'int': 'int64',
+    'float': 'float64',
+    'bool': 'bool',
+    'datetime': 'timestamp[s]'
+}
+
+
+def _schema_options(configuration: FileLoaderConfiguration) -> dict:
+    if configuration.json_schema is None:
+        return {}
+
+    return {'schema': configuration.json_schema, 'unexpected_fields': configuration.unexpected_fields}
+
+
+def _to_arrow_type(type_name: str) -> 'pa.DataType':
+    import pyarrow as pa
+
+    try:
+        return pa.type_for_alias(ARROW_TYPES.get(type_name, type_name))
+    except ValueError:
+        raise ValueError(f"Unknown JSON lines field type {type_name}")
+
+
+def _read_batches(reader, filename: str) -> Iterator['pa.RecordBatch']:
+    """
+    Reads the batches of a JSON reader, explaining the error raised for a field that
+    is not in the schema inferred from the first block.
+    """
+    import pyarrow as pa
+
+    try:
+        yield from reader
+    except pa.ArrowInvalid as e:
+        if 'unexpected field' not in str(e):
+            raise
+
+        raise ValueError(f"{filename} has a field that is not in its schema, set `json_schema` in the mapping to read it: {e}") from e
+
+class JsonLinesFileLoader(FileLoader):
+    """
+    Loads line delimited JSON (NDJSON) files.
+
+    Files are decoded by pyarrow's JSON reader in blocks of `block_size` bytes, using
+    multiple threads when `use_threads` is set, so large files are read without
+    holding the whole file in memory. Without a schema the column types are
+    inferred from the first block, so a field that first appears after the first
+    block fails the read. A `json_schema` gives the type of each field up front, with
+    `unexpected_fields` deciding what happens to the other fields. When a `key` is
+    set the schema lists the fields of the selected object.
+
+    The `key` of the configuration selects a nested object on each line, the fields
+    of that object become the columns. Dotted keys such as `event.payload` select
+    deeper objects.
+
+    :ivar block_size: Number of bytes decoded at a time.
+    :type block_size: int
+    :ivar use_threads: Whether blocks are decoded in parallel.
+    :type use_threads: bool
+    """
+
+    def __init__(self, block_size: int = DEFAULT_JSONL_BLOCK_SIZE, use_threads: bool = True):
+        self.block_size = block_size
+        self.use_threads = use_threads
+
+    def read_file(self, filename: str, **kwargs) -> pd.DataFrame:
+        import pyarrow.json as pa_json
+
+        table = pa_json.read_json(filename, read_options=self.__read_options(), parse_options=self.__parse_options(**kwargs))
+
+        return self.__select_key(table, kwargs.get("key", None)).to_pandas()
+
+    def can_yield(self, configuraton: FileLoaderConfiguration|None = None) -> bool:
+        return True
+
+    def estimate_rows(self, configuration: FileLoaderConfiguration, pancham_configuration: PanchamConfiguration | None = None) -> int | None:
+        return _estimate_file_lines(self, configuration, pancham_configuration, header_lines=0)
+
+    def yield_file(self, filename: str, **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Streams the file, yielding DataFrames of `chunk_size` rows.
+
+        :param filename: The path to the file.
+        :param kwargs: Keyword arguments, 'key' for the nested object to read,
+            'chunk_size' for the number of rows in each DataFrame, 'chunk_sizer' to
+            size each DataFrame from a memory target instead, and 'schema' and
+            'unexpected_fields' for the types of the fields.
+        :return: An iterator over the chunks of the file.
+        :rtype: Iterator[pd.DataFrame]
+        """
+        chunk_size = kwargs.get("chunk_size", None) or DEFAULT_CHUNK_SIZE
+        chunk_sizer = kwargs.get("chunk_sizer", None)
+        key = kwargs.get("key", None)
+        reporter = get_reporter()
+
+        import pyarrow as pa
+        import pyarrow.json as pa_json
+
+        reader = pa_json.open_json(filename, read_options=self.__read_options(), parse_options=self.__parse_options(**kwargs))
+        batches = []
+        rows = 0
+
+        for batch in _read_batches(reader, filename):
+            batches.append(batch)
+            rows += batch.num_rows
+
+            if rows < _chunk_rows(chunk_size, chunk_sizer):
+                continue
+
+            table = pa.Table.from_batches(batches)
+            offset = 0
+            while rows - offset >= (size := _chunk_rows(chunk_size, chunk_sizer)):
+                reporter.report_debug(lambda: f"Loading JSON lines chunk - size {size}")
+                yield self.__select_key(table.slice(offset, size), key).to_pandas()
+                offset += size
+
+            batches = table.slice(offset).to_batches()
+            rows -= offset
+
+        if rows > 0:
+            yield self.__select_key(pa.Table.from_batches(batches), key).to_pandas()
+
+    def __read_options(self) -> 'pa_json.ReadOptions':
+        import pyarrow.json as pa_json
+
+        return pa_json.ReadOptions(block_size=self.block_size, use_threads=self.use_threads)
+
+    def __parse_options(self, **kwargs) -> 'pa_json.ParseOptions':
+        import pyarrow as pa
+        import pyarrow.json as pa_json
+
+        schema = kwargs.get("schema", None)
+        unexpected_fields = kwargs.get("unexpected_fields", None) or 'ignore'
+
+        if schema is None:
+            return pa_json.ParseOptions()
+
+        if unexpected_fields not in JSONL_UNEXPECTED_FIELDS:
+            raise ValueError(f"unexpected_fields must be one of {', '.join(JSONL_UNEXPECTED_FIELDS)}, got {unexpected_fields}")
+
+        fields = [pa.field(name, _to_arrow_type(type_name)) for name, type_name in schema.items()]
+        key = kwargs.get("key", None)
+
+        # The schema of a nested object is wrapped in the objects the key passes through
+        for name in reversed(key.split('.') if key is not None else []):
+            fields = [pa.field(name, pa.struct(fields))]
+
+        return pa_json.ParseOptions(explicit_schema=pa.schema(fields), unexpected_field_behavior=unexpected_fields)
+
+    def __select_key(self, table: 'pa.Table', key: str | None) -> 'pa.Table':
+        if key is None:
+            return table
+
+        # Each flatten moves the children of struct columns up a level, named `parent.child`
+        for _ in key.split('.'):
+            table = table.flatten()
+
+        prefix = f"{key}."
+        names = [name for name in table.column_names if name.startswith(prefix)]
+        if len(names) == 0:
+            raise ValueError(f"{key} must select an object in each line")
+
+        return table.select(names).rename_columns([name[len(prefix):] for name in names])
+
+
 class CsvFileLoader(FileLoader):
     """
     Handles loading and reading CSV files.
@@ -246,3 +912,42 @@ class CsvFileLoader(FileLoader):
 
     def read_file(self, filename: str, **kwargs) -> pd.DataFrame:
         return pd.read_csv(filename)
+
+    def can_yield(self, configuraton: FileLoaderConfiguration|None = None) -> bool:
+        return True
+
+    def estimate_rows(self, configuration: FileLoaderConfiguration, pancham_configuration: PanchamConfiguration | None = None) -> int | None:
+        return _estimate_file_lines(self, configuration, pancham_configuration, header_lines=1)
+
+    def can_seek(self, configuraton: FileLoaderConfiguration|None = None) -> bool:
+        return True
+
+    def yield_file(self, filename: str, **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Reads a CSV file in chunks of `chunk_size` rows. Rows after the header can be
+        skipped with `skip_rows`, they are split into values but not parsed. Blank
+        lines are dropped by pandas so they are not counted as rows.
+
+        :param filename: The path to the CSV file to be read.
+        :param kwargs: Keyword arguments, 'chunk_size' for the number of rows in each
+            DataFrame, 'chunk_sizer' to size each DataFrame from a memory target
+            instead and 'skip_rows' for the number of rows to skip.
+        :return: An iterator over the chunks of the file.
+        :rtype: Iterator[pd.DataFrame]
+        """
+        chunk_size = kwargs.get("chunk_size", None) or DEFAULT_CHUNK_SIZE
+        chunk_sizer = kwargs.get("chunk_sizer", None)
+        skip_rows = kwargs.get("skip_rows", 0)
+
+        if skip_rows == 0:
+            with pd.read_csv(filename, chunksize=chunk_size) as reader:
+                yield from _read_csv_chunks(reader, chunk_sizer)
+            return
+
+        columns = pd.read_csv(filename, nrows=0).columns
+
+        with open(filename, newline='', encoding='utf-8') as csv_file:
+            _skip_csv_records(csv_file, skip_rows)
+
+            with pd.read_csv(csv_file, chunksize=chunk_size, header=None, names=columns) as reader:
+                yield from _read_csv_chunks(reader, chunk_sizer)
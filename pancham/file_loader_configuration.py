@@ -1,9 +1,12 @@
 import json
+import re
 from dataclasses import dataclass
 from typing import Optional, Union
 
 DEFAULT_CHUNK_SIZE = 100000
 
+MEMORY_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
 @dataclass(kw_only=True)
 class FileLoaderConfiguration:
     """
@@ -20,6 +23,16 @@ class FileLoaderConfiguration:
     :ivar file_path: Path(s) to the file(s) to be loaded. Can accept a single file path
                      or a list of file paths.
     :type file_path: Optional[str | list[str]]
+    :ivar chunk_memory: Target memory in bytes for each chunk of an iterated read, the
+                        number of rows is adjusted to it instead of using `chunk_size`.
+    :type chunk_memory: Optional[int]
+    :ivar json_schema: Type of each field of a JSON lines file, such as `str` or `int`,
+                  instead of inferring the types from the start of the file.
+    :type json_schema: Optional[dict[str, str]]
+    :ivar unexpected_fields: What happens to fields missing from `json_schema`, `ignore`
+                             drops them, `infer` reads them if they are in the first
+                             block and `error` fails.
+    :type unexpected_fields: str
     """
 
     sheet: Optional[str] = None
@@ -28,7 +41,19 @@ class FileLoaderConfiguration:
     file_type: Optional[str]
     use_iterator: bool = False
     chunk_size: int = DEFAULT_CHUNK_SIZE
+    chunk_memory: Optional[int] = None
     query: Optional[str] = None
+    json_schema: Optional[dict[str, str]] = None
+    unexpected_fields: str = 'ignore'
+
+    def get_chunk_memory(self) -> Optional[int]:
+        """
+        The target memory of each chunk, limited by anything the chunks are written to.
+
+        :return: The target in bytes, or None to read `chunk_size` rows at a time.
+        :rtype: Optional[int]
+        """
+        return self.chunk_memory
 
 
     def __hash__(self):
@@ -37,4 +62,30 @@ class FileLoaderConfiguration:
         if isinstance(path, list):
             path = json.dumps(path)
 
-        return hash((self.key, self.file_type, self.sheet, path, self.query))
\ No newline at end of file
+        return hash((self.key, self.file_type, self.sheet, path, self.query))
+
+
+def parse_memory_size(value: int|str) -> int:
+    """
+    Parses a memory size such as `256MB`. Numbers without a unit are bytes, units are
+    powers of 1024.
+
+    :param value: The size as a number of bytes or text with a unit.
+    :type value: int | str
+    :return: The size in bytes.
+    :rtype: int
+    :raises ValueError: If the size cannot be parsed or is not positive.
+    """
+    if isinstance(value, int):
+        size = value
+    else:
+        match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*', str(value).upper())
+        if match is None:
+            raise ValueError(f"Invalid memory size {value}")
+
+        size = int(float(match.group(1)) * MEMORY_UNITS[match.group(2)])
+
+    if size <= 0:
+        raise ValueError(f"Memory size must be positive, got {value}")
+
+    return size
@@ -0,0 +1,273 @@
+import os
+import pickle
+import re
+from typing import Any, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .data_frame_configuration import IncrementalConfiguration
+from .tool.frame_tools import hash_rows
+
+
+class IncrementalStateStore:
+    """
+    Stores the state of incremental mappings on disk between runs, one file per
+    mapping. Files are replaced atomically so an interrupted run leaves the state of
+    the previous run in place. Unreadable files are ignored, which processes every row
+    again.
+
+    :ivar state_dir: Directory the state files are written to.
+    :type state_dir: str
+    """
+
+    def __init__(self, state_dir: str):
+        self.state_dir = state_dir
+
+    def load(self, name: str) -> dict|None:
+        """
+        Reads the state saved for a mapping.
+
+        :param name: The name of the mapping.
+        :type name: str
+        :return: The saved state, or None if there is no readable state.
+        :rtype: dict | None
+        """
+        path = self.__get_path(name)
+
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as state_file:
+                return pickle.load(state_file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def save(self, name: str, state: dict):
+        """
+        Writes the state for a mapping, replacing the state of the previous run.
+
+        :param name: The name of the mapping.
+        :type name: str
+        :param state: The state to save.
+        :type state: dict
+        """
+        path = self.__get_path(name)
+
+        os.makedirs(self.state_dir, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as state_file:
+            pickle.dump(state, state_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    def __get_path(self, name: str) -> str:
+        return os.path.join(self.state_dir, f"{re.sub(r'[^A-Za-z0-9_.-]', '_', name)}.pickle")
+
+
+class IncrementalTracker:
+    """
+    Filters the chunks of an incremental mapping down to the rows that are new or have
+    changed since the last committed run.
+
+    When hashing, every source row is hashed and compared with the hash stored for its
+    key. When using a watermark, rows are kept if their watermark is above the highest
+    value of the last run. Rows at that value are kept unless the last run saw the
+    same row, as rows can arrive with the highest value after a run. The state is only
+    written by `commit`, which should be called once every chunk has been written, so
+    a failed run is processed again in full on the next run.
+
+    :ivar configuration: The incremental settings of the mapping.
+    :type configuration: IncrementalConfiguration
+    :ivar store: Where the state is kept between runs.
+    :type store: IncrementalStateStore
+    :ivar name: The name of the mapping the state belongs to.
+    :type name: str
+    """
+
+    def __init__(self, configuration: IncrementalConfiguration, store: IncrementalStateStore, name: str):
+        self.configuration = configuration
+        self.store = store
+        self.name = name
+        self.rows_read = 0
+        self.rows_changed = 0
+
+        self.__previous = self.__load_previous()
+        self.__seen: list[pd.Series] = []
+        self.__watermark: Any = None
+        self.__watermark_rows: list[np.ndarray] = []
+
+    def filter(self, chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Yields the new and changed rows of each chunk, chunks without changes are
+        skipped.
+
+        :param chunks: The chunks read from the source.
+        :type chunks: Iterator[pd.DataFrame]
+        :return: The rows to process.
+        :rtype: Iterator[pd.DataFrame]
+        """
+        for chunk in chunks:
+            if self.configuration.watermark is None:
+                changed = self.__filter_by_hash(chunk)
+            else:
+                changed = self.__filter_by_watermark(chunk)
+
+            self.rows_read += len(chunk)
+            self.rows_changed += len(changed)
+
+            if len(changed) > 0:
+                yield changed
+
+    def deleted_keys(self) -> pd.DataFrame:
+        """
+        Finds the keys from the last run that were not in the source, only valid once
+        every chunk has been filtered.
+
+        :return: A frame with a column for each key column.
+        :rtype: pd.DataFrame
+        """
+        key_columns = self.configuration.key_columns
+
+        if self.__previous is None or len(self.__previous) == 0:
+            return pd.DataFrame(columns=key_columns)
+
+        deleted = self.__previous.index.difference(self.__get_seen().index)
+
+        if isinstance(deleted, pd.MultiIndex):
+            return deleted.to_frame(index=False, name=key_columns)
+
+        return deleted.to_frame(index=False, name=key_columns[0])
+
+    def commit(self):
+        """
+        Saves the state of this run so the next run only processes later changes.
+        """
+        if self.configuration.watermark is not None:
+            self.store.save(self.name, self.__build_state(self.__get_watermark_state()))
+            return
+
+        self.store.save(self.name, self.__build_state(self.__get_seen()))
+
+    def __filter_by_hash(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        hashes = hash_rows(chunk)
+        keys = self.__get_keys(chunk, hashes)
+        self.__seen.append(pd.Series(hashes, index=keys))
+
+        if self.__previous is None or len(self.__previous) == 0:
+            return chunk
+
+        positions = self.__previous.index.get_indexer(keys)
+        changed = (positions == -1) | (self.__previous.to_numpy()[positions] != hashes)
+
+        return chunk[changed]
+
+    def __filter_by_watermark(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        watermark = self.configuration.watermark
+
+        if watermark not in chunk.columns:
+            raise ValueError(f"Watermark column {watermark} not found in {self.name}")
+
+        # Rows without a watermark are only loaded by the first run
+        present = chunk[watermark].notna()
+        values = chunk.loc[present, watermark]
+        rows = chunk.loc[present]
+
+        previous = self.__previous['value'] if self.__previous is not None else None
+        at_previous = np.zeros(len(values), dtype=bool)
+        if previous is not None and self.__previous['rows'] is not None:
+            at_previous = (values == previous).to_numpy(dtype=bool)
+
+        at_highest = np.zeros(len(values), dtype=bool)
+        if len(values) > 0:
+            highest = values.max()
+            if self.__watermark is None or highest > self.__watermark:
+                self.__watermark = highest
+                self.__watermark_rows = []
+
+            if highest == self.__watermark:
+                at_highest = (values == highest).to_numpy(dtype=bool)
+
+        # Only the rows at a watermark are ever compared, so only they are hashed
+        compared = at_previous | at_highest
+        hashes = np.zeros(len(values), dtype=np.uint64)
+        if compared.any():
+            hashes[compared] = hash_rows(rows[compared])
+
+        if at_highest.any():
+            self.__watermark_rows.append(hashes[at_highest])
+
+        if previous is None:
+            return chunk
+
+        newer = (values > previous).to_numpy(dtype=bool) | (at_previous & ~np.isin(hashes, self.__previous['rows']))
+
+        kept = np.zeros(len(chunk), dtype=bool)
+        kept[present.to_numpy()] = newer
+
+        return chunk[kept]
+
+    def __get_watermark_state(self) -> dict:
+        """
+        The highest watermark read by this or an earlier run, with the hashes of the
+        rows read at that value.
+        """
+        rows = np.unique(np.concatenate(self.__watermark_rows)) if len(self.__watermark_rows) > 0 else np.array([], dtype=np.uint64)
+        state = {'value': self.__watermark, 'rows': rows}
+        previous = self.__previous
+
+        if previous is None or previous['value'] is None:
+            return state
+
+        if self.__watermark is None or previous['value'] > self.__watermark:
+            return previous
+
+        if previous['value'] == self.__watermark and previous['rows'] is not None:
+            state['rows'] = np.union1d(rows, previous['rows'])
+
+        return state
+
+    def __get_keys(self, chunk: pd.DataFrame, hashes: np.ndarray) -> pd.Index:
+        key_columns = self.configuration.key_columns
+
+        if len(key_columns) == 0:
+            return pd.Index(hashes)
+
+        missing = [c for c in key_columns if c not in chunk.columns]
+        if len(missing) > 0:
+            raise ValueError(f"Key columns {missing} not found in {self.name}")
+
+        if len(key_columns) == 1:
+            return pd.Index(chunk[key_columns[0]], name=key_columns[0])
+
+        return pd.MultiIndex.from_frame(chunk[key_columns])
+
+    def __get_seen(self) -> pd.Series:
+        if len(self.__seen) == 0:
+            return pd.Series([], dtype=np.uint64)
+
+        seen = pd.concat(self.__seen)
+        self.__seen = [seen[~seen.index.duplicated(keep='last')]]
+
+        return self.__seen[0]
+
+    def __build_state(self, value: Any) -> dict:
+        return {
+            'key': self.configuration.key_columns,
+            'watermark': self.configuration.watermark,
+            'value': value
+        }
+
+    def __load_previous(self) -> Any:
+        state = self.store.load(self.name)
+
+        # A change to the key or watermark makes the saved state meaningless
+        if state is None or state.get('key') != self.configuration.key_columns or state.get('watermark') != self.configuration.watermark:
+            return None
+
+        # Watermarks saved without the rows at their value only load newer rows
+        if self.configuration.watermark is not None and not isinstance(state['value'], dict):
+            return {'value': state['value'], 'rows': None}
+
+        return state['value']
+
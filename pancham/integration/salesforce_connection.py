@@ -1,5 +1,14 @@
 from simple_salesforce import Salesforce
 import os
+import threading
+import time
+
+SESSION_MAX_AGE = 900
+
+__connection: Salesforce|None = None
+__connection_settings: tuple|None = None
+__connection_created = 0.0
+__connection_lock = threading.Lock()
 
 def get_connection() -> Salesforce:
     """
@@ -10,7 +19,9 @@ def get_connection() -> Salesforce:
     'PANCHAM_SF_INSTANCE_URL', respectively.
 
     If the credentials are available, it initializes and returns a Salesforce
-    client connection using these parameters.
+    client connection using these parameters. The connection is reused for
+    `SESSION_MAX_AGE` seconds, within the shortest session timeout Salesforce
+    allows, so each chunk or lookup does not log in again.
 
     :returns: A Salesforce client connection object initialized with the
         specified username, password, and instance URL.
@@ -23,11 +34,46 @@ def get_connection() -> Salesforce:
     domain = os.environ.get('PANCHAM_SF_DOMAIN', None)
     api_version = os.environ.get('PANCHAM_SF_API_VERSION', '59.0')
 
-    return Salesforce(
-        username=username,
-        password=password,
-        instance_url=url,
-        security_token=token,
-        domain=domain,
-        version=api_version
-    )
\ No newline at end of file
+    global __connection, __connection_settings, __connection_created
+
+    settings = (username, password, url, token, domain, api_version)
+
+    with __connection_lock:
+        if __connection is None or __connection_settings != settings or time.monotonic() - __connection_created > SESSION_MAX_AGE:
+            __connection = Salesforce(
+                username=username,
+                password=password,
+                instance_url=url,
+                security_token=token,
+                domain=domain,
+                version=api_version
+            )
+            __connection_settings = settings
+            __connection_created = time.monotonic()
+
+        return __connection
+
+
+def connection_identity() -> list:
+    """
+    Identifies the Salesforce org and user `get_connection` logs in to, without
+    logging in.
+
+    :return: The instance URL, domain and username.
+    :rtype: list
+    """
+    return [
+        os.environ.get('PANCHAM_SF_INSTANCE_URL', None),
+        os.environ.get('PANCHAM_SF_DOMAIN', None),
+        os.environ.get('PANCHAM_SF_USERNAME', None)
+    ]
+
+
+def clear_connection():
+    """
+    Drops the connection kept by `get_connection`, the next call logs in again.
+    """
+    global __connection
+
+    with __connection_lock:
+        __connection = None
\ No newline at end of file
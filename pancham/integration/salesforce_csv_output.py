@@ -1,11 +1,11 @@
-from io import StringIO
-
 import pandas as pd
 
 from pancham.data_frame_configuration import DataFrameConfiguration
 from pancham.data_frame_loader import DataFrameLoader
+from pancham.file_loader_configuration import DEFAULT_CHUNK_SIZE
 from pancham.reporter import get_reporter
-from .salesforce_connection import get_connection
+from .salesforce_connection import get_connection, connection_identity
+from .salesforce_output import save_bulk_results, SUCCESSFUL_RESULTS, FAILED_RESULTS
 from pancham.output_configuration import OutputConfiguration, OutputWriter
 
 SALESFORCE_CSV_BULK = 'salesforce_csv_bulk'
@@ -59,6 +59,10 @@ class SalesforceCsvBulkOutputWriter(OutputWriter):
         self.csv_file = configuration.get('csv_file')
         self.object_name = configuration.get('object_name')
         self.method = configuration.get('method', 'insert')
+        self.result_chunk_size = configuration.get('result_chunk_size', DEFAULT_CHUNK_SIZE)
+
+    def target_identity(self) -> list:
+        return connection_identity()
 
 
     def write(self,
@@ -91,7 +95,7 @@ class SalesforceCsvBulkOutputWriter(OutputWriter):
         sf = get_connection()
         reporter = get_reporter()
 
-        reporter.report_debug(f'Writing to Salesforce Bulk', self.csv_file)
+        reporter.report_debug('Writing to Salesforce Bulk', self.csv_file)
 
         if self.method == 'upsert':
             results = getattr(sf.bulk2, self.object_name).upsert(self.csv_file)
@@ -102,41 +106,15 @@ class SalesforceCsvBulkOutputWriter(OutputWriter):
 
         for r in results:
             job_id = r['job_id']
+            self.failed_rows += int(r.get('numberRecordsFailed', 0) or 0)
 
-            reporter.report_debug(f'Salesforce Bulk job {job_id} completed', r)
-            reporter.report_debug(f'Applying success and failure handlers {success_handler}, {failure_handler}')
+            reporter.report_debug(lambda: f'Salesforce Bulk job {job_id} completed', r)
+            reporter.report_debug(lambda: f'Applying success and failure handlers {success_handler}, {failure_handler}')
 
             if success_handler is not None:
-                success = getattr(sf.bulk2, self.object_name).get_successful_records(job_id)
-                reporter.report_debug('success', success)
-                self.__save_handled_data(success, success_handler, loader)
+                rows = save_bulk_results(sf, job_id, SUCCESSFUL_RESULTS, success_handler, loader, self.result_chunk_size)
+                reporter.report_debug(f'Saved {rows} successful records from job {job_id}')
 
             if failure_handler is not None:
-                failed = getattr(sf.bulk2, self.object_name).get_failed_records(job_id)
-                reporter.report_debug('failures', failed)
-                self.__save_handled_data(failed, failure_handler, loader)
-
-
-    def __save_handled_data(self, data: str, handler_configuration: DataFrameConfiguration, loader: DataFrameLoader):
-        """
-        Handles the saving of processed data using a configured output writer.
-
-        This method reads data in CSV format, processes it into a pandas DataFrame, and
-        writes the result using the provided output writer instance. The handler
-        configuration must include the instance of an OutputWriter to determine how
-        and where the data is saved.
-
-        :param data: The string containing CSV formatted data to be handled and saved.
-        :type data: str
-        :param handler_configuration: A dictionary containing the configuration for the
-            output writer. Must include the key 'instance' associated with an
-            OutputWriter object.
-        :type handler_configuration: dict
-        :return: None
-        """
-        handler: OutputWriter = handler_configuration.output[0].primary_writer
-
-        df = pd.read_csv(StringIO(data))
-        processed = loader.process_dataframe(df, handler_configuration)
-        handler.write(processed, handler_configuration)
-
+                rows = save_bulk_results(sf, job_id, FAILED_RESULTS, failure_handler, loader, self.result_chunk_size)
+                reporter.report_debug(f'Saved {rows} failed records from job {job_id}')
@@ -51,7 +51,7 @@ class SalesforceLookup:
 
         reporter = get_reporter()
         reporter.report_debug(
-            f'Salesforce Lookup data {self.cache}'
+            lambda: f'Salesforce Lookup data {self.cache}'
         )
 
         return self.cache
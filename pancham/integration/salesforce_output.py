@@ -1,18 +1,29 @@
-from io import StringIO
+import os
 
 import pandas as pd
 import tempfile
+from simple_salesforce import Salesforce
 
 from pancham.data_frame_configuration import DataFrameConfiguration
 from pancham.data_frame_loader import DataFrameLoader
+from pancham.file_loader_configuration import DEFAULT_CHUNK_SIZE
+from pancham.profiler import get_active_profiler
 from pancham.reporter import get_reporter
-from .salesforce_connection import get_connection
+from pancham.tool.frame_tools import restore_dtypes
+from .salesforce_connection import get_connection, connection_identity
 from pancham.output_configuration import OutputConfiguration, OutputWriter
 
 SALESFORCE_BULK = 'salesforce_bulk'
 
+# Bulk API 2.0 accepts up to 100MB of CSV in each upload
+SALESFORCE_BULK_MAX_UPLOAD = 100 * 1024 * 1024
+
+SUCCESSFUL_RESULTS = 'successfulResults'
+FAILED_RESULTS = 'failedResults'
+RESULTS_BLOCK_SIZE = 1024 * 1024
+
 def pd_to_sf_dict(data: pd.DataFrame, int_cols: list[str] = [], bool_cols: list[str] = [], nullable_cols: list[str] = []) -> str:
-    data = data.fillna('')
+    data = restore_dtypes(data).fillna('')
 
     def map_int(value):
         if isinstance(value, float):
@@ -88,6 +99,9 @@ class SalesforceBulkOutputConfiguration(OutputConfiguration):
 
 class SalesforceBulkOutputWriter(OutputWriter):
 
+    # A frame takes at least as much memory as its CSV, so this keeps each chunk to one upload
+    max_chunk_memory = SALESFORCE_BULK_MAX_UPLOAD
+
     def __init__(
             self,
             configuration: dict
@@ -98,6 +112,10 @@ class SalesforceBulkOutputWriter(OutputWriter):
         self.int_cols = configuration.get('int_cols', [])
         self.bool_cols = configuration.get('bool_cols', [])
         self.nullable_cols = configuration.get('nullable_cols', [])
+        self.result_chunk_size = configuration.get('result_chunk_size', DEFAULT_CHUNK_SIZE)
+
+    def target_identity(self) -> list:
+        return connection_identity()
 
     def write(self,
               data: pd.DataFrame,
@@ -129,8 +147,9 @@ class SalesforceBulkOutputWriter(OutputWriter):
         sf = get_connection()
         reporter = get_reporter()
 
-        filename = pd_to_sf_dict(data, int_cols=self.int_cols, bool_cols=self.bool_cols, nullable_cols=self.nullable_cols)
-        reporter.report_debug(f'Writing to Salesforce Bulk', filename)
+        with get_active_profiler().stage('sf_dict', rows_in=len(data), object_name=self.object_name):
+            filename = pd_to_sf_dict(data, int_cols=self.int_cols, bool_cols=self.bool_cols, nullable_cols=self.nullable_cols)
+        reporter.report_debug('Writing to Salesforce Bulk', filename)
 
         if self.method == 'upsert':
             results = getattr(sf.bulk2, self.object_name).upsert(filename)
@@ -141,19 +160,18 @@ class SalesforceBulkOutputWriter(OutputWriter):
 
         for r in results:
             job_id = r['job_id']
+            self.failed_rows += int(r.get('numberRecordsFailed', 0) or 0)
 
-            reporter.report_debug(f'Salesforce Bulk job {job_id} completed', r)
-            reporter.report_debug(f'Applying success and failure handlers {success_handler}, {failure_handler}')
+            reporter.report_debug(lambda: f'Salesforce Bulk job {job_id} completed', r)
+            reporter.report_debug(lambda: f'Applying success and failure handlers {success_handler}, {failure_handler}')
 
             if success_handler is not None:
-                success = getattr(sf.bulk2, self.object_name).get_successful_records(job_id)
-                reporter.report_debug('success', success)
-                self.__save_handled_data(success, success_handler, loader)
+                rows = save_bulk_results(sf, job_id, SUCCESSFUL_RESULTS, success_handler, loader, self.result_chunk_size)
+                reporter.report_debug(f'Saved {rows} successful records from job {job_id}')
 
             if failure_handler is not None:
-                failed = getattr(sf.bulk2, self.object_name).get_failed_records(job_id)
-                reporter.report_debug('failures', failed)
-                self.__save_handled_data(failed, failure_handler, loader)
+                rows = save_bulk_results(sf, job_id, FAILED_RESULTS, failure_handler, loader, self.result_chunk_size)
+                reporter.report_debug(f'Saved {rows} failed records from job {job_id}')
 
     def __get_handler_configuration(self, configuration: dict, handler_name: str) -> dict|None:
         """
@@ -177,26 +195,69 @@ class SalesforceBulkOutputWriter(OutputWriter):
 
         return None
 
-    def __save_handled_data(self, data: str, handler_configuration: DataFrameConfiguration, loader: DataFrameLoader):
-        """
-        Handles the saving of processed data using a configured output writer.
-
-        This method reads data in CSV format, processes it into a pandas DataFrame, and
-        writes the result using the provided output writer instance. The handler
-        configuration must include the instance of an OutputWriter to determine how
-        and where the data is saved.
-
-        :param data: The string containing CSV formatted data to be handled and saved.
-        :type data: str
-        :param handler_configuration: A dictionary containing the configuration for the
-            output writer. Must include the key 'instance' associated with an
-            OutputWriter object.
-        :type handler_configuration: dict
-        :return: None
-        """
-        handler: OutputWriter = handler_configuration.output[0].primary_writer
-
-        df = pd.read_csv(StringIO(data))
-        processed = loader.process_dataframe(df, handler_configuration)
-        handler.write(processed, handler_configuration)
 
+def save_bulk_results(
+        sf: Salesforce,
+        job_id: str,
+        results_type: str,
+        handler_configuration: DataFrameConfiguration,
+        loader: DataFrameLoader,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> int:
+    """
+    Hands the successful or failed records of a Bulk API 2.0 job to a handler.
+
+    The results are streamed to a temporary file instead of being held in memory, as
+    ingest results have no locator to page through. The file is then read
+    `chunk_size` rows at a time, and each chunk is processed with the handler
+    configuration and written by its output writer.
+
+    :param sf: The Salesforce connection.
+    :type sf: Salesforce
+    :param job_id: The ID of the completed job.
+    :type job_id: str
+    :param results_type: `successfulResults` or `failedResults`.
+    :type results_type: str
+    :param handler_configuration: The configuration of the handler, its first output
+        writes the records.
+    :type handler_configuration: DataFrameConfiguration
+    :param loader: The loader used to process the records.
+    :type loader: DataFrameLoader
+    :param chunk_size: The number of records processed at a time.
+    :type chunk_size: int
+    :return: The number of records handled.
+    :rtype: int
+    """
+    handler: OutputWriter = handler_configuration.output[0].primary_writer
+    rows = 0
+
+    with tempfile.TemporaryDirectory(prefix='pancham-bulk-') as directory:
+        path = os.path.join(directory, f"{results_type}.csv")
+        _download_bulk_results(sf, job_id, results_type, path)
+
+        if os.path.getsize(path) == 0:
+            return 0
+
+        with pd.read_csv(path, chunksize=chunk_size) as reader:
+            for chunk in reader:
+                processed = loader.process_dataframe(chunk, handler_configuration)
+                handler.write(processed, handler_configuration)
+                rows += len(chunk)
+
+    return rows
+
+
+def _download_bulk_results(sf: Salesforce, job_id: str, results_type: str, path: str):
+    """
+    Writes the results of a job to a file as they are received, simple_salesforce
+    reads the whole response before writing it.
+    """
+    headers = dict(sf.headers)
+    headers['Accept'] = 'text/csv'
+
+    with sf.session.get(f"{sf.base_url}jobs/ingest/{job_id}/{results_type}/", headers=headers, stream=True) as response:
+        response.raise_for_status()
+
+        with open(path, 'wb') as results_file:
+            for block in response.iter_content(chunk_size=RESULTS_BLOCK_SIZE):
+                results_file.write(block)
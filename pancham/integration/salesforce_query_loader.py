@@ -2,8 +2,12 @@ import pandas as pd
 
 from pancham.integration.salesforce_connection import get_connection
 from pancham.file_loader import FileLoader
+from pancham.file_loader_configuration import FileLoaderConfiguration
+from pancham.pancham_configuration import PanchamConfiguration
 from pancham.reporter import get_reporter
 
+SOQL_MIN_BATCH_SIZE = 200
+
 
 class SalesforceQueryLoader(FileLoader):
     """
@@ -27,6 +31,19 @@ class SalesforceQueryLoader(FileLoader):
         df = pd.DataFrame(sf_data['records'])
 
         reporter = get_reporter()
-        reporter.report_debug(f'Salesforce Query data {df}')
+        reporter.report_debug(lambda: f'Salesforce Query data {df}')
 
         return df
+
+    def estimate_rows(self, configuration: FileLoaderConfiguration, pancham_configuration: PanchamConfiguration | None = None) -> int | None:
+        """
+        Reads the `totalSize` of the query, requesting the smallest batch of records
+        Salesforce allows.
+        """
+        if configuration.query is None:
+            return None
+
+        sf = get_connection()
+        result = sf.query(configuration.query, headers={'Sforce-Query-Options': f'batchSize={SOQL_MIN_BATCH_SIZE}'})
+
+        return result['totalSize']
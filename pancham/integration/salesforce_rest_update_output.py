@@ -3,7 +3,7 @@ from typing import Any
 
 from pancham.output_configuration import OutputWriter, OutputConfiguration
 from pancham.reporter import get_reporter
-from .salesforce_connection import get_connection
+from .salesforce_connection import get_connection, connection_identity
 
 SALESFORCE_REST_UPDATE = 'salesforce_rest_update'
 
@@ -89,6 +89,9 @@ class SalesforceRestUpdateWriter(OutputWriter):
             return value
         return value
 
+    def target_identity(self) -> list:
+        return connection_identity()
+
     def write(self, data: pd.DataFrame, *args, **kwargs):
         """
         Loop DataFrame rows and call Simple Salesforce REST update per record.
@@ -137,6 +140,7 @@ class SalesforceRestUpdateWriter(OutputWriter):
                 failure_count += 1
                 failures.append({'id': record_id, 'error': str(e), 'fields': payload})
 
+        self.failed_rows += failure_count
         reporter.report_debug('SalesforceRestUpdateWriter completed', {
             'object_name': self.object_name,
             'id_column': self.id_column,
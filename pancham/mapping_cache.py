@@ -0,0 +1,72 @@
+import hashlib
+import os
+import pickle
+from importlib.metadata import version, PackageNotFoundError
+from typing import Callable
+
+
+def pancham_version() -> str:
+    """
+    The installed version of Pancham, cached results are not reused across versions.
+
+    :return: The version, or 'unknown' if Pancham is not installed.
+    :rtype: str
+    """
+    try:
+        return version('pancham')
+    except PackageNotFoundError:
+        return 'unknown'
+
+
+class MappingFileCache:
+    """
+    Stores parsed mapping files on disk so they are not parsed again on the next run.
+
+    Entries are keyed by the absolute path, modification time and size of the mapping
+    file along with the installed Pancham version, so editing a mapping or upgrading
+    Pancham reads the file again. Unreadable entries are ignored and replaced.
+
+    :ivar cache_dir: Directory the parsed mappings are written to.
+    :type cache_dir: str
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    def load(self, filename: str, parse: Callable[[str], dict]) -> dict:
+        """
+        Returns the cached content of a mapping file, parsing and caching it if there
+        is no entry for the current version of the file.
+
+        :param filename: Path to the mapping file.
+        :type filename: str
+        :param parse: Function that parses the file when it is not cached.
+        :type parse: Callable[[str], dict]
+        :return: The parsed mapping.
+        :rtype: dict
+        """
+        cache_path = os.path.join(self.cache_dir, f"{self.__cache_key(filename)}.pickle")
+
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as cache_file:
+                    return pickle.load(cache_file)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+
+        data = parse(filename)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as cache_file:
+            pickle.dump(data, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+
+        return data
+
+    def __cache_key(self, filename: str) -> str:
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+        key = f"{path}|{stat.st_mtime_ns}|{stat.st_size}|{pancham_version()}"
+
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
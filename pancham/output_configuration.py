@@ -8,8 +8,19 @@ from pancham.data_frame_loader import DataFrameLoader
 class OutputWriter:
     """
     Write the output data to the target system
+
+    :ivar max_chunk_memory: The most memory in bytes a chunk written at once can use,
+        for targets that limit the size of a request. Chunks sized from a memory
+        target are kept below it.
+    :type max_chunk_memory: int|None
+    :ivar failed_rows: Rows the target rejected without the write raising an error,
+        counted by writers that continue past failed rows.
+    :type failed_rows: int
     """
 
+    max_chunk_memory: int|None = None
+    failed_rows: int = 0
+
     def __init__(self, root_configuration: dict):
         self.root_configuration = root_configuration
 
@@ -28,6 +39,17 @@ class OutputWriter:
         """
         pass
 
+    def target_identity(self) -> str|list|None:
+        """
+        Identifies the system the writer connects to, for targets that are not fully
+        described by the root configuration, such as a database or Salesforce org.
+
+        :return: A value that changes when the target does, or None if the writer has
+            no connection of its own.
+        :rtype: str | list | None
+        """
+        return None
+
 
 @dataclass
 class OutputActivitySet:
@@ -0,0 +1,66 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable
+
+
+class OutputExecutor:
+    """
+    Runs independent output steps concurrently on a shared thread pool.
+
+    Each call to `run` submits a group of tasks, waits for every task in the group
+    to finish and then raises if any of them failed. All tasks are always allowed
+    to finish so a failure in one output does not leave another half written. A
+    single failure is raised as-is; multiple failures are raised together as an
+    `ExceptionGroup`.
+
+    :ivar max_workers: Maximum number of threads used to run the tasks, None uses
+        the `ThreadPoolExecutor` default.
+    :type max_workers: int | None
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers
+        self.__pool: ThreadPoolExecutor | None = None
+
+    def run(self, tasks: list[Callable[[], None]]):
+        """
+        Runs the tasks concurrently and waits for all of them to complete.
+
+        :param tasks: The tasks to run, each called without arguments.
+        :type tasks: list[Callable[[], None]]
+        :raises Exception: The failure when exactly one task fails.
+        :raises ExceptionGroup: All failures when more than one task fails.
+        :return: None
+        """
+        if len(tasks) == 0:
+            return
+
+        if len(tasks) == 1:
+            tasks[0]()
+            return
+
+        # Each task runs in a copy of the caller's context, which holds the active profiler
+        futures: list[Future] = [self.__get_pool().submit(contextvars.copy_context().run, task) for task in tasks]
+        errors = [f.exception() for f in futures if f.exception() is not None]
+
+        if len(errors) == 1:
+            raise errors[0]
+
+        if len(errors) > 1:
+            raise ExceptionGroup(f"{len(errors)} output steps failed", errors)
+
+    def shutdown(self):
+        """
+        Stops the thread pool, it will be recreated if the executor is used again.
+
+        :return: None
+        """
+        if self.__pool is not None:
+            self.__pool.shutdown(wait=True)
+            self.__pool = None
+
+    def __get_pool(self) -> ThreadPoolExecutor:
+        if self.__pool is None:
+            self.__pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pancham-output')
+
+        return self.__pool
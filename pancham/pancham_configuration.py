@@ -1,7 +1,12 @@
-import yaml
 import os
 from benedict import benedict
 
+from pancham.deduplication import DEFAULT_DEDUPLICATION_MEMORY_LIMIT
+from pancham.pipeline_executor import DEFAULT_QUEUE_SIZE
+from pancham.reporter_lib.telemetry_reporter import DEFAULT_TELEMETRY_INTERVAL
+from pancham.validation_failure_store import DEFAULT_FAILURE_SAMPLE_SIZE, DEFAULT_FAILURE_MAX_ROWS
+from pancham.tool.yaml_tools import safe_load
+
 class PanchamConfiguration:
     """
     Represents the configuration settings for the Pancham application.
@@ -123,6 +128,330 @@ class PanchamConfiguration:
         """
         return []
 
+    @property
+    def pipeline_queue_size(self) -> int:
+        """
+        Number of chunks that can wait between the read, transform and write stages
+        when the `pipeline` feature is enabled. Larger values smooth out uneven
+        stages at the cost of holding more chunks in memory.
+
+        :return: The maximum number of queued chunks per stage.
+        :rtype: int
+        """
+        return DEFAULT_QUEUE_SIZE
+
+    @property
+    def output_max_workers(self) -> int|None:
+        """
+        Maximum number of threads used to write outputs concurrently when the
+        `parallel_output` feature is enabled. None lets the thread pool decide.
+
+        :return: The maximum number of output threads, or None for the default.
+        :rtype: int | None
+        """
+        return None
+
+    @property
+    def profile_enabled(self) -> bool:
+        """
+        Whether each stage of the run is timed and reported. When enabled a JSON
+        report of wall time, CPU time and row counts per stage is produced at the
+        end of the run.
+
+        :return: True if the run should be profiled.
+        :rtype: bool
+        """
+        return False
+
+    @property
+    def profile_allocations(self) -> bool:
+        """
+        Whether memory allocations are recorded for each stage when profiling. This
+        uses tracemalloc, which slows the run down considerably.
+
+        :return: True if allocations should be tracked.
+        :rtype: bool
+        """
+        return False
+
+    @property
+    def profile_memory(self) -> bool:
+        """
+        Whether the resident set size of the process is sampled around each stage
+        when profiling, and the memory held by caches is added to the report.
+
+        :return: True if memory should be tracked.
+        :rtype: bool
+        """
+        return False
+
+    @property
+    def profile_snapshot_top(self) -> int:
+        """
+        Number of allocation sites recorded from a tracemalloc snapshot each time a
+        stage allocates more than any stage before it. Only used when allocations
+        are tracked.
+
+        :return: The number of sites, 0 to take no snapshots.
+        :rtype: int
+        """
+        return 0
+
+    @property
+    def profile_output(self) -> str|None:
+        """
+        Path of the file the profile report is written to. If not set the report is
+        printed by the reporter.
+
+        :return: The output path, or None to print the report.
+        :rtype: str | None
+        """
+        return None
+
+    @property
+    def mapping_cache_dir(self) -> str|None:
+        """
+        Directory used to cache parsed mapping files between runs. Caching is
+        disabled when not set.
+
+        :return: The cache directory, or None to parse mapping files on every run.
+        :rtype: str | None
+        """
+        return None
+
+    @property
+    def incremental_state_dir(self) -> str:
+        """
+        Directory the state of incremental mappings is kept in between runs.
+
+        :return: The state directory.
+        :rtype: str
+        """
+        return ".pancham/state"
+
+    @property
+    def checkpoint_dir(self) -> str:
+        """
+        Directory the checkpoints of iterated runs are written to, so a failed run
+        can be resumed from the last chunk that was written.
+
+        :return: The checkpoint directory.
+        :rtype: str
+        """
+        return ".pancham/checkpoints"
+
+    @property
+    def checkpoint_enabled(self) -> bool:
+        """
+        Whether every run writes checkpoints, so it can be resumed if it fails. Runs
+        started with `--resume` always write them.
+
+        :return: True to write checkpoints.
+        :rtype: bool
+        """
+        return False
+
+    @property
+    def result_cache_dir(self) -> str:
+        """
+        Directory the fingerprints and stored output of cached mappings are kept in.
+
+        :return: The result cache directory.
+        :rtype: str
+        """
+        return ".pancham/results"
+
+    @property
+    def copy_on_write(self) -> bool:
+        """
+        Whether pandas copy-on-write is turned on when Pancham starts, which lets chunks
+        share data with the frames they were derived from instead of copying it.
+
+        :return: True to turn on copy-on-write.
+        :rtype: bool
+        """
+        return True
+
+    @property
+    def sql_pushdown(self) -> bool:
+        """
+        Whether the database lookups of mappings that read a SQL query are joined to
+        the query in the database. Mappings can override this with `sql_pushdown`.
+
+        :return: True to push lookups down to the database.
+        :rtype: bool
+        """
+        return False
+
+    @property
+    def optimize_dtypes(self) -> bool:
+        """
+        Whether the processed data of every mapping is optimized, converting text
+        columns with few distinct values to `category` and downcasting numbers.
+        Mappings can override this with `optimize_dtypes`.
+
+        :return: True to optimize the dtypes of processed data.
+        :rtype: bool
+        """
+        return False
+
+    @property
+    def dtype_category_ratio(self) -> float:
+        """
+        The highest ratio of distinct values to rows for a text column to be
+        converted to `category` when dtypes are optimized.
+
+        :return: The category ratio.
+        :rtype: float
+        """
+        return 0.5
+
+    @property
+    def deduplication_memory_limit(self) -> int:
+        """
+        Number of bytes the keys seen by the deduplication of an iterated run can use
+        before they are moved to a store on disk.
+
+        :return: The memory limit in bytes.
+        :rtype: int
+        """
+        return DEFAULT_DEDUPLICATION_MEMORY_LIMIT
+
+    @property
+    def deduplication_spill_dir(self) -> str|None:
+        """
+        Directory the deduplication of an iterated run writes to once it reaches its
+        memory limit. The files are removed at the end of the run.
+
+        :return: The spill directory, or None to use the system temporary directory.
+        :rtype: str | None
+        """
+        return None
+
+    @property
+    def telemetry_prometheus_file(self) -> str|None:
+        """
+        Path of the Prometheus textfile collector file the telemetry reporter writes
+        its metrics to.
+
+        :return: The file path, or None to not write one.
+        :rtype: str | None
+        """
+        return None
+
+    @property
+    def telemetry_metrics_log(self) -> str|None:
+        """
+        Path of the JSON lines log the telemetry reporter appends its metrics to.
+
+        :return: The file path, or None to not write one.
+        :rtype: str | None
+        """
+        return None
+
+    @property
+    def telemetry_interval(self) -> float:
+        """
+        Seconds between each export of the telemetry metrics.
+
+        :return: The interval in seconds.
+        :rtype: float
+        """
+        return DEFAULT_TELEMETRY_INTERVAL
+
+    @property
+    def validation_failure_file(self) -> str|None:
+        """
+        Parquet or CSV file every validation failure is written to. If not set the
+        failures are kept in memory and only their counts are reported.
+
+        :return: The failure file path, or None.
+        :rtype: str | None
+        """
+        return None
+
+    @property
+    def validation_failure_sample_size(self) -> int:
+        """
+        Number of failed ids reported for each validation rule and field.
+
+        :return: The sample size.
+        :rtype: int
+        """
+        return DEFAULT_FAILURE_SAMPLE_SIZE
+
+    @property
+    def validation_failure_max_rows(self) -> int|None:
+        """
+        Number of validation failures kept in memory when there is no failure file,
+        later failures are only counted. 0 or less keeps every failure.
+
+        :return: The number of failures, or None to keep every failure.
+        :rtype: int | None
+        """
+        return DEFAULT_FAILURE_MAX_ROWS
+
+    @property
+    def server_host(self) -> str:
+        """
+        Address `pancham serve` accepts jobs on over HTTP.
+
+        :return: The host name or address.
+        :rtype: str
+        """
+        return "127.0.0.1"
+
+    @property
+    def server_port(self) -> int|None:
+        """
+        Port `pancham serve` accepts jobs on over HTTP.
+
+        :return: The port, 0 for any free port or None to not accept jobs over HTTP.
+        :rtype: int | None
+        """
+        return 8765
+
+    @property
+    def server_watch_dir(self) -> str|None:
+        """
+        Directory `pancham serve` watches for mapping files to run.
+
+        :return: The directory, or None to not watch a directory.
+        :rtype: str | None
+        """
+        return None
+
+    @property
+    def server_workers(self) -> int:
+        """
+        Number of jobs `pancham serve` runs at the same time.
+
+        :return: The number of workers.
+        :rtype: int
+        """
+        return 2
+
+    @property
+    def server_cache_ttl(self) -> float:
+        """
+        Seconds `pancham serve` keeps lookup caches and Salesforce sessions before
+        clearing them.
+
+        :return: The time in seconds, 0 to keep them until the server stops.
+        :rtype: float
+        """
+        return 3600.0
+
+    @property
+    def server_poll_interval(self) -> float:
+        """
+        Seconds between each check of the watched directory.
+
+        :return: The interval in seconds.
+        :rtype: float
+        """
+        return 2.0
+
     def has_feature_enabled(self, feature: str) -> bool:
         """
         Checks if a specified feature is enabled for the current instance.
@@ -176,6 +505,303 @@ class OrderedPanchamConfiguration(PanchamConfiguration):
 
         return super().enabled_features
 
+    @property
+    def pipeline_queue_size(self) -> int:
+        queue_size = self.__get_config_item("pipeline_queue_size", "PANCHAM_PIPELINE_QUEUE_SIZE", "pipeline.queue_size")
+
+        if queue_size is None:
+            return super().pipeline_queue_size
+
+        return int(queue_size)
+
+    @property
+    def output_max_workers(self) -> int|None:
+        max_workers = self.__get_config_item("output_max_workers", "PANCHAM_OUTPUT_MAX_WORKERS", "output.max_workers")
+
+        if max_workers is None:
+            return super().output_max_workers
+
+        return int(max_workers)
+
+    @property
+    def profile_enabled(self) -> bool:
+        enabled = self.__get_config_item("profile_enabled", "PANCHAM_PROFILE", "profile.enabled")
+
+        if enabled is None:
+            return super().profile_enabled
+
+        if isinstance(enabled, str):
+            return enabled.lower() in ["true", "1", "yes"]
+
+        return bool(enabled)
+
+    @property
+    def profile_allocations(self) -> bool:
+        allocations = self.__get_config_item("profile_allocations", "PANCHAM_PROFILE_ALLOCATIONS", "profile.allocations")
+
+        if allocations is None:
+            return super().profile_allocations
+
+        if isinstance(allocations, str):
+            return allocations.lower() in ["true", "1", "yes"]
+
+        return bool(allocations)
+
+    @property
+    def profile_memory(self) -> bool:
+        memory = self.__get_config_item("profile_memory", "PANCHAM_PROFILE_MEMORY", "profile.memory")
+
+        if memory is None:
+            return super().profile_memory
+
+        if isinstance(memory, str):
+            return memory.lower() in ["true", "1", "yes"]
+
+        return bool(memory)
+
+    @property
+    def profile_snapshot_top(self) -> int:
+        snapshot_top = self.__get_config_item("profile_snapshot_top", "PANCHAM_PROFILE_SNAPSHOT_TOP", "profile.snapshot_top")
+
+        if snapshot_top is None:
+            return super().profile_snapshot_top
+
+        return int(snapshot_top)
+
+    @property
+    def profile_output(self) -> str|None:
+        output = self.__get_config_item("profile_output", "PANCHAM_PROFILE_OUTPUT", "profile.output")
+
+        if output is None:
+            return super().profile_output
+
+        return output
+
+    @property
+    def mapping_cache_dir(self) -> str|None:
+        cache_dir = self.__get_config_item("mapping_cache_dir", "PANCHAM_MAPPING_CACHE_DIR", "mapping.cache_dir")
+
+        if cache_dir is None:
+            return super().mapping_cache_dir
+
+        return cache_dir
+
+    @property
+    def incremental_state_dir(self) -> str:
+        state_dir = self.__get_config_item("incremental_state_dir", "PANCHAM_INCREMENTAL_STATE_DIR", "incremental.state_dir")
+
+        if state_dir is None:
+            return super().incremental_state_dir
+
+        return state_dir
+
+    @property
+    def checkpoint_dir(self) -> str:
+        checkpoint_dir = self.__get_config_item("checkpoint_dir", "PANCHAM_CHECKPOINT_DIR", "checkpoint.dir")
+
+        if checkpoint_dir is None:
+            return super().checkpoint_dir
+
+        return checkpoint_dir
+
+    @property
+    def checkpoint_enabled(self) -> bool:
+        enabled = self.__get_config_item("checkpoint_enabled", "PANCHAM_CHECKPOINT_ENABLED", "checkpoint.enabled")
+
+        if enabled is None:
+            return super().checkpoint_enabled
+
+        if isinstance(enabled, str):
+            return enabled.lower() in ["true", "1", "yes"]
+
+        return bool(enabled)
+
+    @property
+    def result_cache_dir(self) -> str:
+        cache_dir = self.__get_config_item("result_cache_dir", "PANCHAM_RESULT_CACHE_DIR", "result_cache.dir")
+
+        if cache_dir is None:
+            return super().result_cache_dir
+
+        return cache_dir
+
+    @property
+    def copy_on_write(self) -> bool:
+        enabled = self.__get_config_item("copy_on_write", "PANCHAM_COPY_ON_WRITE", "pandas.copy_on_write")
+
+        if enabled is None:
+            return super().copy_on_write
+
+        if isinstance(enabled, str):
+            return enabled.lower() in ["true", "1", "yes"]
+
+        return bool(enabled)
+
+    @property
+    def sql_pushdown(self) -> bool:
+        enabled = self.__get_config_item("sql_pushdown", "PANCHAM_SQL_PUSHDOWN", "database.sql_pushdown")
+
+        if enabled is None:
+            return super().sql_pushdown
+
+        if isinstance(enabled, str):
+            return enabled.lower() in ["true", "1", "yes"]
+
+        return bool(enabled)
+
+    @property
+    def optimize_dtypes(self) -> bool:
+        enabled = self.__get_config_item("optimize_dtypes", "PANCHAM_OPTIMIZE_DTYPES", "dtypes.optimize")
+
+        if enabled is None:
+            return super().optimize_dtypes
+
+        if isinstance(enabled, str):
+            return enabled.lower() in ["true", "1", "yes"]
+
+        return bool(enabled)
+
+    @property
+    def dtype_category_ratio(self) -> float:
+        category_ratio = self.__get_config_item("dtype_category_ratio", "PANCHAM_DTYPE_CATEGORY_RATIO", "dtypes.category_ratio")
+
+        if category_ratio is None:
+            return super().dtype_category_ratio
+
+        return float(category_ratio)
+
+    @property
+    def deduplication_memory_limit(self) -> int:
+        memory_limit = self.__get_config_item("deduplication_memory_limit", "PANCHAM_DEDUPLICATION_MEMORY_LIMIT", "deduplication.memory_limit")
+
+        if memory_limit is None:
+            return super().deduplication_memory_limit
+
+        return int(memory_limit)
+
+    @property
+    def deduplication_spill_dir(self) -> str|None:
+        spill_dir = self.__get_config_item("deduplication_spill_dir", "PANCHAM_DEDUPLICATION_SPILL_DIR", "deduplication.spill_dir")
+
+        if spill_dir is None:
+            return super().deduplication_spill_dir
+
+        return spill_dir
+
+    @property
+    def telemetry_prometheus_file(self) -> str|None:
+        prometheus_file = self.__get_config_item("telemetry_prometheus_file", "PANCHAM_TELEMETRY_PROMETHEUS_FILE", "telemetry.prometheus_file")
+
+        if prometheus_file is None:
+            return super().telemetry_prometheus_file
+
+        return prometheus_file
+
+    @property
+    def telemetry_metrics_log(self) -> str|None:
+        metrics_log = self.__get_config_item("telemetry_metrics_log", "PANCHAM_TELEMETRY_METRICS_LOG", "telemetry.metrics_log")
+
+        if metrics_log is None:
+            return super().telemetry_metrics_log
+
+        return metrics_log
+
+    @property
+    def telemetry_interval(self) -> float:
+        interval = self.__get_config_item("telemetry_interval", "PANCHAM_TELEMETRY_INTERVAL", "telemetry.interval")
+
+        if interval is None:
+            return super().telemetry_interval
+
+        return float(interval)
+
+    @property
+    def validation_failure_file(self) -> str|None:
+        failure_file = self.__get_config_item("validation_failure_file", "PANCHAM_VALIDATION_FAILURE_FILE", "validation.failure_file")
+
+        if failure_file is None:
+            return super().validation_failure_file
+
+        return failure_file
+
+    @property
+    def validation_failure_sample_size(self) -> int:
+        sample_size = self.__get_config_item("validation_failure_sample_size", "PANCHAM_VALIDATION_FAILURE_SAMPLE_SIZE", "validation.sample_size")
+
+        if sample_size is None:
+            return super().validation_failure_sample_size
+
+        return int(sample_size)
+
+    @property
+    def validation_failure_max_rows(self) -> int|None:
+        max_rows = self.__get_config_item("validation_failure_max_rows", "PANCHAM_VALIDATION_FAILURE_MAX_ROWS", "validation.max_rows")
+
+        if max_rows is None:
+            return super().validation_failure_max_rows
+
+        if int(max_rows) <= 0:
+            return None
+
+        return int(max_rows)
+
+    @property
+    def server_host(self) -> str:
+        host = self.__get_config_item("server_host", "PANCHAM_SERVER_HOST", "server.host")
+
+        if host is None:
+            return super().server_host
+
+        return host
+
+    @property
+    def server_port(self) -> int|None:
+        port = self.__get_config_item("server_port", "PANCHAM_SERVER_PORT", "server.port")
+
+        if port is None:
+            return super().server_port
+
+        if port is False or (isinstance(port, str) and port.lower() in ["false", "none", "off"]):
+            return None
+
+        return int(port)
+
+    @property
+    def server_watch_dir(self) -> str|None:
+        watch_dir = self.__get_config_item("server_watch_dir", "PANCHAM_SERVER_WATCH_DIR", "server.watch_dir")
+
+        if watch_dir is None:
+            return super().server_watch_dir
+
+        return watch_dir
+
+    @property
+    def server_workers(self) -> int:
+        workers = self.__get_config_item("server_workers", "PANCHAM_SERVER_WORKERS", "server.workers")
+
+        if workers is None:
+            return super().server_workers
+
+        return int(workers)
+
+    @property
+    def server_cache_ttl(self) -> float:
+        cache_ttl = self.__get_config_item("server_cache_ttl", "PANCHAM_SERVER_CACHE_TTL", "server.cache_ttl")
+
+        if cache_ttl is None:
+            return super().server_cache_ttl
+
+        return float(cache_ttl)
+
+    @property
+    def server_poll_interval(self) -> float:
+        interval = self.__get_config_item("server_poll_interval", "PANCHAM_SERVER_POLL_INTERVAL", "server.poll_interval")
+
+        if interval is None:
+            return super().server_poll_interval
+
+        return float(interval)
+
     @property
     def mapping_files(self) -> list[str]:
         """
@@ -253,7 +879,7 @@ class OrderedPanchamConfiguration(PanchamConfiguration):
             return self.config_file
 
         with open(self.config_file_path, "r") as config_file:
-            self.config_file = yaml.safe_load(config_file)
+            self.config_file = safe_load(config_file)
             return self.config_file
 
 class StaticPanchamConfiguration(PanchamConfiguration):
@@ -0,0 +1,158 @@
+import contextvars
+import queue
+import threading
+from typing import Any, Callable, Iterator
+
+DEFAULT_QUEUE_SIZE = 2
+
+
+class PipelinedExecutor:
+    """
+    Runs a read / transform / write pipeline where reading and writing happen on
+    their own threads and the transform runs on the calling thread.
+
+    The stages are connected by bounded queues sized in chunks. When the writer
+    falls behind the transform blocks, and when the transform falls behind the
+    reader blocks, so at most `queue_size` chunks are waiting between each pair of
+    stages. This allows network bound reads (SQL, SOQL) to overlap with network
+    bound writes (database, Salesforce) without holding the whole input in memory.
+
+    If any stage raises, the other stages are stopped and the original exception
+    is raised from `run` on the calling thread.
+
+    :ivar queue_size: Maximum number of chunks waiting between two stages.
+    :type queue_size: int
+    """
+
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        if queue_size < 1:
+            raise ValueError("Pipeline queue size must be at least 1")
+
+        self.queue_size = queue_size
+        self.__stop = threading.Event()
+        self.__error: BaseException | None = None
+        self.__error_lock = threading.Lock()
+        self.__queues: dict[str, queue.Queue] = {}
+
+    def run(self, source: Iterator[Any], transform: Callable[[Any], Any], write: Callable[[Any], None]):
+        """
+        Executes the pipeline until the source is exhausted or a stage fails.
+
+        :param source: Iterator producing the input chunks. It is consumed on the
+            reader thread.
+        :type source: Iterator
+        :param transform: Function applied to each chunk on the calling thread.
+        :type transform: Callable
+        :param write: Function receiving each transformed chunk on the writer thread.
+        :type write: Callable
+        :raises BaseException: The first exception raised by any of the stages.
+        :return: None
+        """
+        self.__stop.clear()
+        self.__error = None
+
+        read_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        write_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        self.__queues = {'read': read_queue, 'write': write_queue}
+
+        # The stage threads run in copies of the caller's context, which holds the active profiler
+        reader = threading.Thread(target=contextvars.copy_context().run, args=(self.__read, source, read_queue), name="pancham-reader", daemon=True)
+        writer = threading.Thread(target=contextvars.copy_context().run, args=(self.__write, write, write_queue), name="pancham-writer", daemon=True)
+
+        reader.start()
+        writer.start()
+
+        try:
+            while True:
+                received, item = self.__get(read_queue)
+                if not received or item is _END:
+                    break
+
+                if not self.__put(write_queue, transform(item)):
+                    break
+        except BaseException as e:
+            self.__fail(e)
+        finally:
+            self.__put(write_queue, _END)
+
+        reader.join()
+        writer.join()
+
+        if self.__error is not None:
+            raise self.__error
+
+    def queue_depths(self) -> dict[str, int]:
+        """
+        Returns the number of chunks currently waiting in each queue.
+
+        :return: Queue depth keyed by the queue name ('read' or 'write').
+        :rtype: dict[str, int]
+        """
+        return {name: q.qsize() for name, q in self.__queues.items()}
+
+    def __read(self, source: Iterator[Any], read_queue: queue.Queue):
+        try:
+            for item in source:
+                if not self.__put(read_queue, item):
+                    break
+        except BaseException as e:
+            self.__fail(e)
+        finally:
+            close = getattr(source, 'close', None)
+            if close is not None:
+                close()
+
+            self.__put(read_queue, _END)
+
+    def __write(self, write: Callable[[Any], None], write_queue: queue.Queue):
+        try:
+            while True:
+                received, item = self.__get(write_queue)
+                if not received or item is _END:
+                    break
+
+                write(item)
+        except BaseException as e:
+            self.__fail(e)
+
+    def __put(self, target: queue.Queue, item: Any) -> bool:
+        """
+        Put an item on a queue, giving up if the pipeline has been stopped. The end
+        marker is always delivered so a waiting consumer can finish.
+        """
+        while not self.__stop.is_set() or item is _END:
+            try:
+                target.put(item, timeout=self.POLL_INTERVAL)
+                return True
+            except queue.Full:
+                if item is _END and self.__stop.is_set():
+                    return False
+
+        return False
+
+    def __get(self, source: queue.Queue) -> tuple[bool, Any]:
+        while not self.__stop.is_set():
+            try:
+                return True, source.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+        return False, None
+
+    def __fail(self, error: BaseException):
+        with self.__error_lock:
+            if self.__error is None:
+                self.__error = error
+
+        self.__stop.set()
+
+
+class _EndOfStream:
+
+    def __repr__(self) -> str:
+        return '<end of stream>'
+
+
+_END = _EndOfStream()
@@ -0,0 +1,256 @@
+import threading
+from importlib import import_module
+from importlib.metadata import entry_points, EntryPoint
+from typing import Any, Iterator, Literal
+
+import pandas as pd
+
+from .configuration.field_parser import FieldParser
+from .data_frame_field import DataFrameField
+from .file_loader import FileLoader, ChunkPosition
+from .file_loader_configuration import FileLoaderConfiguration
+from .output_configuration import OutputConfiguration, OutputWriter
+from .pancham_configuration import PanchamConfiguration
+from .validation_field import ValidationStep, ValidationInput, ValidationFailure
+
+PluginKind = Literal['loaders', 'field_parsers', 'outputs', 'validation_rules']
+
+BUILTIN_PLUGINS: dict[str, dict[str, str]] = {
+    'loaders': {
+        'xlsx': 'pancham.file_loader:ExcelFileLoader',
+        'sql_file': 'pancham.database.sql_file_loader:SqlFileLoader',
+        'sql_execute': 'pancham.database.sql_file_loader:SqlExecuteFileLoader',
+        'yaml': 'pancham.file_loader:YamlFileLoader',
+        'csv': 'pancham.file_loader:CsvFileLoader',
+        'json': 'pancham.file_loader:JsonFileLoader',
+        'jsonl': 'pancham.file_loader:JsonLinesFileLoader',
+        'soql': 'pancham.integration.salesforce_query_loader:SalesforceQueryLoader'
+    },
+    'field_parsers': {
+        'eq': 'pancham.configuration.match_field_parser:MatchFieldParser',
+        'datetime': 'pancham.configuration.datetime_field_parser:DateTimeFieldParser',
+        'dynamic': 'pancham.configuration.dynamic_field_parser:DynamicFieldParser',
+        'to_int': 'pancham.configuration.to_int_field_parser:ToIntFieldParser',
+        'split_extract': 'pancham.configuration.part_text_extractor_parser:PartTextExtractorParser',
+        'static': 'pancham.configuration.static_field_parser:StaticFieldParser',
+        'database_match': 'pancham.configuration.database_match_field_parser:DatabaseMatchFieldParser',
+        'database_value': 'pancham.configuration.database_fixed_field_parser:DatabaseFixedFieldParser',
+        'split': 'pancham.configuration.split_field_parser:SplitFieldParser',
+        'explode': 'pancham.configuration.explode_field_parser:ExplodeFieldParser',
+        'concat': 'pancham.configuration.concat_field_parser:ConcatFieldParser',
+        'database_multi_field_search': 'pancham.configuration.database_multi_field_search_parser:DatabaseMultiFieldSearchParser',
+        'remove': 'pancham.configuration.remove_field_parser:RemoveFieldParser',
+        'deduplicate': 'pancham.configuration.deduplicate_field_parser:DeduplicateFieldParser',
+        'regex_match': 'pancham.configuration.regex_match_field_parser:RegexMatchFieldParser',
+        'regex_extract': 'pancham.configuration.regex_extract_field_parser:RegexExtractFieldParser',
+        'email_match': 'pancham.configuration.email_regex_match_parser:EmailRegexMatchParser',
+        'sf_lookup': 'pancham.configuration.sf_lookup_field_parser:SFLookupFieldParser',
+        'fill_nan': 'pancham.configuration.fillnan_field_parser:FillNanFieldParser',
+        'to_bool': 'pancham.configuration.to_bool_field_parser:ToBoolFieldParser',
+        'number_format': 'pancham.configuration.number_format_field_parser:NumberFormatFieldParser',
+        'expr': 'pancham.configuration.expression_field_parser:ExpressionFieldParser'
+    },
+    'outputs': {
+        'database': 'pancham.database.database_output:DatabaseOutput',
+        'salesforce_bulk': 'pancham.integration.salesforce_output:SalesforceBulkOutputConfiguration',
+        'salesforce_csv_bulk': 'pancham.integration.salesforce_csv_output:SalesforceCsvBulkOutputConfiguration',
+        'salesforce_rest_update': 'pancham.integration.salesforce_rest_update_output:SalesforceRestUpdateOutputConfiguration'
+    },
+    'validation_rules': {
+        'not_null': 'pancham.validation.not_null_validation:NotNullValidation',
+        'one_of': 'pancham.validation.one_of_validation:OneOfValidation',
+        'not_all_null': 'pancham.validation.not_all_null_validation:NotAllNullValidation',
+        'match': 'pancham.validation.matching_validation:MatchingValidation',
+        'contains': 'pancham.validation.contains_validation:ContainsValidation'
+    }
+}
+
+ENTRY_POINT_GROUPS: dict[str, str] = {
+    'loaders': 'pancham.loaders',
+    'field_parsers': 'pancham.field_parsers',
+    'outputs': 'pancham.outputs',
+    'validation_rules': 'pancham.validation_rules'
+}
+
+
+def get_plugin_sources(kind: PluginKind) -> dict[str, str | EntryPoint]:
+    """
+    Lists the plugins of a kind by name, without importing them.
+
+    Built in plugins are given as `module:attribute` import paths. Plugins from other
+    packages are found through the `pancham.loaders`, `pancham.field_parsers`,
+    `pancham.outputs` and `pancham.validation_rules` entry point groups, where the
+    entry point name is the file type, `func` key, `output_type` or rule name. Built
+    in plugins take priority over entry points with the same name.
+
+    :param kind: The kind of plugin.
+    :type kind: PluginKind
+    :return: The import path or entry point of each plugin, keyed by name.
+    :rtype: dict[str, str | EntryPoint]
+    """
+    sources: dict[str, str | EntryPoint] = dict(BUILTIN_PLUGINS[kind])
+
+    for entry_point in entry_points(group=ENTRY_POINT_GROUPS[kind]):
+        if entry_point.name not in sources:
+            sources[entry_point.name] = entry_point
+
+    return sources
+
+
+class LazyPlugin:
+    """
+    Holds the name and import path of a plugin, importing and creating it the first
+    time it is used. If the import path refers to a class it is instantiated without
+    arguments, otherwise the object is used as is.
+
+    :ivar name: The name the plugin is registered under.
+    :type name: str
+    :ivar source: The `module:attribute` import path or entry point of the plugin.
+    :type source: str | EntryPoint
+    """
+
+    def __init__(self, name: str, source: str | EntryPoint):
+        self.name = name
+        self.source = source
+        self.__plugin: Any = None
+        self.__lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__plugin is not None
+
+    @property
+    def plugin(self) -> Any:
+        if self.__plugin is None:
+            with self.__lock:
+                if self.__plugin is None:
+                    self.__plugin = self.__load()
+
+        return self.__plugin
+
+    def __load(self) -> Any:
+        if isinstance(self.source, EntryPoint):
+            target = self.source.load()
+        else:
+            module_name, _, attribute = self.source.partition(':')
+            target = getattr(import_module(module_name), attribute)
+
+        if isinstance(target, type):
+            return target()
+
+        return target
+
+
+def resolve_plugin(plugin: Any) -> Any:
+    """
+    Returns the plugin behind a lazy plugin, importing it if needed. Other objects are
+    returned unchanged.
+    """
+    if isinstance(plugin, LazyPlugin):
+        return plugin.plugin
+
+    return plugin
+
+
+class LazyFileLoader(LazyPlugin, FileLoader):
+
+    def read_file_from_configuration(self, configuration: FileLoaderConfiguration, pancham_configuration: PanchamConfiguration | None = None) -> Iterator[pd.DataFrame]:
+        return self.plugin.read_file_from_configuration(configuration, pancham_configuration)
+
+    def read_chunks_from_configuration(self, configuration: FileLoaderConfiguration, pancham_configuration: PanchamConfiguration | None = None, start: ChunkPosition | None = None) -> Iterator[tuple[ChunkPosition, pd.DataFrame]]:
+        return self.plugin.read_chunks_from_configuration(configuration, pancham_configuration, start)
+
+    def read_file(self, filename: str, **kwargs) -> pd.DataFrame:
+        return self.plugin.read_file(filename, **kwargs)
+
+    def can_yield(self, configuraton: FileLoaderConfiguration|None = None) -> bool:
+        return self.plugin.can_yield(configuraton)
+
+    def can_seek(self, configuraton: FileLoaderConfiguration|None = None) -> bool:
+        return self.plugin.can_seek(configuraton)
+
+    def yield_file(self, filename: str, **kwargs) -> Iterator[pd.DataFrame]:
+        return self.plugin.yield_file(filename, **kwargs)
+
+    def register_configuration(self, configuration: FileLoaderConfiguration, pancham_configuration: PanchamConfiguration | None = None):
+        self.plugin.register_configuration(configuration, pancham_configuration)
+
+    def clear_cache(self):
+        # Nothing can be cached by a loader that was never used
+        if self.is_loaded:
+            self.plugin.clear_cache()
+
+    def cache_size(self) -> int:
+        if self.is_loaded:
+            return self.plugin.cache_size()
+
+        return 0
+
+    def describe_cache(self) -> list[dict[str, str | int]]:
+        if self.is_loaded:
+            return self.plugin.describe_cache()
+
+        return []
+
+    def estimate_rows(self, configuration: FileLoaderConfiguration, pancham_configuration: PanchamConfiguration | None = None) -> int | None:
+        return self.plugin.estimate_rows(configuration, pancham_configuration)
+
+
+class LazyFieldParser(LazyPlugin, FieldParser):
+    """
+    Field parser registered under its `func` key. The parser is only imported once a
+    field uses the key.
+    """
+
+    def can_parse_field(self, field: dict) -> bool:
+        if not self.has_function_key(field, self.name):
+            return False
+
+        return self.plugin.can_parse_field(field)
+
+    def parse_field(self, field: dict) -> DataFrameField:
+        return self.plugin.parse_field(field)
+
+
+class LazyOutputConfiguration(LazyPlugin, OutputConfiguration):
+    """
+    Output registered under its `output_type`. The output is only imported once a
+    configuration uses the type.
+    """
+
+    def can_apply(self, configuration: dict):
+        if self.extract_configuration_by_key(configuration, self.name) is None:
+            return False
+
+        return self.plugin.can_apply(configuration)
+
+    def to_output_writer(self, configuration: dict) -> OutputWriter:
+        return self.plugin.to_output_writer(configuration)
+
+
+class LazyValidationStep(LazyPlugin, ValidationStep):
+
+    def validate(self, input: ValidationInput) -> list[ValidationFailure]:
+        return self.plugin.validate(input)
+
+    def get_name(self) -> str:
+        return self.name
+
+
+def default_file_loaders() -> dict[str, FileLoader]:
+    return {name: LazyFileLoader(name, source) for name, source in get_plugin_sources('loaders').items()}
+
+
+def default_field_parsers() -> list[FieldParser]:
+    from .configuration.text_field_parser import TextFieldParser
+
+    # Plain fields have no func key, so the text parser is always needed
+    return [TextFieldParser()] + [LazyFieldParser(name, source) for name, source in get_plugin_sources('field_parsers').items()]
+
+
+def default_outputs() -> list[OutputConfiguration]:
+    return [LazyOutputConfiguration(name, source) for name, source in get_plugin_sources('outputs').items()]
+
+
+def default_validation_rules() -> list[ValidationStep]:
+    return [LazyValidationStep(name, source) for name, source in get_plugin_sources('validation_rules').items()]
@@ -0,0 +1,380 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, asdict
+from typing import Iterator, Any
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, peak RSS is not reported there
+    resource = None
+
+
+@dataclass
+class StageProfile:
+    """
+    Measurements taken for a single execution of a pipeline stage.
+
+    :ivar stage: The type of stage, e.g. load, rename, field, cast, schema, output.
+    :type stage: str
+    :ivar labels: Details identifying the stage, such as the field name and parser.
+    :type labels: dict[str, str]
+    :ivar wall_time: Elapsed time in seconds.
+    :type wall_time: float
+    :ivar cpu_time: CPU time in seconds used by the thread running the stage.
+    :type cpu_time: float
+    :ivar rows_in: Number of rows passed into the stage, if known.
+    :type rows_in: int | None
+    :ivar rows_out: Number of rows produced by the stage, if known.
+    :type rows_out: int | None
+    :ivar allocated_bytes: Peak memory allocated during the stage, only recorded
+        when allocation tracking is enabled and no stage ran on another thread at the
+        same time.
+    :type allocated_bytes: int | None
+    :ivar rss_before: Resident set size of the process when the stage started, only
+        recorded when memory tracking is enabled.
+    :type rss_before: int | None
+    :ivar rss_after: Resident set size of the process when the stage ended.
+    :type rss_after: int | None
+    :ivar peak_rss: Highest resident set size of the process so far, when the stage
+        ended.
+    :type peak_rss: int | None
+    :ivar top_allocations: The source lines holding the most memory when the stage
+        ended, only recorded when the stage allocated more than any stage before it.
+    :type top_allocations: list[dict[str, Any]] | None
+    """
+
+    stage: str
+    labels: dict[str, str] = field(default_factory=dict)
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    rows_in: int | None = None
+    rows_out: int | None = None
+    allocated_bytes: int | None = None
+    rss_before: int | None = None
+    rss_after: int | None = None
+    peak_rss: int | None = None
+    top_allocations: list[dict[str, Any]] | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(eq=False)
+class _AllocationFrame:
+    """
+    The allocations of a stage that is running. tracemalloc has one peak for the
+    process, so the peak is copied into every running stage before it is reset.
+    """
+
+    start: int
+    peak: int
+    thread: int
+    shared: bool = False
+
+
+class StageProfiler:
+    """
+    Records timings for each stage of a run and hands them to the reporter.
+
+    When disabled the profiler does no measurement, so stages can always be wrapped
+    without a cost on runs that are not being profiled.
+
+    Nested stages each get their own allocation peak. tracemalloc cannot tell threads
+    apart, so stages that overlap with a stage on another thread record no
+    allocations.
+
+    :ivar enabled: Whether stages are measured.
+    :type enabled: bool
+    :ivar track_allocations: Whether tracemalloc is used to record allocations.
+    :type track_allocations: bool
+    :ivar track_memory: Whether the resident set size of the process is sampled
+        around each stage.
+    :type track_memory: bool
+    :ivar snapshot_top: Number of allocation sites recorded when a stage allocates
+        more than any stage before it, 0 to take no snapshots. Needs allocation
+        tracking.
+    :type snapshot_top: int
+    """
+
+    def __init__(self, reporter, enabled: bool = False, track_allocations: bool = False, track_memory: bool = False, snapshot_top: int = 0):
+        self.reporter = reporter
+        self.enabled = enabled
+        self.track_allocations = enabled and track_allocations
+        self.track_memory = enabled and track_memory
+        self.snapshot_top = snapshot_top if self.track_allocations else 0
+        self.__largest_allocation = 0
+        self.__allocation_frames: list[_AllocationFrame] = []
+        self.__allocation_lock = threading.Lock()
+
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, stage: str, rows_in: int | None = None, **labels: str) -> Iterator[StageProfile]:
+        """
+        Measures the code run inside the context. The yielded profile can be updated
+        with `rows_out` once the stage has produced its output.
+
+        :param stage: The type of stage being measured.
+        :param rows_in: The number of rows going into the stage.
+        :param labels: Additional labels identifying the stage.
+        :return: The profile for the stage.
+        """
+        profile = StageProfile(stage=stage, labels=labels, rows_in=rows_in)
+
+        if not self.enabled:
+            yield profile
+            return
+
+        started = self.__start(profile)
+
+        try:
+            yield profile
+        finally:
+            self.__finish(profile, started)
+            self.reporter.save_stage_profile(profile)
+
+    def profile_iterator(self, iterator: Iterator[Any], stage: str, **labels: str) -> Iterator[Any]:
+        """
+        Measures the time taken to produce each item of an iterator, for example
+        the chunks returned by a file loader.
+
+        :param iterator: The iterator to measure.
+        :param stage: The type of stage being measured.
+        :param labels: Additional labels identifying the stage.
+        :return: The items of the iterator.
+        """
+        if not self.enabled:
+            yield from iterator
+            return
+
+        while True:
+            profile = StageProfile(stage=stage, labels=labels)
+            started = self.__start(profile)
+
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.__finish(profile, started)
+                return
+            except BaseException:
+                # A failed read is reported like a failed stage, and stops tracking its allocations
+                self.__finish(profile, started)
+                self.reporter.save_stage_profile(profile)
+                raise
+
+            self.__finish(profile, started)
+            profile.rows_out = len(item)
+            self.reporter.save_stage_profile(profile)
+
+            yield item
+
+    def __start(self, profile: StageProfile) -> tuple[_AllocationFrame | None, float, float]:
+        if self.track_memory:
+            profile.rss_before = current_rss()
+
+        return self.__start_allocations(), time.perf_counter(), time.thread_time()
+
+    def __finish(self, profile: StageProfile, started: tuple[_AllocationFrame | None, float, float]):
+        allocation_start, wall_start, cpu_start = started
+
+        profile.wall_time = time.perf_counter() - wall_start
+        profile.cpu_time = time.thread_time() - cpu_start
+        profile.allocated_bytes = self.__end_allocations(allocation_start)
+
+        if self.track_memory:
+            profile.rss_after = current_rss()
+            profile.peak_rss = peak_rss()
+
+        if self.snapshot_top > 0 and profile.allocated_bytes is not None and profile.allocated_bytes > self.__largest_allocation:
+            self.__largest_allocation = profile.allocated_bytes
+            profile.top_allocations = top_allocations(self.snapshot_top)
+
+    def __start_allocations(self) -> _AllocationFrame | None:
+        if not self.track_allocations:
+            return None
+
+        with self.__allocation_lock:
+            current = self.__record_peak()
+            frame = _AllocationFrame(current, current, threading.get_ident())
+
+            for running in self.__allocation_frames:
+                if running.thread != frame.thread:
+                    running.shared = True
+                    frame.shared = True
+
+            self.__allocation_frames.append(frame)
+            tracemalloc.reset_peak()
+
+        return frame
+
+    def __end_allocations(self, frame: _AllocationFrame | None) -> int | None:
+        if frame is None:
+            return None
+
+        with self.__allocation_lock:
+            self.__record_peak()
+            self.__allocation_frames.remove(frame)
+
+        if frame.shared:
+            return None
+
+        return max(frame.peak - frame.start, 0)
+
+    def __record_peak(self) -> int:
+        """
+        Copies the peak since the last reset into the running stages.
+
+        :return: The memory currently allocated.
+        :rtype: int
+        """
+        current, peak = tracemalloc.get_traced_memory()
+
+        for frame in self.__allocation_frames:
+            frame.peak = max(frame.peak, peak)
+
+        return current
+
+
+# Set per run, so jobs running on other threads keep their own profiler
+_active_profiler: ContextVar[StageProfiler | None] = ContextVar('pancham_active_profiler', default=None)
+_disabled_profiler = StageProfiler(None)
+
+
+def get_active_profiler() -> StageProfiler:
+    """
+    Returns the profiler of the current run, for code that does not have access to
+    the loader, such as lookup caches. Stages are not measured before a run has
+    created its profiler.
+
+    The profiler is held in a context variable, so each thread, and each server job,
+    sees the profiler of its own run. Threads started by a run copy its context.
+
+    :return: The profiler.
+    :rtype: StageProfiler
+    """
+    profiler = _active_profiler.get()
+
+    return _disabled_profiler if profiler is None else profiler
+
+
+def set_active_profiler(profiler: StageProfiler):
+    """
+    Sets the profiler returned by `get_active_profiler` in the current context.
+
+    :param profiler: The profiler of the current run.
+    :type profiler: StageProfiler
+    """
+    _active_profiler.set(profiler)
+
+
+def current_rss() -> int | None:
+    """
+    :return: The resident set size of the process in bytes, or None where it cannot
+        be read cheaply, which is anywhere but Linux.
+    :rtype: int | None
+    """
+    try:
+        with open('/proc/self/statm', 'r') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def peak_rss() -> int | None:
+    """
+    :return: The highest resident set size of the process so far in bytes, or None
+        if it is not available.
+    :rtype: int | None
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def top_allocations(limit: int) -> list[dict[str, Any]]:
+    """
+    Takes a tracemalloc snapshot and finds the source lines holding the most memory.
+
+    :param limit: The number of lines to return.
+    :type limit: int
+    :return: The file, line, bytes and number of blocks held by each line, largest
+        first.
+    :rtype: list[dict[str, Any]]
+    """
+    if not tracemalloc.is_tracing():
+        return []
+
+    statistics = tracemalloc.take_snapshot().statistics('lineno')[:limit]
+
+    return [
+        {'file': stat.traceback[0].filename, 'line': stat.traceback[0].lineno, 'bytes': stat.size, 'blocks': stat.count}
+        for stat in statistics
+    ]
+
+
+def summarise_profiles(profiles: list[StageProfile]) -> list[dict[str, Any]]:
+    """
+    Aggregates stage profiles that share a stage type and labels, so a run with
+    many chunks produces a single entry per stage.
+
+    :param profiles: The profiles recorded during the run.
+    :type profiles: list[StageProfile]
+    :return: A list of dictionaries with the totals for each stage, in the order
+        the stages were first seen.
+    :rtype: list[dict[str, Any]]
+    """
+    summary: dict[tuple, dict[str, Any]] = {}
+
+    for profile in profiles:
+        key = (profile.stage, tuple(sorted(profile.labels.items())))
+
+        if key not in summary:
+            summary[key] = {
+                'stage': profile.stage,
+                'labels': dict(profile.labels),
+                'calls': 0,
+                'wall_time': 0.0,
+                'cpu_time': 0.0,
+                'rows_in': None,
+                'rows_out': None,
+                'allocated_bytes': None,
+                'rss_growth': None,
+                'peak_rss': None,
+                'top_allocations': None,
+            }
+
+        entry = summary[key]
+        entry['calls'] += 1
+        entry['wall_time'] += profile.wall_time
+        entry['cpu_time'] += profile.cpu_time
+
+        for total_key in ['rows_in', 'rows_out']:
+            value = getattr(profile, total_key)
+            if value is not None:
+                entry[total_key] = (entry[total_key] or 0) + value
+
+        if profile.allocated_bytes is not None:
+            entry['allocated_bytes'] = max(entry['allocated_bytes'] or 0, profile.allocated_bytes)
+
+        if profile.rss_before is not None and profile.rss_after is not None:
+            entry['rss_growth'] = max(entry['rss_growth'] or 0, profile.rss_after - profile.rss_before)
+
+        if profile.peak_rss is not None:
+            entry['peak_rss'] = max(entry['peak_rss'] or 0, profile.peak_rss)
+
+        # Snapshots are only taken for a new largest allocation, so the latest is the largest
+        if profile.top_allocations is not None:
+            entry['top_allocations'] = profile.top_allocations
+
+    return list(summary.values())
@@ -1,6 +1,11 @@
+import json
+from typing import Any, Callable
+
 import pandas as pd
 
+from .profiler import StageProfile, summarise_profiles
 from .validation_field import ValidationFailure
+from .validation_failure_store import ValidationFailureStore, DEFAULT_FAILURE_SAMPLE_SIZE, DEFAULT_FAILURE_MAX_ROWS
 from .data_frame_configuration import DataFrameConfiguration
 
 class Reporter:
@@ -90,14 +95,32 @@ class Reporter:
         """
         pass
 
-    def report_debug(self, debug_message: str, data: pd.DataFrame|None = None):
+    def is_debug_enabled(self) -> bool:
+        """
+        Checks whether debug messages are reported. Callers that need to do work to
+        build a debug message, beyond formatting a string, can check this first.
+
+        :return: True if debug messages are reported.
+        :rtype: bool
+        """
+        return False
+
+    def report_debug(self, debug_message: str|Callable[[], str], data: Any|Callable[[], Any]|None = None):
         """
         Logs and reports the provided debug message for analysis or tracking purposes.
         This method facilitates streamlined logging processes by accepting a debug message
         as input.
 
-        :param debug_message: The debug message string provided for logging or reporting purposes.
-        :type debug_message: str
+        Messages are often built on hot paths, so both the message and the data can be
+        passed as a callable. The callable is only invoked if debug is enabled, which
+        avoids formatting data frames and caches that are then discarded, e.g.
+        `reporter.report_debug(lambda: f'Outcome {df}')`.
+
+        :param debug_message: The debug message string provided for logging or reporting purposes,
+            or a callable returning it.
+        :type debug_message: str | Callable[[], str]
+        :param data: Optional data to report with the message, or a callable returning it.
+        :type data: Any | Callable[[], Any] | None
 
         :return: None
         """
@@ -131,6 +154,28 @@ class Reporter:
         """
         pass
 
+    def configure_validation_failures(
+            self,
+            output_file: str|None = None,
+            sample_size: int = DEFAULT_FAILURE_SAMPLE_SIZE,
+            max_rows: int|None = DEFAULT_FAILURE_MAX_ROWS
+    ):
+        """
+        Sets where validation failures are kept and how many ids are reported for
+        each rule, called by the runner before any failure is saved.
+
+        :param output_file: Parquet or CSV file the failures are written to, if None
+            they are kept in memory.
+        :type output_file: str | None
+        :param sample_size: Number of failed ids reported for each rule and field.
+        :type sample_size: int
+        :param max_rows: Number of failures kept in memory without an output file,
+            None to keep every failure.
+        :type max_rows: int | None
+        :return: None
+        """
+        pass
+
     def report_validation_failure(self):
         """
         Reports validation failure encountered during processing.
@@ -144,6 +189,91 @@ class Reporter:
         """
         pass
 
+    def save_stage_profile(self, profile: StageProfile):
+        """
+        Saves the measurements for a pipeline stage, called by the profiler each
+        time a stage completes while profiling is enabled.
+
+        :param profile: The measurements for the stage.
+        :type profile: StageProfile
+        :return: None
+        """
+        pass
+
+    def report_profile(self, output_file: str|None = None, memory: dict[str, Any]|None = None):
+        """
+        Reports the stage measurements collected during the run as JSON.
+
+        :param output_file: Path of the file to write the report to, if None the
+            report is printed.
+        :type output_file: str | None
+        :param memory: The peak memory of the process and the memory held by caches,
+            included when memory is profiled.
+        :type memory: dict[str, Any] | None
+        :return: None
+        """
+        pass
+
+    def is_telemetry_enabled(self) -> bool:
+        """
+        Checks whether the reporter exports telemetry. When it does the runner measures
+        every stage and estimates the size of each source, even if the run is not
+        being profiled.
+
+        :return: True if telemetry is exported.
+        :rtype: bool
+        """
+        return False
+
+    def report_run_start(self, name: str, estimated_rows: int|None = None):
+        """
+        Reports the start of the run of a mapping, the stages reported until the next
+        run starts belong to it.
+
+        :param name: The name of the mapping.
+        :type name: str
+        :param estimated_rows: The number of rows the source is expected to hold, if
+            the loader can estimate it.
+        :type estimated_rows: int | None
+        :return: None
+        """
+        pass
+
+    def report_chunk_written(self, name: str, rows: int):
+        """
+        Reports that a chunk of a mapping has been written to every output.
+
+        :param name: The name of the mapping.
+        :type name: str
+        :param rows: The number of rows in the chunk.
+        :type rows: int
+        :return: None
+        """
+        pass
+
+    def watch(self, name: str, read: Callable[[], dict[str, int|float]]):
+        """
+        Registers a value that is read each time telemetry is exported, such as the
+        depth of the pipeline queues.
+
+        :param name: The name of the value.
+        :type name: str
+        :param read: Returns the current values keyed by what they measure.
+        :type read: Callable[[], dict[str, int | float]]
+        :return: None
+        """
+        pass
+
+    def unwatch(self, name: str):
+        """
+        Stops reading a value registered with `watch`.
+
+        :param name: The name of the value.
+        :type name: str
+        :return: None
+        """
+        pass
+
 class PrintReporter(Reporter):
     """
     A reporter class for printing updates during file processing.
@@ -161,10 +291,11 @@ class PrintReporter(Reporter):
     :type some_attribute: type
     """
 
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, validation_failures: ValidationFailureStore|None = None):
         super().__init__()
         self.debug = debug
-        self.validation_failures: list[ValidationFailure] = []
+        self.validation_failures = ValidationFailureStore() if validation_failures is None else validation_failures
+        self.stage_profiles: list[StageProfile] = []
 
 
     def report_start(self, file_path: str):
@@ -182,28 +313,88 @@ class PrintReporter(Reporter):
             for f in configuration.fields:
                 print(f" - {f}")
 
-    def report_debug(self, debug_message: str, data: pd.DataFrame|None = None):
-        if self.debug:
-            print(f"DEBUG: {debug_message}")
+    def is_debug_enabled(self) -> bool:
+        return bool(self.debug)
+
+    def report_debug(self, debug_message: str|Callable[[], str], data: Any|Callable[[], Any]|None = None):
+        if not self.is_debug_enabled():
+            return
 
-            if data is not None:
-                print(data)
+        print(f"DEBUG: {resolve_debug_value(debug_message)}")
+
+        if data is not None:
+            print(resolve_debug_value(data))
 
     def report_info(self, message: str):
         print(message)
 
+    def configure_validation_failures(
+            self,
+            output_file: str|None = None,
+            sample_size: int = DEFAULT_FAILURE_SAMPLE_SIZE,
+            max_rows: int|None = DEFAULT_FAILURE_MAX_ROWS
+    ):
+        self.validation_failures.close()
+        self.validation_failures = ValidationFailureStore(output_file, sample_size=sample_size, max_rows=max_rows)
+
     def save_validation_failure(self, validation_failure: ValidationFailure):
-        self.validation_failures.append(validation_failure)
+        self.validation_failures.add(validation_failure)
 
     def report_validation_failure(self):
-        print(f"{len(self.validation_failures)} validation failures encountered:")
+        failures = self.validation_failures
+        failures.close()
+
+        print(f"{failures.count} validation failures encountered:")
+
+        for summary in failures.summaries():
+            target = summary.rule if summary.field is None else f"{summary.rule} on {summary.field}"
+            ids = ', '.join(str(i) for i in summary.sample_ids)
+            if summary.count > len(summary.sample_ids) and len(summary.sample_ids) > 0:
+                ids = f"{ids}, ..."
+
+            print(f" - {target}: {summary.count} failures" + (f" (ids {ids})" if ids != '' else ''))
+
+        if failures.output_file is not None and failures.count > 0:
+            print(f"Validation failures written to {failures.output_file}")
+
+        if failures.dropped > 0:
+            print(f"{failures.dropped} validation failures were not kept, set validation.failure_file to keep every failure")
+
+    def save_stage_profile(self, profile: StageProfile):
+        self.stage_profiles.append(profile)
+
+    def report_profile(self, output_file: str|None = None, memory: dict[str, Any]|None = None):
+        profile = {'stages': summarise_profiles(self.stage_profiles)}
+        if memory is not None:
+            profile['memory'] = memory
 
-        for v in self.validation_failures:
-            print(f" - {v}")
+        report = json.dumps(profile, indent=2)
+
+        if output_file is None:
+            print(report)
+            return
+
+        with open(output_file, 'w') as f:
+            f.write(report)
+
+        print(f"Profile written to {output_file}")
 
 
 __reporter: Reporter|None = None
 
+def resolve_debug_value(value: Any|Callable[[], Any]) -> Any:
+    """
+    Returns the value passed to `report_debug`, calling it first if the message or
+    data was passed lazily as a callable.
+
+    :param value: The message or data, or a callable returning it.
+    :return: The message or data.
+    """
+    if callable(value):
+        return value()
+
+    return value
+
 def get_reporter(debug: bool = False, reporter: Reporter|None = None) -> Reporter:
     """
     Get the reporter instance.
@@ -0,0 +1,361 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from pancham.profiler import StageProfile
+from pancham.reporter import PrintReporter
+
+DEFAULT_TELEMETRY_INTERVAL = 10.0
+
+
+@dataclass
+class StageTotals:
+    """
+    Totals of every execution of a stage during the run of a mapping.
+
+    :ivar calls: Number of executions.
+    :type calls: int
+    :ivar rows: Number of rows produced, or passed in when the output is not known.
+    :type rows: int
+    :ivar seconds: Elapsed time of every execution.
+    :type seconds: float
+    :ivar last_seconds: Elapsed time of the last execution.
+    :type last_seconds: float
+    """
+
+    calls: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+    last_seconds: float = 0.0
+
+    def add(self, profile: StageProfile):
+        self.calls += 1
+        self.rows += (profile.rows_out if profile.rows_out is not None else profile.rows_in) or 0
+        self.seconds += profile.wall_time
+        self.last_seconds = profile.wall_time
+
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class RunProgress:
+    """
+    Progress of the run of a mapping.
+
+    :ivar started: Monotonic time the run started.
+    :type started: float
+    :ivar estimated_rows: Rows the source is expected to hold, if known.
+    :type estimated_rows: int | None
+    :ivar rows_read: Rows read from the source.
+    :type rows_read: int
+    :ivar chunks_read: Chunks read from the source.
+    :type chunks_read: int
+    :ivar rows_written: Rows written to every output.
+    :type rows_written: int
+    :ivar chunks_written: Chunks written to every output.
+    :type chunks_written: int
+    :ivar last_progress: Monotonic time a chunk was last read or written.
+    :type last_progress: float
+    :ivar stages: Totals of each processing stage, keyed by the stage.
+    :type stages: dict[str, StageTotals]
+    :ivar writers: Totals of each output writer, keyed by the writer class.
+    :type writers: dict[str, StageTotals]
+    """
+
+    started: float
+    estimated_rows: int|None = None
+    rows_read: int = 0
+    chunks_read: int = 0
+    rows_written: int = 0
+    chunks_written: int = 0
+    last_progress: float = 0.0
+    stages: dict[str, StageTotals] = field(default_factory=dict)
+    writers: dict[str, StageTotals] = field(default_factory=dict)
+
+    def eta(self, now: float) -> float|None:
+        """
+        Estimates the seconds until every row has been read, from the rate rows
+        have been read so far.
+
+        :param now: The current monotonic time.
+        :type now: float
+        :return: The remaining seconds, or None if the size of the source or the
+            read rate is not known.
+        :rtype: float | None
+        """
+        if self.estimated_rows is None or self.rows_read == 0:
+            return None
+
+        remaining = self.estimated_rows - self.rows_read
+        if remaining <= 0:
+            return 0.0
+
+        return remaining / (self.rows_read / max(now - self.started, 1e-9))
+
+
+class TelemetryReporter(PrintReporter):
+    """
+    Extends the PrintReporter to export the progress of a run for monitoring. Every
+    `interval` seconds the metrics are written to a Prometheus textfile collector
+    file, replaced atomically, and/or appended as one line to a JSON lines log.
+
+    The metrics are built from the stage profiles: rows per second for each stage,
+    chunks read and written, the latency of each output writer, and values
+    registered with `watch` such as queue depths and cache sizes. When the loader
+    estimated the size of the source an ETA is included, and the seconds since the
+    last chunk was read or written tell a slow run from a stalled one.
+
+    :ivar prometheus_file: Path of the Prometheus textfile, if exported.
+    :type prometheus_file: str | None
+    :ivar metrics_log: Path of the JSON lines log, if exported.
+    :type metrics_log: str | None
+    :ivar interval: Seconds between exports.
+    :type interval: float
+    :ivar keep_profiles: Whether stage profiles are also kept for `report_profile`.
+    :type keep_profiles: bool
+    """
+
+    def __init__(
+            self,
+            debug: bool = False,
+            prometheus_file: str|None = None,
+            metrics_log: str|None = None,
+            interval: float = DEFAULT_TELEMETRY_INTERVAL,
+            keep_profiles: bool = False
+    ):
+        super().__init__(debug)
+
+        if prometheus_file is None and metrics_log is None:
+            raise ValueError("Telemetry needs a Prometheus file or a metrics log to write to")
+
+        if interval <= 0:
+            raise ValueError(f"Telemetry interval must be positive, got {interval}")
+
+        self.prometheus_file = prometheus_file
+        self.metrics_log = metrics_log
+        self.interval = interval
+        self.keep_profiles = keep_profiles
+
+        self.__lock = threading.Lock()
+        self.__runs: dict[str, RunProgress] = {}
+        self.__current: str|None = None
+        self.__gauges: dict[str, Callable[[], dict[str, int|float]]] = {}
+        self.__stop = threading.Event()
+        self.__thread: threading.Thread|None = None
+
+    def is_telemetry_enabled(self) -> bool:
+        return True
+
+    def report_run_start(self, name: str, estimated_rows: int|None = None):
+        now = time.monotonic()
+
+        with self.__lock:
+            self.__runs[name] = RunProgress(started=now, estimated_rows=estimated_rows, last_progress=now)
+            self.__current = name
+
+        self.__start()
+
+    def report_chunk_written(self, name: str, rows: int):
+        with self.__lock:
+            progress = self.__runs.get(name)
+            if progress is None:
+                return
+
+            progress.rows_written += rows
+            progress.chunks_written += 1
+            progress.last_progress = time.monotonic()
+
+    def save_stage_profile(self, profile: StageProfile):
+        if self.keep_profiles:
+            super().save_stage_profile(profile)
+
+        with self.__lock:
+            progress = self.__runs.get(profile.labels.get('configuration', self.__current))
+            if progress is None:
+                return
+
+            if profile.stage == 'output':
+                progress.writers.setdefault(profile.labels.get('writer', ''), StageTotals()).add(profile)
+            else:
+                progress.stages.setdefault(profile.stage, StageTotals()).add(profile)
+
+            if profile.stage == 'load':
+                progress.rows_read += profile.rows_out or 0
+                progress.chunks_read += 1
+                progress.last_progress = time.monotonic()
+
+    def watch(self, name: str, read: Callable[[], dict[str, int|float]]):
+        with self.__lock:
+            self.__gauges[name] = read
+
+    def unwatch(self, name: str):
+        with self.__lock:
+            self.__gauges.pop(name, None)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Builds the current metrics.
+
+        :return: The progress of each mapping run so far and the watched values.
+        :rtype: dict[str, Any]
+        """
+        now = time.monotonic()
+
+        with self.__lock:
+            gauges = dict(self.__gauges)
+            runs = []
+
+            for name, progress in self.__runs.items():
+                runs.append({
+                    'configuration': name,
+                    'running': name == self.__current,
+                    'elapsed_seconds': now - progress.started,
+                    'estimated_rows': progress.estimated_rows,
+                    'eta_seconds': progress.eta(now),
+                    'rows_read': progress.rows_read,
+                    'chunks_read': progress.chunks_read,
+                    'rows_written': progress.rows_written,
+                    'chunks_written': progress.chunks_written,
+                    'seconds_since_progress': now - progress.last_progress,
+                    'stages': {stage: _totals_dict(totals) for stage, totals in progress.stages.items()},
+                    'writers': {writer: _totals_dict(totals) for writer, totals in progress.writers.items()}
+                })
+
+        values = {}
+        for name, read in gauges.items():
+            try:
+                values[name] = dict(read())
+            except Exception as e:
+                self.report_debug(lambda: f"Could not read {name} for telemetry: {e}")
+
+        return {'timestamp': time.time(), 'runs': runs, 'gauges': values}
+
+    def write_metrics(self):
+        """
+        Writes the current metrics to the Prometheus file and the metrics log.
+        """
+        snapshot = self.snapshot()
+
+        if self.prometheus_file is not None:
+            _prepare_dir(self.prometheus_file)
+            temp_path = f"{self.prometheus_file}.{os.getpid()}.tmp"
+            with open(temp_path, 'w') as prometheus_file:
+                prometheus_file.write(format_prometheus(snapshot))
+            os.replace(temp_path, self.prometheus_file)
+
+        if self.metrics_log is not None:
+            _prepare_dir(self.metrics_log)
+            with open(self.metrics_log, 'a') as metrics_log:
+                metrics_log.write(json.dumps(snapshot, default=str) + '\n')
+
+    def close(self):
+        """
+        Stops the periodic export and writes the final metrics.
+        """
+        self.__stop.set()
+
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+        self.write_metrics()
+
+    def __start(self):
+        if self.__thread is not None:
+            return
+
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__export, name="pancham-telemetry", daemon=True)
+        self.__thread.start()
+
+    def __export(self):
+        while not self.__stop.wait(self.interval):
+            try:
+                self.write_metrics()
+            except OSError as e:
+                self.report_debug(lambda: f"Could not write telemetry: {e}")
+
+
+def format_prometheus(snapshot: dict[str, Any]) -> str:
+    """
+    Formats a telemetry snapshot in the Prometheus text exposition format.
+
+    :param snapshot: The metrics built by `TelemetryReporter.snapshot`.
+    :type snapshot: dict[str, Any]
+    :return: The metrics as text.
+    :rtype: str
+    """
+    metrics: dict[str, tuple[str, str, list[str]]] = {}
+
+    def add(name: str, metric_type: str, description: str, labels: dict[str, Any], value: Any):
+        if value is None:
+            return
+
+        label_text = ','.join(f'{key}="{_escape_label(label)}"' for key, label in labels.items())
+        if label_text != '':
+            label_text = f"{{{label_text}}}"
+
+        metrics.setdefault(name, (metric_type, description, []))[2].append(f"pancham_{name}{label_text} {float(value)}")
+
+    for run in snapshot['runs']:
+        labels = {'configuration': run['configuration']}
+
+        add('running', 'gauge', 'Whether the mapping is being run.', labels, int(run['running']))
+        add('elapsed_seconds', 'gauge', 'Seconds since the run of the mapping started.', labels, run['elapsed_seconds'])
+        add('estimated_rows', 'gauge', 'Rows the source of the mapping is expected to hold.', labels, run['estimated_rows'])
+        add('eta_seconds', 'gauge', 'Estimated seconds until the source has been read.', labels, run['eta_seconds'])
+        add('rows_read_total', 'counter', 'Rows read from the source.', labels, run['rows_read'])
+        add('chunks_read_total', 'counter', 'Chunks read from the source.', labels, run['chunks_read'])
+        add('rows_written_total', 'counter', 'Rows written to every output.', labels, run['rows_written'])
+        add('chunks_written_total', 'counter', 'Chunks written to every output.', labels, run['chunks_written'])
+        add('seconds_since_progress', 'gauge', 'Seconds since a chunk was last read or written.', labels, run['seconds_since_progress'])
+
+        for stage, totals in run['stages'].items():
+            stage_labels = {**labels, 'stage': stage}
+            add('stage_rows_total', 'counter', 'Rows produced by each stage.', stage_labels, totals['rows'])
+            add('stage_seconds_total', 'counter', 'Seconds spent in each stage.', stage_labels, totals['seconds'])
+            add('stage_rows_per_second', 'gauge', 'Rows per second of time spent in each stage.', stage_labels, totals['rows_per_second'])
+
+        for writer, totals in run['writers'].items():
+            writer_labels = {**labels, 'writer': writer}
+            add('writer_calls_total', 'counter', 'Chunks written by each output writer.', writer_labels, totals['calls'])
+            add('writer_seconds_total', 'counter', 'Seconds spent writing by each output writer.', writer_labels, totals['seconds'])
+            add('writer_last_seconds', 'gauge', 'Seconds taken by the last write of each output writer.', writer_labels, totals['last_seconds'])
+
+    for name, values in snapshot['gauges'].items():
+        for key, value in values.items():
+            add(name, 'gauge', f"Current {name.replace('_', ' ')}.", {'name': key}, value)
+
+    add('last_update_timestamp_seconds', 'gauge', 'Time the metrics were written.', {}, snapshot['timestamp'])
+
+    lines = []
+    for name, (metric_type, description, samples) in metrics.items():
+        lines.append(f"# HELP pancham_{name} {description}")
+        lines.append(f"# TYPE pancham_{name} {metric_type}")
+        lines.extend(samples)
+
+    return '\n'.join(lines) + '\n'
+
+
+def _totals_dict(totals: StageTotals) -> dict[str, Any]:
+    return {
+        'calls': totals.calls,
+        'rows': totals.rows,
+        'seconds': totals.seconds,
+        'last_seconds': totals.last_seconds,
+        'rows_per_second': totals.rows_per_second()
+    }
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _prepare_dir(path: str):
+    directory = os.path.dirname(path)
+    if directory != '':
+        os.makedirs(directory, exist_ok=True)
@@ -0,0 +1,248 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import pandas as pd
+
+from .checkpoint import configuration_fingerprint, file_stamp
+from .data_frame_configuration import DataFrameConfiguration
+from .database.sql_pushdown import PUSHDOWN_PARSER_NAME
+from .file_loader import FileLoader
+from .mapping_cache import pancham_version
+from .output_configuration import OutputWriter
+from .pancham_configuration import PanchamConfiguration
+
+FILE_HASH_BLOCK_SIZE = 1024 * 1024
+
+# The files of these types hold queries, the data they return can change while the file does not
+QUERY_FILE_TYPES = {'sql_file', 'sql_execute', 'soql'}
+
+# Fields made by these parsers read tables or run code outside the mapping's source
+LOOKUP_PARSERS = {
+    'DatabaseMatchFieldParser',
+    'DatabaseFixedFieldParser',
+    'DatabaseMultiFieldSearchParser',
+    'SFLookupFieldParser',
+    'DynamicFieldParser',
+    PUSHDOWN_PARSER_NAME
+}
+
+
+@dataclass
+class ResultCacheEntry:
+    """
+    Records the last completed run of a mapping.
+
+    :ivar fingerprint: Fingerprint of the inputs and configuration of the run.
+    :type fingerprint: str
+    :ivar outputs: Fingerprints of the outputs the result was written to.
+    :type outputs: list[str]
+    :ivar chunks: Number of processed chunks stored with the entry, 0 if the output
+        was not stored.
+    :type chunks: int
+    """
+
+    fingerprint: str
+    outputs: list[str] = field(default_factory=list)
+    chunks: int = 0
+
+
+class ResultCache:
+    """
+    Keeps the fingerprint of the last completed run of each mapping, and optionally
+    its processed chunks, so unchanged mappings can be skipped or replayed.
+
+    Each mapping has a directory holding an `entry.json` file and a pickle for each
+    stored chunk.
+
+    :ivar cache_dir: Directory the cache is written to.
+    :type cache_dir: str
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    def load(self, name: str) -> ResultCacheEntry|None:
+        """
+        Reads the entry for a mapping.
+
+        :param name: The name of the mapping.
+        :type name: str
+        :return: The entry, or None if there is no readable entry.
+        :rtype: ResultCacheEntry | None
+        """
+        path = os.path.join(self.__get_dir(name), 'entry.json')
+
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'r') as entry_file:
+                data = json.load(entry_file)
+
+            return ResultCacheEntry(data['fingerprint'], data['outputs'], data['chunks'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, name: str, entry: ResultCacheEntry):
+        """
+        Writes the entry for a mapping.
+
+        :param name: The name of the mapping.
+        :type name: str
+        :param entry: The entry to save.
+        :type entry: ResultCacheEntry
+        """
+        directory = self.__get_dir(name)
+        path = os.path.join(directory, 'entry.json')
+
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as entry_file:
+            json.dump({'fingerprint': entry.fingerprint, 'outputs': entry.outputs, 'chunks': entry.chunks}, entry_file)
+        os.replace(temp_path, path)
+
+    def clear(self, name: str):
+        """
+        Removes the entry and stored chunks of a mapping.
+
+        :param name: The name of the mapping.
+        :type name: str
+        """
+        shutil.rmtree(self.__get_dir(name), ignore_errors=True)
+
+    def store_chunk(self, name: str, index: int, data: pd.DataFrame):
+        """
+        Stores a processed chunk of a mapping.
+
+        :param name: The name of the mapping.
+        :type name: str
+        :param index: The position of the chunk in the run.
+        :type index: int
+        :param data: The processed chunk.
+        :type data: pd.DataFrame
+        """
+        directory = self.__get_dir(name)
+        os.makedirs(directory, exist_ok=True)
+
+        data.to_pickle(os.path.join(directory, f"{index}.pickle"))
+
+    def read_chunks(self, name: str, count: int) -> Iterator[pd.DataFrame]:
+        """
+        Reads the stored chunks of a mapping in the order they were written.
+
+        :param name: The name of the mapping.
+        :type name: str
+        :param count: The number of chunks stored.
+        :type count: int
+        :return: The stored chunks.
+        :rtype: Iterator[pd.DataFrame]
+        """
+        for index in range(count):
+            yield pd.read_pickle(os.path.join(self.__get_dir(name), f"{index}.pickle"))
+
+    def __get_dir(self, name: str) -> str:
+        return os.path.join(self.cache_dir, re.sub(r'[^A-Za-z0-9_.-]', '_', name))
+
+
+def output_fingerprint(writer: OutputWriter) -> str:
+    """
+    Identifies an output by its writer type, configuration and target, so writing
+    to another database or Salesforce org counts as a new output.
+
+    :param writer: The output writer.
+    :type writer: OutputWriter
+    :return: A hex digest of the output.
+    :rtype: str
+    """
+    values = [type(writer).__name__, writer.root_configuration, writer.target_identity()]
+
+    return hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def result_fingerprint(
+        configuration: DataFrameConfiguration,
+        file_loader: FileLoader,
+        pancham_configuration: PanchamConfiguration|None,
+        watermark: str|None = None,
+        lookup_watermark: str|None = None
+) -> str|None:
+    """
+    Builds a fingerprint of everything that determines the result of a mapping: the
+    mapping itself, the Pancham version, the input files and, for database sources,
+    the value of the watermark query.
+
+    Files are identified by their size and modification time, or by their content
+    when `hash_content` is set. Sources that are not files can only be fingerprinted
+    with a watermark. Mappings with lookup, Salesforce lookup or dynamic fields can
+    only be fingerprinted with the value of the lookup query, unless `ignore_lookups`
+    is set.
+
+    :param configuration: The mapping.
+    :type configuration: DataFrameConfiguration
+    :param file_loader: The loader that reads the mapping's source.
+    :type file_loader: FileLoader
+    :param pancham_configuration: The configuration for the run.
+    :type pancham_configuration: PanchamConfiguration | None
+    :param watermark: The result of the watermark query, if there is one.
+    :type watermark: str | None
+    :param lookup_watermark: The result of the lookup query, if there is one.
+    :type lookup_watermark: str | None
+    :return: A hex digest, or None if a change to the source could not be detected.
+    :rtype: str | None
+    """
+    if configuration.mapping_fingerprint is None or configuration.result_cache is None:
+        return None
+
+    if watermark is None and (configuration.query is not None or configuration.file_type in QUERY_FILE_TYPES):
+        return None
+
+    if lookup_watermark is None and not configuration.result_cache.ignore_lookups and has_lookups(configuration):
+        return None
+
+    parts = [configuration.mapping_fingerprint, configuration_fingerprint(configuration), pancham_version(), watermark]
+
+    if lookup_watermark is not None:
+        parts.append({'lookups': lookup_watermark})
+
+    if configuration.query is None:
+        for file_path in file_loader.reduce_file_paths(configuration, pancham_configuration):
+            path = file_path['path'] if type(file_path) is dict else file_path
+
+            if not os.path.isfile(path):
+                if watermark is None:
+                    return None
+                continue
+
+            if configuration.result_cache.hash_content:
+                parts.append(_hash_file(path))
+            else:
+                parts.append(file_stamp(path))
+
+    return hashlib.sha256(json.dumps(parts, default=str).encode('utf-8')).hexdigest()
+
+
+def has_lookups(configuration: DataFrameConfiguration) -> bool:
+    """
+    Checks whether the result of a mapping depends on data outside its source.
+
+    :param configuration: The mapping.
+    :type configuration: DataFrameConfiguration
+    :return: True if a field of the mapping looks values up or runs a dynamic module.
+    :rtype: bool
+    """
+    return any(f.parser_name in LOOKUP_PARSERS for f in configuration.fields)
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(FILE_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+
+    return digest.hexdigest()
@@ -1,96 +1,117 @@
-from typing import Optional
+from typing import Optional, Iterator, Any, Callable
 
 import pandas as pd
+from sqlalchemy import text
 
-from .validation import ContainsValidation, MatchingValidation, NotAllNullValidation, NotNullValidation, OneOfValidation
 from .validation_field import ValidationStep, ValidationInput
-from .configuration.database_match_field_parser import DatabaseMatchFieldParser
-from .configuration import DynamicFieldParser, DateTimeFieldParser, RemoveFieldParser, RegexExtractFieldParser, ToBoolFieldParser, SFLookupFieldParser, FillNanFieldParser, DatabaseFixedFieldParser, DatabaseMultiFieldSearchParser, StaticFieldParser, ToIntFieldParser, FieldParser, MatchFieldParser, SplitFieldParser, PartTextExtractorParser, ConcatFieldParser, TextFieldParser, EmailRegexMatchParser, RegexMatchFieldParser, NumberFormatFieldParser
-from .configuration.explode_field_parser import ExplodeFieldParser
-from .configuration.deduplicate_field_parser import DeduplicateFieldParser
+from .configuration.field_parser import FieldParser
 from .data_frame_configuration import DataFrameConfiguration
-from .data_frame_loader import DataFrameLoader
+from .data_frame_loader import DataFrameLoader, DataFrameOutput
+from .checkpoint import Checkpoint, CheckpointStore, source_fingerprint
 from .data_frame_configuration_loader import YamlDataFrameConfigurationLoader
-from .database.database_engine import initialize_db_engine
-from .database.sql_file_loader import SqlFileLoader, SqlExecuteFileLoader
-from .database.database_output import DatabaseOutput
-from .file_loader import FileLoader, ExcelFileLoader, YamlFileLoader, CsvFileLoader, JsonFileLoader
-from .output_configuration import OutputWriter, OutputConfiguration
+from .deduplication import GlobalDeduplication, deduplicates_across_chunks
+from .database.database_engine import initialize_db_engine, get_db_engine
+from .database.sql_pushdown import SqlPushdownOptimizer
+from .database.database_search_manager import count_cached_search_values, describe_search_caches
+from .mapping_cache import MappingFileCache
+from .file_loader import FileLoader, ChunkPosition
+from .incremental_state import IncrementalStateStore, IncrementalTracker
+from .output_configuration import OutputWriter, OutputConfiguration, OutputActivitySet
+from .output_executor import OutputExecutor
 from .pancham_configuration import PanchamConfiguration, OrderedPanchamConfiguration
+from .pipeline_executor import PipelinedExecutor
+from .profiler import peak_rss
+from .plugin_registry import default_file_loaders, default_field_parsers, default_outputs, default_validation_rules
 from .reporter import Reporter, PrintReporter, get_reporter
-from .integration import SalesforceBulkOutputConfiguration, SalesforceCsvBulkOutputConfiguration, SalesforceRestUpdateOutputConfiguration
-from .integration.salesforce_query_loader import SalesforceQueryLoader
-
-DEFAULT_LOADERS = {
-    'xlsx': ExcelFileLoader(),
-    'sql_file': SqlFileLoader(),
-    'sql_execute': SqlExecuteFileLoader(),
-    'yaml': YamlFileLoader(),
-    'csv': CsvFileLoader(),
-    'json': JsonFileLoader(),
-    'soql': SalesforceQueryLoader()
-}
+from .reporter_lib.telemetry_reporter import TelemetryReporter
+from .tool.frame_tools import enable_copy_on_write
+from .result_cache import ResultCache, ResultCacheEntry, output_fingerprint, result_fingerprint
+
 DEFAULT_REPORTER = PrintReporter()
 
-DEFAULT_FIELD_PARSERS = [
-    TextFieldParser(),
-    MatchFieldParser(),
-    DateTimeFieldParser(),
-    DynamicFieldParser(),
-    ToIntFieldParser(),
-    PartTextExtractorParser(),
-    StaticFieldParser(),
-    DatabaseMatchFieldParser(),
-    DatabaseFixedFieldParser(),
-    SplitFieldParser(),
-    ExplodeFieldParser(),
-    ConcatFieldParser(),
-    DatabaseMultiFieldSearchParser(),
-    RemoveFieldParser(),
-    DeduplicateFieldParser(),
-    RegexMatchFieldParser(),
-    RegexExtractFieldParser(),
-    EmailRegexMatchParser(),
-    SFLookupFieldParser(),
-    FillNanFieldParser(),
-    ToBoolFieldParser(),
-    NumberFormatFieldParser()
-]
-DEFAULT_OUTPUTS = [
-    DatabaseOutput(),
-    SalesforceBulkOutputConfiguration(),
-    SalesforceCsvBulkOutputConfiguration(),
-    SalesforceRestUpdateOutputConfiguration()
-]
-DEFAULT_VALIDATION_RULES = [
-    NotNullValidation(),
-    OneOfValidation(),
-    NotAllNullValidation(),
-    MatchingValidation(),
-    ContainsValidation()
-]
+# The default loaders, parsers, outputs and validation rules are built on first use
+# and each plugin is only imported once a configuration needs it
+_DEFAULT_FACTORIES = {
+    'DEFAULT_LOADERS': default_file_loaders,
+    'DEFAULT_FIELD_PARSERS': default_field_parsers,
+    'DEFAULT_OUTPUTS': default_outputs,
+    'DEFAULT_VALIDATION_RULES': default_validation_rules
+}
+
+
+def _get_default(name: str):
+    if name not in globals():
+        globals()[name] = _DEFAULT_FACTORIES[name]()
+
+    return globals()[name]
+
+
+def __getattr__(name: str):
+    if name in _DEFAULT_FACTORIES:
+        return _get_default(name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def start_pancham(
         configuration: str,
         data_configuration: Optional[str],
-        test: bool = False
+        test: bool = False,
+        profile: bool = False,
+        resume: bool = False
 ):
     print("Starting Pancham!")
     pancham_configuration = OrderedPanchamConfiguration(configuration)
 
-    reporter = get_reporter(pancham_configuration.debug_status)
+    if profile:
+        pancham_configuration.config_data['profile_enabled'] = True
+
+    # Chunks are not copied as they are processed, set once as pandas options apply to the whole process
+    if pancham_configuration.copy_on_write:
+        enable_copy_on_write()
+
+    reporter = create_reporter(pancham_configuration)
 
     print(f"Reporter enabled - Debug = {pancham_configuration.debug_status}")
-    runner = PanchamRunner(pancham_configuration, reporter = reporter)
+    runner = PanchamRunner(pancham_configuration, reporter = reporter, resume = resume)
 
-    if data_configuration is not None:
-        runner.load_and_run(data_configuration)
-    else:
-        if test:
-            runner.run_all_tests()
+    try:
+        if data_configuration is not None:
+            runner.load_and_run(data_configuration)
         else:
-            runner.run_all()
-
+            if test:
+                runner.run_all_tests()
+            else:
+                runner.run_all()
+    finally:
+        if isinstance(reporter, TelemetryReporter):
+            reporter.close()
+
+
+
+def create_reporter(pancham_configuration: PanchamConfiguration, keep_profiles: bool|None = None) -> Reporter:
+    """
+    Creates the global reporter selected by the configuration, the telemetry
+    reporter must be closed once the runs are complete.
+
+    :param pancham_configuration: The configuration for the runs.
+    :type pancham_configuration: PanchamConfiguration
+    :param keep_profiles: Whether the telemetry reporter keeps the stage profiles,
+        by default when profiling is enabled.
+    :type keep_profiles: bool | None
+    :return: The reporter.
+    :rtype: Reporter
+    """
+    if pancham_configuration.reporter_name == 'telemetry':
+        return get_reporter(pancham_configuration.debug_status, TelemetryReporter(
+            pancham_configuration.debug_status,
+            prometheus_file=pancham_configuration.telemetry_prometheus_file,
+            metrics_log=pancham_configuration.telemetry_metrics_log,
+            interval=pancham_configuration.telemetry_interval,
+            keep_profiles=pancham_configuration.profile_enabled if keep_profiles is None else keep_profiles
+        ))
+
+    return get_reporter(pancham_configuration.debug_status)
 
 
 class PanchamRunner:
@@ -101,13 +122,18 @@ class PanchamRunner:
                  reporter: Reporter | None = None,
                  field_parsers: list[FieldParser] | None = None,
                  outputs_configuration: list[OutputConfiguration] | None = None,
-                 validation_rules: list[ValidationStep] | None = None
+                 validation_rules: list[ValidationStep] | None = None,
+                 resume: bool = False
                 ):
         self.pancham_configuration = pancham_configuration
+        self.resume = resume
         self.loaded_outputs: dict[str, OutputWriter] = {}
+        self.output_executor: OutputExecutor | None = None
+        self.__chunk_listeners: dict[int, Callable[[pd.DataFrame], None]] = {}
+        self.__cache_usage: dict[tuple[str, str], dict[str, str|int]] = {}
 
         if file_loaders is None:
-            self.file_loaders = DEFAULT_LOADERS
+            self.file_loaders = _get_default('DEFAULT_LOADERS')
         else:
             self.file_loaders = file_loaders
 
@@ -117,21 +143,22 @@ class PanchamRunner:
             self.reporter = reporter
 
         if field_parsers is None:
-            self.field_parsers = DEFAULT_FIELD_PARSERS
+            self.field_parsers = _get_default('DEFAULT_FIELD_PARSERS')
         else:
             self.field_parsers = field_parsers
 
         if outputs_configuration is None:
-            self.outputs_configuration = DEFAULT_OUTPUTS
+            self.outputs_configuration = _get_default('DEFAULT_OUTPUTS')
         else:
             self.outputs_configuration = outputs_configuration
 
         if validation_rules is None:
-            self.validation_rules = DEFAULT_VALIDATION_RULES
+            self.validation_rules = _get_default('DEFAULT_VALIDATION_RULES')
         else:
             self.validation_rules = validation_rules
 
         self.loader = DataFrameLoader(self.file_loaders, self.reporter, self.pancham_configuration)
+        self.reporter.watch('cache_entries', self.__get_cache_sizes)
 
     def run_all(self):
         """
@@ -150,15 +177,25 @@ class PanchamRunner:
             or process accordingly.
         :return: None
         """
-        configuration_loader = YamlDataFrameConfigurationLoader(field_parsers=self.field_parsers, output_configuration=self.outputs_configuration)
+        self.__configure_validation_failures()
+        configuration_loader = self.__get_configuration_loader()
         loaders = list(map(lambda f: configuration_loader.load(f), self.pancham_configuration.mapping_files))
 
         for l in loaders:
-            self.reporter.report_configuration(l)
-            self.run(l)
-            self.run_validation(l)
-
+            self.loader.register_configuration(l)
+
+        try:
+            for l in loaders:
+                self.reporter.report_configuration(l)
+                self.run(l)
+                self.run_validation(l)
+        finally:
+            self.loader.clear_cache()
+            self.__shutdown_output_executor()
+
+        self.__clear_checkpoints(loaders)
         self.reporter.report_validation_failure()
+        self.__report_profile()
 
     def run_all_tests(self):
         """
@@ -170,33 +207,47 @@ class PanchamRunner:
         :raises ReportError: If there is an issue generating the validation failure report.
         :return: None
         """
-        configuration_loader = YamlDataFrameConfigurationLoader(field_parsers=self.field_parsers, output_configuration=self.outputs_configuration)
+        self.__configure_validation_failures()
+        configuration_loader = self.__get_configuration_loader()
         loaders = list(map(lambda f: configuration_loader.load(f), self.pancham_configuration.test_files))
 
         for l in loaders:
-            self.run_validation(l)
+            self.loader.register_configuration(l)
+
+        try:
+            for l in loaders:
+                self.run_validation(l)
+        finally:
+            self.loader.clear_cache()
 
         self.reporter.report_validation_failure()
 
     def load_and_run(self, configuration_file: str):
-        configuration_loader = YamlDataFrameConfigurationLoader(field_parsers=self.field_parsers, output_configuration=self.outputs_configuration)
+        self.__configure_validation_failures()
+        configuration_loader = self.__get_configuration_loader()
         configuration = configuration_loader.load(configuration_file)
 
         self.reporter.report_configuration(configuration)
+        self.loader.register_configuration(configuration)
 
-        self.run(configuration)
-        self.run_validation(configuration)
+        try:
+            self.run(configuration)
+            self.run_validation(configuration)
+        finally:
+            self.loader.clear_cache()
+            self.__shutdown_output_executor()
+
+        self.__clear_checkpoints([configuration])
         self.reporter.report_validation_failure()
+        self.__report_profile()
 
     def run(self, configuration: DataFrameConfiguration):
         """
-        Executes the data loading and writing process based on the provided configuration.
+        Loads, processes and writes a configuration to each of its outputs.
 
-        The method initializes a DataFrameLoader with the given file loaders and
-        reporter, then uses it to load data as specified in the input configuration.
-        Once the data is loaded, it iterates over the output specifications defined
-        in the configuration and writes the data to each output destination by obtaining
-        the appropriate writer.
+        Mappings with a result cache are skipped when nothing has changed, and when the
+        runner resumes a failed run, mappings it already completed are skipped. When
+        checkpoints are kept, the mapping is recorded as completed once it finishes.
 
         :param configuration: Configuration object defining how the data will be
             loaded and written. This includes input details for loading the data
@@ -209,17 +260,288 @@ class PanchamRunner:
         if configuration.name.startswith('test'):
             return
 
+        checkpoint_store = CheckpointStore(self.pancham_configuration.checkpoint_dir)
+        fingerprint = self.__get_source_fingerprint(configuration)
+        if self.resume and self.__is_completed(checkpoint_store.load(configuration.name), fingerprint):
+            self.reporter.report_info(f"{configuration.name} was completed by the run being resumed, skipping")
+            return
+
         self.reporter.report_info(f"Starting run for {configuration.name}")
 
-        for data in self.loader.load(configuration):
-            self.reporter.report_debug(f'Writing data {len(data.processed)}')
-            self.__write_output(configuration, data.processed, self.loader)
+        # The rows are only estimated to give the progress exported by telemetry an ETA
+        estimated_rows = self.loader.estimate_rows(configuration) if self.reporter.is_telemetry_enabled() else None
+        self.reporter.report_run_start(configuration.name, estimated_rows)
 
-            for post_run_configuration in configuration.post_run_configuration:
-                input_data = data.get_required_dataframe(post_run_configuration.merge_configuration)
-                post_run_data = self.loader.process_dataframe(input_data, post_run_configuration)
+        if configuration.result_cache is not None:
+            self.__run_cached(configuration)
+        else:
+            self.__run_configuration(configuration)
+
+        if self.__keeps_checkpoints():
+            checkpoint_store.save(configuration.name, Checkpoint(fingerprint, 0, ChunkPosition(0, 0), completed=True))
+        self.__report_dtype_savings(configuration)
+        self.__record_cache_usage()
+
+    def __run_configuration(self, configuration: DataFrameConfiguration):
+        """
+        Runs a configuration, deduplicating iterated configurations across all of their
+        chunks. When a deduplicated field keeps the best row of each key, the source is
+        read once more beforehand to find those rows.
+        """
+        if not deduplicates_across_chunks(configuration):
+            self.__run_source(configuration)
+            return
+
+        with GlobalDeduplication(
+                configuration,
+                self.pancham_configuration.deduplication_memory_limit,
+                self.pancham_configuration.deduplication_spill_dir
+        ) as deduplication:
+            for field in deduplication.keep_best_fields:
+                self.reporter.report_info(f"Finding the best rows of {field.name} in {configuration.name}")
+                deduplication.start_pass()
+                deduplication.collect(
+                    field,
+                    self.__read_source(configuration),
+                    lambda source_df: self.loader.process_until(source_df, configuration, field)
+                )
+
+            deduplication.start_pass()
+            self.__run_source(configuration)
+
+    def __read_source(self, configuration: DataFrameConfiguration) -> Iterator[pd.DataFrame]:
+        """
+        Reads the chunks of a configuration as they are passed to processing.
+        """
+        chunks = self.loader.load_file(configuration)
+
+        if configuration.incremental is None:
+            return chunks
+
+        # The state is only read, so a separate tracker filters the same rows as the run
+        tracker = IncrementalTracker(configuration.incremental, IncrementalStateStore(self.pancham_configuration.incremental_state_dir), configuration.name)
+        return tracker.filter(chunks)
+
+    def __run_source(self, configuration: DataFrameConfiguration):
+        if configuration.incremental is not None:
+            self.__run_incremental(configuration)
+            return
+
+        if configuration.use_iterator:
+            self.__run_checkpointed(configuration)
+            return
+
+        self.__run_chunks(
+            self.loader.load_file(configuration),
+            lambda source_df: self.loader.process_chunk(source_df, configuration),
+            lambda data: self.__write_chunk(configuration, data)
+        )
+
+    def __run_chunks(self, chunks: Iterator[Any], transform: Callable[[Any], Any], write: Callable[[Any], None]):
+        """
+        Transforms and writes each chunk, overlapping the stages when the `pipeline`
+        feature is enabled.
+        """
+        if self.pancham_configuration.has_feature_enabled('pipeline'):
+            executor = PipelinedExecutor(self.pancham_configuration.pipeline_queue_size)
+            self.reporter.watch('queue_depth', executor.queue_depths)
+
+            try:
+                executor.run(chunks, transform, write)
+            finally:
+                self.reporter.unwatch('queue_depth')
+            return
+
+        for chunk in chunks:
+            write(transform(chunk))
+
+    def __run_checkpointed(self, configuration: DataFrameConfiguration):
+        """
+        Runs an iterated configuration, saving a checkpoint once each chunk has been
+        written to every output when checkpoints are kept. The checkpoint is marked
+        completed by `run`.
+
+        :param configuration: An iterated configuration.
+        :type configuration: DataFrameConfiguration
+        :return: None
+        """
+        store = CheckpointStore(self.pancham_configuration.checkpoint_dir)
+        fingerprint = self.__get_source_fingerprint(configuration)
+        checkpoint = store.load(configuration.name) if self.resume else None
+        keep_checkpoints = self.__keeps_checkpoints()
+
+        if checkpoint is not None and checkpoint.fingerprint != fingerprint:
+            self.reporter.report_info(f"Checkpoint for {configuration.name} is for a different source, starting from the first chunk")
+            checkpoint = None
+
+        # The keys in the written chunks would not be known to the deduplication
+        if checkpoint is not None and deduplicates_across_chunks(configuration):
+            self.reporter.report_info(f"{configuration.name} is deduplicated across chunks, starting from the first chunk")
+            checkpoint = None
+
+        completed = 0
+        start = None
+        if checkpoint is not None:
+            completed = checkpoint.chunks
+            start = checkpoint.position
+            self.reporter.report_info(f"Resuming {configuration.name} after {completed} chunks")
+
+        def write(item: tuple[ChunkPosition, DataFrameOutput]):
+            nonlocal completed
+            position, data = item
+
+            self.__write_chunk(configuration, data)
+            completed += 1
+            if keep_checkpoints:
+                store.save(configuration.name, Checkpoint(fingerprint, completed, position))
+
+        self.__run_chunks(
+            self.loader.load_chunks(configuration, start),
+            lambda item: (item[0], self.loader.process_chunk(item[1], configuration)),
+            write
+        )
+
+    def __is_completed(self, checkpoint: Checkpoint|None, fingerprint: str) -> bool:
+        return checkpoint is not None and checkpoint.completed and checkpoint.fingerprint == fingerprint
+
+    def __keeps_checkpoints(self) -> bool:
+        """
+        Checkpoints are only written when the run can be resumed, by a runner that is
+        resuming or when they are turned on in the Pancham configuration.
+        """
+        return self.resume or self.pancham_configuration.checkpoint_enabled
+
+    def __get_source_fingerprint(self, configuration: DataFrameConfiguration) -> str:
+        file_loader = self.file_loaders.get(configuration.file_type, FileLoader())
+
+        return source_fingerprint(configuration, file_loader, self.pancham_configuration)
+
+    def __clear_checkpoints(self, configurations: list[DataFrameConfiguration]):
+        """
+        Removes the checkpoints of a run once every configuration has completed, so
+        the next run writes them all again.
+        """
+        if not self.__keeps_checkpoints():
+            return
+
+        store = CheckpointStore(self.pancham_configuration.checkpoint_dir)
+
+        for configuration in configurations:
+            store.clear(configuration.name)
+
+    def __run_cached(self, configuration: DataFrameConfiguration):
+        """
+        Runs a configuration unless the fingerprint of its inputs and mapping matches
+        the last completed run. When the processed output was stored, outputs added
+        since then are written from the stored chunks instead of skipped.
+
+        :param configuration: A configuration with a result cache.
+        :type configuration: DataFrameConfiguration
+        :return: None
+        """
+        fingerprint = self.__get_result_fingerprint(configuration)
+
+        if fingerprint is None:
+            self.reporter.report_info(f"Changes to the inputs of {configuration.name} cannot be detected, results are not cached")
+            self.__run_configuration(configuration)
+            return
+
+        cache = ResultCache(self.pancham_configuration.result_cache_dir)
+        outputs = {output_fingerprint(o.primary_writer): o for o in configuration.output}
+        entry = cache.load(configuration.name)
 
-                self.__write_output(post_run_configuration, post_run_data, self.loader)
+        if entry is not None and entry.fingerprint == fingerprint:
+            pending = [k for k in outputs if k not in entry.outputs]
+
+            if len(pending) == 0:
+                self.reporter.report_info(f"{configuration.name} has not changed since the last run, skipping")
+                return
+
+            if entry.chunks > 0:
+                self.reporter.report_info(f"{configuration.name} has not changed, writing stored output to {len(pending)} new outputs")
+                for data in cache.read_chunks(configuration.name, entry.chunks):
+                    for key in pending:
+                        self.__write_to(configuration, outputs[key], data, self.loader)
+
+                cache.save(configuration.name, ResultCacheEntry(fingerprint, entry.outputs + pending, entry.chunks))
+                return
+
+        # The entry of the last run is invalid as soon as the outputs are written again
+        cache.clear(configuration.name)
+        chunks = 0
+
+        def store_chunk(data: pd.DataFrame):
+            nonlocal chunks
+            cache.store_chunk(configuration.name, chunks, data)
+            chunks += 1
+
+        if configuration.result_cache.store_output:
+            self.__chunk_listeners[id(configuration)] = store_chunk
+
+        try:
+            self.__run_configuration(configuration)
+        finally:
+            self.__chunk_listeners.pop(id(configuration), None)
+
+        cache.save(configuration.name, ResultCacheEntry(fingerprint, list(outputs), chunks))
+
+    def __get_result_fingerprint(self, configuration: DataFrameConfiguration) -> str|None:
+        watermark = self.__read_watermark(configuration.result_cache.watermark_query)
+        lookup_watermark = self.__read_watermark(configuration.result_cache.lookup_query)
+        file_loader = self.file_loaders.get(configuration.file_type, FileLoader())
+
+        return result_fingerprint(configuration, file_loader, self.pancham_configuration, watermark, lookup_watermark)
+
+    def __read_watermark(self, query: str|None) -> str|None:
+        if query is None:
+            return None
+
+        with get_db_engine().engine.connect() as connection:
+            return str(connection.execute(text(query)).scalar())
+
+    def __run_incremental(self, configuration: DataFrameConfiguration):
+        """
+        Runs a configuration with only the new and changed rows of its source, then
+        writes the deleted keys to the deleted outputs if deletes are detected. The
+        state is not saved when an output rejected rows, so they are read again.
+
+        :param configuration: An incremental configuration.
+        :type configuration: DataFrameConfiguration
+        :return: None
+        """
+        incremental = configuration.incremental
+        tracker = IncrementalTracker(incremental, IncrementalStateStore(self.pancham_configuration.incremental_state_dir), configuration.name)
+        failed_rows = self.__count_failed_rows(configuration)
+
+        self.__run_chunks(
+            tracker.filter(self.loader.load_file(configuration)),
+            lambda source_df: self.loader.process_chunk(source_df, configuration),
+            lambda data: self.__write_chunk(configuration, data)
+        )
+        self.reporter.report_info(f"{tracker.rows_changed} of {tracker.rows_read} rows changed in {configuration.name}")
+
+        if incremental.detect_deletes:
+            deleted = tracker.deleted_keys()
+            self.reporter.report_info(f"{len(deleted)} rows deleted from {configuration.name}")
+
+            if len(deleted) > 0 and incremental.deleted_configuration is not None:
+                deleted_data = self.loader.process_dataframe(deleted, incremental.deleted_configuration)
+                self.__write_output(incremental.deleted_configuration, deleted_data, self.loader)
+
+        # Rows rejected by an output are only retried if the state is left as it was
+        failed_rows = self.__count_failed_rows(configuration) - failed_rows
+        if failed_rows > 0:
+            self.reporter.report_info(f"{failed_rows} rows of {configuration.name} failed to write, its incremental state is not saved")
+            return
+
+        tracker.commit()
+
+    def __count_failed_rows(self, configuration: DataFrameConfiguration) -> int:
+        configurations = [configuration, *configuration.post_run_configuration]
+        if configuration.incremental is not None and configuration.incremental.deleted_configuration is not None:
+            configurations.append(configuration.incremental.deleted_configuration)
+
+        return sum(o.primary_writer.failed_rows for c in configurations for o in c.output)
 
     def run_validation(self, configuration: DataFrameConfiguration):
         """
@@ -251,6 +573,105 @@ class PanchamRunner:
                         for failure in failures:
                             self.reporter.save_validation_failure(failure)
 
+    def __write_chunk(self, configuration: DataFrameConfiguration, data: DataFrameOutput):
+        """
+        Writes a processed chunk to the outputs of the configuration, then processes
+        and writes each of the post run configurations.
+
+        When the `parallel_output` feature is enabled the outputs are written
+        concurrently, each receiving a shallow copy of the processed data. Post run
+        configurations with `wait_for_output` disabled run alongside the outputs,
+        the others run concurrently once every output has been written.
+
+        :param configuration: The configuration that produced the chunk.
+        :type configuration: DataFrameConfiguration
+        :param data: The source and processed data for the chunk.
+        :type data: DataFrameOutput
+        :return: None
+        """
+        self.reporter.report_debug(lambda: f'Writing data {len(data.processed)}')
+
+        if id(configuration) in self.__chunk_listeners:
+            self.__chunk_listeners[id(configuration)](data.processed)
+
+        if not self.pancham_configuration.has_feature_enabled('parallel_output'):
+            self.__write_output(configuration, data.processed, self.loader)
+
+            for post_run_configuration in configuration.post_run_configuration:
+                self.__run_post_run_configuration(post_run_configuration, data)
+
+            self.reporter.report_chunk_written(configuration.name, len(data.processed))
+            return
+
+        executor = self.__get_output_executor()
+        output_tasks = [
+            lambda o=output_writer: self.__write_to(configuration, o, data.processed.copy(deep=False), self.loader)
+            for output_writer in configuration.output
+        ]
+        independent_tasks = [
+            lambda c=post_run_configuration: self.__run_post_run_configuration(c, data)
+            for post_run_configuration in configuration.post_run_configuration
+            if not post_run_configuration.wait_for_output
+        ]
+        dependent_tasks = [
+            lambda c=post_run_configuration: self.__run_post_run_configuration(c, data)
+            for post_run_configuration in configuration.post_run_configuration
+            if post_run_configuration.wait_for_output
+        ]
+
+        executor.run(output_tasks + independent_tasks)
+        executor.run(dependent_tasks)
+
+        self.reporter.report_chunk_written(configuration.name, len(data.processed))
+
+    def __run_post_run_configuration(self, post_run_configuration: DataFrameConfiguration, data: DataFrameOutput):
+        """
+        Processes the data required by a post run configuration and writes it to the
+        configuration's outputs.
+
+        :param post_run_configuration: The post run step to execute.
+        :type post_run_configuration: DataFrameConfiguration
+        :param data: The source and processed data for the chunk.
+        :type data: DataFrameOutput
+        :return: None
+        """
+        input_data = data.get_required_dataframe(post_run_configuration.merge_configuration)
+        post_run_data = self.loader.process_dataframe(input_data, post_run_configuration)
+
+        self.__write_output(post_run_configuration, post_run_data, self.loader)
+
+    def __get_configuration_loader(self) -> YamlDataFrameConfigurationLoader:
+        mapping_cache = None
+        if self.pancham_configuration.mapping_cache_dir is not None:
+            mapping_cache = MappingFileCache(self.pancham_configuration.mapping_cache_dir)
+
+        sql_pushdown = SqlPushdownOptimizer(
+            self.pancham_configuration.database_connection,
+            source_dir=self.pancham_configuration.source_dir,
+            enabled=self.pancham_configuration.sql_pushdown is True
+        )
+
+        return YamlDataFrameConfigurationLoader(
+            field_parsers=self.field_parsers,
+            output_configuration=self.outputs_configuration,
+            mapping_cache=mapping_cache,
+            sql_pushdown=sql_pushdown
+        )
+
+    def __get_output_executor(self) -> OutputExecutor:
+        if self.output_executor is None:
+            self.output_executor = OutputExecutor(self.pancham_configuration.output_max_workers)
+
+        return self.output_executor
+
+    def __shutdown_output_executor(self):
+        """
+        Stops the output threads at the end of a set of runs, so a runner kept by a
+        long running process does not hold idle threads between jobs.
+        """
+        if self.output_executor is not None:
+            self.output_executor.shutdown()
+
     def __write_output(self, configuration: DataFrameConfiguration, output: pd.DataFrame, loader: DataFrameLoader):
         """
         Writes the given output DataFrame to the destinations specified in the
@@ -268,6 +689,15 @@ class PanchamRunner:
         :return: None
         """
         for output_writer in configuration.output:
+            self.__write_to(configuration, output_writer, output, loader)
+
+    def __write_to(self, configuration: DataFrameConfiguration, output_writer: OutputActivitySet, output: pd.DataFrame, loader: DataFrameLoader):
+        with loader.profiler.stage(
+                'output',
+                rows_in=len(output),
+                configuration=configuration.name,
+                writer=type(output_writer.primary_writer).__name__
+        ):
             output_writer.primary_writer.write(
                 output,
                 success_handler=output_writer.success_handler,
@@ -275,3 +705,50 @@ class PanchamRunner:
                 loader=loader
             )
 
+    def __report_dtype_savings(self, configuration: DataFrameConfiguration):
+        """
+        Reports the bytes dtype optimization saved in each column of a configuration.
+        """
+        saved = self.loader.pop_dtype_savings(configuration.name)
+
+        if len(saved) > 0:
+            columns = ', '.join(f"{column} {saved_bytes}" for column, saved_bytes in sorted(saved.items(), key=lambda item: -item[1]))
+            self.reporter.report_info(f"Optimizing dtypes saved {sum(saved.values())} bytes in {configuration.name}: {columns}")
+
+    def __get_cache_sizes(self) -> dict[str, int]:
+        return {**self.loader.cache_sizes(), 'database_search': count_cached_search_values()}
+
+    def __configure_validation_failures(self):
+        self.reporter.configure_validation_failures(
+            self.pancham_configuration.validation_failure_file,
+            self.pancham_configuration.validation_failure_sample_size,
+            self.pancham_configuration.validation_failure_max_rows
+        )
+
+    def __record_cache_usage(self):
+        """
+        Keeps the largest size seen of each cache for the memory profile. It is called
+        after each configuration, as file caches are released at the end of a set of
+        runs.
+        """
+        if not (self.pancham_configuration.profile_enabled and self.pancham_configuration.profile_memory):
+            return
+
+        for cache in describe_search_caches() + self.loader.describe_caches():
+            key = (cache['cache'], cache['name'])
+            if key not in self.__cache_usage or cache['bytes'] > self.__cache_usage[key]['bytes']:
+                self.__cache_usage[key] = cache
+
+    def __report_profile(self):
+        if not self.pancham_configuration.profile_enabled:
+            return
+
+        memory = None
+        if self.pancham_configuration.profile_memory:
+            memory = {
+                'peak_rss': peak_rss(),
+                'caches': sorted(self.__cache_usage.values(), key=lambda cache: -cache['bytes'])
+            }
+
+        self.reporter.report_profile(self.pancham_configuration.profile_output, memory)
+
@@ -0,0 +1,563 @@
+import json
+import os
+import signal
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Literal, Optional
+
+import pandas as pd
+
+from .database.database_engine import initialize_db_engine
+from .database.database_search_manager import clear_search_caches
+from .data_frame_configuration import DataFrameConfiguration
+from .pancham_configuration import PanchamConfiguration, OrderedPanchamConfiguration
+from .plugin_registry import default_file_loaders, default_field_parsers, default_outputs, default_validation_rules
+from .profiler import StageProfile
+from .reporter import Reporter, PrintReporter
+from .reporter_lib.telemetry_reporter import TelemetryReporter
+from .runner import PanchamRunner, create_reporter
+from .tool.frame_tools import enable_copy_on_write
+
+MAPPING_EXTENSIONS = ('.yml', '.yaml')
+MAX_FINISHED_JOBS = 1000
+
+WATCH_RUNNING_DIR = 'running'
+WATCH_DONE_DIR = 'done'
+WATCH_FAILED_DIR = 'failed'
+
+JobStatus = Literal['queued', 'running', 'succeeded', 'failed']
+
+
+@dataclass
+class ServerJob:
+    """
+    A mapping run requested from the server.
+
+    :ivar id: Identifier of the job.
+    :type id: str
+    :ivar mapping: Path of the mapping file to run, watched files are moved as the
+        job progresses.
+    :type mapping: str
+    :ivar source: How the job was submitted, 'api' or 'watch'.
+    :type source: str
+    :ivar status: Progress of the job.
+    :type status: str
+    :ivar submitted_at: Unix time the job was submitted.
+    :type submitted_at: float
+    :ivar started_at: Unix time the job started, None while queued.
+    :type started_at: float | None
+    :ivar finished_at: Unix time the job finished, None until then.
+    :type finished_at: float | None
+    :ivar error: The error that failed the job.
+    :type error: str | None
+    :ivar validation_failures: Validation failures found by the job, None until it
+        has finished.
+    :type validation_failures: int | None
+    """
+
+    id: str
+    mapping: str
+    source: str
+    status: JobStatus = 'queued'
+    submitted_at: float = 0.0
+    started_at: float|None = None
+    finished_at: float|None = None
+    error: str|None = None
+    validation_failures: int|None = None
+
+    def is_finished(self) -> bool:
+        """
+        :return: True once the job has succeeded or failed.
+        :rtype: bool
+        """
+        return self.status in ('succeeded', 'failed')
+
+
+class PanchamServer:
+    """
+    Runs mappings as jobs in a long running process, so the database engine, lookup
+    caches and Salesforce session are created once and shared by every job instead
+    of once per run.
+
+    Jobs are submitted over HTTP, or by dropping mapping files into the watched
+    directory. Dropped files are moved to `running` when they are picked up, then to
+    `done` or `failed`. Files are only picked up once they have not changed for a
+    poll interval, so partly copied files are left alone.
+
+    Jobs run on a pool of worker threads. Each job has its own runner, plugins and
+    reporter, so jobs running at the same time keep their file caches, validation
+    failures and stage profiles apart. Lookup caches and the Salesforce session are
+    cleared every `cache_ttl` seconds, or when requested, and loaded again by the
+    next job that needs them.
+
+    :ivar pancham_configuration: The configuration shared by every job.
+    :type pancham_configuration: PanchamConfiguration
+    :ivar reporter: The reporter the messages and telemetry of every job are passed to.
+    :type reporter: Reporter
+    :ivar runner_factory: Creates the runner of a job from the job's reporter.
+    :type runner_factory: Callable[[Reporter], PanchamRunner]
+    """
+
+    def __init__(
+            self,
+            pancham_configuration: PanchamConfiguration,
+            reporter: Reporter,
+            runner_factory: Callable[[Reporter], PanchamRunner]|None = None
+    ):
+        self.pancham_configuration = pancham_configuration
+        self.reporter = reporter
+
+        if runner_factory is None:
+            self.runner_factory = self.__create_runner
+        else:
+            self.runner_factory = runner_factory
+
+        self.__jobs: dict[str, ServerJob] = {}
+        self.__jobs_lock = threading.Lock()
+        self.__job_reporters: dict[str, _JobReporter] = {}
+        self.__gauges: set[str] = set()
+        self.__executor: ThreadPoolExecutor|None = None
+        self.__http_server: ThreadingHTTPServer|None = None
+        self.__threads: list[threading.Thread] = []
+        self.__stop_requested = threading.Event()
+        self.__caches_cleared = time.monotonic()
+
+    @property
+    def address(self) -> tuple[str, int]|None:
+        """
+        :return: The host and port jobs are accepted on over HTTP, None if HTTP is not used.
+        :rtype: tuple[str, int] | None
+        """
+        if self.__http_server is None:
+            return None
+
+        return self.__http_server.server_address[:2]
+
+    def start(self):
+        """
+        Starts the workers, the HTTP endpoint and the directory watcher.
+        """
+        initialize_db_engine(self.pancham_configuration, self.reporter)
+
+        self.__stop_requested.clear()
+        self.__caches_cleared = time.monotonic()
+        self.__executor = ThreadPoolExecutor(max_workers=self.pancham_configuration.server_workers, thread_name_prefix="pancham-worker")
+
+        port = self.pancham_configuration.server_port
+        if port is not None:
+            self.__http_server = ThreadingHTTPServer((self.pancham_configuration.server_host, port), _JobRequestHandler)
+            self.__http_server.daemon_threads = True
+            self.__http_server.pancham_server = self
+            self.__start_thread(self.__http_server.serve_forever, "pancham-http")
+
+        self.__start_thread(self.__schedule, "pancham-scheduler")
+
+    def serve(self):
+        """
+        Starts the server and blocks until `request_stop` is called, then waits for
+        the running jobs to finish.
+        """
+        self.start()
+
+        address = self.address
+        if address is not None:
+            self.reporter.report_info(f"Accepting jobs on http://{address[0]}:{address[1]}/jobs")
+
+        watch_dir = self.pancham_configuration.server_watch_dir
+        if watch_dir is not None:
+            self.reporter.report_info(f"Watching {watch_dir} for mapping files")
+
+        try:
+            while not self.__stop_requested.wait(1):
+                pass
+        finally:
+            self.stop()
+
+    def request_stop(self):
+        """
+        Asks a server started with `serve` to stop, safe to call from a signal handler.
+        """
+        self.__stop_requested.set()
+
+    def stop(self):
+        """
+        Stops accepting jobs and waits for the submitted jobs to finish.
+        """
+        self.__stop_requested.set()
+
+        if self.__http_server is not None:
+            self.__http_server.shutdown()
+            self.__http_server.server_close()
+            self.__http_server = None
+
+        for thread in self.__threads:
+            thread.join()
+        self.__threads = []
+
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+            self.__executor = None
+
+    def submit(self, mapping: str, source: str = 'api') -> ServerJob:
+        """
+        Queues a run of a mapping file.
+
+        :param mapping: Path of the mapping file.
+        :type mapping: str
+        :param source: How the job was submitted.
+        :type source: str
+        :return: The queued job.
+        :rtype: ServerJob
+        :raises ValueError: If the mapping file does not exist or the server is not started.
+        """
+        if not os.path.isfile(mapping):
+            raise ValueError(f"Mapping file {mapping} not found")
+
+        return self.__queue(ServerJob(id=uuid.uuid4().hex, mapping=mapping, source=source, submitted_at=time.time()))
+
+    def get_job(self, job_id: str) -> ServerJob|None:
+        """
+        :param job_id: Identifier of the job.
+        :type job_id: str
+        :return: The job, or None if it is not known.
+        :rtype: ServerJob | None
+        """
+        with self.__jobs_lock:
+            return self.__jobs.get(job_id, None)
+
+    def list_jobs(self) -> list[ServerJob]:
+        """
+        :return: The queued and running jobs, and the most recent finished jobs, oldest first.
+        :rtype: list[ServerJob]
+        """
+        with self.__jobs_lock:
+            return list(self.__jobs.values())
+
+    def invalidate_caches(self):
+        """
+        Clears the lookup caches and the Salesforce session, they are loaded again by
+        the next job that needs them.
+        """
+        clear_search_caches()
+
+        # Only loaded by mappings that use Salesforce
+        salesforce_connection = sys.modules.get('pancham.integration.salesforce_connection', None)
+        if salesforce_connection is not None:
+            salesforce_connection.clear_connection()
+
+        self.__caches_cleared = time.monotonic()
+        self.reporter.report_info("Lookup caches cleared")
+
+    def scan_watch_dir(self) -> list[ServerJob]:
+        """
+        Queues the mapping files in the watched directory that have not changed for
+        a poll interval.
+
+        :return: The queued jobs.
+        :rtype: list[ServerJob]
+        """
+        watch_dir = self.pancham_configuration.server_watch_dir
+        if watch_dir is None or not os.path.isdir(watch_dir):
+            return []
+
+        settled = time.time() - self.pancham_configuration.server_poll_interval
+        jobs = []
+
+        for name in sorted(os.listdir(watch_dir)):
+            path = os.path.join(watch_dir, name)
+            if not name.endswith(MAPPING_EXTENSIONS) or not os.path.isfile(path) or os.path.getmtime(path) > settled:
+                continue
+
+            job = ServerJob(id=uuid.uuid4().hex, mapping=path, source='watch', submitted_at=time.time())
+            job.mapping = _move_to(path, WATCH_RUNNING_DIR, f"{job.id}_{name}")
+            jobs.append(self.__queue(job))
+
+        return jobs
+
+    def __queue(self, job: ServerJob) -> ServerJob:
+        if self.__executor is None:
+            raise ValueError("The server is not started")
+
+        with self.__jobs_lock:
+            self.__jobs[job.id] = job
+            self.__prune_jobs()
+
+        self.__executor.submit(self.__run_job, job)
+        return job
+
+    def __run_job(self, job: ServerJob):
+        job.status = 'running'
+        job.started_at = time.time()
+        self.reporter.report_info(f"Starting job {job.id} for {job.mapping}")
+
+        worker = threading.current_thread().name
+        reporter = _JobReporter(self.reporter, worker, self.__watch_gauge)
+        with self.__jobs_lock:
+            self.__job_reporters[worker] = reporter
+
+        try:
+            self.runner_factory(reporter).load_and_run(job.mapping)
+            job.status = 'succeeded'
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+            self.reporter.report_error(e)
+        finally:
+            with self.__jobs_lock:
+                self.__job_reporters.pop(worker, None)
+
+        job.validation_failures = reporter.validation_failures.count
+        job.finished_at = time.time()
+
+        if job.source == 'watch':
+            job.mapping = _move_to(job.mapping, WATCH_DONE_DIR if job.status == 'succeeded' else WATCH_FAILED_DIR)
+
+        self.reporter.report_info(f"Job {job.id} {job.status} in {job.finished_at - job.started_at:.2f}s")
+
+    def __create_runner(self, reporter: Reporter) -> PanchamRunner:
+        # The default plugins hold file caches, so each job has its own
+        return PanchamRunner(
+            self.pancham_configuration,
+            file_loaders=default_file_loaders(),
+            reporter=reporter,
+            field_parsers=default_field_parsers(),
+            outputs_configuration=default_outputs(),
+            validation_rules=default_validation_rules()
+        )
+
+    def __watch_gauge(self, name: str):
+        with self.__jobs_lock:
+            if name in self.__gauges:
+                return
+            self.__gauges.add(name)
+
+        self.reporter.watch(name, lambda: self.__read_gauge(name))
+
+    def __read_gauge(self, name: str) -> dict[str, int|float]:
+        """
+        Reads a value watched by the running jobs, keyed by the worker running each job.
+        """
+        with self.__jobs_lock:
+            reporters = list(self.__job_reporters.values())
+
+        values = {}
+        for reporter in reporters:
+            read = reporter.gauges.get(name, None)
+            if read is not None:
+                values.update({f"{reporter.worker}.{key}": value for key, value in read().items()})
+
+        return values
+
+    def __schedule(self):
+        interval = self.pancham_configuration.server_poll_interval
+        cache_ttl = self.pancham_configuration.server_cache_ttl
+
+        while not self.__stop_requested.wait(interval):
+            try:
+                self.scan_watch_dir()
+
+                if cache_ttl > 0 and time.monotonic() - self.__caches_cleared >= cache_ttl:
+                    self.invalidate_caches()
+            except Exception as e:
+                self.reporter.report_error(e)
+
+    def __prune_jobs(self):
+        finished = [job.id for job in self.__jobs.values() if job.is_finished()]
+
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.__jobs[job_id]
+
+    def __start_thread(self, target: Callable[[], None], name: str):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self.__threads.append(thread)
+
+
+class _JobReporter(PrintReporter):
+    """
+    The reporter of a single job. Messages and telemetry are passed to the server's
+    reporter, while validation failures and stage profiles are kept for the job.
+
+    :ivar reporter: The server's reporter.
+    :type reporter: Reporter
+    :ivar worker: Name of the worker running the job.
+    :type worker: str
+    :ivar gauges: The values watched by the job, by name.
+    :type gauges: dict[str, Callable[[], dict[str, int | float]]]
+    """
+
+    def __init__(self, reporter: Reporter, worker: str, watch_gauge: Callable[[str], None]):
+        super().__init__(reporter.is_debug_enabled())
+        self.reporter = reporter
+        self.worker = worker
+        self.gauges: dict[str, Callable[[], dict[str, int|float]]] = {}
+        self.__watch_gauge = watch_gauge
+
+    def report_start(self, file_path: str):
+        self.reporter.report_start(file_path)
+
+    def report_error(self, error: Exception):
+        self.reporter.report_error(error)
+
+    def report_end(self, file_path: str, data: pd.DataFrame):
+        self.reporter.report_end(file_path, data)
+
+    def report_configuration(self, configuration: DataFrameConfiguration):
+        self.reporter.report_configuration(configuration)
+
+    def is_debug_enabled(self) -> bool:
+        return self.reporter.is_debug_enabled()
+
+    def report_debug(self, debug_message: str|Callable[[], str], data: Any|Callable[[], Any]|None = None):
+        self.reporter.report_debug(debug_message, data)
+
+    def report_info(self, message: str):
+        self.reporter.report_info(message)
+
+    def save_stage_profile(self, profile: StageProfile):
+        super().save_stage_profile(profile)
+
+        if self.reporter.is_telemetry_enabled():
+            self.reporter.save_stage_profile(profile)
+
+    def is_telemetry_enabled(self) -> bool:
+        return self.reporter.is_telemetry_enabled()
+
+    def report_run_start(self, name: str, estimated_rows: int|None = None):
+        self.reporter.report_run_start(name, estimated_rows)
+
+    def report_chunk_written(self, name: str, rows: int):
+        self.reporter.report_chunk_written(name, rows)
+
+    def watch(self, name: str, read: Callable[[], dict[str, int|float]]):
+        self.gauges[name] = read
+        self.__watch_gauge(name)
+
+    def unwatch(self, name: str):
+        self.gauges.pop(name, None)
+
+
+class _JobRequestHandler(BaseHTTPRequestHandler):
+    """
+    The HTTP API of the server:
+
+    - `GET /health` reports the number of queued and running jobs.
+    - `GET /jobs` lists the jobs, `GET /jobs/<id>` returns one job.
+    - `POST /jobs` with `{"mapping": "<path>"}` queues a run of a mapping file.
+    - `POST /caches/invalidate` clears the lookup caches.
+    """
+
+    @property
+    def pancham_server(self) -> PanchamServer:
+        return self.server.pancham_server
+
+    def do_GET(self):
+        path = self.path.rstrip('/')
+
+        if path == '/health':
+            jobs = self.pancham_server.list_jobs()
+            self.__send(200, {
+                'status': 'ok',
+                'queued': sum(1 for job in jobs if job.status == 'queued'),
+                'running': sum(1 for job in jobs if job.status == 'running')
+            })
+        elif path == '/jobs':
+            self.__send(200, {'jobs': [asdict(job) for job in self.pancham_server.list_jobs()]})
+        elif path.startswith('/jobs/'):
+            job = self.pancham_server.get_job(path[len('/jobs/'):])
+            if job is None:
+                self.__send(404, {'error': 'Job not found'})
+            else:
+                self.__send(200, asdict(job))
+        else:
+            self.__send(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        path = self.path.rstrip('/')
+
+        if path == '/jobs':
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                mapping = body.get('mapping', None) if isinstance(body, dict) else None
+
+                if not isinstance(mapping, str):
+                    raise ValueError("A mapping file is required")
+
+                self.__send(202, asdict(self.pancham_server.submit(mapping)))
+            except ValueError as e:
+                self.__send(400, {'error': str(e)})
+        elif path == '/caches/invalidate':
+            self.pancham_server.invalidate_caches()
+            self.__send(200, {'status': 'ok'})
+        else:
+            self.__send(404, {'error': 'Not found'})
+
+    def log_message(self, format: str, *args):
+        self.pancham_server.reporter.report_debug(lambda: format % args)
+
+    def __send(self, status: int, body: dict):
+        content = json.dumps(body).encode('utf-8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def start_pancham_server(
+        configuration: str,
+        port: Optional[int] = None,
+        watch: Optional[str] = None,
+        workers: Optional[int] = None
+):
+    """
+    Runs the server until it is interrupted, options given on the command line
+    override the configuration file.
+    """
+    print("Starting Pancham server!")
+    pancham_configuration = OrderedPanchamConfiguration(configuration)
+
+    for name, value in (('server_port', port), ('server_watch_dir', watch), ('server_workers', workers)):
+        if value is not None:
+            pancham_configuration.config_data[name] = value
+
+    # Chunks are not copied as they are processed, set once as pandas options apply to every job
+    if pancham_configuration.copy_on_write:
+        enable_copy_on_write()
+
+    # Each job keeps its own stage profiles
+    reporter = create_reporter(pancham_configuration, keep_profiles=False)
+    server = PanchamServer(pancham_configuration, reporter)
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.request_stop())
+    signal.signal(signal.SIGINT, lambda signum, frame: server.request_stop())
+
+    try:
+        server.serve()
+    finally:
+        if isinstance(reporter, TelemetryReporter):
+            reporter.close()
+
+
+def _move_to(path: str, directory: str, name: str|None = None) -> str:
+    """
+    Moves a watched file to a directory next to the watched directory's files.
+    """
+    watch_dir = os.path.dirname(path)
+    if os.path.basename(watch_dir) in (WATCH_RUNNING_DIR, WATCH_DONE_DIR, WATCH_FAILED_DIR):
+        watch_dir = os.path.dirname(watch_dir)
+
+    target_dir = os.path.join(watch_dir, directory)
+    os.makedirs(target_dir, exist_ok=True)
+
+    target = os.path.join(target_dir, name or os.path.basename(path))
+    os.replace(path, target)
+
+    return target
@@ -0,0 +1,197 @@
+import ast
+import operator
+import re
+from functools import reduce
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+Evaluator = Callable[[pd.DataFrame], Any]
+
+QUOTED_NAME_PATTERN = re.compile(r"`([^`]+)`")
+
+BINARY_OPERATORS: dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.BitAnd: operator.and_,
+    ast.BitOr: operator.or_
+}
+
+COMPARISON_OPERATORS: dict[type, Callable[[Any, Any], Any]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda left, right: _isin(left, right),
+    ast.NotIn: lambda left, right: _invert(_isin(left, right))
+}
+
+
+def compile_expression(expression: str) -> Callable[[pd.DataFrame], pd.Series]:
+    """
+    Compiles an expression over the columns of a DataFrame into a function that
+    evaluates it for every row at once.
+
+    Expressions use Python syntax. Names refer to columns, names that are not valid
+    identifiers are quoted with backticks, e.g. `` `Order Id` ``. Supported are
+    arithmetic, string concatenation with `+`, comparisons including `in` with a
+    list of values, `and`, `or` and `not`, `a if condition else b` and the functions
+    `where(condition, a, b)`, `coalesce(a, b, ...)`, `isnull(a)`, `notnull(a)`,
+    `str(a)` and `abs(a)`.
+
+    :param expression: The expression to compile.
+    :type expression: str
+    :return: A function taking a DataFrame and returning a Series aligned to it.
+    :rtype: Callable[[pd.DataFrame], pd.Series]
+    :raises ValueError: If the expression is not valid or uses unsupported syntax.
+    """
+    quoted_names: dict[str, str] = {}
+
+    def replace_quoted(match: re.Match) -> str:
+        placeholder = f"__column_{len(quoted_names)}"
+        quoted_names[placeholder] = match.group(1)
+        return placeholder
+
+    try:
+        tree = ast.parse(QUOTED_NAME_PATTERN.sub(replace_quoted, expression).strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression {expression}: {e.msg}")
+
+    evaluator = _compile_node(tree.body, quoted_names, expression)
+
+    def evaluate(df: pd.DataFrame) -> pd.Series:
+        return _as_series(evaluator(df), df.index)
+
+    return evaluate
+
+
+def _compile_node(node: ast.AST, quoted_names: dict[str, str], expression: str) -> Evaluator:
+    compile_child = lambda n: _compile_node(n, quoted_names, expression)
+
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda df: value
+
+    if isinstance(node, (ast.List, ast.Tuple)):
+        values = [compile_child(e) for e in node.elts]
+        return lambda df: [v(df) for v in values]
+
+    if isinstance(node, ast.Name):
+        column = quoted_names.get(node.id, node.id)
+
+        def get_column(df: pd.DataFrame) -> pd.Series:
+            if column not in df.columns:
+                raise ValueError(f"Column {column} used in expression {expression} not found")
+            return df[column]
+
+        return get_column
+
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        binary_operator = BINARY_OPERATORS[type(node.op)]
+        left, right = compile_child(node.left), compile_child(node.right)
+        return lambda df: binary_operator(left(df), right(df))
+
+    if isinstance(node, ast.UnaryOp):
+        operand = compile_child(node.operand)
+
+        if isinstance(node.op, ast.USub):
+            return lambda df: -operand(df)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        if isinstance(node.op, (ast.Not, ast.Invert)):
+            return lambda df: _invert(operand(df))
+
+    if isinstance(node, ast.BoolOp):
+        values = [compile_child(v) for v in node.values]
+        combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+        return lambda df: reduce(combine, [_as_bool(v(df)) for v in values])
+
+    if isinstance(node, ast.Compare) and all(type(o) in COMPARISON_OPERATORS for o in node.ops):
+        operands = [compile_child(node.left)] + [compile_child(c) for c in node.comparators]
+        comparisons = [COMPARISON_OPERATORS[type(o)] for o in node.ops]
+
+        def compare(df: pd.DataFrame) -> Any:
+            values = [o(df) for o in operands]
+            results = [c(values[i], values[i + 1]) for i, c in enumerate(comparisons)]
+            return reduce(operator.and_, results)
+
+        return compare
+
+    if isinstance(node, ast.IfExp):
+        condition, body, orelse = compile_child(node.test), compile_child(node.body), compile_child(node.orelse)
+        return lambda df: _where(df.index, condition(df), body(df), orelse(df))
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS and len(node.keywords) == 0:
+        function = FUNCTIONS[node.func.id]
+        arguments = [compile_child(a) for a in node.args]
+        return lambda df: function(df.index, *[a(df) for a in arguments])
+
+    raise ValueError(f"Unsupported syntax {ast.unparse(node)} in expression {expression}")
+
+
+def _as_series(value: Any, index: pd.Index) -> pd.Series:
+    if isinstance(value, pd.Series):
+        return value
+
+    return pd.Series([value] * len(index), index=index)
+
+
+def _as_bool(value: Any) -> Any:
+    if isinstance(value, pd.Series):
+        return value.fillna(False).astype(bool)
+
+    return bool(value)
+
+
+def _invert(value: Any) -> Any:
+    if isinstance(value, pd.Series):
+        return ~_as_bool(value)
+
+    return not value
+
+
+def _isin(left: Any, right: Any) -> Any:
+    if isinstance(left, pd.Series):
+        return left.isin(right)
+
+    return left in right
+
+
+def _where(index: pd.Index, condition: Any, if_true: Any, if_false: Any) -> pd.Series:
+    return _as_series(if_true, index).where(_as_bool(_as_series(condition, index)), _as_series(if_false, index))
+
+
+def _coalesce(index: pd.Index, *values: Any) -> pd.Series:
+    if len(values) == 0:
+        raise ValueError("coalesce requires at least one value")
+
+    result = _as_series(values[0], index)
+    for value in values[1:]:
+        result = result.where(result.notna(), _as_series(value, index))
+
+    return result
+
+
+def _to_str(index: pd.Index, value: Any) -> Any:
+    if isinstance(value, pd.Series):
+        return value.astype(str).where(value.notna(), np.nan)
+
+    return str(value)
+
+
+FUNCTIONS: dict[str, Callable[..., Any]] = {
+    'where': _where,
+    'coalesce': _coalesce,
+    'isnull': lambda index, value: _as_series(value, index).isna(),
+    'notnull': lambda index, value: _as_series(value, index).notna(),
+    'str': _to_str,
+    'abs': lambda index, value: abs(value)
+}
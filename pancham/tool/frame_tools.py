@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+
+def enable_copy_on_write():
+    """
+    Turns on pandas copy-on-write for the process. Frames derived from another frame
+    share its data until either of them is modified, so copies made to protect a
+    frame from later changes cost nothing until they are needed. This is the default
+    from pandas 3.
+    """
+    pd.set_option('mode.copy_on_write', True)
+
+
+def copy_on_write_enabled() -> bool:
+    """
+    :return: True if pandas copy-on-write is turned on, the 'warn' mode does not count.
+    :rtype: bool
+    """
+    return pd.options.mode.copy_on_write is True
+
+
+def detach(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns a frame that can be modified without changing the frame passed in. With
+    copy-on-write this is a lazy copy that shares the data, otherwise the data is
+    copied.
+
+    :param df: The frame to protect.
+    :type df: pd.DataFrame
+    :return: A frame with the same data.
+    :rtype: pd.DataFrame
+    """
+    return df.copy(deep=not copy_on_write_enabled())
+
+
+def hash_rows(df: pd.DataFrame) -> np.ndarray:
+    """
+    Hashes the values of each row, ignoring the index and the order of the columns.
+    Values that cannot be hashed directly, such as lists, are hashed as text.
+
+    :param df: The rows to hash.
+    :type df: pd.DataFrame
+    :return: A 64 bit hash for each row.
+    :rtype: np.ndarray
+    """
+    ordered = df[sorted(df.columns, key=str)]
+
+    try:
+        return pd.util.hash_pandas_object(ordered, index=False).to_numpy()
+    except TypeError:
+        return pd.util.hash_pandas_object(ordered.astype(str), index=False).to_numpy()
+
+
+def optimize_dtypes(df: pd.DataFrame, category_ratio: float = 0.5, downcast: bool = True) -> tuple[pd.DataFrame, dict[str, int]]:
+    """
+    Reduces the memory used by a frame. Text columns with few distinct values are
+    converted to `category`, and integer and float columns are downcast to the
+    smallest type that holds every value exactly. Other columns are left unchanged.
+
+    :param df: The frame to optimize, it is not modified.
+    :type df: pd.DataFrame
+    :param category_ratio: The highest ratio of distinct values to rows for a text
+        column to be converted to `category`.
+    :type category_ratio: float
+    :param downcast: Whether to downcast integer and float columns.
+    :type downcast: bool
+    :return: The optimized frame and the bytes saved for each converted column.
+    :rtype: tuple[pd.DataFrame, dict[str, int]]
+    """
+    converted = {}
+
+    for name, column in df.items():
+        optimized = None
+
+        if column.dtype == object and len(column) > 0:
+            if pd.api.types.infer_dtype(column, skipna=True) == 'string' and column.nunique() <= category_ratio * len(column):
+                optimized = column.astype('category')
+        elif downcast and column.dtype == np.int64:
+            optimized = pd.to_numeric(column, downcast='integer')
+        elif downcast and column.dtype == np.float64:
+            narrowed = column.astype(np.float32)
+            if ((narrowed.to_numpy() == column.to_numpy()) | column.isna().to_numpy()).all():
+                optimized = narrowed
+
+        if optimized is None or optimized.dtype == column.dtype:
+            continue
+
+        saved = int(column.memory_usage(deep=True, index=False) - optimized.memory_usage(deep=True, index=False))
+        if saved > 0:
+            converted[name] = (optimized, saved)
+
+    if len(converted) == 0:
+        return df, {}
+
+    # The other columns are shared with the frame passed in
+    optimized_df = df.copy(deep=False)
+    for name, (optimized, _) in converted.items():
+        optimized_df[name] = optimized
+
+    return optimized_df, {name: saved for name, (_, saved) in converted.items()}
+
+
+def restore_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts `category` columns back to the type of their values, for code that
+    adds new values to columns, such as `fillna`.
+
+    :param df: The frame to convert, it is not modified.
+    :type df: pd.DataFrame
+    :return: The frame without category columns.
+    :rtype: pd.DataFrame
+    """
+    categories = [name for name, column in df.items() if isinstance(column.dtype, pd.CategoricalDtype)]
+
+    if len(categories) == 0:
+        return df
+
+    restored = df.copy(deep=False)
+    for name in categories:
+        restored[name] = restored[name].astype(restored[name].cat.categories.dtype)
+
+    return restored
@@ -0,0 +1,80 @@
+from typing import Any, Iterator, TextIO
+
+import yaml
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.events import MappingStartEvent, MappingEndEvent, SequenceStartEvent, SequenceEndEvent
+from yaml.resolver import Resolver
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+    from yaml.cyaml import CParser
+
+    class StreamingLoader(CParser, Composer, SafeConstructor, Resolver):
+        """
+        Safe loader that parses with libyaml but composes nodes in Python, so a
+        document can be read one node at a time.
+        """
+
+        def __init__(self, stream):
+            CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+
+except ImportError:
+    from yaml import SafeLoader
+    StreamingLoader = SafeLoader
+
+
+def safe_load(stream: str | TextIO) -> Any:
+    """
+    Parses a YAML document with the libyaml safe loader when it is available,
+    falling back to the pure Python loader.
+
+    :param stream: The YAML text or an open file.
+    :return: The parsed document.
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def yield_key_items(stream: str | TextIO, key: str) -> Iterator[Any]:
+    """
+    Yields the items of a list under a top level key of a YAML document, parsing
+    one item at a time so the whole list is never held in memory.
+
+    :param stream: The YAML text or an open file.
+    :param key: The top level key of the list.
+    :return: An iterator over the items of the list.
+    :raises ValueError: If the document is not a mapping, the key is missing or the
+        key does not hold a list.
+    """
+    loader = StreamingLoader(stream)
+
+    try:
+        # Stream and document start
+        loader.get_event()
+        loader.get_event()
+
+        if not loader.check_event(MappingStartEvent):
+            raise ValueError("YAML document must be a mapping")
+        loader.get_event()
+
+        while not loader.check_event(MappingEndEvent):
+            node = loader.compose_node(None, None)
+
+            if node.value != key:
+                loader.compose_node(None, None)
+                continue
+
+            if not loader.check_event(SequenceStartEvent):
+                raise ValueError(f"{key} must be a list")
+            loader.get_event()
+
+            while not loader.check_event(SequenceEndEvent):
+                yield loader.construct_document(loader.compose_node(None, None))
+            return
+
+        raise ValueError(f"{key} not in YAML document")
+    finally:
+        loader.dispose()
@@ -22,7 +22,10 @@ class ContainsValidation(ValidationStep):
                 failure = ValidationFailure(
                     failed_id=None,
                     test_name=self.get_name(),
-                    message=f"Expected value '{value}' not found in field '{test_field}'."
+                    field=test_field,
+                    message=f"Expected value '{value}' not found in field '{test_field}'.",
+                    value=value,
+                    message_template=f"Expected value '{{value}}' not found in field '{test_field}'."
                 )
                 validation_failures.append(failure)
 
@@ -33,7 +33,10 @@ class MatchingValidation(ValidationStep):
             failure = ValidationFailure(
                 failed_id=expected_value,
                 test_name=self.get_name(),
-                message=f"No matching row found for {search_field} = {search_value}."
+                field=test_field,
+                message=f"No matching row found for {search_field} = {search_value}.",
+                value=search_value,
+                message_template=f"No matching row found for {search_field} = {{value}}."
             )
             validation_failures.append(failure)
         else:
@@ -42,7 +45,10 @@ class MatchingValidation(ValidationStep):
                 failure = ValidationFailure(
                     failed_id=matching_row.iloc[0][input.rule.id_field],
                     test_name=self.get_name(),
-                    message=f"Expected value {expected_value} does not match {test_field} value."
+                    field=test_field,
+                    message=f"Expected value {expected_value} does not match {test_field} value.",
+                    value=expected_value,
+                    message_template=f"Expected value {{value}} does not match {test_field} value."
                 )
                 validation_failures.append(failure)
 
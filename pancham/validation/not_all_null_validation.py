@@ -25,6 +25,7 @@ class NotAllNullValidation(ValidationStep):
                 failure = ValidationFailure(
                     failed_id=None,  # No specific ID associated with this failure
                     test_name=self.get_name(),
+                    field=column,
                     message=f"No non-null values found in column: {column}"
                 )
                 validation_failures.append(failure)
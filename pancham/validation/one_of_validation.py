@@ -25,6 +25,7 @@ class OneOfValidation(ValidationStep):
                 failure = ValidationFailure(
                     failed_id=row[input.rule.id_field],
                     test_name=self.get_name(),
+                    field=test_field,
                     message=f"value for {test_field} is not in allowed values.")
                 validation_failures.append(failure)
 
@@ -0,0 +1,234 @@
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .validation_field import ValidationFailure
+
+DEFAULT_FAILURE_BUFFER_ROWS = 100000
+DEFAULT_FAILURE_SAMPLE_SIZE = 10
+DEFAULT_FAILURE_MAX_ROWS = 1000000
+
+FAILURE_COLUMNS = ['rule', 'field', 'failed_id', 'value', 'message']
+FAILURE_FILE_TYPES = {'.parquet': 'parquet', '.csv': 'csv'}
+
+FAILURE_SCHEMA = pa.schema([(name, pa.string()) for name in FAILURE_COLUMNS])
+
+
+@dataclass
+class ValidationFailureSummary:
+    """
+    Counts the failures of a validation rule on one field.
+
+    :ivar rule: Name of the validation rule.
+    :type rule: str
+    :ivar field: Name of the field the rule was applied to.
+    :type field: str | int | None
+    :ivar count: Number of failures.
+    :type count: int
+    :ivar sample_ids: The ids of the first failures.
+    :type sample_ids: list
+    """
+
+    rule: str
+    field: str|int|None
+    count: int = 0
+    sample_ids: list = field(default_factory=list)
+
+
+class ValidationFailureStore:
+    """
+    Collects validation failures as columns rather than objects. Failures are
+    buffered in a list per column and every `buffer_rows` failures the buffer is
+    moved to a frame, with the rule, field and message stored as categories so each
+    distinct value is held once. Messages are stored as written by the rules, with
+    `{value}` in place of the value, which has its own column. When an output file is
+    set the frames are appended to it instead of being kept in memory, as Parquet or
+    CSV depending on its extension.
+
+    Without an output file only the first `max_rows` failures are kept, later
+    failures are counted but dropped. The count and a sample of ids for each rule and
+    field are always kept, so the failures can be reported without reading them back.
+
+    :ivar output_file: The file failures are written to, or None to keep them in memory.
+    :type output_file: str | None
+    :ivar buffer_rows: Number of failures buffered before they are moved.
+    :type buffer_rows: int
+    :ivar sample_size: Number of ids kept for each rule and field.
+    :type sample_size: int
+    :ivar max_rows: Number of failures kept in memory, None to keep every failure.
+    :type max_rows: int | None
+    :ivar count: Number of failures saved.
+    :type count: int
+    :ivar dropped: Number of failures counted but not kept in memory.
+    :type dropped: int
+    """
+
+    def __init__(
+            self,
+            output_file: str|None = None,
+            buffer_rows: int = DEFAULT_FAILURE_BUFFER_ROWS,
+            sample_size: int = DEFAULT_FAILURE_SAMPLE_SIZE,
+            max_rows: int|None = DEFAULT_FAILURE_MAX_ROWS
+    ):
+        if output_file is not None and get_failure_file_type(output_file) is None:
+            raise ValueError(f"Validation failures can only be written to {', '.join(FAILURE_FILE_TYPES)} files, not {output_file}")
+
+        if buffer_rows < 1:
+            raise ValueError(f"buffer_rows must be at least 1, got {buffer_rows}")
+
+        if max_rows is not None and max_rows < 0:
+            raise ValueError(f"max_rows must not be negative, got {max_rows}")
+
+        self.output_file = output_file
+        self.buffer_rows = buffer_rows
+        self.sample_size = sample_size
+        self.max_rows = max_rows
+        self.count = 0
+        self.dropped = 0
+
+        self.__summaries: dict[tuple[str, Any], ValidationFailureSummary] = {}
+        self.__buffer: dict[str, list] = {name: [] for name in FAILURE_COLUMNS}
+        self.__chunks: list[pd.DataFrame] = []
+        self.__parquet_writer: pq.ParquetWriter|None = None
+        self.__file_started = False
+
+    def add(self, failure: ValidationFailure):
+        """
+        Saves a validation failure.
+
+        :param failure: The failure to save.
+        :type failure: ValidationFailure
+        """
+        key = (failure.test_name, failure.field)
+        summary = self.__summaries.get(key)
+
+        if summary is None:
+            summary = ValidationFailureSummary(failure.test_name, failure.field)
+            self.__summaries[key] = summary
+
+        summary.count += 1
+        if len(summary.sample_ids) < self.sample_size and failure.failed_id is not None:
+            summary.sample_ids.append(failure.failed_id)
+
+        self.count += 1
+
+        if self.output_file is None and self.max_rows is not None and self.count > self.max_rows:
+            self.dropped += 1
+            return
+
+        self.__buffer['rule'].append(failure.test_name)
+        self.__buffer['field'].append(_to_text(failure.field))
+        self.__buffer['failed_id'].append(_to_text(failure.failed_id))
+        self.__buffer['value'].append(_to_text(failure.value))
+        # Failures with different values share a template, so the message column stays small
+        self.__buffer['message'].append(failure.message_template or failure.message)
+
+        if len(self.__buffer['rule']) >= self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        """
+        Moves the buffered failures to memory or to the output file.
+        """
+        if len(self.__buffer['rule']) == 0:
+            return
+
+        buffer = self.__buffer
+        self.__buffer = {name: [] for name in FAILURE_COLUMNS}
+
+        if self.output_file is None:
+            self.__chunks.append(_build_frame(buffer))
+        elif get_failure_file_type(self.output_file) == 'parquet':
+            self.__write_parquet(buffer)
+        else:
+            self.__write_csv(buffer)
+
+    def close(self):
+        """
+        Writes any buffered failures and closes the output file. Failures saved
+        after closing start a new output file.
+        """
+        self.flush()
+
+        if self.__parquet_writer is not None:
+            self.__parquet_writer.close()
+            self.__parquet_writer = None
+
+        self.__file_started = False
+
+    def summaries(self) -> list[ValidationFailureSummary]:
+        """
+        :return: The count and sample ids of each rule and field, most failures first.
+        :rtype: list[ValidationFailureSummary]
+        """
+        return sorted(self.__summaries.values(), key=lambda s: s.count, reverse=True)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Builds a frame of the failures kept in memory, the failures written to the
+        output file are read from there once it is closed.
+
+        :return: A frame with the rule, field, failed_id, value and message of each failure.
+        :rtype: pd.DataFrame
+        """
+        self.flush()
+
+        if len(self.__chunks) == 0:
+            return _build_frame({name: [] for name in FAILURE_COLUMNS})
+
+        # Chunks with different categories are combined as objects
+        return _as_categories(pd.concat(self.__chunks, ignore_index=True))
+
+    def __write_parquet(self, buffer: dict[str, list]):
+        if self.__parquet_writer is None:
+            self.__prepare_output()
+            self.__parquet_writer = pq.ParquetWriter(self.output_file, FAILURE_SCHEMA)
+
+        self.__parquet_writer.write_table(pa.table(buffer, schema=FAILURE_SCHEMA))
+
+    def __write_csv(self, buffer: dict[str, list]):
+        append = self.__file_started
+        if not append:
+            self.__prepare_output()
+            self.__file_started = True
+
+        pd.DataFrame(buffer, columns=FAILURE_COLUMNS).to_csv(self.output_file, mode='a' if append else 'w', header=not append, index=False)
+
+    def __prepare_output(self):
+        directory = os.path.dirname(self.output_file)
+        if directory != '':
+            os.makedirs(directory, exist_ok=True)
+
+
+def get_failure_file_type(path: str) -> str|None:
+    """
+    Finds the format of a validation failure file from its extension.
+
+    :param path: The path of the file.
+    :type path: str
+    :return: 'parquet' or 'csv', or None if the extension is not supported.
+    :rtype: str | None
+    """
+    return FAILURE_FILE_TYPES.get(os.path.splitext(path)[1].lower())
+
+
+def _to_text(value: Any) -> str|None:
+    if value is None:
+        return None
+
+    return str(value)
+
+
+def _build_frame(buffer: dict[str, list]) -> pd.DataFrame:
+    return _as_categories(pd.DataFrame(buffer, columns=FAILURE_COLUMNS, dtype=object))
+
+
+def _as_categories(frame: pd.DataFrame) -> pd.DataFrame:
+    for name in ['rule', 'field', 'message']:
+        frame[name] = frame[name].astype('category')
+
+    return frame
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Any
 
 import pandas as pd
 
@@ -18,11 +19,21 @@ class ValidationFailure:
     :type test_name: str
     :ivar message: Detailed message describing the failure.
     :type message: str
+    :ivar field: Name of the field that was tested, if the test applies to a field.
+    :type field: str | int | None
+    :ivar value: The value the failure is about, if the message refers to one.
+    :type value: Any
+    :ivar message_template: The message with `{value}` in place of the value, so
+        failures with different values can be grouped under one message.
+    :type message_template: str | None
     """
 
     failed_id: str | int
     test_name: str
     message: str
+    field: str | int | None = None
+    value: Any = None
+    message_template: str | None = None
 
 
 @dataclass()
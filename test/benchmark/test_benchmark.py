@@ -0,0 +1,66 @@
+from benchmark.data_generator import DataGenerator, mapping_fields
+from benchmark.results import BenchmarkResults, BenchmarkResult, compare_results
+from benchmark.suite import BenchmarkSuite, _select_parser
+from pancham.plugin_registry import resolve_plugin
+from pancham.runner import DEFAULT_FIELD_PARSERS
+
+
+class TestDataGenerator:
+
+    def test_generated_data_is_repeatable(self, tmp_path):
+        first = DataGenerator(100, str(tmp_path)).build_frame()
+        second = DataGenerator(100, str(tmp_path)).build_frame()
+
+        assert len(first) == 100
+        assert first.equals(second)
+
+    def test_mapping_uses_every_parser(self):
+        used = {type(resolve_plugin(_select_parser(f))) for f in mapping_fields()}
+
+        assert used == {type(resolve_plugin(p)) for p in DEFAULT_FIELD_PARSERS}
+
+    def test_generate_files(self, tmp_path):
+        mappings = DataGenerator(20, str(tmp_path)).generate(['csv', 'json'])
+
+        assert set(mappings.keys()) == {'csv', 'json'}
+        assert (tmp_path / 'orders.csv').exists()
+        assert (tmp_path / 'benchmark.db').exists()
+
+
+class TestBenchmarkSuite:
+
+    def test_run_benchmarks(self, tmp_path):
+        generator = DataGenerator(50, str(tmp_path))
+        suite = BenchmarkSuite(generator, repeat=2)
+
+        results = suite.run(names=['loader.csv', 'parser.', 'lookup.caching', 'output.database.append', 'mapping.csv'])
+        by_name = results.by_name()
+
+        assert 'loader.csv' in by_name
+        assert 'mapping.csv' in by_name
+        assert len([r for r in results.results if r.group == 'parser']) == len(DEFAULT_FIELD_PARSERS)
+
+        for result in results.results:
+            assert result.error is None, result.name
+            assert len(result.times) == 2
+
+        assert by_name['loader.csv'].rows == 50
+
+    def test_save_and_compare(self, tmp_path):
+        baseline = BenchmarkResults(metadata={'rows': 10}, results=[
+            BenchmarkResult('a', 'loader', 10, [1.0, 1.2]),
+            BenchmarkResult('b', 'loader', 10, [1.0]),
+        ])
+        baseline.save(str(tmp_path / 'baseline.json'))
+
+        current = BenchmarkResults(results=[
+            BenchmarkResult('a', 'loader', 10, [1.5]),
+            BenchmarkResult('c', 'loader', 10, [1.0]),
+        ])
+
+        comparisons = {c.name: c for c in compare_results(BenchmarkResults.load(str(tmp_path / 'baseline.json')), current)}
+
+        assert comparisons['a'].regression
+        assert comparisons['a'].change == 0.5
+        assert comparisons['b'].current is None
+        assert comparisons['c'].baseline is None
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from configuration.expression_field_parser import ExpressionFieldParser
+
+class TestExpressionFieldParser:
+
+    def test_can_parse(self):
+        field = {
+            'name': 'a',
+            'func': {
+                'expr': 'b + 1'
+            }
+        }
+
+        parser = ExpressionFieldParser()
+        assert parser.can_parse_field(field)
+
+    def test_parse_expression(self):
+        field = {
+            'name': 'total',
+            'field_type': 'float',
+            'func': {
+                'expr': {
+                    'expression': "quantity * `Unit Price`"
+                }
+            }
+        }
+
+        data = pd.DataFrame({'quantity': [1, 2], 'Unit Price': [1.5, 3.0]})
+
+        data_field = ExpressionFieldParser().parse_field(field)
+
+        assert data_field.has_vector_func()
+        assert list(data_field.vector_func(data)) == [1.5, 6.0]
+
+    def test_invalid_expression(self):
+        field = {
+            'name': 'total',
+            'func': {
+                'expr': 'quantity *'
+            }
+        }
+
+        with pytest.raises(ValueError):
+            ExpressionFieldParser().parse_field(field)
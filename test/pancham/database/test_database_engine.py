@@ -43,6 +43,17 @@ class TestDatabaseEngine:
 
         assert get_db_engine() is not None
 
+    def test_db_init_keeps_engine_for_same_configuration(self):
+        config = MockConfig()
+        initialize_db_engine(config, PrintReporter())
+        engine = get_db_engine().engine
+
+        initialize_db_engine(config, PrintReporter())
+        assert get_db_engine().engine is engine
+
+        initialize_db_engine(MockConfig(), PrintReporter())
+        assert get_db_engine().engine is not engine
+
     def test_merge_data(self):
         config = MockConfig()
         db_engine = DatabaseEngine(config, PrintReporter())
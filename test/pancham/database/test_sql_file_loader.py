@@ -56,6 +56,22 @@ class TestSqlFileLoader:
         for chunk in data:
             assert chunk.iloc[0]['id'] == '2'
 
+    def test_sql_read_query_with_iterator(self):
+        initialize_db_engine(MockConfig(), PrintReporter())
+
+        data = pd.DataFrame({'email': ['a@example.com', 'b@example.com', 'c@example.com'], 'customer_id': ['1', '2', '3']})
+
+        get_db_engine().write_df(data, 'customer_query', exists='replace')
+
+        loader = SqlFileLoader()
+        config = FileLoaderConfiguration(file_type='sql_file', file_path='', query='SELECT customer_id FROM customer_query ORDER BY customer_id', use_iterator=True, chunk_size=2)
+
+        chunks = list(loader.read_chunks_from_configuration(config))
+
+        assert [len(chunk) for _, chunk in chunks] == [2, 1]
+        assert chunks[-1][0].rows == 3
+        assert loader.estimate_rows(config) == 3
+
     def test_can_yield_without_config(self):
         loader = SqlFileLoader()
 
@@ -0,0 +1,198 @@
+import pandas as pd
+import yaml
+from pandas._testing import assert_frame_equal
+
+from pancham.data_frame_configuration_loader import YamlDataFrameConfigurationLoader
+from pancham.data_frame_loader import DataFrameLoader
+from pancham.database.database_engine import get_db_engine, initialize_db_engine
+from pancham.database.sql_file_loader import SqlFileLoader
+from pancham.database.sql_pushdown import SqlPushdownOptimizer
+from pancham.reporter import PrintReporter
+from pancham.runner import DEFAULT_FIELD_PARSERS, DEFAULT_OUTPUTS
+from pancham_configuration import PanchamConfiguration
+
+DATABASE_CONNECTION = "sqlite:///:memory:"
+
+
+class MockConfig(PanchamConfiguration):
+
+    @property
+    def database_connection(self) -> str:
+        return DATABASE_CONNECTION
+
+
+def write_tables(suffix: str):
+    initialize_db_engine(MockConfig(), PrintReporter())
+
+    get_db_engine().write_df(pd.DataFrame({
+        'order_id': ['1', '2', '3', '4'],
+        'email': ['a@example.com', 'b@example.com', 'c@example.com', 'd@example.com'],
+        'region': ['north', 'south', 'north', 'south']
+    }), f'pd_order_{suffix}', exists='replace')
+
+    get_db_engine().write_df(pd.DataFrame({
+        'email': ['a@example.com', 'b@example.com', 'c@example.com', 'd@example.com', 'd@example.com'],
+        'customer_id': ['10', '20', '30', '40', None],
+        'active': ['yes', 'yes', 'no', 'no', 'yes']
+    }), f'pd_customer_{suffix}', exists='replace')
+
+    get_db_engine().write_df(pd.DataFrame({
+        'name': ['north', 'south'],
+        'channel': ['web', 'web'],
+        'region_id': [100, 200]
+    }), f'pd_region_{suffix}', exists='replace')
+
+
+def write_mapping(tmp_path, suffix: str, fields: list[dict], **kwargs) -> str:
+    mapping = {
+        'name': f'pushdown_{suffix}',
+        'file_type': 'sql_file',
+        'query': f'SELECT order_id, email, region FROM pd_order_{suffix} ORDER BY order_id;',
+        'fields': fields
+    } | kwargs
+
+    filename = str(tmp_path / f'{suffix}.yml')
+    with open(filename, 'w') as mapping_file:
+        yaml.safe_dump(mapping, mapping_file)
+
+    return filename
+
+
+def run_mapping(filename: str, optimizer: SqlPushdownOptimizer|None) -> pd.DataFrame:
+    configuration = YamlDataFrameConfigurationLoader(DEFAULT_FIELD_PARSERS, DEFAULT_OUTPUTS, sql_pushdown=optimizer).load(filename)
+    loader = DataFrameLoader({'sql_file': SqlFileLoader()}, PrintReporter())
+
+    return pd.concat([loader.process_dataframe(chunk, configuration) for chunk in loader.load_file(configuration)], ignore_index=True)
+
+
+def lookup_fields(suffix: str) -> list[dict]:
+    return [
+        {'name': 'Order', 'source_name': 'order_id', 'field_type': 'str'},
+        {'name': 'Customer', 'field_type': 'int', 'nullable': True, 'func': {'database_match': {
+            'table_name': f'pd_customer_{suffix}', 'search_column': 'email', 'value_column': 'customer_id',
+            'source_name': 'email', 'value_cast': 'int'
+        }}},
+        {'name': 'Active', 'field_type': 'str', 'nullable': True, 'func': {'database_match': {
+            'table_name': f'pd_customer_{suffix}', 'search_column': 'email', 'value_column': 'customer_id',
+            'source_name': 'email', 'filter': {'active': 'yes'}
+        }}},
+        {'name': 'Region', 'field_type': 'int', 'nullable': True, 'func': {'database_multi_field_search': {
+            'table_name': f'pd_region_{suffix}', 'value_column': 'region_id',
+            'search': [{'type': 'static', 'search_column': 'channel', 'value': 'web'}, {'type': 'field', 'search_column': 'name', 'source_name': 'region'}]
+        }}},
+        {'name': 'North', 'field_type': 'int', 'func': {'database_value': {
+            'table_name': f'pd_region_{suffix}', 'search_column': 'name', 'value_column': 'region_id', 'value': 'north'
+        }}}
+    ]
+
+
+class TestSqlPushdownOptimizer:
+
+    def test_lookups_match_python_lookups(self, tmp_path):
+        write_tables('match')
+        filename = write_mapping(tmp_path, 'match', lookup_fields('match'))
+
+        pushed = run_mapping(filename, SqlPushdownOptimizer(DATABASE_CONNECTION, enabled=True))
+        searched = run_mapping(filename, None)
+
+        assert pushed['Customer'].tolist() == [10, 20, 30, 40]
+        assert pushed['Active'].tolist()[:2] == ['10', '20']
+        assert pushed['Active'].iloc[2:].isna().all()
+        assert pushed['Region'].tolist() == [100, 200, 100, 200]
+        assert pushed['North'].tolist() == [100, 100, 100, 100]
+        assert_frame_equal(pushed.astype(object).where(pushed.notna(), None), searched.astype(object).where(searched.notna(), None))
+
+    def test_plan_joins_lookups(self, tmp_path):
+        write_tables('plan')
+        filename = write_mapping(tmp_path, 'plan', lookup_fields('plan'))
+
+        configuration = YamlDataFrameConfigurationLoader(DEFAULT_FIELD_PARSERS, DEFAULT_OUTPUTS, sql_pushdown=SqlPushdownOptimizer(DATABASE_CONNECTION, enabled=True)).load(filename)
+
+        assert configuration.query.count('LEFT OUTER JOIN') == 3
+        assert [f.parser_name for f in configuration.fields[1:]] == ['SqlPushdown'] * 4
+        assert configuration.renames == {'order_id': 'Order'}
+
+    def test_only_renamed_columns_are_selected(self):
+        optimizer = SqlPushdownOptimizer(DATABASE_CONNECTION, enabled=True)
+        data = {'name': 'a', 'file_type': 'sql_file', 'query': 'SELECT * FROM source', 'fields': lookup_fields('select')}
+
+        assert 'pushdown_source.*' not in optimizer.plan(data).query
+
+        data['fields'].append({'name': 'Email', 'field_type': 'str', 'func': {'to_lower': {'source_name': 'email'}}})
+
+        assert 'pushdown_source.*' in optimizer.plan(data).query
+
+    def test_unsupported_lookups_are_not_pushed_down(self):
+        optimizer = SqlPushdownOptimizer(DATABASE_CONNECTION, enabled=True)
+        data = {'name': 'a', 'file_type': 'sql_file', 'query': 'SELECT * FROM source', 'fields': [
+            {'name': 'Populated', 'field_type': 'str', 'func': {'database_match': {
+                'table_name': 'customer', 'search_column': 'email', 'value_column': 'id', 'source_name': 'email', 'populate': True
+            }}},
+            {'name': 'Fixture', 'field_type': 'str', 'func': {'database_match': {
+                'table_name': 'customer', 'search_column': 'email', 'value_column': 'id', 'source_name': 'email',
+                'filter': {'account': {'fixture_key': 'account'}}
+            }}},
+            {'name': 'Matched', 'field_type': 'str', 'func': {'database_match': {
+                'table_name': 'customer', 'search_column': 'email', 'value_column': 'id', 'source_name': 'email'
+            }}}
+        ]}
+
+        assert list(optimizer.plan(data).columns) == [2]
+
+    def test_mappings_are_pushed_down_when_enabled(self):
+        data = {'name': 'a', 'file_type': 'sql_file', 'query': 'SELECT * FROM source', 'fields': lookup_fields('enabled')}
+
+        assert SqlPushdownOptimizer(DATABASE_CONNECTION).plan(data) is None
+        assert SqlPushdownOptimizer(DATABASE_CONNECTION).plan(data | {'sql_pushdown': True}) is not None
+        assert SqlPushdownOptimizer(DATABASE_CONNECTION, enabled=True).plan(data | {'sql_pushdown': False}) is None
+        assert SqlPushdownOptimizer(DATABASE_CONNECTION, enabled=True).plan(data | {'file_type': 'csv'}) is None
+
+    def test_renamed_source_columns_match_python_lookups(self, tmp_path):
+        write_tables('renamed')
+        customer = {'table_name': 'pd_customer_renamed', 'search_column': 'email', 'value_column': 'customer_id', 'value_cast': 'int'}
+        filename = write_mapping(tmp_path, 'renamed', [
+            {'name': 'Order', 'source_name': 'order_id', 'field_type': 'str'},
+            {'name': 'mail', 'source_name': 'email', 'field_type': 'str'},
+            {'name': 'Customer', 'field_type': 'int', 'nullable': True, 'func': {'database_match': customer | {'source_name': 'mail'}}}
+        ])
+
+        optimizer = SqlPushdownOptimizer(DATABASE_CONNECTION, enabled=True)
+        pushed = run_mapping(filename, optimizer)
+
+        assert optimizer.plan(yaml.safe_load(open(filename))) is None
+        assert pushed['Customer'].tolist() == [10, 20, 30, 40]
+        assert_frame_equal(pushed, run_mapping(filename, None))
+
+    def test_overwritten_source_columns_match_python_lookups(self, tmp_path):
+        write_tables('overwritten')
+        filename = write_mapping(tmp_path, 'overwritten', [
+            {'name': 'Order', 'source_name': 'order_id', 'field_type': 'str'},
+            {'name': 'email', 'field_type': 'str', 'func': {'static': {'value': 'b@example.com'}}},
+            {'name': 'Customer', 'field_type': 'int', 'nullable': True, 'func': {'database_match': {
+                'table_name': 'pd_customer_overwritten', 'search_column': 'email', 'value_column': 'customer_id',
+                'source_name': 'email', 'value_cast': 'int'
+            }}}
+        ])
+
+        pushed = run_mapping(filename, SqlPushdownOptimizer(DATABASE_CONNECTION, enabled=True))
+
+        assert pushed['Customer'].tolist() == [20, 20, 20, 20]
+        assert_frame_equal(pushed, run_mapping(filename, None))
+
+    def test_order_of_query_is_kept(self, tmp_path):
+        write_tables('ordered')
+        filename = write_mapping(tmp_path, 'ordered', lookup_fields('ordered'), query='SELECT order_id, email, region FROM pd_order_ordered ORDER BY "order_id" DESC')
+
+        pushed = run_mapping(filename, SqlPushdownOptimizer(DATABASE_CONNECTION, enabled=True))
+
+        assert pushed['Order'].tolist() == ['4', '3', '2', '1']
+        assert pushed['Customer'].tolist() == [40, 30, 20, 10]
+
+    def test_queries_with_unknown_order_are_not_pushed_down(self):
+        optimizer = SqlPushdownOptimizer(DATABASE_CONNECTION, enabled=True)
+        data = {'name': 'a', 'file_type': 'sql_file', 'fields': lookup_fields('unordered')}
+
+        assert optimizer.plan(data | {'query': 'SELECT * FROM source ORDER BY created_at'}) is None
+        assert optimizer.plan(data | {'query': 'SELECT * FROM source ORDER BY lower(email)'}) is None
+        assert optimizer.plan(data | {'query': 'SELECT * FROM (SELECT * FROM source ORDER BY created_at) s'}) is not None
+        assert 'ORDER BY pushdown_source.region ASC, pushdown_source.order_id DESC' in optimizer.plan(data | {'query': 'SELECT * FROM source ORDER BY region ASC, order_id desc LIMIT 10'}).query
@@ -3,7 +3,11 @@ import csv
 import numpy as np
 import pandas as pd
 
-from pancham.integration.salesforce_output import pd_to_sf_dict
+from pancham.data_frame_configuration import DataFrameConfiguration
+from pancham.data_frame_loader import DataFrameLoader
+from pancham.integration.salesforce_output import pd_to_sf_dict, save_bulk_results, SUCCESSFUL_RESULTS
+from pancham.output_configuration import OutputWriter, OutputActivitySet
+from pancham.reporter import PrintReporter
 
 def read_file(filename: str):
     content = []
@@ -15,6 +19,80 @@ def read_file(filename: str):
 
     return content
 
+class StreamedResponse:
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size: int):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+
+class StubSession:
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self.requests = []
+
+    def get(self, url: str, headers: dict, stream: bool):
+        self.requests.append((url, headers, stream))
+        return StreamedResponse(self.content)
+
+
+class StubSalesforce:
+
+    def __init__(self, content: bytes):
+        self.base_url = 'https://example.my.salesforce.com/services/data/v59.0/'
+        self.headers = {'Authorization': 'Bearer token'}
+        self.session = StubSession(content)
+
+
+class CapturingWriter(OutputWriter):
+
+    def __init__(self):
+        super().__init__({})
+        self.written = []
+
+    def write(self, data: pd.DataFrame, success_handler=None, failure_handler=None, loader=None):
+        self.written.append(data)
+
+
+class TestSaveBulkResults:
+
+    def test_save_results_in_chunks(self):
+        sf = StubSalesforce(b"sf__Id,sf__Created,Name\n" + b"".join(f"id{i},true,Name {i}\n".encode() for i in range(5)))
+        writer = CapturingWriter()
+        handler = DataFrameConfiguration('', 'csv', 'success')
+        handler.add_field('id', 'sf__Id', str)
+        handler.add_output(OutputActivitySet(primary_writer=writer, success_handler=None, failure_handler=None))
+
+        rows = save_bulk_results(sf, '750xx', SUCCESSFUL_RESULTS, handler, DataFrameLoader({}, PrintReporter()), chunk_size=2)
+
+        assert rows == 5
+        assert [list(d['id']) for d in writer.written] == [['id0', 'id1'], ['id2', 'id3'], ['id4']]
+        assert sf.session.requests[0][0].endswith('jobs/ingest/750xx/successfulResults/')
+        assert sf.session.requests[0][1]['Accept'] == 'text/csv'
+        assert sf.session.requests[0][2] is True
+
+    def test_save_empty_results(self):
+        writer = CapturingWriter()
+        handler = DataFrameConfiguration('', 'csv', 'success')
+        handler.add_output(OutputActivitySet(primary_writer=writer, success_handler=None, failure_handler=None))
+
+        assert save_bulk_results(StubSalesforce(b""), '750xx', SUCCESSFUL_RESULTS, handler, DataFrameLoader({}, PrintReporter())) == 0
+        assert writer.written == []
+
+
 class TestPdToSf:
 
     def test_transform_basic(self):
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from pancham.profiler import StageProfile
+from pancham.reporter_lib.telemetry_reporter import TelemetryReporter
+
+
+class TestTelemetryReporter:
+
+    def test_tracks_progress_of_a_run(self, tmp_path):
+        reporter = TelemetryReporter(metrics_log=str(tmp_path / 'metrics.jsonl'), interval=60)
+
+        reporter.report_run_start('customers', estimated_rows=100)
+        reporter.save_stage_profile(StageProfile('load', {'file_type': 'csv'}, wall_time=0.5, rows_out=25))
+        reporter.save_stage_profile(StageProfile('cast', {'configuration': 'customers'}, wall_time=0.25, rows_in=25, rows_out=25))
+        reporter.save_stage_profile(StageProfile('output', {'configuration': 'customers', 'writer': 'DatabaseOutputWriter'}, wall_time=2.0, rows_in=25))
+        reporter.report_chunk_written('customers', 25)
+        reporter.watch('queue_depth', lambda: {'read': 2, 'write': 1})
+
+        run = reporter.snapshot()['runs'][0]
+        reporter.close()
+
+        assert run['rows_read'] == 25
+        assert run['chunks_written'] == 1
+        assert run['eta_seconds'] > 0
+        assert run['stages']['cast']['rows_per_second'] == 100
+        assert run['writers']['DatabaseOutputWriter']['last_seconds'] == 2.0
+        assert reporter.stage_profiles == []
+
+        logged = json.loads((tmp_path / 'metrics.jsonl').read_text().splitlines()[-1])
+        assert logged['gauges'] == {'queue_depth': {'read': 2, 'write': 1}}
+
+    def test_writes_prometheus_file(self, tmp_path):
+        path = tmp_path / 'textfile' / 'pancham.prom'
+        reporter = TelemetryReporter(prometheus_file=str(path), keep_profiles=True)
+
+        reporter.report_run_start('customers')
+        reporter.save_stage_profile(StageProfile('load', {}, rows_out=10))
+        reporter.write_metrics()
+
+        text = path.read_text()
+        assert '# TYPE pancham_rows_read_total counter' in text
+        assert 'pancham_rows_read_total{configuration="customers"} 10.0' in text
+        assert 'pancham_eta_seconds' not in text
+        assert len(reporter.stage_profiles) == 1
+
+    def test_requires_an_output(self):
+        with pytest.raises(ValueError):
+            TelemetryReporter()
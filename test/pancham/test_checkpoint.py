@@ -0,0 +1,46 @@
+import os
+
+from pancham.checkpoint import Checkpoint, CheckpointStore, configuration_fingerprint, source_fingerprint
+from pancham.data_frame_configuration import DataFrameConfiguration
+from pancham.file_loader import ChunkPosition, CsvFileLoader
+
+
+class TestCheckpointStore:
+
+    def test_save_load_and_clear(self, tmp_path):
+        store = CheckpointStore(str(tmp_path))
+        checkpoint = Checkpoint('abc', 4, ChunkPosition(1, 200))
+
+        store.save('orders/main', checkpoint)
+
+        assert store.load('orders/main') == checkpoint
+
+        store.clear('orders/main')
+
+        assert store.load('orders/main') is None
+
+    def test_unreadable_checkpoint(self, tmp_path):
+        (tmp_path / "orders.json").write_text("{")
+
+        assert CheckpointStore(str(tmp_path)).load('orders') is None
+
+    def test_fingerprint_includes_chunk_size(self):
+        configuration = DataFrameConfiguration('orders.csv', 'csv', 'orders')
+        fingerprint = configuration_fingerprint(configuration)
+
+        configuration.chunk_size = 10
+
+        assert fingerprint != configuration_fingerprint(configuration)
+
+    def test_source_fingerprint_changes_with_file(self, tmp_path):
+        source = tmp_path / "orders.csv"
+        source.write_text("id\n1\n")
+        configuration = DataFrameConfiguration(str(source), 'csv', 'orders')
+        fingerprint = source_fingerprint(configuration, CsvFileLoader(), None)
+
+        assert fingerprint == source_fingerprint(configuration, CsvFileLoader(), None)
+
+        source.write_text("id\n1\n2\n")
+        os.utime(source, ns=(0, 0))
+
+        assert fingerprint != source_fingerprint(configuration, CsvFileLoader(), None)
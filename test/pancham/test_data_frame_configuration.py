@@ -1,5 +1,6 @@
 from pancham.data_frame_field import DataFrameField
 from pancham.data_frame_configuration import DataFrameConfiguration
+from pancham.output_configuration import OutputWriter, OutputActivitySet
 
 
 class TestDataFrameConfiguration:
@@ -43,3 +44,16 @@ class TestDataFrameConfiguration:
 
     def __build(self) -> DataFrameConfiguration:
         return DataFrameConfiguration('a', 'xlsx', 'a')
+
+    def test_chunk_memory_limited_by_output(self):
+        class LimitedWriter(OutputWriter):
+            max_chunk_memory = 1000
+
+        config = DataFrameConfiguration('abc', 'xlsx', 'a')
+        assert config.get_chunk_memory() is None
+
+        config.chunk_memory = 5000
+        assert config.get_chunk_memory() == 5000
+
+        config.add_output(OutputActivitySet(primary_writer=LimitedWriter({}), success_handler=None, failure_handler=None))
+        assert config.get_chunk_memory() == 1000
@@ -64,3 +64,80 @@ class TestDataFrameConfigurationLoader:
         assert output.primary_writer is not None
         assert output.success_handler is not None
         assert output.failure_handler is None
+
+    def test_load_incremental_configuration(self, tmp_path):
+        mapping = tmp_path / "incremental.yml"
+        mapping.write_text("""
+name: incremental
+file_type: csv
+file_path: customers.csv
+incremental:
+  key: id
+  detect_deletes: true
+  deleted:
+    output:
+      - output_type: database
+        table: deleted_customers
+    fields:
+      - name: id
+        source_name: id
+        field_type: int
+fields:
+  - name: id
+    source_name: id
+    field_type: int
+""")
+        loader = YamlDataFrameConfigurationLoader(field_parsers=DEFAULT_FIELD_PARSERS, output_configuration=DEFAULT_OUTPUTS)
+
+        config = loader.load(str(mapping))
+
+        assert config.incremental.key_columns == ['id']
+        assert config.incremental.detect_deletes is True
+        assert len(config.incremental.deleted_configuration.output) == 1
+        assert config.result_cache is None
+        assert config.mapping_fingerprint is not None
+
+    def test_load_optimize_dtypes_configuration(self, tmp_path):
+        mapping = tmp_path / "optimized.yml"
+        mapping.write_text("""
+name: optimized
+file_type: csv
+file_path: customers.csv
+optimize_dtypes:
+  category_ratio: 0.1
+  downcast: false
+fields:
+  - name: id
+    source_name: id
+    field_type: int
+""")
+        loader = YamlDataFrameConfigurationLoader(field_parsers=DEFAULT_FIELD_PARSERS, output_configuration=DEFAULT_OUTPUTS)
+
+        config = loader.load(str(mapping))
+
+        assert config.optimize_dtypes.enabled is True
+        assert config.optimize_dtypes.category_ratio == 0.1
+        assert config.optimize_dtypes.downcast is False
+
+    def test_load_json_lines_schema(self, tmp_path):
+        mapping = tmp_path / "events.yml"
+        mapping.write_text("""
+name: events
+file_type: jsonl
+file_path: events.jsonl
+key: event
+json_schema:
+  customer: str
+  amount: float
+unexpected_fields: infer
+fields:
+  - name: customer
+    source_name: customer
+    field_type: str
+""")
+        loader = YamlDataFrameConfigurationLoader(field_parsers=DEFAULT_FIELD_PARSERS, output_configuration=DEFAULT_OUTPUTS)
+
+        config = loader.load(str(mapping))
+
+        assert config.json_schema == {'customer': 'str', 'amount': 'float'}
+        assert config.unexpected_fields == 'infer'
@@ -1,12 +1,14 @@
 import datetime
 import os
 
+import numpy as np
 import pandas as pd
 import pytest
 from pandas._testing import assert_frame_equal
 from pandera.errors import SchemaError
 
-from pancham.data_frame_configuration import DataFrameConfiguration, MergeConfiguration
+from pancham.data_frame_configuration import DataFrameConfiguration, MergeConfiguration, DtypeOptimizationConfiguration
+from pancham.data_frame_field import DataFrameField
 from pancham.data_frame_loader import DataFrameLoader, DataFrameOutput
 from pancham.file_loader import ExcelFileLoader
 from pancham.reporter import PrintReporter
@@ -75,6 +77,92 @@ class TestDataFrameLoader:
 
 class TestDataFrameOutput:
 
+    def test_pure_field_runs_once_per_distinct_value(self):
+        calls = []
+        def status(row):
+            calls.append(row['code'])
+            return f"{row['code']}-{row['region']}"
+
+        loader = DataFrameLoader({}, PrintReporter())
+        configuration = DataFrameConfiguration('', '', 'a')
+        configuration.add_field('code', 'code', str)
+        configuration.add_field('region', 'region', str, nullable=True)
+        configuration.add_dynamic_field(data_frame_field=DataFrameField('status', None, str, func=status, input_columns=['code', 'region'], pure=True))
+
+        source = pd.DataFrame({'code': ['A', 'B', 'A', 'A', 'B'], 'region': ['N', 'N', 'N', None, None]}, index=[10, 11, 12, 13, 14])
+        data = loader.process_dataframe(source, configuration)
+
+        assert len(calls) == 4
+        assert list(data['status']) == ['A-N', 'B-N', 'A-N', 'A-None', 'B-None']
+        assert list(data.index) == [10, 11, 12, 13, 14]
+
+    def test_pure_field_keeps_mixed_values_apart(self):
+        configuration = DataFrameConfiguration('', '', 'a')
+        configuration.add_field('value', 'value', object, nullable=True)
+        configuration.add_dynamic_field(data_frame_field=DataFrameField('kind', None, str, func=lambda row: repr(row['value']), input_columns=['value'], pure=True))
+
+        source = pd.DataFrame({'value': pd.Series([None, np.nan, 1, True, 1.0, '1', None, True], dtype=object)})
+        data = DataFrameLoader({}, PrintReporter()).process_dataframe(source, configuration)
+
+        assert list(data['kind']) == ['None', 'nan', '1', 'True', '1.0', "'1'", 'None', 'True']
+
+    def test_pure_field_without_inputs_runs_once(self):
+        calls = []
+        configuration = DataFrameConfiguration('', '', 'a')
+        configuration.add_field('code', 'code', str)
+        configuration.add_dynamic_field(data_frame_field=DataFrameField('fixed', None, int, func=lambda row: calls.append(1) or 5, input_columns=[], pure=True))
+
+        data = DataFrameLoader({}, PrintReporter()).process_dataframe(pd.DataFrame({'code': ['A', 'B', 'C']}), configuration)
+
+        assert len(calls) == 1
+        assert list(data['fixed']) == [5, 5, 5]
+
+    def test_pure_field_with_unhashable_values(self):
+        configuration = DataFrameConfiguration('', '', 'a')
+        configuration.add_field('parts', 'parts', list)
+        configuration.add_dynamic_field(data_frame_field=DataFrameField('count', None, int, func=lambda row: len(row['parts']), input_columns=['parts'], pure=True))
+
+        data = DataFrameLoader({}, PrintReporter()).process_dataframe(pd.DataFrame({'parts': [['a'], ['a', 'b']]}), configuration)
+
+        assert list(data['count']) == [1, 2]
+
+    def test_source_only_kept_when_required(self):
+        source = pd.DataFrame({'a': [1, 2]})
+        configuration = DataFrameConfiguration('', '', 'a')
+        configuration.add_field('b', 'a', int)
+
+        loader = DataFrameLoader({}, PrintReporter())
+
+        assert loader.process_chunk(source, configuration).source is None
+
+        post = DataFrameConfiguration('post', 'post', 'post', merge_configuration=MergeConfiguration('source'))
+        configuration.post_run_configuration.append(post)
+
+        assert loader.process_chunk(source, configuration).source is source
+
+    def test_optimize_dtypes(self):
+        loader = DataFrameLoader({}, PrintReporter())
+        configuration = DataFrameConfiguration('', 'csv', 'optimized', optimize_dtypes=DtypeOptimizationConfiguration())
+        configuration.add_field('status', 'status', str)
+        configuration.add_field('count', 'count', int)
+
+        post_run = DataFrameConfiguration('', 'csv', 'post')
+        post_run.add_field('count', 'count', int)
+
+        data = loader.process_dataframe(pd.DataFrame({'status': ['open', 'closed'] * 5, 'count': range(10)}), configuration)
+
+        assert isinstance(data['status'].dtype, pd.CategoricalDtype)
+        assert data['count'].dtype == 'int8'
+        assert set(loader.pop_dtype_savings('optimized').keys()) == {'status', 'count'}
+        assert loader.pop_dtype_savings('optimized') == {}
+        assert list(loader.process_dataframe(data, post_run)['count']) == list(range(10))
+
+    def test_get_required_source_not_kept(self):
+        output = DataFrameOutput(None, pd.DataFrame({'c': [1, 2, 3]}))
+
+        with pytest.raises(ValueError):
+            output.get_required_dataframe(MergeConfiguration('source'))
+
     def test_get_required_without_merge(self):
         frame1 = pd.DataFrame({'a': [1, 2, 3], 'b': ['x', 'y', 'z']})
         frame2 = pd.DataFrame({'c': [1, 2, 3]})
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from pancham.deduplication import BestRowStore, DeduplicateFunction, KeyStore, HASH_COLUMN, ROW_COLUMN
+
+
+class TestDeduplication:
+
+    def test_key_store_spills(self, tmp_path):
+        keys = KeyStore(16, str(tmp_path))
+
+        first = keys.add(np.array([1, 2, 2, 3], dtype=np.uint64))
+        second = keys.add(np.array([3, 4, 1, 5], dtype=np.uint64))
+
+        assert keys.spilled
+        assert list(first) == [True, True, False, True]
+        assert list(second) == [False, True, False, True]
+
+        keys.close()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_best_row_store_spills(self, tmp_path):
+        store = BestRowStore(['score'], [False], 1, str(tmp_path))
+
+        store.add(pd.DataFrame({HASH_COLUMN: np.array([1, 2], dtype=np.uint64), ROW_COLUMN: [0, 1], 'score': [5, 1]}))
+        store.add(pd.DataFrame({HASH_COLUMN: np.array([1, 2], dtype=np.uint64), ROW_COLUMN: [2, 3], 'score': [7, 1]}))
+
+        assert store.spilled
+        assert list(store.winners()) == [1, 2]
+
+        store.close()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_keeps_first_across_frames(self):
+        deduplicate = DeduplicateFunction('id')
+        deduplicate.track(KeyStore(1024))
+
+        first = deduplicate(pd.DataFrame({'id': [1, 2, 2], 'value': ['a', 'b', 'c']}))
+        second = deduplicate(pd.DataFrame({'id': [2, 3], 'value': ['d', 'e']}))
+
+        assert list(first['value']) == ['a', 'b']
+        assert list(second['value']) == ['e']
+
+        deduplicate.reset()
+        assert len(deduplicate(pd.DataFrame({'id': [2], 'value': ['f']}))) == 1
+
+    def test_keys_match_across_inferred_dtypes(self):
+        deduplicate = DeduplicateFunction('id')
+        deduplicate.track(KeyStore(1024))
+
+        first = deduplicate(pd.DataFrame({'id': [1, 2], 'value': ['a', 'b']}))
+        second = deduplicate(pd.DataFrame({'id': [2.0, np.nan, 3.0], 'value': ['c', 'd', 'e']}))
+        third = deduplicate(pd.DataFrame({'id': ['3', None, '4', 'x'], 'value': ['f', 'g', 'h', 'i']}))
+
+        assert list(first['value']) == ['a', 'b']
+        assert list(second['value']) == ['d', 'e']
+        assert list(third['value']) == ['h', 'i']
+
+    def test_selects_best_across_frames(self):
+        deduplicate = DeduplicateFunction('id', sort_by='score', ascending=False)
+        frames = [
+            pd.DataFrame({'id': [1, 2, 1], 'score': [1, 5, 3]}),
+            pd.DataFrame({'id': [1, 2], 'score': [4, 2]})
+        ]
+
+        store = BestRowStore(deduplicate.sort_columns, deduplicate.sort_ascending, 1024)
+        for frame in frames:
+            deduplicate.collect(frame, store)
+        deduplicate.select(store.winners())
+
+        output = pd.concat([deduplicate(frame) for frame in frames])
+
+        assert list(output['id']) == [2, 1]
+        assert list(output['score']) == [5, 4]
@@ -1,8 +1,10 @@
 import os
+import pandas as pd
+import openpyxl
 import pytest
 
 from pancham.data_frame_configuration import DataFrameConfiguration
-from pancham.file_loader import ExcelFileLoader, YamlFileLoader, JsonFileLoader
+from pancham.file_loader import ExcelFileLoader, YamlFileLoader, JsonFileLoader, JsonLinesFileLoader, CsvFileLoader, ChunkPosition, ChunkSizer
 
 
 class TestExcelFileLoader():
@@ -22,6 +24,93 @@ class TestExcelFileLoader():
         with pytest.raises(ValueError):
             loader.read_file(filename)
 
+    def test_yield_excel_file_in_chunks(self):
+        filename = os.path.dirname(os.path.realpath(__file__)) + "/../example/orders.xlsx"
+
+        loader = ExcelFileLoader()
+        chunks = list(loader.yield_file(filename, sheet = 'Sheet1', chunk_size = 3))
+
+        assert [len(c) for c in chunks] == [3, 3, 3, 1]
+        pd.testing.assert_frame_equal(
+            pd.concat(chunks, ignore_index=True),
+            loader.read_file(filename, sheet = 'Sheet1')
+        )
+
+    def test_resume_excel_from_position(self):
+        filename = os.path.dirname(os.path.realpath(__file__)) + "/../example/orders.xlsx"
+        configuration = DataFrameConfiguration(filename, 'xlsx', 'a', sheet='Sheet1')
+        configuration.use_iterator = True
+        configuration.chunk_size = 3
+
+        loader = ExcelFileLoader()
+        chunks = list(loader.read_chunks_from_configuration(configuration))
+        resumed = list(loader.read_chunks_from_configuration(configuration, start=chunks[1][0]))
+
+        assert [p for p, _ in chunks] == [ChunkPosition(0, 3), ChunkPosition(0, 6), ChunkPosition(0, 9), ChunkPosition(0, 10)]
+        assert [p for p, _ in resumed] == [ChunkPosition(0, 9), ChunkPosition(0, 10)]
+        pd.testing.assert_frame_equal(resumed[0][1], chunks[2][1])
+
+    def test_resume_excel_with_blank_rows(self, tmp_path):
+        filename = str(tmp_path / "blank.xlsx")
+        workbook = openpyxl.Workbook()
+        for row in [['id'], [1], [None], [2], [None], [None], [3], [4]]:
+            workbook.active.append(row)
+        workbook.save(filename)
+
+        configuration = DataFrameConfiguration(filename, 'xlsx', 'a', sheet=workbook.active.title)
+        configuration.use_iterator = True
+        configuration.chunk_size = 2
+
+        loader = ExcelFileLoader()
+        chunks = list(loader.read_chunks_from_configuration(configuration))
+        resumed = list(loader.read_chunks_from_configuration(configuration, start=chunks[0][0]))
+
+        pd.testing.assert_frame_equal(
+            pd.concat([c for _, c in resumed], ignore_index=True),
+            pd.concat([c for _, c in chunks[1:]], ignore_index=True)
+        )
+
+    def test_yield_excel_without_sheet(self):
+        filename = os.path.dirname(os.path.realpath(__file__)) + "/../example/orders.xlsx"
+
+        loader = ExcelFileLoader()
+        with pytest.raises(ValueError):
+            next(loader.yield_file(filename))
+
+    def test_registered_sheets_read_once(self, tmp_path, monkeypatch):
+        filename = str(tmp_path / "reference.xlsx")
+        with pd.ExcelWriter(filename) as writer:
+            pd.DataFrame({'a': [1, 2]}).to_excel(writer, sheet_name='First', index=False)
+            pd.DataFrame({'b': [3]}).to_excel(writer, sheet_name='Second', index=False)
+
+        parse_calls = []
+        original_parse = pd.ExcelFile.parse
+        def counting_parse(excel_file, *args, **kwargs):
+            parse_calls.append(kwargs.get('sheet_name'))
+            return original_parse(excel_file, *args, **kwargs)
+        monkeypatch.setattr(pd.ExcelFile, 'parse', counting_parse)
+
+        loader = ExcelFileLoader()
+        loader.register_configuration(DataFrameConfiguration(filename, 'xlsx', 'a', sheet='First'))
+        loader.register_configuration(DataFrameConfiguration(filename, 'xlsx', 'b', sheet='Second'))
+        loader.register_configuration(DataFrameConfiguration(filename, 'xlsx', 'c', sheet='Missing'))
+
+        first = loader.read_file(filename, sheet='First')
+        first['a'] = 0
+        second = loader.read_file(filename, sheet='Second')
+
+        assert len(parse_calls) == 1
+        assert sorted(parse_calls[0]) == ['First', 'Second']
+        assert list(loader.read_file(filename, sheet='First')['a']) == [1, 2]
+        assert list(second['b']) == [3]
+
+        os.utime(filename, (0, 0))
+        loader.read_file(filename, sheet='First')
+        assert len(parse_calls) == 2
+
+        loader.clear_cache()
+        assert loader.workbook_cache == {}
+
     def test_load_missing_excel_file(self):
         filename = os.path.dirname(os.path.realpath(__file__)) + "/../not_there.xlsx"
 
@@ -39,6 +128,15 @@ class TestExcelFileLoader():
         assert len(data) == 2
         assert data.iloc[0]['name'] == 'A'
 
+    def test_yield_yaml_file_in_chunks(self):
+        filename = os.path.dirname(os.path.realpath(__file__)) + "/../example/orders.yaml"
+
+        loader = YamlFileLoader()
+        chunks = list(loader.yield_file(filename, key = 'orders', chunk_size = 1))
+
+        assert [len(c) for c in chunks] == [1, 1]
+        assert chunks[1].iloc[0]['name'] == 'B'
+
     def test_read_from_configuration(self):
         filename = os.path.dirname(os.path.realpath(__file__)) + "/../example/orders.xlsx"
         configuration = DataFrameConfiguration(filename, 'xlsx', 'a', sheet='Sheet1')
@@ -75,3 +173,137 @@ class TestExcelFileLoader():
         data = next(loader.read_file_from_configuration(configuration))
 
         assert len(data) == 6
+
+    def test_read_json_lines_file(self):
+        filename = os.path.dirname(os.path.realpath(__file__)) + "/../example/events.jsonl"
+
+        loader = JsonLinesFileLoader()
+        data = loader.read_file(filename)
+
+        assert len(data) == 7
+        assert data.iloc[0]['type'] == 'order'
+
+    def test_yield_json_lines_with_key(self):
+        filename = os.path.dirname(os.path.realpath(__file__)) + "/../example/events.jsonl"
+
+        loader = JsonLinesFileLoader(block_size=128)
+        chunks = list(loader.yield_file(filename, key='event', chunk_size=3))
+
+        assert [len(c) for c in chunks] == [3, 3, 1]
+        assert list(chunks[0].columns) == ['customer', 'amount']
+        assert chunks[2].iloc[0]['customer'] == 'C007'
+        assert chunks[0]['amount'].dtype == 'float64'
+
+    def test_json_lines_fields_after_first_block(self, tmp_path):
+        path = tmp_path / "late.jsonl"
+        lines = [f'{{"event": {{"customer": "C{i}", "amount": {i}.5}}}}' for i in range(50)]
+        lines.append('{"event": {"customer": "C50", "amount": 1.0, "coupon": "SAVE"}, "id": 50}')
+        path.write_text("\n".join(lines) + "\n")
+
+        loader = JsonLinesFileLoader(block_size=128)
+        with pytest.raises(ValueError):
+            list(loader.yield_file(str(path), key='event', chunk_size=20))
+
+        schema = {'customer': 'str', 'amount': 'float', 'coupon': 'str'}
+        chunks = list(loader.yield_file(str(path), key='event', chunk_size=20, schema=schema))
+        data = pd.concat(chunks, ignore_index=True)
+
+        assert list(data.columns) == ['customer', 'amount', 'coupon']
+        assert len(data) == 51
+        assert data['coupon'].iloc[-1] == 'SAVE'
+        assert data['coupon'].iloc[:-1].isna().all()
+
+        with pytest.raises(ValueError):
+            loader.read_file(str(path), key='event', schema=schema, unexpected_fields='error')
+
+    def test_json_lines_key_must_be_object(self):
+        filename = os.path.dirname(os.path.realpath(__file__)) + "/../example/events.jsonl"
+
+        loader = JsonLinesFileLoader()
+        with pytest.raises(ValueError):
+            loader.read_file(filename, key='id')
+
+
+class TestCsvFileLoader:
+
+    def test_resume_across_files(self, tmp_path):
+        (tmp_path / "a.csv").write_text("id,name\n1,A\n2,B\n3,C\n")
+        (tmp_path / "b.csv").write_text("id,name\n4,D\n5,E\n")
+
+        configuration = DataFrameConfiguration([str(tmp_path / "a.csv"), str(tmp_path / "b.csv")], 'csv', 'a')
+        configuration.use_iterator = True
+        configuration.chunk_size = 2
+
+        loader = CsvFileLoader()
+        chunks = list(loader.read_chunks_from_configuration(configuration, start=ChunkPosition(0, 2)))
+
+        assert [p for p, _ in chunks] == [ChunkPosition(0, 3), ChunkPosition(1, 2)]
+        assert list(chunks[0][1]['id']) == [3]
+        assert list(chunks[1][1]['name']) == ['D', 'E']
+
+    def test_resume_with_blank_lines(self, tmp_path):
+        (tmp_path / "a.csv").write_text('id,name\n\n1,A\n2,"B\nC"\n\n3,D\n4,E\n')
+
+        configuration = DataFrameConfiguration(str(tmp_path / "a.csv"), 'csv', 'a')
+        configuration.use_iterator = True
+        configuration.chunk_size = 2
+
+        loader = CsvFileLoader()
+        chunks = list(loader.read_chunks_from_configuration(configuration))
+        resumed = list(loader.read_chunks_from_configuration(configuration, start=chunks[0][0]))
+
+        assert [p for p, _ in chunks] == [ChunkPosition(0, 2), ChunkPosition(0, 4)]
+        assert [p for p, _ in resumed] == [ChunkPosition(0, 4)]
+        assert list(resumed[0][1]['id']) == [3, 4]
+        assert list(resumed[0][1]['name']) == ['D', 'E']
+
+    def test_size_chunks_from_memory(self, tmp_path):
+        (tmp_path / "a.csv").write_text("id,name\n" + "".join(f"{i},name {i}\n" for i in range(10000)))
+
+        configuration = DataFrameConfiguration(str(tmp_path / "a.csv"), 'csv', 'a')
+        configuration.use_iterator = True
+        configuration.chunk_memory = 200000
+
+        chunks = [c for _, c in CsvFileLoader().read_chunks_from_configuration(configuration)]
+        expected = int(200000 / (chunks[0].memory_usage(deep=True).sum() / len(chunks[0])))
+
+        assert len(chunks[0]) == 1000
+        assert len(chunks[1]) == expected
+        assert sum(len(c) for c in chunks) == 10000
+
+    def test_estimate_rows(self, tmp_path, monkeypatch):
+        (tmp_path / "a.csv").write_text("id,name\n1,A\n2,B\n3,C")
+        (tmp_path / "b.csv").write_text("id,name\n" + "".join(f"{i},B\n" for i in range(1000, 2000)))
+        monkeypatch.setattr('pancham.file_loader.ESTIMATE_SAMPLE_BYTES', 100)
+
+        configuration = DataFrameConfiguration([str(tmp_path / "a.csv"), str(tmp_path / "b.csv")], 'csv', 'a')
+
+        assert CsvFileLoader().estimate_rows(configuration) == pytest.approx(3 + 1000, rel=0.05)
+
+    def test_chunk_sizer_limits(self):
+        sizer = ChunkSizer(10, min_rows=5, max_rows=50)
+        sizer.observe(pd.DataFrame({'a': range(10)}))
+
+        assert sizer.rows == 5
+
+        sizer = ChunkSizer(10 ** 9, min_rows=5, max_rows=50)
+        sizer.observe(pd.DataFrame({'a': range(10)}))
+        sizer.observe(pd.DataFrame({'a': ['x' * 1000] * 10}))
+
+        assert sizer.rows == 50
+
+        sizer.start_file()
+        assert sizer.rows == 5
+
+    def test_resume_without_seeking(self, tmp_path):
+        (tmp_path / "a.csv").write_text("id,name\n1,A\n2,B\n3,C\n")
+
+        configuration = DataFrameConfiguration(str(tmp_path / "a.csv"), 'csv', 'a')
+        configuration.use_iterator = True
+        configuration.chunk_size = 2
+
+        loader = CsvFileLoader()
+        loader.can_seek = lambda configuration=None: False
+        chunks = list(loader.read_chunks_from_configuration(configuration, start=ChunkPosition(0, 1)))
+
+        assert list(pd.concat([c for _, c in chunks])['id']) == [2, 3]
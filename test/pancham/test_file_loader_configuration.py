@@ -1,6 +1,8 @@
 import json
 
-from pancham.file_loader_configuration import FileLoaderConfiguration
+import pytest
+
+from pancham.file_loader_configuration import FileLoaderConfiguration, parse_memory_size
 
 class TestFileLoaderConfiguration:
 
@@ -26,4 +28,13 @@ class TestFileLoaderConfiguration:
         )
 
         paths = json.dumps(['x', 'y'])
-        assert hash(config) == hash(('d', 'c', 'a', paths, None))
\ No newline at end of file
+        assert hash(config) == hash(('d', 'c', 'a', paths, None))
+
+    def test_parse_memory_size(self):
+        assert parse_memory_size('256MB') == 256 * 1024 * 1024
+        assert parse_memory_size('1.5 gb') == 1536 * 1024 * 1024
+        assert parse_memory_size('64k') == 64 * 1024
+        assert parse_memory_size(1000) == 1000
+
+        with pytest.raises(ValueError):
+            parse_memory_size('lots')
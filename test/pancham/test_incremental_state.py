@@ -0,0 +1,109 @@
+import pandas as pd
+import pytest
+
+from pancham.data_frame_configuration import IncrementalConfiguration
+from pancham import incremental_state
+from pancham.incremental_state import IncrementalStateStore, IncrementalTracker
+
+
+def run_tracker(configuration: IncrementalConfiguration, store: IncrementalStateStore, chunks: list[pd.DataFrame]) -> tuple[IncrementalTracker, pd.DataFrame]:
+    tracker = IncrementalTracker(configuration, store, 'customers')
+    changed = list(tracker.filter(iter(chunks)))
+
+    if len(changed) == 0:
+        return tracker, pd.DataFrame()
+
+    return tracker, pd.concat(changed)
+
+
+class TestIncrementalTracker:
+
+    def test_only_changed_rows(self, tmp_path):
+        store = IncrementalStateStore(str(tmp_path))
+        configuration = IncrementalConfiguration(key='id', detect_deletes=True)
+
+        first = pd.DataFrame({'id': [1, 2, 3], 'name': ['A', 'B', 'C']})
+        tracker, changed = run_tracker(configuration, store, [first.iloc[:2], first.iloc[2:]])
+        tracker.commit()
+
+        assert len(changed) == 3
+
+        second = pd.DataFrame({'name': ['A', 'X', 'D'], 'id': [1, 2, 4]})
+        tracker, changed = run_tracker(configuration, store, [second])
+
+        assert list(changed['id']) == [2, 4]
+        assert list(tracker.deleted_keys()['id']) == [3]
+        assert tracker.rows_read == 3
+        assert tracker.rows_changed == 2
+
+    def test_state_saved_on_commit(self, tmp_path):
+        store = IncrementalStateStore(str(tmp_path))
+        configuration = IncrementalConfiguration(key=['id', 'region'])
+        data = pd.DataFrame({'id': [1, 1], 'region': ['EU', 'US'], 'name': ['A', 'B']})
+
+        run_tracker(configuration, store, [data])
+        _, changed = run_tracker(configuration, store, [data])
+
+        assert len(changed) == 2
+
+        tracker, _ = run_tracker(configuration, store, [data])
+        tracker.commit()
+        _, changed = run_tracker(configuration, store, [data])
+
+        assert len(changed) == 0
+
+    def test_watermark(self, tmp_path):
+        store = IncrementalStateStore(str(tmp_path))
+        configuration = IncrementalConfiguration(watermark='modified')
+
+        first = pd.DataFrame({'id': [1, 2], 'modified': ['2024-01-01', '2024-01-02']})
+        tracker, _ = run_tracker(configuration, store, [first])
+        tracker.commit()
+
+        second = pd.DataFrame({'id': [1, 2, 3], 'modified': ['2024-01-01', '2024-01-03', None]})
+        _, changed = run_tracker(configuration, store, [second])
+
+        assert list(changed['id']) == [2]
+
+    def test_rows_at_watermark(self, tmp_path):
+        store = IncrementalStateStore(str(tmp_path))
+        configuration = IncrementalConfiguration(watermark='modified')
+
+        first = pd.DataFrame({'id': [1, 2], 'modified': ['2024-01-01', '2024-01-02']})
+        tracker, _ = run_tracker(configuration, store, [first])
+        tracker.commit()
+
+        second = pd.DataFrame({'id': [1, 2, 3], 'modified': ['2024-01-01', '2024-01-02', '2024-01-02']})
+        tracker, changed = run_tracker(configuration, store, [second.iloc[:2], second.iloc[2:]])
+        tracker.commit()
+
+        assert list(changed['id']) == [3]
+
+        third = pd.concat([second, pd.DataFrame({'id': [4], 'modified': ['2024-01-02']})])
+        _, changed = run_tracker(configuration, store, [third])
+
+        assert list(changed['id']) == [4]
+
+    def test_only_rows_at_watermark_are_hashed(self, tmp_path, mocker):
+        store = IncrementalStateStore(str(tmp_path))
+        store.save('customers', {'key': [], 'watermark': 'modified', 'value': {'value': '2024-01-02', 'rows': None}})
+        hashed = mocker.spy(incremental_state, 'hash_rows')
+
+        data = pd.DataFrame({'id': [1, 2, 3, 4], 'modified': ['2024-01-01', '2024-01-03', '2024-01-04', '2024-01-04']})
+        _, changed = run_tracker(IncrementalConfiguration(watermark='modified'), store, [data])
+
+        assert list(changed['id']) == [2, 3, 4]
+        assert [list(call.args[0]['id']) for call in hashed.call_args_list] == [[3, 4]]
+
+    def test_watermark_saved_without_rows(self, tmp_path):
+        store = IncrementalStateStore(str(tmp_path))
+        store.save('customers', {'key': [], 'watermark': 'modified', 'value': '2024-01-02'})
+
+        data = pd.DataFrame({'id': [1, 2], 'modified': ['2024-01-02', '2024-01-03']})
+        _, changed = run_tracker(IncrementalConfiguration(watermark='modified'), store, [data])
+
+        assert list(changed['id']) == [2]
+
+    def test_deletes_require_key(self):
+        with pytest.raises(ValueError):
+            IncrementalConfiguration(detect_deletes=True)
@@ -0,0 +1,30 @@
+from typer.testing import CliRunner
+
+from pancham.__main__ import app, serve_app
+
+
+class TestMain:
+
+    def test_runs_with_config_path(self, mocker):
+        start = mocker.patch('pancham.runner.start_pancham', return_value=None)
+
+        result = CliRunner().invoke(app, ['example/config.yaml', 'example/order_configuration.yml'])
+
+        assert result.exit_code == 0
+        start.assert_called_once_with('example/config.yaml', 'example/order_configuration.yml', test=False, profile=False, resume=False)
+
+    def test_runs_with_bare_config_path(self, mocker):
+        start = mocker.patch('pancham.runner.start_pancham', return_value=None)
+
+        result = CliRunner().invoke(app, ['example/config.yaml', '--resume'])
+
+        assert result.exit_code == 0
+        start.assert_called_once_with('example/config.yaml', None, test=False, profile=False, resume=True)
+
+    def test_serves_with_config_path(self, mocker):
+        start = mocker.patch('pancham.server.start_pancham_server', return_value=None)
+
+        result = CliRunner().invoke(serve_app, ['example/config.yaml', '--workers', '3'])
+
+        assert result.exit_code == 0
+        start.assert_called_once_with('example/config.yaml', port=None, watch=None, workers=3)
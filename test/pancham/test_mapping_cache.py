@@ -0,0 +1,38 @@
+import os
+
+from pancham.mapping_cache import MappingFileCache
+
+
+class TestMappingFileCache:
+
+    def test_parsed_once_until_changed(self, tmp_path):
+        mapping = tmp_path / "mapping.yaml"
+        mapping.write_text("name: a\n")
+        parsed = []
+
+        def parse(filename: str) -> dict:
+            parsed.append(filename)
+            return {'name': 'a'}
+
+        cache = MappingFileCache(str(tmp_path / "cache"))
+
+        assert cache.load(str(mapping), parse) == {'name': 'a'}
+        assert MappingFileCache(str(tmp_path / "cache")).load(str(mapping), parse) == {'name': 'a'}
+        assert len(parsed) == 1
+
+        mapping.write_text("name: b\n")
+        os.utime(mapping, (0, 0))
+        cache.load(str(mapping), parse)
+
+        assert len(parsed) == 2
+
+    def test_corrupt_entry_is_replaced(self, tmp_path):
+        mapping = tmp_path / "mapping.yaml"
+        mapping.write_text("name: a\n")
+        cache = MappingFileCache(str(tmp_path / "cache"))
+        cache.load(str(mapping), lambda f: {'name': 'a'})
+
+        for entry in os.listdir(tmp_path / "cache"):
+            (tmp_path / "cache" / entry).write_bytes(b'not a pickle')
+
+        assert cache.load(str(mapping), lambda f: {'name': 'b'}) == {'name': 'b'}
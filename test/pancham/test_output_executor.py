@@ -0,0 +1,47 @@
+import threading
+
+import pytest
+
+from pancham.output_executor import OutputExecutor
+
+
+class TestOutputExecutor:
+
+    def test_runs_tasks_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+        completed = []
+
+        def task(i):
+            barrier.wait()
+            completed.append(i)
+
+        executor = OutputExecutor(3)
+        executor.run([lambda i=i: task(i) for i in range(3)])
+
+        assert sorted(completed) == [0, 1, 2]
+
+    def test_single_failure_is_raised(self):
+        completed = []
+
+        def fail():
+            raise ValueError('failed')
+
+        with pytest.raises(ValueError, match='failed'):
+            OutputExecutor().run([fail, lambda: completed.append(1)])
+
+        assert completed == [1]
+
+    def test_multiple_failures_are_grouped(self):
+        def fail_value():
+            raise ValueError('a')
+
+        def fail_key():
+            raise KeyError('b')
+
+        with pytest.raises(ExceptionGroup) as e:
+            OutputExecutor().run([fail_value, fail_key])
+
+        assert len(e.value.exceptions) == 2
+
+    def test_no_tasks(self):
+        OutputExecutor().run([])
@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from pancham.pipeline_executor import PipelinedExecutor
+
+
+class TestPipelinedExecutor:
+
+    def test_runs_all_chunks_in_order(self):
+        written = []
+
+        executor = PipelinedExecutor(2)
+        executor.run(iter(range(10)), lambda x: x * 2, written.append)
+
+        assert written == [x * 2 for x in range(10)]
+
+    def test_reader_and_writer_use_threads(self):
+        threads = set()
+
+        def source():
+            for i in range(3):
+                threads.add(('read', threading.current_thread().name))
+                yield i
+
+        def write(_):
+            threads.add(('write', threading.current_thread().name))
+
+        PipelinedExecutor(1).run(source(), lambda x: x, write)
+
+        assert ('read', 'pancham-reader') in threads
+        assert ('write', 'pancham-writer') in threads
+
+    def test_backpressure_limits_read_ahead(self):
+        read = []
+        max_ahead = 0
+
+        def source():
+            for i in range(20):
+                read.append(i)
+                yield i
+
+        def write(item):
+            nonlocal max_ahead
+            time.sleep(0.01)
+            max_ahead = max(max_ahead, len(read) - item)
+
+        PipelinedExecutor(1).run(source(), lambda x: x, write)
+
+        # one chunk in each queue, plus one in each stage
+        assert max_ahead <= 5
+
+    def test_writer_error_is_raised(self):
+        def write(item):
+            if item == 3:
+                raise ValueError('write failed')
+
+        with pytest.raises(ValueError, match='write failed'):
+            PipelinedExecutor(2).run(iter(range(100)), lambda x: x, write)
+
+    def test_reader_error_is_raised(self):
+        def source():
+            yield 1
+            raise IOError('read failed')
+
+        with pytest.raises(IOError, match='read failed'):
+            PipelinedExecutor(2).run(source(), lambda x: x, lambda x: None)
+
+    def test_transform_error_stops_reader(self):
+        closed = False
+
+        def source():
+            nonlocal closed
+            try:
+                for i in range(1000):
+                    yield i
+            finally:
+                closed = True
+
+        def transform(item):
+            if item == 2:
+                raise KeyError('bad')
+            return item
+
+        with pytest.raises(KeyError):
+            PipelinedExecutor(2).run(source(), transform, lambda x: None)
+
+        assert closed
+
+    def test_invalid_queue_size(self):
+        with pytest.raises(ValueError):
+            PipelinedExecutor(0)
@@ -0,0 +1,42 @@
+from importlib.metadata import EntryPoint
+
+import pancham.plugin_registry as plugin_registry
+from pancham.configuration.match_field_parser import MatchFieldParser
+from pancham.plugin_registry import BUILTIN_PLUGINS, LazyFieldParser, LazyOutputConfiguration, LazyPlugin, get_plugin_sources, resolve_plugin
+from pancham.validation_field import ValidationStep
+
+
+class TestPluginRegistry:
+
+    def test_builtin_import_paths(self):
+        for kind, plugins in BUILTIN_PLUGINS.items():
+            for name, source in plugins.items():
+                assert LazyPlugin(name, source).plugin is not None
+
+    def test_field_parser_imported_on_use(self):
+        parser = LazyFieldParser('eq', 'pancham.configuration.match_field_parser:MatchFieldParser')
+
+        assert not parser.can_parse_field({'name': 'a', 'source_name': 'b', 'field_type': 'str'})
+        assert not parser.is_loaded
+
+        assert parser.can_parse_field({'name': 'a', 'func': {'eq': {'source_name': 'b', 'match': 'c'}}})
+        assert isinstance(resolve_plugin(parser), MatchFieldParser)
+
+    def test_output_imported_on_use(self):
+        output = LazyOutputConfiguration('database', 'pancham.database.database_output:DatabaseOutput')
+
+        assert not output.can_apply({'output': [{'output_type': 'csv'}]})
+        assert not output.is_loaded
+
+        assert output.can_apply({'output': [{'output_type': 'database', 'table': 'a'}]})
+        assert output.is_loaded
+
+    def test_entry_point_plugins(self, monkeypatch):
+        entry_point = EntryPoint(name='custom', value='pancham.validation_field:ValidationStep', group='pancham.validation_rules')
+        shadowed = EntryPoint(name='not_null', value='pancham.validation_field:ValidationStep', group='pancham.validation_rules')
+        monkeypatch.setattr(plugin_registry, 'entry_points', lambda group: [entry_point, shadowed] if group == 'pancham.validation_rules' else [])
+
+        sources = get_plugin_sources('validation_rules')
+
+        assert sources['not_null'] == BUILTIN_PLUGINS['validation_rules']['not_null']
+        assert isinstance(LazyPlugin('custom', sources['custom']).plugin, ValidationStep)
@@ -0,0 +1,200 @@
+import json
+import threading
+
+import pytest
+
+from pancham.output_executor import OutputExecutor
+from pancham.profiler import StageProfiler, summarise_profiles, get_active_profiler, set_active_profiler
+from pancham.reporter import PrintReporter
+
+
+class TestStageProfiler:
+
+    def test_disabled_profiler_does_not_report(self):
+        reporter = PrintReporter()
+        profiler = StageProfiler(reporter)
+
+        with profiler.stage('rename', rows_in=10):
+            pass
+
+        assert reporter.stage_profiles == []
+
+    def test_stage_is_reported(self):
+        reporter = PrintReporter()
+        profiler = StageProfiler(reporter, enabled=True)
+
+        with profiler.stage('field', rows_in=10, field='a', parser='FieldParser') as stage:
+            stage.rows_out = 8
+
+        profile = reporter.stage_profiles[0]
+        assert profile.stage == 'field'
+        assert profile.labels == {'field': 'a', 'parser': 'FieldParser'}
+        assert profile.rows_in == 10
+        assert profile.rows_out == 8
+        assert profile.wall_time >= 0
+        assert profile.allocated_bytes is None
+
+    def test_failed_stage_is_reported(self):
+        reporter = PrintReporter()
+        profiler = StageProfiler(reporter, enabled=True)
+
+        with pytest.raises(ValueError):
+            with profiler.stage('cast'):
+                raise ValueError('cast failed')
+
+        assert len(reporter.stage_profiles) == 1
+
+    def test_allocations_are_tracked(self):
+        reporter = PrintReporter()
+        profiler = StageProfiler(reporter, enabled=True, track_allocations=True)
+
+        with profiler.stage('load'):
+            data = [i for i in range(10000)]
+
+        assert reporter.stage_profiles[0].allocated_bytes > 0
+
+    def test_nested_stages_keep_their_own_peak(self):
+        reporter = PrintReporter()
+        profiler = StageProfiler(reporter, enabled=True, track_allocations=True)
+
+        with profiler.stage('field'):
+            data = bytearray(4 * 1024 * 1024)
+            del data
+
+            with profiler.stage('lookup'):
+                small = bytearray(1024)
+
+        inner, outer = reporter.stage_profiles
+
+        assert inner.allocated_bytes < 1024 * 1024
+        assert outer.allocated_bytes >= 4 * 1024 * 1024
+
+    def test_allocations_are_not_shared_across_threads(self):
+        reporter = PrintReporter()
+        profiler = StageProfiler(reporter, enabled=True, track_allocations=True)
+        started = threading.Event()
+        finish = threading.Event()
+
+        def run_stage():
+            with profiler.stage('output'):
+                started.set()
+                finish.wait(5)
+
+        thread = threading.Thread(target=run_stage)
+        thread.start()
+        started.wait(5)
+
+        with profiler.stage('field'):
+            pass
+
+        finish.set()
+        thread.join()
+
+        with profiler.stage('cast'):
+            pass
+
+        assert [(p.stage, p.allocated_bytes is None) for p in reporter.stage_profiles] == [('field', True), ('output', True), ('cast', False)]
+
+    def test_active_profiler_is_kept_per_thread(self):
+        profilers = {}
+
+        def run_job(name: str, barrier: threading.Barrier):
+            profiler = StageProfiler(PrintReporter(), enabled=True)
+            set_active_profiler(profiler)
+            barrier.wait(5)
+
+            seen = []
+            OutputExecutor(2).run([lambda: seen.append(get_active_profiler()), lambda: seen.append(get_active_profiler())])
+            profilers[name] = (profiler, get_active_profiler(), seen)
+
+        barrier = threading.Barrier(2)
+        threads = [threading.Thread(target=run_job, args=(name, barrier)) for name in ['first', 'second']]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for profiler, active, seen in profilers.values():
+            assert active is profiler
+            assert seen == [profiler, profiler]
+
+    def test_failed_iterator_stops_tracking(self):
+        reporter = PrintReporter()
+        profiler = StageProfiler(reporter, enabled=True, track_allocations=True)
+
+        def failing():
+            yield [1]
+            raise OSError('read failed')
+
+        with pytest.raises(OSError):
+            list(profiler.profile_iterator(failing(), 'load'))
+
+        def run_stage():
+            with profiler.stage('output'):
+                pass
+
+        thread = threading.Thread(target=run_stage)
+        thread.start()
+        thread.join()
+
+        assert [p.stage for p in reporter.stage_profiles] == ['load', 'load', 'output']
+        assert reporter.stage_profiles[-1].allocated_bytes is not None
+
+    def test_memory_is_tracked(self):
+        reporter = PrintReporter()
+        profiler = StageProfiler(reporter, enabled=True, track_allocations=True, track_memory=True, snapshot_top=3)
+
+        with profiler.stage('explode'):
+            data = [str(i) for i in range(50000)]
+
+        with profiler.stage('cast'):
+            pass
+
+        first, second = reporter.stage_profiles
+        summary = summarise_profiles(reporter.stage_profiles)
+
+        assert first.rss_after > 0 and first.peak_rss > 0
+        assert len(first.top_allocations) == 3
+        assert second.top_allocations is None
+        assert summary[0]['top_allocations'] == first.top_allocations
+        assert summary[0]['rss_growth'] is not None
+
+    def test_profile_iterator(self):
+        reporter = PrintReporter()
+        profiler = StageProfiler(reporter, enabled=True)
+
+        items = list(profiler.profile_iterator(iter([[1, 2], [3]]), 'load', file_type='csv'))
+
+        assert items == [[1, 2], [3]]
+        assert [p.rows_out for p in reporter.stage_profiles] == [2, 1]
+
+    def test_summarise_profiles(self):
+        reporter = PrintReporter()
+        profiler = StageProfiler(reporter, enabled=True)
+
+        for _ in range(3):
+            with profiler.stage('rename', rows_in=5) as stage:
+                stage.rows_out = 5
+
+        with profiler.stage('cast', rows_in=5):
+            pass
+
+        summary = summarise_profiles(reporter.stage_profiles)
+
+        assert len(summary) == 2
+        assert summary[0]['calls'] == 3
+        assert summary[0]['rows_in'] == 15
+        assert summary[1]['rows_out'] is None
+
+    def test_report_profile_to_file(self, tmp_path):
+        reporter = PrintReporter()
+        profiler = StageProfiler(reporter, enabled=True)
+
+        with profiler.stage('output', writer='DatabaseOutputWriter'):
+            pass
+
+        output_file = tmp_path / 'profile.json'
+        reporter.report_profile(str(output_file))
+
+        report = json.loads(output_file.read_text())
+        assert report['stages'][0]['labels']['writer'] == 'DatabaseOutputWriter'
@@ -0,0 +1,54 @@
+import pandas as pd
+
+from pancham.reporter import PrintReporter, Reporter
+from pancham.validation_field import ValidationFailure
+
+
+class TestReporter:
+
+    def test_debug_disabled_does_not_build_message(self, capsys):
+        reporter = PrintReporter(debug=False)
+        calls = []
+
+        reporter.report_debug(lambda: calls.append('message') or 'message', lambda: calls.append('data'))
+
+        assert calls == []
+        assert capsys.readouterr().out == ''
+        assert not reporter.is_debug_enabled()
+
+    def test_debug_enabled_builds_message(self, capsys):
+        reporter = PrintReporter(debug=True)
+
+        reporter.report_debug(lambda: f"Rows {len(pd.DataFrame({'a': [1, 2]}))}", lambda: {'a': 1})
+
+        assert capsys.readouterr().out == "DEBUG: Rows 2\n{'a': 1}\n"
+
+    def test_debug_accepts_strings(self, capsys):
+        reporter = PrintReporter(debug=True)
+
+        reporter.report_debug('Plain message')
+
+        assert capsys.readouterr().out == "DEBUG: Plain message\n"
+
+    def test_base_reporter_ignores_lazy_messages(self):
+        reporter = Reporter()
+
+        reporter.report_debug(lambda: 1 / 0)
+
+        assert not reporter.is_debug_enabled()
+
+    def test_reports_failure_counts(self, capsys):
+        reporter = PrintReporter()
+        reporter.configure_validation_failures(sample_size=2)
+
+        for i in range(3):
+            reporter.save_validation_failure(ValidationFailure(i, 'not_null', 'value for email is null.', 'email'))
+        reporter.save_validation_failure(ValidationFailure(None, 'not_all_null', 'No non-null values found in column: phone', 'phone'))
+
+        reporter.report_validation_failure()
+
+        assert capsys.readouterr().out == (
+            "4 validation failures encountered:\n"
+            " - not_null on email: 3 failures (ids 0, 1, ...)\n"
+            " - not_all_null on phone: 1 failures\n"
+        )
@@ -0,0 +1,80 @@
+import pandas as pd
+
+from pancham.data_frame_configuration import DataFrameConfiguration, ResultCacheConfiguration
+from pancham.data_frame_field import DataFrameField
+from pancham.file_loader import CsvFileLoader
+from pancham.integration.salesforce_output import SalesforceBulkOutputWriter
+from pancham.output_configuration import OutputWriter
+from pancham.result_cache import ResultCache, ResultCacheEntry, output_fingerprint, result_fingerprint
+
+
+def build_configuration(path: str, file_type: str = 'csv', hash_content: bool = False) -> DataFrameConfiguration:
+    configuration = DataFrameConfiguration(path, file_type, 'customers', result_cache=ResultCacheConfiguration(hash_content=hash_content))
+    configuration.mapping_fingerprint = 'mapping'
+
+    return configuration
+
+
+class TestResultCache:
+
+    def test_save_and_read_chunks(self, tmp_path):
+        cache = ResultCache(str(tmp_path))
+
+        cache.store_chunk('customers', 0, pd.DataFrame({'id': [1, 2]}))
+        cache.store_chunk('customers', 1, pd.DataFrame({'id': [3]}))
+        cache.save('customers', ResultCacheEntry('abc', ['out'], 2))
+
+        assert cache.load('customers') == ResultCacheEntry('abc', ['out'], 2)
+        assert [list(c['id']) for c in cache.read_chunks('customers', 2)] == [[1, 2], [3]]
+
+        cache.clear('customers')
+
+        assert cache.load('customers') is None
+
+    def test_fingerprint_changes_with_content(self, tmp_path):
+        source = tmp_path / "customers.csv"
+        source.write_text("id\n1\n")
+        configuration = build_configuration(str(source), hash_content=True)
+
+        first = result_fingerprint(configuration, CsvFileLoader(), None)
+        source.write_text("id\n2\n")
+
+        assert first != result_fingerprint(configuration, CsvFileLoader(), None)
+
+    def test_query_sources_need_watermark(self, tmp_path):
+        source = tmp_path / "customers.sql"
+        source.write_text("select * from customers")
+        configuration = build_configuration(str(source), file_type='sql_file')
+
+        assert result_fingerprint(configuration, CsvFileLoader(), None) is None
+        assert result_fingerprint(configuration, CsvFileLoader(), None, watermark='2024-01-01') is not None
+
+    def test_lookups_need_lookup_query(self, tmp_path):
+        source = tmp_path / "customers.csv"
+        source.write_text("id\n1\n")
+        configuration = build_configuration(str(source))
+        lookup = DataFrameField('account', 'account', str)
+        lookup.parser_name = 'DatabaseMatchFieldParser'
+        configuration.add_field(data_frame_field=lookup)
+
+        assert result_fingerprint(configuration, CsvFileLoader(), None) is None
+
+        first = result_fingerprint(configuration, CsvFileLoader(), None, lookup_watermark='2024-01-01')
+
+        assert first is not None
+        assert first != result_fingerprint(configuration, CsvFileLoader(), None, lookup_watermark='2024-01-02')
+
+        configuration.result_cache.ignore_lookups = True
+
+        assert result_fingerprint(configuration, CsvFileLoader(), None) is not None
+
+    def test_output_fingerprint(self):
+        assert output_fingerprint(OutputWriter({'table': 'a'})) != output_fingerprint(OutputWriter({'table': 'b'}))
+
+    def test_output_fingerprint_includes_target(self, monkeypatch):
+        monkeypatch.setenv('PANCHAM_SF_INSTANCE_URL', 'https://first.my.salesforce.com')
+        first = output_fingerprint(SalesforceBulkOutputWriter({'object_name': 'Contact'}))
+
+        monkeypatch.setenv('PANCHAM_SF_INSTANCE_URL', 'https://second.my.salesforce.com')
+
+        assert first != output_fingerprint(SalesforceBulkOutputWriter({'object_name': 'Contact'}))
@@ -1,13 +1,25 @@
 import datetime
+import json
 import os
+import threading
+
+import pytest
+import pandas as pd
 
 from sqlalchemy import Table, MetaData, select, Integer, Column, DateTime, Boolean, String
 
+from pancham.data_frame_configuration import DataFrameConfiguration, IncrementalConfiguration, ResultCacheConfiguration
+from pancham.checkpoint import CheckpointStore
+from pancham.data_frame_field import DataFrameField
+from pancham.deduplication import DeduplicateFunction
 from pancham.file_loader import FileLoader
+from pancham.output_configuration import OutputWriter, OutputActivitySet
+from pancham.output_executor import OutputExecutor
 from pancham.database.database_engine import get_db_engine, initialize_db_engine
 from pancham.pancham_configuration import PanchamConfiguration
 from pancham.runner import PanchamRunner, start_pancham
 from pancham.reporter import PrintReporter
+from pancham.reporter_lib.telemetry_reporter import TelemetryReporter
 
 
 class Config(PanchamConfiguration):
@@ -26,6 +38,101 @@ class Config(PanchamConfiguration):
         return os.path.dirname(os.path.realpath(__file__)) + "/.."
 
 
+class PipelineConfig(Config):
+
+    @property
+    def enabled_features(self) -> list[str]:
+        return ['pipeline']
+
+
+class ParallelOutputConfig(Config):
+
+    @property
+    def enabled_features(self) -> list[str]:
+        return ['parallel_output']
+
+
+class ProfileConfig(Config):
+
+    @property
+    def profile_enabled(self) -> bool:
+        return True
+
+
+class MemoryProfileConfig(ProfileConfig):
+
+    def __init__(self, profile_output: str):
+        self.output = profile_output
+
+    @property
+    def profile_memory(self) -> bool:
+        return True
+
+    @property
+    def profile_output(self) -> str|None:
+        return self.output
+
+
+class IncrementalConfig(Config):
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @property
+    def source_dir(self) -> str:
+        return self.directory
+
+    @property
+    def incremental_state_dir(self) -> str:
+        return self.directory + "/state"
+
+    @property
+    def checkpoint_dir(self) -> str:
+        return self.directory + "/checkpoints"
+
+    @property
+    def result_cache_dir(self) -> str:
+        return self.directory + "/results"
+
+
+class CheckpointConfig(IncrementalConfig):
+
+    @property
+    def checkpoint_enabled(self) -> bool:
+        return True
+
+
+class CapturingWriter(OutputWriter):
+
+    def __init__(self):
+        super().__init__({})
+        self.written = []
+
+    def write(self, data, success_handler=None, failure_handler=None, loader=None):
+        self.written.append(data)
+
+
+class FailingWriter(CapturingWriter):
+
+    def __init__(self, fail_on: int):
+        super().__init__()
+        self.fail_on = fail_on
+
+    def write(self, data, success_handler=None, failure_handler=None, loader=None):
+        if len(self.written) == self.fail_on:
+            raise ConnectionError("Output unavailable")
+
+        super().write(data)
+
+
+class RejectingWriter(CapturingWriter):
+
+    def write(self, data, success_handler=None, failure_handler=None, loader=None):
+        super().write(data)
+        if len(self.written) == 1:
+            self.failed_rows += 1
+
+
 class TestRunner:
 
     config_file = os.path.dirname(os.path.realpath(__file__)) + "/../example/order_configuration.yml"
@@ -119,6 +226,251 @@ class TestRunner:
             assert result[1][0] == 1
             assert result[1][1] == "B"
 
+    def test_pipelined_runner(self):
+        writer = CapturingWriter()
+
+        configuration = DataFrameConfiguration('example/orders.json', 'json', 'pipelined', key='orders')
+        configuration.use_iterator = True
+        configuration.chunk_size = 2
+        configuration.add_field('customer_id', 'customer', int)
+        configuration.add_output(OutputActivitySet(primary_writer=writer, success_handler=None, failure_handler=None))
+
+        runner = PanchamRunner(PipelineConfig())
+        runner.run(configuration)
+
+        assert len(writer.written) == 3
+        assert sum(len(d) for d in writer.written) == 6
+
+    def test_parallel_output_runner(self):
+        first = CapturingWriter()
+        second = CapturingWriter()
+        post_writer = CapturingWriter()
+
+        configuration = DataFrameConfiguration('example/orders.json', 'json', 'parallel', key='orders')
+        configuration.add_field('customer_id', 'customer', int)
+        configuration.add_output(OutputActivitySet(primary_writer=first, success_handler=None, failure_handler=None))
+        configuration.add_output(OutputActivitySet(primary_writer=second, success_handler=None, failure_handler=None))
+
+        post = DataFrameConfiguration('post', 'post', 'post')
+        post.add_field('customer_id', 'customer_id', int)
+        post.add_output(OutputActivitySet(primary_writer=post_writer, success_handler=None, failure_handler=None))
+        configuration.post_run_configuration.append(post)
+
+        runner = PanchamRunner(ParallelOutputConfig())
+        runner.run(configuration)
+
+        assert len(first.written[0]) == 6
+        assert len(second.written[0]) == 6
+        assert len(post_writer.written[0]) == 6
+
+    def test_output_threads_stop_after_run(self):
+        initialize_db_engine(Config(), PrintReporter())
+        metadata = MetaData()
+        Table('order', metadata, Column('Order', Integer), Column('Date', DateTime), Column('Sent', Boolean))
+        metadata.create_all(get_db_engine().engine)
+
+        runner = PanchamRunner(Config())
+        runner.output_executor = OutputExecutor(2)
+        runner.output_executor.run([lambda: None, lambda: None])
+
+        runner.load_and_run(configuration_file=self.config_file)
+
+        assert not any(t.name.startswith('pancham-output') for t in threading.enumerate())
+
+    def test_profiled_runner(self):
+        writer = CapturingWriter()
+        reporter = PrintReporter()
+
+        configuration = DataFrameConfiguration('example/orders.json', 'json', 'profiled', key='orders')
+        configuration.add_field('customer_id', 'customer', int)
+        configuration.add_output(OutputActivitySet(primary_writer=writer, success_handler=None, failure_handler=None))
+
+        runner = PanchamRunner(ProfileConfig(), reporter=reporter)
+        runner.run(configuration)
+
+        stages = [p.stage for p in reporter.stage_profiles]
+        assert stages == ['load', 'rename', 'cast', 'schema_validation', 'output']
+
+        output = reporter.stage_profiles[-1]
+        assert output.labels['writer'] == 'CapturingWriter'
+        assert output.rows_in == 6
+
+    def test_memory_profiled_runner(self, tmp_path):
+        initialize_db_engine(Config(), PrintReporter())
+        metadata = MetaData()
+        Table('order', metadata, Column('Order', Integer), Column('Date', DateTime), Column('Sent', Boolean))
+        metadata.create_all(get_db_engine().engine)
+        reporter = PrintReporter()
+        profile_output = tmp_path / "profile.json"
+
+        runner = PanchamRunner(MemoryProfileConfig(str(profile_output)), reporter=reporter)
+        runner.load_and_run(configuration_file=self.config_file)
+
+        report = json.loads(profile_output.read_text())
+
+        assert all(p.rss_after is not None for p in reporter.stage_profiles)
+        assert report['memory']['peak_rss'] > 0
+        excel = [c for c in report['memory']['caches'] if c['cache'] == 'excel']
+        assert len(excel) == 1
+        assert excel[0]['bytes'] > 0
+
+    def test_incremental_runner(self, tmp_path):
+        source = tmp_path / "customers.csv"
+        writer = CapturingWriter()
+        deleted_writer = CapturingWriter()
+
+        deleted = DataFrameConfiguration('deleted', 'deleted', 'deleted')
+        deleted.add_field('customer_id', 'id', int)
+        deleted.add_output(OutputActivitySet(primary_writer=deleted_writer, success_handler=None, failure_handler=None))
+
+        configuration = DataFrameConfiguration('customers.csv', 'csv', 'incremental', incremental=IncrementalConfiguration(key='id', detect_deletes=True, deleted_configuration=deleted))
+        configuration.add_field('customer_id', 'id', int)
+        configuration.add_field('name', 'name', str)
+        configuration.add_output(OutputActivitySet(primary_writer=writer, success_handler=None, failure_handler=None))
+
+        runner = PanchamRunner(IncrementalConfig(str(tmp_path)))
+
+        source.write_text("id,name\n1,A\n2,B\n3,C\n")
+        runner.run(configuration)
+
+        source.write_text("id,name\n1,A\n2,X\n4,D\n")
+        runner.run(configuration)
+
+        assert len(writer.written) == 2
+        assert len(writer.written[0]) == 3
+        assert list(writer.written[1]['customer_id']) == [2, 4]
+        assert list(deleted_writer.written[0]['customer_id']) == [3]
+
+    def test_incremental_state_kept_when_rows_fail(self, tmp_path):
+        (tmp_path / "customers.csv").write_text("id,name\n1,A\n2,B\n")
+        writer = RejectingWriter()
+
+        configuration = DataFrameConfiguration('customers.csv', 'csv', 'rejected', incremental=IncrementalConfiguration(key='id'))
+        configuration.add_field('customer_id', 'id', int)
+        configuration.add_output(OutputActivitySet(primary_writer=writer, success_handler=None, failure_handler=None))
+
+        runner = PanchamRunner(IncrementalConfig(str(tmp_path)))
+        runner.run(configuration)
+        runner.run(configuration)
+        runner.run(configuration)
+
+        assert [list(d['customer_id']) for d in writer.written] == [[1, 2], [1, 2]]
+
+    def test_resume_runner(self, tmp_path):
+        (tmp_path / "customers.csv").write_text("id\n\n1\n2\n3\n4\n5\n")
+        failing = FailingWriter(fail_on=1)
+        writer = CapturingWriter()
+
+        def build_configuration(output: OutputWriter) -> DataFrameConfiguration:
+            configuration = DataFrameConfiguration('customers.csv', 'csv', 'resumed')
+            configuration.use_iterator = True
+            configuration.chunk_size = 2
+            configuration.add_field('customer_id', 'id', int)
+            configuration.add_output(OutputActivitySet(primary_writer=output, success_handler=None, failure_handler=None))
+            return configuration
+
+        # Checkpoints are only written when the run can be resumed
+        PanchamRunner(IncrementalConfig(str(tmp_path))).run(build_configuration(CapturingWriter()))
+
+        assert not (tmp_path / "checkpoints").exists()
+
+        with pytest.raises(ConnectionError):
+            PanchamRunner(CheckpointConfig(str(tmp_path))).run(build_configuration(failing))
+
+        PanchamRunner(IncrementalConfig(str(tmp_path)), resume=True).run(build_configuration(writer))
+
+        assert list(failing.written[0]['customer_id']) == [1, 2]
+        assert [list(d['customer_id']) for d in writer.written] == [[3, 4], [5]]
+
+        # Completed configurations are skipped until the whole run has completed
+        completed = CapturingWriter()
+        PanchamRunner(IncrementalConfig(str(tmp_path)), resume=True).run(build_configuration(completed))
+
+        assert completed.written == []
+        assert CheckpointStore(str(tmp_path / "checkpoints")).load('resumed').completed
+
+    def test_deduplicates_across_chunks(self, tmp_path):
+        (tmp_path / "customers.csv").write_text("id,score\n1,1\n2,5\n1,3\n2,2\n1,4\n3,1\n")
+        first = CapturingWriter()
+        best = CapturingWriter()
+
+        first_configuration = DataFrameConfiguration('customers.csv', 'csv', 'first', drop_duplicates='id')
+        first_configuration.use_iterator = True
+        first_configuration.chunk_size = 2
+        first_configuration.add_field('customer_id', 'id', int)
+        first_configuration.add_field('score', 'score', int)
+        first_configuration.add_output(OutputActivitySet(primary_writer=first, success_handler=None, failure_handler=None))
+
+        best_configuration = DataFrameConfiguration('customers.csv', 'csv', 'best')
+        best_configuration.use_iterator = True
+        best_configuration.chunk_size = 2
+        best_configuration.add_field('customer_id', 'id', int)
+        best_configuration.add_field('score', 'score', int)
+        best_configuration.add_field(data_frame_field=DataFrameField('customer_id', None, int, df_func=DeduplicateFunction('customer_id', sort_by='score', ascending=False)))
+        best_configuration.add_output(OutputActivitySet(primary_writer=best, success_handler=None, failure_handler=None))
+
+        runner = PanchamRunner(IncrementalConfig(str(tmp_path)))
+        runner.run(first_configuration)
+        runner.run(best_configuration)
+
+        assert list(pd.concat(first.written)['customer_id']) == [1, 2, 3]
+        assert list(pd.concat(best.written)['score']) == [5, 4, 1]
+        assert first_configuration.source_deduplicator is None
+
+    def test_exports_telemetry(self, tmp_path):
+        (tmp_path / "customers.csv").write_text("id\n1\n2\n3\n4\n5\n")
+        writer = CapturingWriter()
+        reporter = TelemetryReporter(metrics_log=str(tmp_path / "metrics.jsonl"))
+
+        configuration = DataFrameConfiguration('customers.csv', 'csv', 'customers')
+        configuration.use_iterator = True
+        configuration.chunk_size = 2
+        configuration.add_field('customer_id', 'id', int)
+        configuration.add_output(OutputActivitySet(primary_writer=writer, success_handler=None, failure_handler=None))
+
+        runner = PanchamRunner(IncrementalConfig(str(tmp_path)), reporter=reporter)
+        runner.run(configuration)
+        reporter.close()
+
+        run = reporter.snapshot()['runs'][0]
+
+        assert run['estimated_rows'] == 5
+        assert run['rows_read'] == 5
+        assert run['chunks_written'] == 3
+        assert run['eta_seconds'] == 0
+        assert run['writers']['CapturingWriter']['calls'] == 3
+        assert 'cache_entries' in reporter.snapshot()['gauges']
+
+    def test_cached_runner(self, tmp_path):
+        source = tmp_path / "customers.csv"
+        source.write_text("id\n1\n2\n")
+        first = CapturingWriter()
+        second = CapturingWriter()
+        second.root_configuration = {'table': 'second'}
+
+        configuration = DataFrameConfiguration('customers.csv', 'csv', 'cached', result_cache=ResultCacheConfiguration(store_output=True, hash_content=True))
+        configuration.mapping_fingerprint = 'mapping'
+        configuration.add_field('customer_id', 'id', int)
+        configuration.add_output(OutputActivitySet(primary_writer=first, success_handler=None, failure_handler=None))
+
+        runner = PanchamRunner(IncrementalConfig(str(tmp_path)))
+        runner.run(configuration)
+        runner.run(configuration)
+
+        assert len(first.written) == 1
+
+        configuration.add_output(OutputActivitySet(primary_writer=second, success_handler=None, failure_handler=None))
+        runner.run(configuration)
+
+        assert len(first.written) == 1
+        assert list(second.written[0]['customer_id']) == [1, 2]
+
+        source.write_text("id\n3\n")
+        runner.run(configuration)
+
+        assert list(first.written[1]['customer_id']) == [3]
+        assert len(second.written) == 2
+
     def test_add_custom_loaders(self):
         loaders = {'a': FileLoader()}
 
@@ -142,6 +494,8 @@ class TestStartPancham:
         mocker.patch('pancham.runner.OrderedPanchamConfiguration.reporter_name', return_value=None)
         mocker.patch('pancham.runner.OrderedPanchamConfiguration.debug_status', return_value=False)
         mocker.patch('pancham.runner.get_reporter', return_value=None)
+        mocker.patch('pancham.runner.OrderedPanchamConfiguration.copy_on_write', return_value=True)
+        mocker.patch('pancham.runner.enable_copy_on_write')
 
         start_pancham('', None)
 
@@ -152,16 +506,32 @@ class TestStartPancham:
         mocker.patch('pancham.runner.OrderedPanchamConfiguration.reporter_name', return_value=None)
         mocker.patch('pancham.runner.OrderedPanchamConfiguration.debug_status', return_value=False)
         mocker.patch('pancham.runner.get_reporter', return_value=None)
+        mocker.patch('pancham.runner.OrderedPanchamConfiguration.copy_on_write', return_value=True)
+        mocker.patch('pancham.runner.enable_copy_on_write')
 
         start_pancham('', None, test=True)
 
         assert run_all.call_count == 1
 
+    def test_start_pancham_enables_copy_on_write(self, mocker):
+        mocker.patch('pancham.runner.PanchamRunner.run_all', return_value=None)
+        mocker.patch('pancham.runner.OrderedPanchamConfiguration.reporter_name', return_value=None)
+        mocker.patch('pancham.runner.OrderedPanchamConfiguration.debug_status', return_value=False)
+        mocker.patch('pancham.runner.get_reporter', return_value=None)
+        mocker.patch('pancham.runner.OrderedPanchamConfiguration.copy_on_write', return_value=True)
+        enable = mocker.patch('pancham.runner.enable_copy_on_write')
+
+        start_pancham('', None)
+
+        assert enable.call_count == 1
+
     def test_start_pancham_with_data_configuration(self, mocker):
         run_all = mocker.patch('pancham.runner.PanchamRunner.load_and_run', return_value=None)
         mocker.patch('pancham.runner.OrderedPanchamConfiguration.reporter_name', return_value=None)
         mocker.patch('pancham.runner.OrderedPanchamConfiguration.debug_status', return_value=False)
         mocker.patch('pancham.runner.get_reporter', return_value=None)
+        mocker.patch('pancham.runner.OrderedPanchamConfiguration.copy_on_write', return_value=True)
+        mocker.patch('pancham.runner.enable_copy_on_write')
 
         start_pancham('', 'a')
 
@@ -0,0 +1,251 @@
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+import yaml
+
+from pancham.configuration.field_parser import FieldParser
+from pancham.data_frame_field import DataFrameField
+from pancham.database.database_engine import get_db_engine
+from pancham.database.database_search_manager import get_database_search, count_cached_search_values
+from pancham.plugin_registry import default_file_loaders, default_field_parsers, default_outputs, default_validation_rules
+from pancham.reporter import PrintReporter
+from pancham.runner import PanchamRunner
+from pancham.server import PanchamServer
+from pancham_configuration import PanchamConfiguration
+
+
+class ServerConfig(PanchamConfiguration):
+
+    def __init__(self, watch_dir: str|None = None, cache_ttl: float = 0):
+        self.watch_dir = watch_dir
+        self.cache_ttl = cache_ttl
+
+    @property
+    def database_connection(self) -> str:
+        return "sqlite:///:memory:"
+
+    @property
+    def server_port(self) -> int|None:
+        return 0
+
+    @property
+    def server_watch_dir(self) -> str|None:
+        return self.watch_dir
+
+    @property
+    def server_cache_ttl(self) -> float:
+        return self.cache_ttl
+
+    @property
+    def server_poll_interval(self) -> float:
+        return 0.05
+
+
+class JobConfig(ServerConfig):
+
+    def __init__(self, source_dir: str):
+        super().__init__()
+        self.directory = source_dir
+
+    @property
+    def database_connection(self) -> str:
+        return f"sqlite:///{self.directory}/server.db"
+
+    @property
+    def source_dir(self) -> str:
+        return self.directory
+
+    @property
+    def profile_enabled(self) -> bool:
+        return True
+
+    @property
+    def profile_output(self) -> str|None:
+        return f"{self.directory}/profile.json"
+
+
+class BarrierFieldParser(FieldParser):
+    """
+    Holds each job until the other job has reached the same field.
+    """
+
+    def __init__(self, barrier: threading.Barrier):
+        self.barrier = barrier
+
+    def can_parse_field(self, field: dict) -> bool:
+        return self.has_function_key(field, 'barrier')
+
+    def parse_field(self, field: dict) -> DataFrameField:
+        def wait(df):
+            self.barrier.wait()
+            return df['email']
+
+        return DataFrameField(name=field['name'], nullable=True, source_name=None, field_type=field[self.FIELD_TYPE_KEY], vector_func=wait)
+
+
+class FakeRunner:
+
+    def __init__(self, runs: list[str]):
+        self.runs = runs
+
+    def load_and_run(self, configuration_file: str):
+        if 'broken' in configuration_file:
+            raise ValueError("Broken mapping")
+
+        self.runs.append(configuration_file)
+
+
+def wait_for(condition, timeout: float = 5):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if condition():
+            return True
+        time.sleep(0.02)
+
+    return False
+
+
+def request(server: PanchamServer, method: str, path: str, body: dict|None = None) -> tuple[int, dict]:
+    host, port = server.address
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    req = urllib.request.Request(f"http://{host}:{port}{path}", data=data, method=method)
+
+    try:
+        with urllib.request.urlopen(req) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.fixture
+def mapping_file(tmp_path) -> str:
+    path = tmp_path / 'mapping.yml'
+    path.write_text('name: mapping\n')
+
+    return str(path)
+
+
+class TestPanchamServer:
+
+    def test_runs_jobs_submitted_over_http(self, mapping_file):
+        runs = []
+        server = PanchamServer(ServerConfig(), PrintReporter(), runner_factory=lambda reporter: FakeRunner(runs))
+        server.start()
+
+        try:
+            status, job = request(server, 'POST', '/jobs', {'mapping': mapping_file})
+            assert status == 202
+
+            assert wait_for(lambda: server.get_job(job['id']).is_finished())
+            status, job = request(server, 'GET', f"/jobs/{job['id']}")
+
+            assert status == 200
+            assert job['status'] == 'succeeded'
+            assert runs == [mapping_file]
+            assert request(server, 'GET', '/health')[1]['running'] == 0
+        finally:
+            server.stop()
+
+    def test_rejects_missing_mappings(self, tmp_path):
+        server = PanchamServer(ServerConfig(), PrintReporter(), runner_factory=lambda reporter: FakeRunner([]))
+        server.start()
+
+        try:
+            status, body = request(server, 'POST', '/jobs', {'mapping': str(tmp_path / 'missing.yml')})
+
+            assert status == 400
+            assert 'not found' in body['error']
+            assert request(server, 'GET', '/jobs/unknown')[0] == 404
+        finally:
+            server.stop()
+
+    def test_runs_mappings_dropped_in_watch_dir(self, tmp_path):
+        runs = []
+        watch_dir = tmp_path / 'watch'
+        watch_dir.mkdir()
+        (watch_dir / 'orders.yml').write_text('name: orders\n')
+        (watch_dir / 'broken.yml').write_text('name: broken\n')
+        (watch_dir / 'notes.txt').write_text('ignored')
+
+        server = PanchamServer(ServerConfig(str(watch_dir)), PrintReporter(), runner_factory=lambda reporter: FakeRunner(runs))
+        server.start()
+
+        try:
+            assert wait_for(lambda: len(server.list_jobs()) == 2 and all(job.is_finished() for job in server.list_jobs()))
+        finally:
+            server.stop()
+
+        jobs = {os.path.basename(job.mapping).split('_', 1)[1]: job for job in server.list_jobs()}
+
+        assert jobs['orders.yml'].status == 'succeeded'
+        assert os.path.dirname(jobs['orders.yml'].mapping) == str(watch_dir / 'done')
+        assert jobs['broken.yml'].status == 'failed'
+        assert jobs['broken.yml'].error == 'Broken mapping'
+        assert os.path.dirname(jobs['broken.yml'].mapping) == str(watch_dir / 'failed')
+        assert os.listdir(watch_dir / 'running') == []
+        assert (watch_dir / 'notes.txt').exists()
+
+    def test_caches_are_invalidated(self):
+        server = PanchamServer(ServerConfig(cache_ttl=0.1), PrintReporter(), runner_factory=lambda reporter: FakeRunner([]))
+        search = get_database_search('server_cache', 'email', 'id')
+        search.cached_data = {'a@example.com': 1}
+
+        assert count_cached_search_values() > 0
+
+        server.start()
+        try:
+            assert wait_for(lambda: count_cached_search_values() == 0)
+        finally:
+            server.stop()
+
+        assert get_database_search('server_cache', 'email', 'id') is not search
+
+    def test_runs_real_jobs_at_the_same_time(self, tmp_path):
+        for name, emails in (('first', ['a@example.com', None, None]), ('second', ['b@example.com', 'c@example.com', None])):
+            (tmp_path / f"{name}.csv").write_text("id,email\n" + "\n".join(f"{i},{e or ''}" for i, e in enumerate(emails)) + "\n")
+            (tmp_path / f"{name}.yml").write_text(yaml.safe_dump({
+                'name': name,
+                'file_type': 'csv',
+                'file_path': f"{name}.csv",
+                'output': [{'output_type': 'database', 'table': f"server_{name}"}],
+                'fields': [
+                    {'name': 'id', 'source_name': 'id', 'field_type': 'int'},
+                    {'name': 'email', 'field_type': 'str', 'nullable': True, 'func': {'barrier': {}}}
+                ],
+                'validation': [{'name': 'not_null', 'rule': {'test_field': 'email', 'id_field': 'id'}}]
+            }))
+
+        configuration = JobConfig(str(tmp_path))
+        parser = BarrierFieldParser(threading.Barrier(2, timeout=5))
+        server = PanchamServer(configuration, PrintReporter(), runner_factory=lambda reporter: PanchamRunner(
+            configuration,
+            file_loaders=default_file_loaders(),
+            reporter=reporter,
+            field_parsers=default_field_parsers() + [parser],
+            outputs_configuration=default_outputs(),
+            validation_rules=default_validation_rules()
+        ))
+        server.start()
+
+        try:
+            first = server.submit(str(tmp_path / 'first.yml'))
+            second = server.submit(str(tmp_path / 'second.yml'))
+
+            assert wait_for(lambda: first.is_finished() and second.is_finished())
+        finally:
+            server.stop()
+
+        assert (first.status, first.error, first.validation_failures) == ('succeeded', None, 2)
+        assert (second.status, second.error, second.validation_failures) == ('succeeded', None, 1)
+        assert len(pd.read_sql('SELECT * FROM server_first', get_db_engine().engine)) == 3
+        assert len(pd.read_sql('SELECT * FROM server_second', get_db_engine().engine)) == 3
+
+        # Each profile only holds the stages of its own job
+        profile = json.loads((tmp_path / 'profile.json').read_text())
+        assert [stage['rows_in'] for stage in profile['stages'] if stage['stage'] == 'output'] == [3]
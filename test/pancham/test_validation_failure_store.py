@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+from pancham.validation_failure_store import ValidationFailureStore
+from pancham.validation_field import ValidationFailure
+
+
+class TestValidationFailureStore:
+
+    def test_counts_failures_by_rule_and_field(self):
+        store = ValidationFailureStore(buffer_rows=3, sample_size=2)
+
+        for i in range(5):
+            store.add(ValidationFailure(i, 'not_null', 'value for email is null.', 'email'))
+        store.add(ValidationFailure(9, 'one_of', 'value for status is not in allowed values.', 'status'))
+
+        summaries = store.summaries()
+        frame = store.to_frame()
+
+        assert store.count == 6
+        assert [(s.rule, s.field, s.count, s.sample_ids) for s in summaries] == [
+            ('not_null', 'email', 5, [0, 1]),
+            ('one_of', 'status', 1, [9])
+        ]
+        assert len(frame) == 6
+        assert frame['rule'].dtype == 'category'
+        assert list(frame['failed_id']) == ['0', '1', '2', '3', '4', '9']
+
+    @pytest.mark.parametrize('file_name', ['failures.parquet', 'failures.csv'])
+    def test_writes_failures_to_file(self, tmp_path, file_name):
+        path = str(tmp_path / 'out' / file_name)
+        store = ValidationFailureStore(path, buffer_rows=2)
+
+        for i in range(5):
+            store.add(ValidationFailure(i, 'not_null', 'value for email is null.', 'email'))
+        store.close()
+
+        if file_name.endswith('.parquet'):
+            written = pd.read_parquet(path)
+        else:
+            written = pd.read_csv(path, dtype=str)
+
+        assert list(written.columns) == ['rule', 'field', 'failed_id', 'value', 'message']
+        assert list(written['failed_id']) == ['0', '1', '2', '3', '4']
+        assert len(store.to_frame()) == 0
+
+    def test_values_share_a_message(self):
+        store = ValidationFailureStore()
+
+        for value in ['a', 'b', 'c']:
+            store.add(ValidationFailure(None, 'contains', f"Expected value '{value}' not found in field 'code'.", 'code', value, "Expected value '{value}' not found in field 'code'."))
+
+        frame = store.to_frame()
+
+        assert list(frame['value']) == ['a', 'b', 'c']
+        assert len(frame['message'].cat.categories) == 1
+
+    def test_keeps_max_rows_in_memory(self, tmp_path):
+        store = ValidationFailureStore(buffer_rows=2, max_rows=3)
+        written = ValidationFailureStore(str(tmp_path / 'failures.csv'), buffer_rows=2, max_rows=3)
+
+        for i in range(5):
+            store.add(ValidationFailure(i, 'not_null', 'value for email is null.', 'email'))
+            written.add(ValidationFailure(i, 'not_null', 'value for email is null.', 'email'))
+        written.close()
+
+        assert (store.count, store.dropped, len(store.to_frame())) == (5, 2, 3)
+        assert store.summaries()[0].count == 5
+        assert (written.dropped, len(pd.read_csv(tmp_path / 'failures.csv'))) == (0, 5)
+
+    def test_rejects_unknown_file_type(self):
+        with pytest.raises(ValueError):
+            ValidationFailureStore('failures.txt')
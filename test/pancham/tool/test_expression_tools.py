@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pancham.tool.expression_tools import compile_expression
+
+
+class TestExpressionTools:
+
+    data = pd.DataFrame({
+        'quantity': [1, 5, None],
+        'price': [2.0, 3.0, 4.0],
+        'status': ['open', 'closed', 'open'],
+        'first': ['Ann', 'Bob', None],
+        'Last Name': ['Lee', 'Ray', 'Fox']
+    }, index=[3, 4, 5])
+
+    def test_arithmetic(self):
+        output = compile_expression('quantity * price + 1')(self.data)
+
+        assert list(output[:2]) == [3.0, 16.0]
+        assert np.isnan(output[5])
+        assert list(output.index) == [3, 4, 5]
+
+    def test_conditions(self):
+        output = compile_expression("status == 'open' and not quantity > 2 or status in ['closed']")(self.data)
+
+        assert list(output) == [True, True, True]
+
+    def test_chained_comparison(self):
+        output = compile_expression('1 < quantity <= 5')(self.data)
+
+        assert list(output) == [False, True, False]
+
+    def test_where_and_coalesce(self):
+        output = compile_expression("where(status == 'open', coalesce(quantity, 0), -1)")(self.data)
+        conditional = compile_expression("price if quantity > 2 else 0")(self.data)
+
+        assert list(output) == [1.0, -1.0, 0.0]
+        assert list(conditional) == [0.0, 3.0, 0.0]
+
+    def test_string_concatenation(self):
+        output = compile_expression("coalesce(first, '') + ' ' + `Last Name` + str(price)")(self.data)
+
+        assert list(output) == ['Ann Lee2.0', 'Bob Ray3.0', ' Fox4.0']
+
+    def test_constant_is_broadcast(self):
+        output = compile_expression("'fixed'")(self.data)
+
+        assert list(output) == ['fixed', 'fixed', 'fixed']
+
+    def test_unknown_column(self):
+        with pytest.raises(ValueError):
+            compile_expression('missing + 1')(self.data)
+
+    def test_unsupported_syntax(self):
+        with pytest.raises(ValueError):
+            compile_expression('__import__("os")')
+
+        with pytest.raises(ValueError):
+            compile_expression('quantity.sum()')
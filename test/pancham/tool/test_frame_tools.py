@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from pancham.tool.frame_tools import detach, optimize_dtypes, restore_dtypes
+
+
+class TestFrameTools:
+
+    def test_detach_with_copy_on_write(self):
+        with pd.option_context('mode.copy_on_write', True):
+            original = pd.DataFrame({'a': [1, 2, 3]})
+            detached = detach(original)
+
+            assert np.shares_memory(original['a'].to_numpy(), detached['a'].to_numpy())
+
+            detached.loc[0, 'a'] = 10
+
+            assert original.loc[0, 'a'] == 1
+
+    def test_detach_without_copy_on_write(self):
+        with pd.option_context('mode.copy_on_write', False):
+            original = pd.DataFrame({'a': [1, 2, 3]})
+            detached = detach(original)
+
+            detached.loc[0, 'a'] = 10
+
+            assert original.loc[0, 'a'] == 1
+
+    def test_optimize_dtypes(self):
+        original = pd.DataFrame({
+            'status': ['open', 'closed'] * 50,
+            'name': [f"name {i}" for i in range(100)],
+            'count': range(100),
+            'half': [i / 2 for i in range(100)],
+            'third': [i / 3 for i in range(100)]
+        })
+
+        optimized, saved = optimize_dtypes(original)
+
+        assert isinstance(optimized['status'].dtype, pd.CategoricalDtype)
+        assert optimized['name'].dtype == object
+        assert optimized['count'].dtype == np.int8
+        assert optimized['half'].dtype == np.float32
+        assert optimized['third'].dtype == np.float64
+        assert set(saved.keys()) == {'status', 'count', 'half'}
+        assert original['status'].dtype == object
+
+    def test_restore_dtypes(self):
+        optimized, _ = optimize_dtypes(pd.DataFrame({'status': ['open', None, 'open', 'open']}))
+
+        restored = restore_dtypes(optimized).fillna('')
+
+        assert list(restored['status']) == ['open', '', 'open', 'open']
@@ -0,0 +1,28 @@
+import pytest
+
+from pancham.tool.yaml_tools import safe_load, yield_key_items
+
+
+class TestYamlTools:
+
+    def test_safe_load(self):
+        data = safe_load("orders:\n  - name: A\n    date: 2024-01-01\n")
+
+        assert data['orders'][0]['name'] == 'A'
+        assert str(data['orders'][0]['date']) == '2024-01-01'
+
+    def test_yield_key_items(self):
+        document = "before: {a: [1, 2]}\norders:\n  - name: A\n  - &b {name: B}\n  - *b\nafter: 1\n"
+
+        items = list(yield_key_items(document, 'orders'))
+
+        assert items == [{'name': 'A'}, {'name': 'B'}, {'name': 'B'}]
+        assert items == safe_load(document)['orders']
+
+    def test_yield_missing_key(self):
+        with pytest.raises(ValueError):
+            list(yield_key_items("orders: []\n", 'customers'))
+
+    def test_yield_key_not_list(self):
+        with pytest.raises(ValueError):
+            list(yield_key_items("orders: 1\n", 'orders'))
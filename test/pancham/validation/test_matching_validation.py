@@ -1,8 +1,21 @@
+import pandas as pd
+
 from pancham.validation import MatchingValidation
+from pancham.validation_field import ValidationInput, ValidationRule
 
 class TestMatchingValidation:
 
     def test_name(self):
         validation = MatchingValidation()
 
-        assert validation.get_name() == "match"
\ No newline at end of file
+        assert validation.get_name() == "match"
+
+    def test_value_is_kept_apart_from_message(self):
+        validation = MatchingValidation()
+        rule = ValidationRule('status', 'id', {'search_field': 'id', 'search_value': 2, 'expected_value': 'open'})
+
+        failure = validation.validate(ValidationInput('match', pd.DataFrame({'id': [1, 2], 'status': ['open', 'closed']}), rule))[0]
+
+        assert failure.message == "Expected value open does not match status value."
+        assert failure.value == 'open'
+        assert failure.message_template == "Expected value {value} does not match status value."